@@ -13,7 +13,16 @@ load_dotenv()
 
 from .project.prepare_data_model import *
 from .project.rule_checker import *
-from .project.azure_storage import AzureBlobStorageManager
+from .project.azure_storage import AzureBlobStorageManager, GrowingFileReader
+from .project.job_queue import (
+    CANCELLED,
+    FAILED,
+    FINISHED_STATUSES,
+    JobTimeoutError,
+    QueueFullError,
+    job_queue_from_env,
+    job_status,
+)
 import time
 import pandas as pd
 import os
@@ -25,6 +34,8 @@ import tempfile
 import shutil
 
 # =======================  Define Logger Code Here ====================
+# Server process only: the project modules log through loguru's logger directly, so
+# the rule checker's spawn workers never import this module (or rotate this file)
 logger.add(
     "execute_rule_data_modelling.log",
     format="{time} | {level} | {message} | {name} | {file} | line {line}",
@@ -107,6 +118,61 @@ app.add_middleware(
 # Initialize Azure Blob Storage Manager
 storage_manager = AzureBlobStorageManager()
 
+# Stream the XML rung by rung instead of building the whole BeautifulSoup tree
+data_modelling_streaming = (
+    os.getenv("DATA_MODELLING_STREAMING", "false").lower() == "true"
+)
+
+# Blob storage folders: stream the XML into the parser while the folder downloads and
+# upload outputs while later stages run (always uses the streaming parser)
+data_modelling_pipelined = (
+    os.getenv("DATA_MODELLING_PIPELINED", "false").lower() == "true"
+)
+
+# Data models of previously modelled XML exports, keyed by content hash. Created on
+# first use: scripts importing prepare_data_model before this module get a partially
+# imported package here (its modules import the logger from main)
+_data_model_cache = None
+
+
+def get_data_model_cache() -> "DataModelCache":
+
+    global _data_model_cache
+    if _data_model_cache is None:
+        _data_model_cache = data_model_cache_from_env()
+
+    return _data_model_cache
+
+
+async def materialize_model_folder(folder_name: str, folder_path: Path) -> bool:
+    """Rebuild model_files/<folder_name> from blob storage: the project folder (XML, PDF,
+    Task-*.csv) and the data model uploaded under the XML name. Downloads go through the
+    blob cache, so only blobs changed since the last download are transferred."""
+
+    if not storage_manager.enabled:
+        return False
+
+    if not await storage_manager.download_directory(f"{folder_name}/", str(folder_path)):
+        return False
+
+    xml_files = list(folder_path.glob("*.xml"))
+    if not xml_files:
+        logger.warning(f"No XML file in blob folder '{folder_name}'")
+        return False
+
+    dest_file_name = xml_files[0].stem
+
+    return await storage_manager.download_directory(
+        f"{dest_file_name}/", str(folder_path / dest_file_name)
+    )
+
+
+# Selected rules run concurrently on a process pool (RULE_CHECKER_WORKERS=1: sequentially)
+rule_scheduler = RuleScheduler(rule_checker_workers())
+
+# Data modelling and rule checks run as jobs, JOB_WORKERS at a time (see job_queue.py)
+job_queue = job_queue_from_env()
+
 
 class ConnectionManager:
     def __init__(self):
@@ -132,6 +198,49 @@ class ConnectionManager:
         for connection in disconnected_connections:
             self.active_connections.remove(connection)
 
+    async def broadcast_transfer_progress(self, progress_data):
+        """Progress callback of the blob storage transfers, as WebSocket updates"""
+        if isinstance(progress_data, dict):
+            progress_type = progress_data.get('type')
+            direction = progress_data.get('direction', 'download')
+            action = "Uploading" if direction == 'upload' else "Downloading"
+            
+            if progress_type == 'file_start':
+                await self.broadcast(
+                    f"Starting {direction}: {progress_data['current_file']} ({progress_data['file_index']}/{progress_data['total_files']})"
+                )
+            elif progress_type == 'file_progress':
+                # Calculate percentages
+                file_percent = (progress_data['file_progress'] / progress_data['file_total']) * 100 if progress_data['file_total'] > 0 else 0
+                overall_percent = (progress_data['overall_progress'] / progress_data['overall_total']) * 100 if progress_data['overall_total'] > 0 else 0
+                
+                # Format file size
+                def format_bytes(bytes_val):
+                    for unit in ['B', 'KB', 'MB', 'GB']:
+                        if bytes_val < 1024.0:
+                            return f"{bytes_val:.1f} {unit}"
+                        bytes_val /= 1024.0
+                    return f"{bytes_val:.1f} TB"
+                
+                await self.broadcast(
+                    f"{action} {progress_data['current_file']}: {file_percent:.1f}% "
+                    f"({format_bytes(progress_data['file_progress'])}/{format_bytes(progress_data['file_total'])}) | "
+                    f"Overall: {overall_percent:.1f}% ({progress_data['files_completed']}/{progress_data['total_files']} files)"
+                )
+            elif progress_type == 'file_complete':
+                await self.broadcast(
+                    f"Completed: {progress_data['current_file']} ({progress_data['files_completed']}/{progress_data['total_files']} files done)"
+                )
+            elif progress_type in ('download_complete', 'upload_complete'):
+                if progress_data['success']:
+                    await self.broadcast(
+                        f"{direction.capitalize()} completed successfully! All {progress_data['total_files']} files {direction}ed."
+                    )
+                else:
+                    await self.broadcast(
+                        f"{direction.capitalize()} completed with issues. {progress_data['files_completed']}/{progress_data['total_files']} files {direction}ed."
+                    )
+
     async def broadcast_data_modelling(self, input_dir):
         # Check if input_dir is a local path or blob storage folder name
         input_path = Path(input_dir)
@@ -257,55 +366,23 @@ class ConnectionManager:
                             "data_model_dir": "",
                         }
 
+                    if data_modelling_pipelined:
+                        result = await self._pipelined_data_modelling(
+                            input_dir,
+                            local_model_path,
+                            validation_result["xml_files"][0],
+                        )
+                        await self.broadcast(f"Final Result: {result}")
+                        return result
+
                     # Folder is valid, proceed with download
                     await self.broadcast(
                         f"Folder validation successful. Downloading {input_dir} to model_files directory..."
                     )
 
-                    # Create progress callback for WebSocket updates
-                    async def download_progress_callback(progress_data):
-                        if isinstance(progress_data, dict):
-                            progress_type = progress_data.get('type')
-                            
-                            if progress_type == 'file_start':
-                                await self.broadcast(
-                                    f"Starting download: {progress_data['current_file']} ({progress_data['file_index']}/{progress_data['total_files']})"
-                                )
-                            elif progress_type == 'file_progress':
-                                # Calculate percentages
-                                file_percent = (progress_data['file_progress'] / progress_data['file_total']) * 100 if progress_data['file_total'] > 0 else 0
-                                overall_percent = (progress_data['overall_progress'] / progress_data['overall_total']) * 100 if progress_data['overall_total'] > 0 else 0
-                                
-                                # Format file size
-                                def format_bytes(bytes_val):
-                                    for unit in ['B', 'KB', 'MB', 'GB']:
-                                        if bytes_val < 1024.0:
-                                            return f"{bytes_val:.1f} {unit}"
-                                        bytes_val /= 1024.0
-                                    return f"{bytes_val:.1f} TB"
-                                
-                                await self.broadcast(
-                                    f"Downloading {progress_data['current_file']}: {file_percent:.1f}% "
-                                    f"({format_bytes(progress_data['file_progress'])}/{format_bytes(progress_data['file_total'])}) | "
-                                    f"Overall: {overall_percent:.1f}% ({progress_data['files_completed']}/{progress_data['total_files']} files)"
-                                )
-                            elif progress_type == 'file_complete':
-                                await self.broadcast(
-                                    f"Completed: {progress_data['current_file']} ({progress_data['files_completed']}/{progress_data['total_files']} files done)"
-                                )
-                            elif progress_type == 'download_complete':
-                                if progress_data['success']:
-                                    await self.broadcast(
-                                        f"Download completed successfully! All {progress_data['total_files']} files downloaded."
-                                    )
-                                else:
-                                    await self.broadcast(
-                                        f"Download completed with issues. {progress_data['files_completed']}/{progress_data['total_files']} files downloaded."
-                                    )
-
                     # Download files from Azure Blob Storage directly to model_files
                     download_success = await storage_manager.download_directory(
-                        input_dir, str(local_model_path), download_progress_callback
+                        input_dir, str(local_model_path), self.broadcast_transfer_progress
                     )
 
                     if not download_success:
@@ -380,102 +457,260 @@ class ConnectionManager:
     ):
         """Helper method to process data modelling for both local and blob storage cases"""
         try:
-            # Step 3: Call ingest_file in background thread
-            await self.broadcast("Extracting ingest_file: 2%")
-            result_from_ingest = await asyncio.to_thread(
-                ingest_file,
-                str(xml_file_path),  # convert Path to string if needed
+            # Identical XML exports (same modeller version) reuse the cached data model
+            cache_key = await asyncio.to_thread(
+                get_data_model_cache().key, xml_file_path
+            )
+            cached_names = await asyncio.to_thread(
+                get_data_model_cache().restore, cache_key, output_dir, dest_file_name
             )
 
-            all_program_function_names = []
+            if cached_names is not None:
+                await self.broadcast(
+                    "Reusing cached data model of an identical XML export: 90%"
+                )
+                program_names, function_names = cached_names
 
-            # Step 4: data_modelling_program_wise
-            await self.broadcast("Extracting data_modelling_program_wise: 10%")
-            program_names = await asyncio.to_thread(
-                data_modelling_program_wise,
-                result_from_ingest,
-                output_dir,
-                f"{dest_file_name}_programwise.csv",
-            )
+            else:
+                # Step 3: Call ingest_file in background thread
+                await self.broadcast("Extracting ingest_file: 2%")
+                result_from_ingest = await asyncio.to_thread(
+                    ingest_file,
+                    str(xml_file_path),  # convert Path to string if needed
+                    data_modelling_streaming,
+                )
 
-            # Step 5: data_modelling_function_wise
-            await self.broadcast("Extracting data_modelling_function_wise: 40%")
-            function_names = await asyncio.to_thread(
-                data_modelling_function_wise,
-                result_from_ingest,
-                output_dir,
-                f"{dest_file_name}_functionwise.csv",
-            )
+                # Step 4: Programwise/functionwise data model and variable comments in one tree walk
+                await self.broadcast(
+                    "Extracting data model and variable comments (programwise/functionwise): 10%"
+                )
+                program_names, function_names = await asyncio.to_thread(
+                    data_modelling_single_pass,
+                    result_from_ingest,
+                    output_dir,
+                    dest_file_name,
+                )
 
-            # Step 6: extract_variable_comment_programwise
-            await self.broadcast("Extracting extract_variable_comment_programwise: 70%")
-            await asyncio.to_thread(
-                extract_variable_comment_programwise,
-                result_from_ingest,
-                f"{dest_file_name}_programwise.json",
-                output_dir,
-            )
+                if program_names or function_names:
+                    await asyncio.to_thread(
+                        get_data_model_cache().store,
+                        cache_key,
+                        output_dir,
+                        dest_file_name,
+                        program_names,
+                        function_names,
+                    )
 
-            # Step 7: extract_variable_comment_functionwise
-            await self.broadcast(
-                "Extracting extract_variable_comment_functionwise: 85%"
-            )
-            await asyncio.to_thread(
-                extract_variable_comment_functionwise,
-                result_from_ingest,
-                f"{dest_file_name}_functionwise.json",
-                output_dir,
+            return await self._upload_data_modelling_results(
+                output_dir, dest_file_name, source_dir, program_names, function_names
             )
+        except Exception as e:
+            await self.broadcast(f"Error during data modelling: {str(e)}")
+            return {
+                "status": "Data Modelling Failed",
+                "reason": f"Error during processing: {str(e)}",
+                "data_model_dir": "",
+                "all_task_names": [],
+            }
 
-            # Step 8: Upload results back to Azure Blob Storage
-            await self.broadcast("Uploading results to Azure Blob Storage: 90%")
-            blob_output_path = f"{dest_file_name}"
-            await asyncio.to_thread(
-                storage_manager.upload_directory, str(output_dir), blob_output_path
+    async def _pipelined_data_modelling(self, input_dir, local_model_path, xml_blob):
+        """Data modelling of a blob storage folder that parses the XML while it downloads
+
+        The XML blob is downloaded first and followed by the streaming parser, while the
+        other files download alongside; each finished group of outputs (data models,
+        comments) is uploaded while the next stage runs. An XML restored from the blob
+        cache is already complete, so it takes the regular path and the data model cache.
+        """
+        dest_file_name = Path(xml_blob).stem
+        relative_xml_path = xml_blob[len(input_dir) :].lstrip("/")
+        xml_file_path = local_model_path / relative_xml_path
+        output_dir = local_model_path / dest_file_name
+
+        await self.broadcast(
+            f"Folder validation successful. Downloading {input_dir} while modelling the XML..."
+        )
+        xml_reader = GrowingFileReader()
+        download = asyncio.create_task(
+            storage_manager.download_directory(
+                input_dir,
+                str(local_model_path),
+                self.broadcast_transfer_progress,
+                followers={xml_blob: xml_reader},
             )
+        )
 
-            # Step 9: Upload source files to input-files container with timestamp
-            await self.broadcast("Uploading source files to input-files container: 95%")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            input_files_folder = f"{dest_file_name}_{timestamp}"
+        with xml_reader:
+            xml_complete = await asyncio.to_thread(xml_reader.wait_started)
 
-            try:
-                await asyncio.to_thread(
-                    storage_manager.upload_directory,
-                    str(source_dir),
-                    input_files_folder,
-                    "input-files",  # container name
+            if xml_complete:
+                if not await download:
+                    return {
+                        "status": "Data Modelling Failed",
+                        "reason": f"Failed to download folder '{input_dir}' from Azure Blob Storage",
+                        "data_model_dir": "",
+                    }
+                output_dir.mkdir(parents=True, exist_ok=True)
+                return await self._process_data_modelling(
+                    xml_file_path, dest_file_name, output_dir, local_model_path
                 )
+
+            uploads = []
+            try:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                loop = asyncio.get_running_loop()
+                uploaded_files = []
+
+                def files_written(file_names):
+                    # Called from the modelling thread after each stage
+                    uploaded_files.extend(file_names)
+                    uploads.append(
+                        asyncio.run_coroutine_threadsafe(
+                            storage_manager.upload_directory(
+                                str(output_dir),
+                                dest_file_name,
+                                progress_callback=self.broadcast_transfer_progress,
+                                incremental=True,
+                                relative_paths=file_names,
+                            ),
+                            loop,
+                        )
+                    )
+
                 await self.broadcast(
-                    f"Source files uploaded to input-files/{input_files_folder}"
+                    "Extracting data model and variable comments while downloading: 2%"
                 )
-            except Exception as e:
-                logger.warning(
-                    f"Failed to upload source files to input-files container: {e}"
+                program_names, function_names = await asyncio.to_thread(
+                    data_modelling_single_pass,
+                    ingest_file(xml_reader, True),
+                    output_dir,
+                    dest_file_name,
+                    files_written,
                 )
-                await self.broadcast(
-                    "Warning: Failed to upload source files to input-files container"
+
+                download_success = await download
+                await asyncio.gather(
+                    *(asyncio.wrap_future(upload) for upload in uploads),
+                    return_exceptions=True,
                 )
 
-            all_program_function_names.extend(program_names)
-            all_program_function_names.extend(function_names)
+                if not download_success:
+                    await self.broadcast(
+                        f"Failed to download folder '{input_dir}' from Azure Blob Storage"
+                    )
+                    return {
+                        "status": "Data Modelling Failed",
+                        "reason": f"Failed to download folder '{input_dir}' from Azure Blob Storage",
+                        "data_model_dir": "",
+                    }
 
-            # Final message
-            await self.broadcast("✅ Data Modelling Completed: 100%")
+                if program_names or function_names:
+                    cache_key = await asyncio.to_thread(
+                        get_data_model_cache().key, xml_file_path
+                    )
+                    await asyncio.to_thread(
+                        get_data_model_cache().store,
+                        cache_key,
+                        output_dir,
+                        dest_file_name,
+                        program_names,
+                        function_names,
+                    )
 
-            return {
-                "status": "Data Modelling Success",
-                "data_model_dir": blob_output_path,
-                "all_task_names": all_program_function_names,
-            }
+                return await self._upload_data_modelling_results(
+                    output_dir,
+                    dest_file_name,
+                    local_model_path,
+                    program_names,
+                    function_names,
+                    uploaded_files,
+                )
+            except Exception as e:
+                # Nothing may outlive the failed request: stop the folder download and
+                # let the uploads of the stages already written finish
+                download.cancel()
+                await asyncio.gather(
+                    download,
+                    *(asyncio.wrap_future(upload) for upload in uploads),
+                    return_exceptions=True,
+                )
+
+                await self.broadcast(f"Error during data modelling: {str(e)}")
+                return {
+                    "status": "Data Modelling Failed",
+                    "reason": f"Error during processing: {str(e)}",
+                    "data_model_dir": "",
+                    "all_task_names": [],
+                }
+
+    async def _upload_data_modelling_results(
+        self,
+        output_dir,
+        dest_file_name,
+        source_dir,
+        program_names,
+        function_names,
+        uploaded_files=(),
+    ):
+        """Upload the data model and archive the source files (steps 5 and 6); outputs in
+        uploaded_files were already uploaded during modelling"""
+        all_program_function_names = []
+
+        # Step 5: Upload results back to Azure Blob Storage
+        await self.broadcast("Uploading results to Azure Blob Storage: 90%")
+        blob_output_path = f"{dest_file_name}"
+        remaining_files = None
+        if uploaded_files:
+            remaining_files = [
+                file.relative_to(output_dir).as_posix()
+                for file in Path(output_dir).rglob("*")
+                if file.is_file()
+                and file.relative_to(output_dir).as_posix() not in uploaded_files
+            ]
+        if remaining_files is None or remaining_files:
+            # Only new or changed outputs are uploaded (compared by Content-MD5)
+            await storage_manager.upload_directory(
+                str(output_dir),
+                blob_output_path,
+                progress_callback=self.broadcast_transfer_progress,
+                incremental=True,
+                relative_paths=remaining_files,
+            )
+
+        # Step 6: Upload source files to input-files container with timestamp
+        await self.broadcast("Uploading source files to input-files container: 95%")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        input_files_folder = f"{dest_file_name}_{timestamp}"
+
+        try:
+            # Contents already archived by an earlier run are not uploaded again
+            await storage_manager.archive_directory(
+                str(source_dir),
+                input_files_folder,
+                "input-files",  # container name
+                progress_callback=self.broadcast_transfer_progress,
+            )
+            await self.broadcast(
+                f"Source files uploaded to input-files/{input_files_folder}"
+            )
         except Exception as e:
-            await self.broadcast(f"Error during data modelling: {str(e)}")
-            return {
-                "status": "Data Modelling Failed",
-                "reason": f"Error during processing: {str(e)}",
-                "data_model_dir": "",
-                "all_task_names": [],
-            }
+            logger.warning(
+                f"Failed to upload source files to input-files container: {e}"
+            )
+            await self.broadcast(
+                "Warning: Failed to upload source files to input-files container"
+            )
+
+        all_program_function_names.extend(program_names)
+        all_program_function_names.extend(function_names)
+
+        # Final message
+        await self.broadcast("✅ Data Modelling Completed: 100%")
+
+        return {
+            "status": "Data Modelling Success",
+            "data_model_dir": blob_output_path,
+            "all_task_names": all_program_function_names,
+        }
 
     async def broadcast_rule_checker(
         self, data_model_input_path, input_list, input_image=None
@@ -492,8 +727,6 @@ class ConnectionManager:
             "Detail",
             "Status",
         ]
-        standard_df = pd.DataFrame(columns=columns)
-        output_df = pd.DataFrame(columns=columns)
 
         try:
             # Use local files from model_files directory instead of downloading
@@ -532,69 +765,36 @@ class ConnectionManager:
                 data_model_local_path.glob("*datasource_comments_functionwise.csv")
             )[0]
 
-            total_rules = len(in_list)
-            rule_status = {}
-            all_outputs = []
-
-            for idx, rl in enumerate(in_list, start=1):
-                function = function_map.get(rl)
+            # Every rule reads the same files, so they are parsed once for the whole request
+            data_model = DataModel(
+                program_file_csv,
+                program_comment_file,
+                datasource_program_file,
+                function_file_csv,
+                function_comment_file,
+                datasource_function_file,
+                input_image,
+            )
 
+            async def report_progress(idx, total_rules, rl):
                 percent_complete = int((idx / total_rules) * 100)
                 await self.broadcast(
                     f"Executing Rule {rl} — {percent_complete}% complete"
                 )
-                if function:
-                    function_status = await asyncio.to_thread(
-                        function,
-                        program_file_csv,
-                        program_comment_file,
-                        datasource_program_file,
-                        function_file_csv,
-                        function_comment_file,
-                        datasource_function_file,
-                        input_image,
-                    )
 
-                    if (
-                        function_status.get("status") == "SUCCESS"
-                        and isinstance(function_status.get("output_df"), pd.DataFrame)
-                        and not function_status["output_df"].empty
-                    ):
-                        output_df = function_status["output_df"]
-                        output_df = output_df[standard_df.columns]
-                        # output_df.to_csv(
-                        #     output_file_path,
-                        #     mode="a",
-                        #     index=False,
-                        #     header=not output_file_path.exists(),
-                        # )
-                        all_outputs.append(output_df)
-                        rule_status[rl] = "SUCCESS"
-
-                    else:
-                        if isinstance(function_status.get("output_df"), pd.DataFrame):
-                            function_status["output_df"] = function_status[
-                                "output_df"
-                            ].to_dict(orient="records")
-                        if (
-                            "output_df" not in function_status
-                            and "error" not in function_status
-                        ):
-                            function_status = "FAILED"
-                        rule_status[rl] = function_status
-                else:
-                    rule_status[rl] = "Rule number not implemented or present"
+            rule_results = await rule_scheduler.run(
+                [(rl, function_map.get(rl)) for rl in in_list],
+                data_model,
+                report_progress,
+            )
+            final_df, rule_status = merge_rule_results(rule_results)
 
         except Exception as e:
             logger.error(f"Error in broadcast_rule_checker: {str(e)}")
             await self.broadcast(f"Error during rule checking: {str(e)}")
             return {"error": f"Error during rule checking: {str(e)}"}
 
-        if not all_outputs:
-            output_json_data = []  # empty list
-        else:
-            final_df = pd.concat(all_outputs, ignore_index=True)
-            output_json_data = final_df[columns].to_dict(orient="records")
+        output_json_data = final_df[columns].to_dict(orient="records")
 
         # Save results locally if output file exists
         if output_file_path.exists():
@@ -615,6 +815,80 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+@app.on_event("startup")
+async def start_job_queue():
+    job_queue.register("data_modelling", run_data_modelling_job)
+    job_queue.register("rule_checker", run_rule_checker_job)
+    job_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_rule_scheduler():
+    await job_queue.stop()
+    rule_scheduler.shutdown()
+
+
+#################### Jobs ##################################
+
+
+async def run_data_modelling_job(payload: Dict):
+
+    return await manager.broadcast_data_modelling(payload["target_input"])
+
+
+async def run_rule_checker_job(payload: Dict):
+
+    folder_name = payload["folder_name"]
+    in_list = payload["input_list"]
+
+    # Parse folder structure
+    model_files_dir = Path("model_files")
+    main_folder_path = model_files_dir / folder_name
+
+    if not main_folder_path.exists():
+        # Not modelled on this instance (or cleaned up): fetch it through the blob cache
+        if not await materialize_model_folder(folder_name, main_folder_path):
+            return {"error": f"Folder {folder_name} not found in model_files directory"}
+
+    # Find the subfolder (should be the only directory inside main folder)
+    subfolders = [item for item in main_folder_path.iterdir() if item.is_dir()]
+    if not subfolders:
+        return {"error": f"No subfolder found in {folder_name}"}
+
+    # Use the first subfolder as data_model_input_path
+    data_model_input_path = str(subfolders[0])
+
+    # Find CSV files starting with "Task-" to get the full file path
+    input_image = None
+    for file in main_folder_path.iterdir():
+        if (
+            file.is_file()
+            and file.name.endswith(".csv")
+            and file.name.startswith("Task-")
+        ):
+            # Use the full file path instead of just the extracted name
+            input_image = str(file)
+            break
+
+    # If Task-*.csv file is not found, continue without it instead of returning an error
+    # This allows the coding checker process to continue even if the Task-csv file doesn't exist
+
+    logger.debug(
+        f"Rule check of {folder_name}: data_model_input_path={data_model_input_path}, "
+        f"input_image={input_image}, in_list={in_list}"
+    )
+
+    if not manager.active_connections:
+        return {"status": "No clients connected"}
+
+    # Pass input_image to broadcast_rule_checker even if it's None
+    # The rule checker functions will need to handle the case where input_image is None
+    output_json_data = await manager.broadcast_rule_checker(
+        data_model_input_path, in_list, input_image
+    )
+    return output_json_data
+
+
 #################### API Routes ##################################
 
 
@@ -663,11 +937,17 @@ async def data_modelling_route(payload: data_model, request: Request):
         if not manager.active_connections:
             return {"status": "No clients connected"}
 
-        # Run data modeling in background to prevent blocking WebSocket connections
-        asyncio.create_task(manager.broadcast_data_modelling(target_input))
+        # Queued, a worker runs it without blocking WebSocket connections
+        try:
+            job = await job_queue.submit(
+                "data_modelling", {"target_input": target_input}
+            )
+        except QueueFullError as e:
+            return {"status": "Data Modelling Failed", "reason": str(e)}
 
         return {
-            "status": "Data modeling started. Check WebSocket for progress updates."
+            "status": "Data modeling started. Check WebSocket for progress updates.",
+            "job_id": job["job_id"],
         }
 
     except Exception as e:
@@ -679,66 +959,71 @@ async def data_modelling_route(payload: data_model, request: Request):
 async def rule_checker_route(payload: rule_check_model, request: Request):
 
     try:
-        folder_name = payload.folder_name
-        in_list = payload.input_list
-
-        # Parse folder structure
-        model_files_dir = Path("model_files")
-        main_folder_path = model_files_dir / folder_name
-
-        if not main_folder_path.exists():
-            return {"error": f"Folder {folder_name} not found in model_files directory"}
+        job = await job_queue.submit(
+            "rule_checker",
+            {"folder_name": payload.folder_name, "input_list": payload.input_list},
+        )
 
-        # Find the subfolder (should be the only directory inside main folder)
-        subfolders = [item for item in main_folder_path.iterdir() if item.is_dir()]
-        if not subfolders:
-            return {"error": f"No subfolder found in {folder_name}"}
-
-        # Use the first subfolder as data_model_input_path
-        data_model_input_path = str(subfolders[0])
-
-        # Find CSV files starting with "Task-" to get the full file path
-        input_image = None
-        for file in main_folder_path.iterdir():
-            if (
-                file.is_file()
-                and file.name.endswith(".csv")
-                and file.name.startswith("Task-")
-            ):
-                # Use the full file path instead of just the extracted name
-                input_image = str(file)
-                break
+        if not payload.wait:
+            return {"status": "Rule check queued", "job_id": job["job_id"]}
 
-        # If Task-*.csv file is not found, continue without it instead of returning an error
-        # This allows the coding checker process to continue even if the Task-csv file doesn't exist
-
-        print("*" * 100)
-        print(
-            "folder_name",
-            folder_name,
-            "data_model_input_path",
-            data_model_input_path,
-            "input_image",
-            input_image,
-            "in_list",
-            in_list,
-        )
+        try:
+            job = await job_queue.wait(job["job_id"])
+        except JobTimeoutError as e:
+            # Still running; the result can be fetched from /jobs/{job_id}/result
+            return {"error": f"Rule Checker timed out: {str(e)}", "job_id": job["job_id"]}
 
-        if not manager.active_connections:
-            return {"status": "No clients connected"}
+        if job["status"] == FAILED:
+            return {"error": f"Rule Checker failed: {job['error']}"}
+        if job["status"] == CANCELLED:
+            return {"error": "Rule Checker cancelled"}
 
-        # Pass input_image to broadcast_rule_checker even if it's None
-        # The rule checker functions will need to handle the case where input_image is None
-        output_json_data = await manager.broadcast_rule_checker(
-            data_model_input_path, in_list, input_image
-        )
-        return output_json_data
+        return job["result"]
 
+    except QueueFullError as e:
+        return {"error": f"Rule Checker failed: {str(e)}"}
     except Exception as e:
         logger.error(f"Error in rule_checker_api: {str(e)}")
         return {"error": f"Rule Checker failed: {str(e)}"}
 
 
+@app.get("/jobs/{job_id}")
+async def job_status_route(job_id: str):
+    """Status of a data modelling or rule checker job"""
+
+    job = await job_queue.get(job_id)
+    if job is None:
+        return {"error": f"Job {job_id} not found"}
+
+    return job_status(job)
+
+
+@app.get("/jobs/{job_id}/result")
+async def job_result_route(job_id: str):
+    """Result of a finished job (the response of the synchronous API)"""
+
+    job = await job_queue.get(job_id)
+    if job is None:
+        return {"error": f"Job {job_id} not found"}
+
+    response = job_status(job)
+    if job["status"] in FINISHED_STATUSES:
+        response["result"] = job["result"]
+
+    return response
+
+
+@app.post("/jobs/{job_id}/cancel")
+async def job_cancel_route(job_id: str):
+    """Cancel a queued job, or stop a running one"""
+
+    job = await job_queue.cancel(job_id)
+    if job is None:
+        return {"error": f"Job {job_id} not found"}
+
+    return job_status(job)
+
+
 @app.post("/download_task_csv")
 async def download_task_csv_route(payload: download_task_csv_model, request: Request):
     """
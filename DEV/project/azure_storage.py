@@ -1,13 +1,238 @@
 import os
 import asyncio
-from typing import List, Optional, BinaryIO
+import hashlib
+import io
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional, BinaryIO, Tuple
 from pathlib import Path
-from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
+from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient, BlobProperties, ContentSettings
 from azure.identity import DefaultAzureCredential
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotModifiedError
 from loguru import logger
 import tempfile
 import shutil
 
+from .local_blob_storage import LocalBlobServiceClient
+from .blob_cache import blob_cache_from_env
+
+MB = 1024 * 1024
+
+# Content-addressed store of archived source files and the manifest of an archive
+# folder (see archive_directory)
+CONTENT_PREFIX = "content"
+ARCHIVE_MANIFEST = "manifest.json"
+
+
+def _env_int(name: str, default: int) -> int:
+    """Positive integer setting from the environment, default when unset or invalid"""
+    try:
+        value = int(os.getenv(name) or default)
+    except ValueError:
+        logger.warning(f"Invalid {name}, using {default}")
+        return default
+    return value if value > 0 else default
+
+
+def file_md5(local_file_path: str) -> bytes:
+    """MD5 digest of a local file, as stored in the blob Content-MD5 property"""
+    md5 = hashlib.md5()
+    with open(local_file_path, 'rb') as file:
+        for block in iter(lambda: file.read(MB), b''):
+            md5.update(block)
+    return md5.digest()
+
+
+def _same_content(blob: Optional[BlobProperties], size: int, content_md5: bytes) -> bool:
+    """True when the blob holds the local content (size and Content-MD5 match)"""
+    if blob is None or blob.size != size:
+        return False
+    blob_md5 = blob.content_settings.content_md5 if blob.content_settings else None
+    return bool(blob_md5) and bytes(blob_md5) == content_md5
+
+
+class TransferProgress:
+    """
+    Aggregated progress of concurrent blob transfers
+
+    The SDK reports the bytes of each blob from its worker threads (progress_hook).
+    TransferProgress adds them up across the blobs in flight, throttles the
+    'file_progress' events and hands every event to the progress callback from one
+    reporter task, in the order they happened. Without a callback it does nothing.
+    """
+
+    def __init__(self, progress_callback, total_files: int, total_bytes: int, direction: str = 'download',
+                 update_interval: float = 10.0, min_progress_change: float = 0.10):
+        self.progress_callback = progress_callback
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.direction = direction
+        self.update_interval = update_interval  # Send an update at least every 10 seconds
+        self.min_progress_change = min_progress_change  # or when 10% overall progress is made
+        self.files_completed = 0
+        self._file_bytes: Dict[str, int] = {}
+        self._last_update_time = 0.0
+        self._last_update_bytes = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._queue = None
+        self._reporter = None
+
+    async def __aenter__(self) -> "TransferProgress":
+        if self.progress_callback:
+            self._loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue()
+            self._reporter = asyncio.create_task(self._report())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._reporter:
+            # Deliver the remaining events before the transfer returns
+            self._post(None)
+            await self._reporter
+
+    async def _report(self):
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                return
+            try:
+                await self.progress_callback(event)
+            except Exception as e:
+                logger.warning(f"Transfer progress callback failed: {e}")
+
+    def _post(self, event: Optional[dict]):
+        # Safe from the SDK threads; the queue keeps the posting order
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def _event(self, event_type: str, **fields):
+        if self._reporter:
+            self._post({'type': event_type, 'direction': self.direction, **fields})
+
+    def file_start(self, blob_name: str, file_index: int):
+        self._event('file_start', current_file=os.path.basename(blob_name),
+                    file_index=file_index, total_files=self.total_files)
+
+    def hook(self, blob_name: str, file_total: int) -> Optional[Callable[[int, Optional[int]], None]]:
+        """SDK progress_hook(current, total) of one blob, None without a callback"""
+        if not self._reporter:
+            return None
+
+        filename = os.path.basename(blob_name)
+
+        def progress_hook(current: int, total: Optional[int]):
+            self._file_progress(blob_name, filename, current, total or file_total)
+
+        return progress_hook
+
+    def _file_progress(self, blob_name: str, filename: str, current: int, file_total: int):
+        with self._lock:
+            self._file_bytes[blob_name] = current
+            overall = sum(self._file_bytes.values())
+
+            # Send update if enough time passed OR significant progress made OR file completed
+            now = time.monotonic()
+            progress_since_last = (overall - self._last_update_bytes) / self.total_bytes if self.total_bytes > 0 else 0
+            if not (now - self._last_update_time >= self.update_interval or
+                    progress_since_last >= self.min_progress_change or
+                    current == file_total):
+                return
+
+            self._last_update_time = now
+            self._last_update_bytes = overall
+            self._event('file_progress', current_file=filename, file_progress=current, file_total=file_total,
+                        overall_progress=overall, overall_total=self.total_bytes,
+                        files_completed=self.files_completed, total_files=self.total_files)
+
+    def file_complete(self, blob_name: str, size: int, success: bool):
+        with self._lock:
+            if not success:
+                self._file_bytes.pop(blob_name, None)
+                return
+            self._file_bytes[blob_name] = size
+            self.files_completed += 1
+            self._event('file_complete', current_file=os.path.basename(blob_name),
+                        files_completed=self.files_completed, total_files=self.total_files)
+
+    def finish(self):
+        """Send the final 'download_complete' / 'upload_complete' event"""
+        self._event(f'{self.direction}_complete', files_completed=self.files_completed,
+                    total_files=self.total_files, success=self.files_completed == self.total_files)
+
+
+class GrowingFileReader(io.RawIOBase):
+    """
+    Read-only file object over a blob that is still being downloaded
+
+    download_directory (followers) writes the blob to disk in order and reports each
+    chunk; reads block until the next bytes are on disk and end with the download, so
+    a parser can consume the blob while it (and other files) transfer. A failed
+    download raises OSError in the reader.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._condition = threading.Condition()
+        self._file: Optional[BinaryIO] = None
+        self._written = 0
+        self._position = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+
+    def start(self, local_file_path: str, complete: bool = False):
+        """Called by the download once the file is created (complete: already fully written)"""
+        with self._condition:
+            self._file = open(local_file_path, 'rb')
+            if complete:
+                self._written = os.path.getsize(local_file_path)
+                self._done = True
+            self._condition.notify_all()
+
+    def wrote(self, size: int):
+        with self._condition:
+            self._written += size
+            self._condition.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None):
+        """End of the download; no-op when already finished"""
+        with self._condition:
+            if self._done:
+                return
+            self._done = True
+            self._error = error
+            self._condition.notify_all()
+
+    def wait_started(self) -> bool:
+        """Block until the download starts or ends, True when the file arrived complete
+        (e.g. restored from the blob cache)"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._file is not None or self._done)
+            return self._file is not None and self._done and self._error is None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        with self._condition:
+            self._condition.wait_for(lambda: self._position < self._written or self._done)
+            if self._error is not None or self._file is None:
+                raise OSError(f"Download failed: {self._error or 'blob not downloaded'}")
+            available = self._written - self._position
+
+        if available <= 0:
+            return 0
+        count = self._file.readinto(memoryview(buffer)[:min(len(buffer), available)])
+        self._position += count
+        return count
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        super().close()
+
+
 class AzureBlobStorageManager:
     """
     Azure Blob Storage manager for handling file operations
@@ -18,34 +243,53 @@ class AzureBlobStorageManager:
         self.account_key = os.getenv('AZURE_STORAGE_ACCOUNT_KEY')
         self.connection_string = os.getenv('AZURE_STORAGE_CONNECTION_STRING')
         self.container_name = os.getenv('AZURE_CONTAINER_NAME', 'coding-checker')
+        # Filesystem stand-in for tests and offline development (see local_blob_storage.py)
+        self.local_directory = os.getenv('AZURE_STORAGE_LOCAL_DIR')
         self.blob_service_client = None
         self.container_client = None
         self.enabled = False
+        # Read-through cache of downloaded blobs, shared by all endpoints (see blob_cache.py)
+        self.blob_cache = blob_cache_from_env()
+
+        # Blobs transferred at the same time, connections per blob (parallel range
+        # reads and block uploads) and the size of each range / block
+        self.transfer_concurrency = _env_int('AZURE_TRANSFER_CONCURRENCY', 4)
+        self.max_concurrency = _env_int('AZURE_TRANSFER_MAX_CONCURRENCY', 4)
+        self.block_size = _env_int('AZURE_TRANSFER_BLOCK_SIZE_MB', 4) * MB
+        client_options = {
+            'max_single_get_size': self.block_size,
+            'max_chunk_get_size': self.block_size,
+            'max_single_put_size': self.block_size,
+            'max_block_size': self.block_size,
+        }
         
         # Initialize blob service client
         try:
             if self.connection_string:
-                self.blob_service_client = BlobServiceClient.from_connection_string(self.connection_string)
+                self.blob_service_client = BlobServiceClient.from_connection_string(self.connection_string, **client_options)
                 logger.info("Azure Blob Storage initialized with connection string")
             elif self.account_name and self.account_key:
                 account_url = f"https://{self.account_name}.blob.core.windows.net"
-                self.blob_service_client = BlobServiceClient(account_url=account_url, credential=self.account_key)
+                self.blob_service_client = BlobServiceClient(account_url=account_url, credential=self.account_key, **client_options)
                 logger.info("Azure Blob Storage initialized with account name and key")
             elif self.account_name:
                 # Use default Azure credentials (managed identity, service principal, etc.)
                 account_url = f"https://{self.account_name}.blob.core.windows.net"
                 credential = DefaultAzureCredential()
-                self.blob_service_client = BlobServiceClient(account_url=account_url, credential=credential)
+                self.blob_service_client = BlobServiceClient(account_url=account_url, credential=credential, **client_options)
                 logger.info("Azure Blob Storage initialized with DefaultAzureCredential")
+            elif self.local_directory:
+                self.blob_service_client = LocalBlobServiceClient(self.local_directory, **client_options)
+                logger.info(f"Blob storage stand-in initialized in local directory '{self.local_directory}'")
             else:
                 logger.warning("Azure Blob Storage not configured - running in local mode")
                 return
             
             self.container_client = self.blob_service_client.get_container_client(self.container_name)
             
-            # Ensure container exists
-            self._ensure_container_exists()
+            # Ensure container exists (the check is skipped while not enabled)
             self.enabled = True
+            self._ensure_container_exists()
             
         except Exception as e:
             logger.error(f"Failed to initialize Azure Blob Storage: {e}")
@@ -90,7 +334,9 @@ class AzureBlobStorageManager:
             blob_client = self.container_client.get_blob_client(blob_name)
             
             with open(local_file_path, 'rb') as data:
-                await asyncio.to_thread(blob_client.upload_blob, data, overwrite=overwrite)
+                await asyncio.to_thread(
+                    blob_client.upload_blob, data, overwrite=overwrite, max_concurrency=self.max_concurrency
+                )
             
             logger.info(f"Successfully uploaded {local_file_path} to {blob_name}")
             return True
@@ -107,87 +353,161 @@ class AzureBlobStorageManager:
             local_file_path: Path where to save the file locally
             progress_callback: Optional callback function for progress updates (current_bytes, total_bytes, filename)
         
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        progress_hook = None
+        pending = []
+
+        if progress_callback:
+            loop = asyncio.get_running_loop()
+            filename = os.path.basename(blob_name)
+
+            def progress_hook(current, total):
+                # Called by the SDK after each range, from its worker threads
+                pending.append(asyncio.run_coroutine_threadsafe(progress_callback(current, total or 0, filename), loop))
+
+        success = await self._download_blob_to_file(blob_name, local_file_path, progress_hook)
+
+        if pending:
+            await asyncio.gather(*(asyncio.wrap_future(future) for future in pending), return_exceptions=True)
+
+        return success
+
+    async def _download_blob_to_file(self, blob_name: str, local_file_path: str, progress_hook=None,
+                                     container_client: ContainerClient = None, etag: Optional[str] = None,
+                                     follower: Optional[GrowingFileReader] = None) -> bool:
+        """
+        Download a blob in ranges of block_size, max_concurrency ranges at a time, through
+        the local blob cache
+        
+        A cached blob is copied without a request when etag (from a listing) matches it, and
+        otherwise revalidated with If-None-Match, so only changed blobs are transferred.
+        
+        Args:
+            blob_name: Name of the blob in storage
+            local_file_path: Path where to save the file locally
+            progress_hook: Optional SDK progress hook (current_bytes, total_bytes)
+            container_client: Optional container client (defaults to self.container_client)
+            etag: Optional current ETag of the blob
+            follower: Optional reader to follow the file while it is written (in order)
+        
         Returns:
             bool: True if successful, False otherwise
         """
         if not self.enabled:
             logger.warning(f"Azure Blob Storage not enabled - cannot download {blob_name}")
+            if follower:
+                follower.finish(RuntimeError("Azure Blob Storage not enabled"))
             return False
             
         try:
-            blob_client = self.container_client.get_blob_client(blob_name)
-            
-            # Ensure local directory exists
-            os.makedirs(os.path.dirname(local_file_path), exist_ok=True)
-            
-            # Get blob properties to determine file size
-            blob_properties = await asyncio.to_thread(blob_client.get_blob_properties)
-            total_size = blob_properties.size
-            
-            with open(local_file_path, 'wb') as download_file:
-                download_stream = await asyncio.to_thread(blob_client.download_blob)
-                
-                if progress_callback and total_size > 0:
-                    # Download in chunks to track progress
-                    chunk_size = 8192  # 8KB chunks
-                    downloaded_bytes = 0
-                    last_update_time = 0
-                    last_update_bytes = 0
-                    update_interval = 5.0  # Update every 5 seconds
-                    min_progress_threshold = 0.05  # Update when 5% progress is made
-                    
-                    # Send initial progress
-                    await progress_callback(0, total_size, os.path.basename(blob_name))
-                    
-                    # Read and write in chunks
-                    while True:
-                        chunk = await asyncio.to_thread(download_stream.read, chunk_size)
-                        if not chunk:
-                            break
-                        
-                        await asyncio.to_thread(download_file.write, chunk)
-                        downloaded_bytes += len(chunk)
-                        
-                        # Throttle progress updates
-                        current_time = asyncio.get_event_loop().time()
-                        progress_since_last = (downloaded_bytes - last_update_bytes) / total_size
-                        time_since_last = current_time - last_update_time
-                        
-                        # Send update if enough time passed OR significant progress made
-                        if (time_since_last >= update_interval or 
-                            progress_since_last >= min_progress_threshold or 
-                            downloaded_bytes == total_size):  # Always send final update
-                            await progress_callback(downloaded_bytes, total_size, os.path.basename(blob_name))
-                            last_update_time = current_time
-                            last_update_bytes = downloaded_bytes
-                else:
-                    # Fallback to original method if no progress callback
-                    await asyncio.to_thread(lambda: download_file.write(download_stream.readall()))
+            blob_client = (container_client or self.container_client).get_blob_client(blob_name)
+            cache = self.blob_cache if self.blob_cache.enabled else None
+
+            def restored(cached) -> None:
+                # No transfer, report the whole blob at once
+                if progress_hook:
+                    progress_hook(cached.size, cached.size)
+                if follower:
+                    follower.start(local_file_path, complete=True)
+
+            def write_blob(download_stream, file_path) -> None:
+                with open(file_path, 'wb') as download_file:
+                    if not follower:
+                        download_stream.readinto(download_file)
+                        return
+                    # Range by range in order, so the follower can read the file as it grows
+                    follower.start(file_path)
+                    for chunk in download_stream.chunks():
+                        download_file.write(chunk)
+                        download_file.flush()
+                        follower.wrote(len(chunk))
+
+            def download_sync() -> str:
+                cached = cache.lookup(blob_client.container_name, blob_name) if cache else None
+                if cached and cached.etag == etag and cache.copy_to(cached, local_file_path):
+                    restored(cached)
+                    return "cached"
+
+                conditions = {}
+                if cached:
+                    conditions = {'etag': cached.etag, 'match_condition': MatchConditions.IfModified}
+                try:
+                    # Fails before the local file is created when the blob is missing
+                    download_stream = blob_client.download_blob(
+                        max_concurrency=self.max_concurrency, progress_hook=progress_hook, **conditions
+                    )
+                except ResourceNotModifiedError:
+                    if cache.copy_to(cached, local_file_path):
+                        restored(cached)
+                        return "not modified"
+                    download_stream = blob_client.download_blob(
+                        max_concurrency=self.max_concurrency, progress_hook=progress_hook
+                    )
+
+                # Ensure local directory exists
+                os.makedirs(os.path.dirname(local_file_path) or '.', exist_ok=True)
+                if not cache:
+                    write_blob(download_stream, local_file_path)
+                    return "downloaded"
+
+                data_path = cache.new_file()
+                try:
+                    write_blob(download_stream, data_path)
+                    shutil.copyfile(data_path, local_file_path)
+                except BaseException:
+                    cache.discard(data_path)
+                    raise
+                cache.store(blob_client.container_name, blob_name, download_stream.properties.etag, data_path)
+                return "downloaded"
+
+            source = await asyncio.to_thread(download_sync)
+            if follower:
+                follower.finish()
             
-            logger.info(f"Successfully downloaded {blob_name} to {local_file_path}")
+            if source == "downloaded":
+                logger.info(f"Successfully downloaded {blob_name} to {local_file_path}")
+            else:
+                logger.info(f"Restored {blob_name} to {local_file_path} from the blob cache ({source})")
             return True
         except Exception as e:
             logger.error(f"Failed to download {blob_name} to {local_file_path}: {e}")
+            if follower:
+                follower.finish(e)
             return False
     
-    async def list_blobs(self, prefix: str = "") -> List[str]:
+    async def list_blob_properties(self, prefix: str = "", container_client: ContainerClient = None) -> List[BlobProperties]:
         """
-        List all blobs in the container with optional prefix filter
+        List all blobs in the container with their properties (size, etag, content settings)
         
         Args:
             prefix: Optional prefix to filter blobs
+            container_client: Optional container client (defaults to self.container_client)
         
         Returns:
-            List[str]: List of blob names
+            List[BlobProperties]: Properties of the blobs, from a single listing call
         """
+        container_client = container_client or self.container_client
         try:
-            blob_list = await asyncio.to_thread(
-                lambda: list(self.container_client.list_blobs(name_starts_with=prefix))
+            return await asyncio.to_thread(
+                lambda: list(container_client.list_blobs(name_starts_with=prefix))
             )
-            return [blob.name for blob in blob_list]
         except Exception as e:
             logger.error(f"Failed to list blobs with prefix '{prefix}': {e}")
             return []
+
+    async def list_blobs(self, prefix: str = "") -> List[str]:
+        """
+        List all blobs in the container with optional prefix filter
+        
+        Args:
+            prefix: Optional prefix to filter blobs
+        
+        Returns:
+            List[str]: List of blob names
+        """
+        return [blob.name for blob in await self.list_blob_properties(prefix)]
     
     async def delete_blob(self, blob_name: str) -> bool:
         """
@@ -302,7 +622,8 @@ class AzureBlobStorageManager:
                 "pdf_files": []
             }
     
-    async def download_directory(self, blob_prefix: str, local_directory: str, progress_callback=None) -> bool:
+    async def download_directory(self, blob_prefix: str, local_directory: str, progress_callback=None,
+                                 followers: Optional[Dict[str, GrowingFileReader]] = None) -> bool:
         """
         Download all blobs with a specific prefix to a local directory
         
@@ -310,181 +631,347 @@ class AzureBlobStorageManager:
             blob_prefix: Prefix of blobs to download (acts as directory path)
             local_directory: Local directory to download files to
             progress_callback: Optional callback function for progress updates
+            followers: Optional readers of blobs (by name) to consume while they download;
+                those blobs are downloaded first
         
         Returns:
             bool: True if all downloads successful, False otherwise
         """
+        followers = followers or {}
         try:
-            blobs = await self.list_blobs(prefix=blob_prefix)
+            # Sizes come with the listing, no properties request per blob
+            blobs = await self.list_blob_properties(prefix=blob_prefix)
             
             if not blobs:
                 logger.warning(f"No blobs found with prefix '{blob_prefix}'")
                 return False
-            
-            # Get total size of all blobs for overall progress tracking
-            total_size = 0
-            blob_sizes = {}
-            
-            if progress_callback:
-                for blob_name in blobs:
-                    try:
-                        blob_client = self.container_client.get_blob_client(blob_name)
-                        blob_properties = await asyncio.to_thread(blob_client.get_blob_properties)
-                        blob_sizes[blob_name] = blob_properties.size
-                        total_size += blob_properties.size
-                    except Exception as e:
-                        logger.warning(f"Could not get size for blob {blob_name}: {e}")
-                        blob_sizes[blob_name] = 0
-            
-            success_count = 0
-            downloaded_bytes = 0
-            last_progress_update_time = 0
-            last_progress_bytes = 0
-            progress_update_interval = 10.0  # Update every 5 seconds
-            min_progress_change = 0.10  # Update when 5% overall progress is made
-            
-            # Create a wrapper progress callback for individual files
-            async def file_progress_callback(current_bytes, file_total_bytes, filename):
-                nonlocal last_progress_update_time, last_progress_bytes
-                
-                if progress_callback:
-                    # Calculate overall progress
-                    file_downloaded = current_bytes
-                    overall_downloaded = downloaded_bytes + file_downloaded
-                    
-                    # Throttle progress updates
-                    current_time = asyncio.get_event_loop().time()
-                    progress_since_last = (overall_downloaded - last_progress_bytes) / total_size if total_size > 0 else 0
-                    time_since_last = current_time - last_progress_update_time
-                    
-                    # Send update if enough time passed OR significant progress made OR file completed
-                    if (time_since_last >= progress_update_interval or 
-                        progress_since_last >= min_progress_change or 
-                        current_bytes == file_total_bytes):  # Always send when file completes
-                        
-                        await progress_callback({
-                            'type': 'file_progress',
-                            'current_file': filename,
-                            'file_progress': current_bytes,
-                            'file_total': file_total_bytes,
-                            'overall_progress': overall_downloaded,
-                            'overall_total': total_size,
-                            'files_completed': success_count,
-                            'total_files': len(blobs)
-                        })
-                        
-                        last_progress_update_time = current_time
-                        last_progress_bytes = overall_downloaded
-            
-            for i, blob_name in enumerate(blobs):
+
+            downloads = []
+            for blob in blobs:
                 # Create relative path by removing prefix
-                relative_path = blob_name[len(blob_prefix):].lstrip('/')
-                local_file_path = os.path.join(local_directory, relative_path)
-                
-                # Send file start notification
-                if progress_callback:
-                    await progress_callback({
-                        'type': 'file_start',
-                        'current_file': os.path.basename(blob_name),
-                        'file_index': i + 1,
-                        'total_files': len(blobs)
-                    })
-                
-                if await self.download_file(blob_name, local_file_path, file_progress_callback):
-                    success_count += 1
-                    # Add this file's size to downloaded bytes
-                    downloaded_bytes += blob_sizes.get(blob_name, 0)
-                    
-                    # Send file completion notification
-                    if progress_callback:
-                        await progress_callback({
-                            'type': 'file_complete',
-                            'current_file': os.path.basename(blob_name),
-                            'files_completed': success_count,
-                            'total_files': len(blobs)
-                        })
-            
-            # Send final completion notification
-            if progress_callback:
-                await progress_callback({
-                    'type': 'download_complete',
-                    'files_completed': success_count,
-                    'total_files': len(blobs),
-                    'success': success_count == len(blobs)
-                })
+                relative_path = blob.name[len(blob_prefix):].lstrip('/')
+                downloads.append(
+                    (blob.name, os.path.join(local_directory, relative_path), blob.size or 0, blob.etag)
+                )
+            # Stable: followed blobs first, the rest in listing order
+            downloads.sort(key=lambda item: item[0] not in followers)
+
+            success_count = await self._download_blobs(downloads, self.container_client, progress_callback,
+                                                       followers)
             
             logger.info(f"Downloaded {success_count}/{len(blobs)} files from '{blob_prefix}'")
             return success_count == len(blobs)
         except Exception as e:
             logger.error(f"Failed to download directory '{blob_prefix}': {e}")
             return False
-    
-    async def upload_directory(self, local_directory: str, blob_prefix: str = "", container_name: str = None) -> bool:
+        finally:
+            # Readers of blobs that were not downloaded must not wait forever
+            for blob_name, follower in followers.items():
+                follower.finish(FileNotFoundError(f"Blob '{blob_name}' not downloaded"))
+
+    async def _download_blobs(self, downloads: List[Tuple[str, str, int, Optional[str]]],
+                              container_client: ContainerClient, progress_callback=None,
+                              followers: Optional[Dict[str, GrowingFileReader]] = None) -> int:
+        """
+        Download (blob name, local path, size, etag or None) items, transfer_concurrency at a time, with
+        their progress aggregated into one stream of progress events
+        
+        Returns:
+            int: Number of successful downloads
+        """
+        if not downloads:
+            return 0
+
+        followers = followers or {}
+        semaphore = asyncio.Semaphore(self.transfer_concurrency)
+
+        async with TransferProgress(progress_callback, len(downloads), sum(item[2] for item in downloads)) as progress:
+
+            async def download(file_index: int, blob_name: str, local_file_path: str, size: int,
+                               etag: Optional[str]) -> bool:
+                async with semaphore:
+                    progress.file_start(blob_name, file_index)
+                    success = await self._download_blob_to_file(
+                        blob_name, local_file_path, progress.hook(blob_name, size), container_client, etag,
+                        followers.get(blob_name)
+                    )
+                    progress.file_complete(blob_name, size, success)
+                    return success
+
+            results = await asyncio.gather(
+                *(download(i + 1, *item) for i, item in enumerate(downloads))
+            )
+            progress.finish()
+
+        return sum(results)
+
+    def _get_container_client(self, container_name: str = None) -> ContainerClient:
+        """Container client of container_name (defaults to self.container_name), created if missing"""
+        if not container_name or container_name == self.container_name:
+            return self.container_client
+
+        target_container_client = self.blob_service_client.get_container_client(container_name)
+        # Ensure target container exists
+        try:
+            target_container_client.create_container()
+            logger.info(f"Created container '{container_name}'")
+        except Exception as e:
+            if "ContainerAlreadyExists" not in str(e):
+                logger.warning(f"Could not create container '{container_name}': {e}")
+        return target_container_client
+
+    @staticmethod
+    def _local_files(local_directory: str) -> List[Tuple[str, str]]:
+        """(path, relative path with forward slashes) of the files under local_directory"""
+        local_path = Path(local_directory)
+        return [
+            (str(file_path), file_path.relative_to(local_path).as_posix())
+            for file_path in sorted(local_path.rglob('*'))
+            if file_path.is_file()
+        ]
+
+    async def upload_directory(self, local_directory: str, blob_prefix: str = "", container_name: str = None,
+                               progress_callback=None, incremental: bool = False,
+                               relative_paths: Optional[List[str]] = None) -> bool:
         """
         Upload all files from a local directory to blob storage
         
+        Every blob gets the MD5 of its file as Content-MD5. In incremental mode the
+        blobs under blob_prefix are listed once and files whose size and MD5 match
+        their blob are skipped.
+        
         Args:
             local_directory: Local directory to upload
             blob_prefix: Prefix to add to blob names (acts as directory path)
             container_name: Optional container name (defaults to self.container_name)
+            progress_callback: Optional callback function for progress updates
+            incremental: Only upload new or changed files
+            relative_paths: Optional subset of the files (paths relative to local_directory)
         
         Returns:
             bool: True if all uploads successful, False otherwise
         """
+        if not self.enabled:
+            logger.warning(f"Azure Blob Storage not enabled - cannot upload {local_directory}")
+            return False
+
         try:
             # Use specified container or default
             target_container = container_name or self.container_name
+            target_container_client = await asyncio.to_thread(self._get_container_client, container_name)
             
-            # Get container client for target container
-            if container_name and container_name != self.container_name:
-                target_container_client = self.blob_service_client.get_container_client(container_name)
-                # Ensure target container exists
-                try:
-                    target_container_client.create_container()
-                    logger.info(f"Created container '{container_name}'")
-                except Exception as e:
-                    if "ContainerAlreadyExists" not in str(e):
-                        logger.warning(f"Could not create container '{container_name}': {e}")
-            else:
-                target_container_client = self.container_client
-            
-            local_path = Path(local_directory)
-            if not local_path.exists():
+            if not Path(local_directory).exists():
                 logger.error(f"Local directory '{local_directory}' does not exist")
                 return False
             
             files_to_upload = []
-            for file_path in local_path.rglob('*'):
-                if file_path.is_file():
-                    relative_path = file_path.relative_to(local_path)
-                    blob_name = f"{blob_prefix}/{relative_path}".replace('\\', '/').lstrip('/')
-                    files_to_upload.append((str(file_path), blob_name))
+            for local_file_path, relative_path in self._local_files(local_directory):
+                if relative_paths is not None and relative_path not in relative_paths:
+                    continue
+                blob_name = f"{blob_prefix}/{relative_path}".lstrip('/')
+                files_to_upload.append((local_file_path, blob_name))
             
             if not files_to_upload:
                 logger.warning(f"No files found in directory '{local_directory}'")
                 return False
+
+            file_md5s = await asyncio.to_thread(
+                lambda: [file_md5(local_file_path) for local_file_path, _ in files_to_upload]
+            )
+            uploads = [
+                (local_file_path, blob_name, content_md5)
+                for (local_file_path, blob_name), content_md5 in zip(files_to_upload, file_md5s)
+            ]
+
+            if incremental:
+                listing_prefix = f"{blob_prefix}/".lstrip('/') if blob_prefix else ""
+                remote_blobs = {
+                    blob.name: blob
+                    for blob in await self.list_blob_properties(listing_prefix, target_container_client)
+                }
+                uploads = [
+                    (local_file_path, blob_name, content_md5)
+                    for local_file_path, blob_name, content_md5 in uploads
+                    if not _same_content(
+                        remote_blobs.get(blob_name), os.path.getsize(local_file_path), content_md5
+                    )
+                ]
+                logger.info(
+                    f"Skipping {len(files_to_upload) - len(uploads)} unchanged files in '{target_container}/{blob_prefix}'"
+                )
+
+            success_count = await self._upload_files(uploads, target_container_client, progress_callback)
             
-            success_count = 0
-            for local_file_path, blob_name in files_to_upload:
-                # Upload to specific container
-                if await self._upload_file_to_container(local_file_path, blob_name, target_container_client):
-                    success_count += 1
-            
-            logger.info(f"Uploaded {success_count}/{len(files_to_upload)} files to '{target_container}/{blob_prefix}'")
-            return success_count == len(files_to_upload)
+            logger.info(f"Uploaded {success_count}/{len(uploads)} files to '{target_container}/{blob_prefix}'")
+            return success_count == len(uploads)
         except Exception as e:
             logger.error(f"Failed to upload directory '{local_directory}': {e}")
             return False
+
+    async def archive_directory(self, local_directory: str, blob_prefix: str, container_name: str = None,
+                                progress_callback=None) -> bool:
+        """
+        Archive a local directory under blob_prefix without storing identical files twice
+        
+        File contents go to content-addressed blobs ("content/<md5>"), uploaded only when
+        no archive has stored that content yet. blob_prefix gets a manifest.json that maps
+        each relative path to its content blob (see download_archive).
+        
+        Args:
+            local_directory: Local directory to archive
+            blob_prefix: Folder of this archive (e.g. "<name>_<timestamp>")
+            container_name: Optional container name (defaults to self.container_name)
+            progress_callback: Optional callback function for progress updates
+        
+        Returns:
+            bool: True if the contents and the manifest were stored, False otherwise
+        """
+        if not self.enabled:
+            logger.warning(f"Azure Blob Storage not enabled - cannot archive {local_directory}")
+            return False
+
+        try:
+            target_container = container_name or self.container_name
+            target_container_client = await asyncio.to_thread(self._get_container_client, container_name)
+
+            local_files = self._local_files(local_directory)
+            if not local_files:
+                logger.warning(f"No files found in directory '{local_directory}'")
+                return False
+
+            file_md5s = await asyncio.to_thread(
+                lambda: [file_md5(local_file_path) for local_file_path, _ in local_files]
+            )
+
+            manifest = {}
+            contents = {}  # content blob name -> (local path, md5, size), one per content
+            for (local_file_path, relative_path), content_md5 in zip(local_files, file_md5s):
+                size = os.path.getsize(local_file_path)
+                content_blob = f"{CONTENT_PREFIX}/{content_md5.hex()}"
+                manifest[relative_path] = {'blob': content_blob, 'size': size, 'content_md5': content_md5.hex()}
+                contents.setdefault(content_blob, (local_file_path, content_md5, size))
+
+            async def stored(content_blob: str) -> bool:
+                local_file_path, content_md5, size = contents[content_blob]
+                try:
+                    blob = await asyncio.to_thread(
+                        target_container_client.get_blob_client(content_blob).get_blob_properties
+                    )
+                except Exception:
+                    return False
+                return _same_content(blob, size, content_md5)
+
+            present = await asyncio.gather(*(stored(content_blob) for content_blob in contents))
+            uploads = [
+                (local_file_path, content_blob, content_md5)
+                for (content_blob, (local_file_path, content_md5, _)), is_present in zip(contents.items(), present)
+                if not is_present
+            ]
+            logger.info(f"Archiving '{local_directory}': {len(contents) - len(uploads)} of {len(contents)} contents already stored")
+
+            success_count = await self._upload_files(uploads, target_container_client, progress_callback)
+            if success_count != len(uploads):
+                logger.error(f"Uploaded {success_count}/{len(uploads)} contents of '{local_directory}'")
+                return False
+
+            manifest_data = json.dumps({'files': manifest}, ensure_ascii=False, indent=2).encode('utf-8')
+            await asyncio.to_thread(
+                target_container_client.upload_blob,
+                name=f"{blob_prefix}/{ARCHIVE_MANIFEST}",
+                data=manifest_data,
+                overwrite=True,
+            )
+
+            logger.info(f"Archived {len(manifest)} files of '{local_directory}' to '{target_container}/{blob_prefix}'")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to archive directory '{local_directory}': {e}")
+            return False
+
+    async def download_archive(self, blob_prefix: str, local_directory: str, container_name: str = None,
+                               progress_callback=None) -> bool:
+        """
+        Restore a folder stored by archive_directory to a local directory
+        
+        Args:
+            blob_prefix: Folder of the archive
+            local_directory: Local directory to restore the files to
+            container_name: Optional container name (defaults to self.container_name)
+            progress_callback: Optional callback function for progress updates
+        
+        Returns:
+            bool: True if all files were restored, False otherwise
+        """
+        try:
+            target_container_client = await asyncio.to_thread(self._get_container_client, container_name)
+
+            manifest_stream = await asyncio.to_thread(
+                target_container_client.get_blob_client(f"{blob_prefix}/{ARCHIVE_MANIFEST}").download_blob
+            )
+            manifest = json.loads(await asyncio.to_thread(manifest_stream.readall))['files']
+
+            downloads = [
+                (entry['blob'], os.path.join(local_directory, relative_path), entry['size'], None)
+                for relative_path, entry in manifest.items()
+            ]
+            success_count = await self._download_blobs(downloads, target_container_client, progress_callback)
+
+            logger.info(f"Restored {success_count}/{len(downloads)} files of archive '{blob_prefix}'")
+            return success_count == len(downloads)
+        except Exception as e:
+            logger.error(f"Failed to download archive '{blob_prefix}': {e}")
+            return False
+
+    async def _upload_files(self, uploads: List[Tuple[str, str, bytes]], container_client: ContainerClient,
+                            progress_callback=None) -> int:
+        """
+        Upload (local path, blob name, MD5) items, transfer_concurrency at a time, with
+        their progress aggregated into one stream of progress events
+        
+        Returns:
+            int: Number of successful uploads
+        """
+        if not uploads:
+            return 0
+
+        file_sizes = [os.path.getsize(local_file_path) for local_file_path, _, _ in uploads]
+        semaphore = asyncio.Semaphore(self.transfer_concurrency)
+
+        async with TransferProgress(progress_callback, len(uploads), sum(file_sizes),
+                                    direction='upload') as progress:
+
+            async def upload(file_index: int, local_file_path: str, blob_name: str, content_md5: bytes,
+                             size: int) -> bool:
+                async with semaphore:
+                    progress.file_start(blob_name, file_index)
+                    # Upload to specific container
+                    success = await self._upload_file_to_container(
+                        local_file_path, blob_name, container_client,
+                        progress_hook=progress.hook(blob_name, size), content_md5=content_md5
+                    )
+                    progress.file_complete(blob_name, size, success)
+                    return success
+
+            results = await asyncio.gather(
+                *(upload(i + 1, *item, size) for i, (item, size) in enumerate(zip(uploads, file_sizes)))
+            )
+            progress.finish()
+
+        return sum(results)
     
-    async def _upload_file_to_container(self, local_file_path: str, blob_name: str, container_client: ContainerClient, overwrite: bool = True) -> bool:
+    async def _upload_file_to_container(self, local_file_path: str, blob_name: str, container_client: ContainerClient,
+                                        overwrite: bool = True, progress_hook=None, content_md5: bytes = None) -> bool:
         """
-        Upload a file to a specific container
+        Upload a file to a specific container, in blocks of block_size with
+        max_concurrency blocks at a time
         
         Args:
             local_file_path: Path to local file
             blob_name: Name for the blob in storage
             container_client: Container client to upload to
             overwrite: Whether to overwrite existing blob
+            progress_hook: Optional SDK progress hook (current_bytes, total_bytes)
+            content_md5: Optional MD5 of the file, stored as the blob's Content-MD5
         
         Returns:
             bool: True if upload successful, False otherwise
@@ -498,13 +985,19 @@ class AzureBlobStorageManager:
             if not local_path.exists():
                 logger.error(f"Local file '{local_file_path}' does not exist")
                 return False
+
+            # Block uploads get no service computed MD5; incremental uploads compare this one
+            content_settings = ContentSettings(content_md5=bytearray(content_md5)) if content_md5 else None
             
             def upload_sync():
                 with open(local_file_path, 'rb') as data:
                     container_client.upload_blob(
                         name=blob_name,
                         data=data,
-                        overwrite=overwrite
+                        overwrite=overwrite,
+                        max_concurrency=self.max_concurrency,
+                        progress_hook=progress_hook,
+                        content_settings=content_settings
                     )
             
             await asyncio.to_thread(upload_sync)
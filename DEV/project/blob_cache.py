@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import *
+
+from loguru import logger
+
+#########################################################
+#
+# Local read-through cache of downloaded blobs
+#
+# Rule checks and data modelling of the same project download the same blobs again
+# and again. BlobCache keeps the last downloaded version of each blob on local disk,
+# keyed by container + blob name and stamped with the blob's ETag:
+#
+#   <cache_dir>/<sha256(container/blob)>/entry.json   container, blob, etag, size
+#   <cache_dir>/<sha256(container/blob)>/data         blob content
+#
+# AzureBlobStorageManager serves a download from the cache when the ETag from a listing
+# matches, and otherwise sends the cached ETag as If-None-Match, so an unchanged blob
+# costs a 304 instead of its content. Entries are written to a temporary directory and
+# renamed into place; the total size is kept under max_bytes by evicting the least
+# recently used entries (entry.json mtime), like the data model cache.
+#
+#########################################################
+
+ENTRY_FILE_NAME = "entry.json"
+DATA_FILE_NAME = "data"
+
+
+class CachedBlob(NamedTuple):
+
+    container: str
+    blob: str
+    etag: str
+    size: int
+    path: Path
+
+
+class BlobCache:
+    """Size bounded LRU cache of blob contents keyed by blob name and ETag."""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+
+        return self.max_bytes > 0
+
+    def _entry_dir(self, container: str, blob: str) -> Path:
+
+        key = hashlib.sha256(f"{container}/{blob}".encode("utf-8")).hexdigest()
+
+        return self.cache_dir / key
+
+    def lookup(self, container: str, blob: str) -> Optional[CachedBlob]:
+        """Cached version of a blob, or None."""
+
+        if not self.enabled:
+            return None
+
+        entry_dir = self._entry_dir(container, blob)
+
+        try:
+            with open(entry_dir / ENTRY_FILE_NAME, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("container") != container or entry.get("blob") != blob:
+            return None
+
+        return CachedBlob(
+            container, blob, entry["etag"], entry["size"], entry_dir / DATA_FILE_NAME
+        )
+
+    def copy_to(self, cached: CachedBlob, local_file_path: str) -> bool:
+        """Copy a cached blob to local_file_path and mark it as recently used."""
+
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(local_file_path) or ".", exist_ok=True)
+                shutil.copyfile(cached.path, local_file_path)
+                os.utime(cached.path.parent / ENTRY_FILE_NAME)
+
+            return True
+
+        except Exception as e:
+            # Evicted in the meantime; the caller downloads the blob
+            logger.warning(f"Failed to restore cached blob {cached.blob}: {e}")
+
+        return False
+
+    def new_file(self) -> Path:
+        """Temporary entry directory to download a blob into (see store)."""
+
+        tmp_dir = self.cache_dir / f".tmp-{uuid.uuid4().hex}"
+        tmp_dir.mkdir(parents=True)
+
+        return tmp_dir / DATA_FILE_NAME
+
+    def store(self, container: str, blob: str, etag: str, data_path: Path) -> Optional[CachedBlob]:
+        """Add the blob downloaded to data_path (from new_file) to the cache."""
+
+        tmp_dir = data_path.parent
+
+        try:
+            size = data_path.stat().st_size
+            if size > self.max_bytes:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return None
+
+            with open(tmp_dir / ENTRY_FILE_NAME, "w", encoding="utf-8") as file:
+                json.dump(
+                    {"container": container, "blob": blob, "etag": etag, "size": size},
+                    file,
+                    ensure_ascii=False,
+                )
+
+            with self._lock:
+                entry_dir = self._entry_dir(container, blob)
+                # Replaces the previous version of the blob
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                tmp_dir.rename(entry_dir)
+                self._evict(keep=entry_dir)
+
+            return CachedBlob(container, blob, etag, size, entry_dir / DATA_FILE_NAME)
+
+        except Exception as e:
+            logger.error(f"Failed to cache blob {blob}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return None
+
+    def discard(self, data_path: Path) -> None:
+        """Drop a temporary file from new_file that is not stored."""
+
+        shutil.rmtree(data_path.parent, ignore_errors=True)
+
+    def _evict(self, keep: Path) -> None:
+        """Drop least recently used entries until the cache fits max_bytes."""
+
+        entries = []
+        for entry_dir in self.cache_dir.iterdir():
+            entry_path = entry_dir / ENTRY_FILE_NAME
+            if entry_dir == keep or not entry_path.exists():
+                continue
+            size = sum(file.stat().st_size for file in entry_dir.iterdir())
+            entries.append((entry_path.stat().st_mtime, size, entry_dir))
+
+        total = sum(size for _, size, _ in entries)
+        total += sum(file.stat().st_size for file in keep.iterdir())
+        for _, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted cached blob {entry_dir.name}")
+
+
+def blob_cache_from_env() -> BlobCache:
+    """BlobCache configured by BLOB_CACHE_DIR / BLOB_CACHE_MAX_MB."""
+
+    cache_dir = os.getenv("BLOB_CACHE_DIR", "blob_cache")
+
+    try:
+        max_mb = float(os.getenv("BLOB_CACHE_MAX_MB", "2048"))
+    except ValueError:
+        logger.error("Invalid BLOB_CACHE_MAX_MB, blob cache disabled")
+        max_mb = 0
+
+    return BlobCache(cache_dir, int(max_mb * 1024 * 1024))
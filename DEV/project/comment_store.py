@@ -0,0 +1,236 @@
+import itertools
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import *
+
+import polars as pl
+
+#########################################################
+#
+# Variable comment store
+#
+# The *_programwise.json / *_functionwise.json comment files map
+#   "<variable>@PG@<program>", "<variable>@FN@<function>"  -> declaration in a unit
+#   "<variable>@GBVAR"                                     -> global variable
+#   "<member>@GBNMSP"                                      -> global namespace member
+# to an attribute dict. get_the_comment_from_program/_function built these keys with
+# f-strings for every lookup, checked the comment attributes of each hit and flattened
+# the hits again on every call.
+#
+# CommentStore reads the attribute dicts once into tables keyed by (variable, unit) and
+# variable that only hold the declarations with a comment, and resolves a (variable,
+# unit) pair to its comment list through an LRU cache. Data modelling saves the tables
+# next to the comment JSON (<stem>_comments.parquet, one row per declaration), so the
+# rule checker loads them without parsing the indented JSON.
+#
+# Comment lists are returned as stored (rules compare the raw text); the half-width
+# normalization for pattern checks stays in ladder_utils.to_half_width.
+#
+#########################################################
+
+RESOLVED_CACHE_SIZE = 65536
+
+VARIABLE_COMMENT_KEYS = (
+    "variable_english_comment",
+    "variable_japanese_comment",
+    "documentation",
+)
+MEMBER_COMMENT_KEYS = (
+    "member_english_comment",
+    "member_japanese_comment",
+    "member_documentation",
+)
+
+# Key suffix / infix of each declaration kind in the comment JSON
+UNIT_KINDS = {"PG": "@PG@", "FN": "@FN@"}
+GLOBAL_KINDS = {"GBVAR": "@GBVAR", "GBNMSP": "@GBNMSP"}
+
+COMMENT_STORE_SCHEMA = {
+    "KIND": pl.Utf8,
+    "VARIABLE": pl.Utf8,
+    "UNIT": pl.Utf8,
+    "VALUES": pl.List(pl.Utf8),
+    "VARIABLE_COMMENTED": pl.Boolean,
+    "MEMBER_COMMENTED": pl.Boolean,
+}
+
+
+def comment_store_path(comment_file: str) -> str:
+
+    return f"{os.path.splitext(str(comment_file))[0]}_comments.parquet"
+
+
+def _has_comment(attributes: Dict, keys: Tuple[str, ...]) -> bool:
+
+    return any(attributes.get(key, "NONE") != "NONE" for key in keys)
+
+
+def _split_key(key: str) -> Optional[Tuple[str, str, Optional[str]]]:
+    """(kind, variable, unit) of a comment JSON key."""
+
+    for kind, suffix in GLOBAL_KINDS.items():
+        if key.endswith(suffix):
+            return kind, key[: -len(suffix)], None
+
+    for kind, infix in UNIT_KINDS.items():
+        variable, found, unit = key.partition(infix)
+        if found:
+            return kind, variable, unit
+
+    return None
+
+
+class CommentStore:
+    """Commented declarations of one comment JSON, with a cached resolver."""
+
+    def __init__(self, rows: Iterable[Tuple]):
+
+        # kind -> {(variable, unit) or variable: comment values}, declarations
+        # with a comment only. Global namespace members are checked on their
+        # member_* keys from programs and on the variable_* keys from functions.
+        self._units: Dict[str, Dict[Tuple[str, str], Tuple]] = {"PG": {}, "FN": {}}
+        self._globals: Dict[str, Tuple] = {}
+        self._members: Dict[str, Dict[str, Tuple]] = {"PG": {}, "FN": {}}
+
+        for kind, variable, unit, values, variable_commented, member_commented in rows:
+            values = tuple(values)
+            if kind in self._units:
+                if variable_commented:
+                    self._units[kind][(variable, unit)] = values
+            elif kind == "GBVAR":
+                if variable_commented:
+                    self._globals[variable] = values
+            elif kind == "GBNMSP":
+                if member_commented:
+                    self._members["PG"][variable] = values
+                if variable_commented:
+                    self._members["FN"][variable] = values
+
+        self.resolve = lru_cache(maxsize=RESOLVED_CACHE_SIZE)(self._resolve)
+
+    ###   Building #############
+
+    @staticmethod
+    def rows_from_comment_data(comment_data: Dict) -> List[Tuple]:
+        """Store rows of a comment JSON dict, in key order."""
+
+        rows = []
+        for key, attributes in comment_data.items():
+            split = _split_key(key)
+            if split is None or not isinstance(attributes, dict):
+                continue
+            kind, variable, unit = split
+            rows.append(
+                (
+                    kind,
+                    variable,
+                    unit,
+                    list(attributes.values()),
+                    _has_comment(attributes, VARIABLE_COMMENT_KEYS),
+                    _has_comment(attributes, MEMBER_COMMENT_KEYS),
+                )
+            )
+
+        return rows
+
+    @classmethod
+    def from_comment_data(cls, comment_data: Dict) -> "CommentStore":
+
+        return cls(cls.rows_from_comment_data(comment_data))
+
+    @classmethod
+    def load(cls, path: str) -> "CommentStore":
+
+        return cls(pl.read_parquet(path).iter_rows())
+
+    ###   Lookups #############
+
+    def _resolve(self, variable, unit: str, kind: str) -> Optional[Tuple]:
+
+        units = self._units[kind]
+
+        if isinstance(variable, str) and "." in variable:
+            # Structure member: comments of the prefix (in the unit, then global)
+            # followed by the comments of the member
+            variable_parts = variable.split(".")
+            prefix, suffix = variable_parts[0], variable_parts[1]
+            found = (
+                units.get((prefix, unit)),
+                self._globals.get(prefix),
+                units.get((suffix, unit)),
+                self._members[kind].get(suffix),
+            )
+            return tuple(itertools.chain(*(values for values in found if values)))
+
+        variable = f"{variable}"
+        values = units.get((variable, unit))
+        if values is None:
+            values = self._globals.get(variable)
+
+        return values
+
+    def comments(self, variable, unit: str, kind: str = "PG") -> Optional[List]:
+        """Comment values of variable in a program (kind "PG") or function block
+        (kind "FN"); None when neither the unit nor the globals comment it."""
+
+        values = self.resolve(variable, unit, kind)
+
+        return None if values is None else list(values)
+
+
+def write_comment_store(comment_data: Dict, comment_file: str) -> str:
+    """Save the store of a comment JSON dict next to comment_file."""
+
+    path = comment_store_path(comment_file)
+    pl.DataFrame(
+        CommentStore.rows_from_comment_data(comment_data),
+        schema=COMMENT_STORE_SCHEMA,
+        orient="row",
+    ).write_parquet(path)
+
+    return path
+
+
+def load_comment_store(comment_file: str) -> CommentStore:
+    """Store of a comment JSON path, read from the JSON when there is no saved one."""
+
+    path = comment_store_path(comment_file)
+
+    if os.path.exists(path):
+        return CommentStore.load(path)
+
+    with open(comment_file, "r", encoding="utf-8") as file:
+        return CommentStore.from_comment_data(json.load(file))
+
+
+###   Stores of comment dicts passed around by the rules #############
+
+STORE_CACHE_SIZE = 16
+
+# Oldest first; the few comment dicts of the running requests fit
+_stores: "OrderedDict[int, Tuple[Dict, CommentStore]]" = OrderedDict()
+_stores_lock = threading.Lock()
+
+
+def comment_store_for(comment_data: Dict) -> CommentStore:
+    """The store of a comment JSON dict, built once per dict object."""
+
+    data_id = id(comment_data)
+
+    # Called for every comment lookup, so the hit path takes no lock
+    entry = _stores.get(data_id)
+    if entry is not None and entry[0] is comment_data:
+        return entry[1]
+
+    store = CommentStore.from_comment_data(comment_data)
+
+    with _stores_lock:
+        # The entry keeps the dict alive, so its id is not reused while cached
+        _stores[data_id] = (comment_data, store)
+        while len(_stores) > STORE_CACHE_SIZE:
+            _stores.popitem(last=False)
+
+    return store
@@ -0,0 +1,326 @@
+import ast
+import os
+import re
+import uuid
+from typing import *
+
+import pandas as pd
+import polars as pl
+from loguru import logger
+
+#########################################################
+#
+# Typed columnar data model
+#
+# The *_programwise.csv / *_functionwise.csv files keep ATTRIBUTES as a Python-repr
+# dict string, so every rule had to eval() it again. Data modelling now also writes a
+# Parquet file next to each CSV (same stem) with:
+#   - the key columns (PROGRAM/FUNCTION_BLOCK, BODY/BODY_TYPE, RUNG, RUNG_NAME, OBJECT,
+#     OBJECT_TYPE_LIST),
+#   - ATTRIBUTES as a typed key/value list: list<struct<key, text, items: list<str>>>,
+#     which round-trips the attribute dict losslessly and in order,
+#   - the commonly used attributes promoted to their own columns (OPERAND, NEGATED,
+#     EDGE, LATCH, TYPE_NAME, INSTANCE_NAME, IDENTIFIER, IN_LIST, OUT_LIST) and the
+#     block variables as VARIABLES: list<struct<parameter, direction, in_order,
+#     in_list, out_order, out_list>>.
+# The CSV is still written for backwards compatibility; the loaders below read the
+# Parquet file when it exists. A data model written before it existed is converted
+# from the CSV once and the Parquet file is saved next to it. The polars loaders
+# hand out these typed columns as they are; only the pandas shim (load_data_model)
+# decodes ATTRIBUTES to dicts for every row.
+#
+#########################################################
+
+ATTRIBUTE_ENTRY = pl.Struct(
+    {"key": pl.Utf8, "text": pl.Utf8, "items": pl.List(pl.Utf8)}
+)
+
+VARIABLE_ENTRY = pl.Struct(
+    {
+        "parameter": pl.Utf8,
+        "direction": pl.Utf8,
+        "in_order": pl.List(pl.Utf8),
+        "in_list": pl.List(pl.Utf8),
+        "out_order": pl.List(pl.Utf8),
+        "out_list": pl.List(pl.Utf8),
+    }
+)
+
+# Promoted column -> attribute key
+TEXT_ATTRIBUTE_COLUMNS = {
+    "OPERAND": "operand",
+    "NEGATED": "negated",
+    "EDGE": "edge",
+    "LATCH": "latch",
+    "TYPE_NAME": "typeName",
+    "INSTANCE_NAME": "instanceName",
+    "IDENTIFIER": "identifier",
+}
+LIST_ATTRIBUTE_COLUMNS = {"IN_LIST": "in_list", "OUT_LIST": "out_list"}
+
+# "<parameter>_<inVar|outVar|inoutVar>_<in_order|in_list|out_order|out_list>"
+VARIABLE_KEY_PATTERN = re.compile(
+    r"^(?P<parameter>.*)_(?P<direction>inoutVar|inVar|outVar)_(?P<field>in_order|in_list|out_order|out_list)$"
+)
+
+# Key columns of the data model, the remaining column is always ATTRIBUTES
+DATA_MODEL_KEY_COLUMNS = {
+    "program": ["PROGRAM", "BODY", "RUNG", "RUNG_NAME", "OBJECT", "OBJECT_TYPE_LIST"],
+    "function": [
+        "FUNCTION_BLOCK",
+        "BODY_TYPE",
+        "RUNG",
+        "RUNG_NAME",
+        "OBJECT",
+        "OBJECT_TYPE_LIST",
+    ],
+}
+
+
+def data_model_parquet_path(csv_path: str) -> str:
+
+    return f"{os.path.splitext(str(csv_path))[0]}.parquet"
+
+
+###   Attribute encoding #############
+
+
+def encode_attributes(attribute_dict: Dict) -> List[Dict]:
+    """Turn an ATTRIBUTES dict into the typed key/value entries stored in Parquet."""
+
+    entries = []
+    for key, value in attribute_dict.items():
+        if isinstance(value, (list, tuple)):
+            entries.append(
+                {"key": key, "text": None, "items": [str(item) for item in value]}
+            )
+        else:
+            entries.append({"key": key, "text": str(value), "items": None})
+
+    return entries
+
+
+def decode_attributes(entries) -> Dict:
+    """Inverse of encode_attributes."""
+
+    if entries is None:
+        return {}
+
+    return {
+        entry["key"]: entry["text"] if entry["items"] is None else list(entry["items"])
+        for entry in entries
+    }
+
+
+def parse_attributes(value) -> Dict:
+    """Return the ATTRIBUTES of a data model row as a dict.
+
+    Accepts the dict handed out by the pandas loader, the typed key/value entries of
+    the polars loaders (a list, or a Series when iterating the column), or the
+    Python-repr string of the CSV files, so rules work with either source. Like
+    eval() of the CSV string, every call returns a fresh dict the caller may modify.
+    """
+
+    if isinstance(value, dict):
+        return {
+            key: list(item) if isinstance(item, list) else item
+            for key, item in value.items()
+        }
+
+    if isinstance(value, str):
+        return ast.literal_eval(value)
+
+    if isinstance(value, list):
+        return decode_attributes(value)
+
+    if isinstance(value, pl.Series):
+        return decode_attributes(value.to_list())
+
+    # Missing ATTRIBUTES (None/NaN)
+    return {}
+
+
+def _variables(attribute_dict: Dict) -> List[Dict]:
+
+    variables = {}
+    for key, value in attribute_dict.items():
+        match = VARIABLE_KEY_PATTERN.match(key)
+        if match:
+            variable = variables.setdefault(
+                (match["parameter"], match["direction"]),
+                {
+                    "parameter": match["parameter"],
+                    "direction": match["direction"],
+                    "in_order": None,
+                    "in_list": None,
+                    "out_order": None,
+                    "out_list": None,
+                },
+            )
+            variable[match["field"]] = [str(item) for item in value]
+
+    return list(variables.values())
+
+
+def _text_or_none(value) -> Optional[str]:
+
+    if value is None or value == "":
+        return None
+
+    return str(value)
+
+
+###   Writing #############
+
+
+def build_data_model_frame(columns: Dict[str, List], section_type: str) -> pl.DataFrame:
+    """Build the typed data model from the columnar buffers of the model writer.
+
+    columns holds one list per data model column with ATTRIBUTES as dicts.
+    """
+
+    key_columns = DATA_MODEL_KEY_COLUMNS[section_type]
+    attributes = columns["ATTRIBUTES"]
+
+    data = {
+        column: [_text_or_none(value) for value in columns[column]]
+        for column in key_columns
+    }
+    schema = {column: pl.Utf8 for column in key_columns}
+
+    data["ATTRIBUTES"] = [encode_attributes(attribute) for attribute in attributes]
+    schema["ATTRIBUTES"] = pl.List(ATTRIBUTE_ENTRY)
+
+    for column, key in TEXT_ATTRIBUTE_COLUMNS.items():
+        data[column] = [_text_or_none(attribute.get(key)) for attribute in attributes]
+        schema[column] = pl.Utf8
+
+    for column, key in LIST_ATTRIBUTE_COLUMNS.items():
+        data[column] = [
+            [str(item) for item in attribute[key]] if key in attribute else None
+            for attribute in attributes
+        ]
+        schema[column] = pl.List(pl.Utf8)
+
+    data["VARIABLES"] = [_variables(attribute) for attribute in attributes]
+    schema["VARIABLES"] = pl.List(VARIABLE_ENTRY)
+
+    data_model_df = pl.DataFrame(data, schema=schema)
+
+    # evaluationOrder is numeric in Sysmac exports; keep it as text if it ever is not
+    try:
+        data_model_df = data_model_df.with_columns(pl.col("RUNG").cast(pl.Int64))
+    except Exception:
+        pass
+
+    return data_model_df
+
+
+def write_data_model_parquet(
+    columns: Dict[str, List], section_type: str, csv_path: str
+) -> str:
+
+    parquet_path = data_model_parquet_path(csv_path)
+    build_data_model_frame(columns, section_type).write_parquet(parquet_path)
+
+    return parquet_path
+
+
+###   Loading #############
+
+
+def save_data_model_parquet(data_model_df: pl.DataFrame, csv_path: str) -> Optional[str]:
+    """Save a data model converted from its CSV as the Parquet file next to it.
+
+    Written to a temporary file and renamed into place, so concurrent readers never see
+    a partial file. Returns the path, or None when it could not be written (read-only
+    input folder); the caller keeps using the converted frame.
+    """
+
+    parquet_path = data_model_parquet_path(csv_path)
+    tmp_path = f"{parquet_path}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        data_model_df.write_parquet(tmp_path)
+        os.replace(tmp_path, parquet_path)
+        logger.info(f"Saved the typed data model of {csv_path} to {parquet_path}")
+        return parquet_path
+    except Exception as e:
+        logger.warning(f"Failed to save the typed data model of {csv_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return None
+
+
+def scan_data_model(input_file: str) -> pl.LazyFrame:
+    """Lazily scan the typed data model of a programwise/functionwise CSV path.
+
+    Uses the Parquet file next to the CSV when present (memory mapped, only the
+    selected columns are read). Older data models without it are converted from the
+    CSV once and the result is saved as that Parquet file for later calls.
+    """
+
+    parquet_path = data_model_parquet_path(input_file)
+
+    if os.path.exists(parquet_path):
+        return pl.scan_parquet(parquet_path)
+
+    logger.warning(f"No typed data model for {input_file}, converting the CSV")
+
+    csv_df = pd.read_csv(input_file, dtype=str, keep_default_na=False)
+    section_type = "function" if "FUNCTION_BLOCK" in csv_df.columns else "program"
+    columns = {column: csv_df[column].tolist() for column in csv_df.columns}
+    columns["ATTRIBUTES"] = [
+        parse_attributes(value) if value else {} for value in columns["ATTRIBUTES"]
+    ]
+    data_model_df = build_data_model_frame(columns, section_type)
+
+    save_data_model_parquet(data_model_df, input_file)
+
+    return data_model_df.lazy()
+
+
+def load_data_model_pl(input_file: str) -> pl.DataFrame:
+    """Typed data model of a programwise/functionwise CSV path, read eagerly.
+
+    Besides the key columns of the CSV, ATTRIBUTES is the typed key/value list and the
+    promoted attributes (OPERAND, NEGATED, EDGE, LATCH, TYPE_NAME, INSTANCE_NAME,
+    IDENTIFIER, IN_LIST, OUT_LIST, VARIABLES) are native columns, so rules filter them
+    in polars; parse_attributes turns one ATTRIBUTES value into a dict.
+    """
+
+    return scan_data_model(input_file).collect()
+
+
+def load_data_model(input_file: str) -> pd.DataFrame:
+    """Pandas drop-in for pd.read_csv(input_file) of a data model CSV.
+
+    Returns the usual seven columns with ATTRIBUTES already decoded to dicts.
+    """
+
+    parquet_path = data_model_parquet_path(input_file)
+
+    if not os.path.exists(parquet_path):
+        data_model_df = pd.read_csv(input_file)
+        data_model_df["ATTRIBUTES"] = data_model_df["ATTRIBUTES"].apply(
+            parse_attributes
+        )
+        return data_model_df
+
+    data_model_pl_df = pl.read_parquet(parquet_path)
+    key_columns = [
+        column
+        for column in data_model_pl_df.columns
+        if column in DATA_MODEL_KEY_COLUMNS["program"]
+        or column in DATA_MODEL_KEY_COLUMNS["function"]
+    ]
+
+    data_model_df = pd.DataFrame(
+        data_model_pl_df.select(key_columns).to_dict(as_series=False)
+    )
+    data_model_df["ATTRIBUTES"] = [
+        decode_attributes(entries) for entries in data_model_pl_df["ATTRIBUTES"]
+    ]
+
+    return data_model_df
@@ -0,0 +1,699 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from typing import *
+
+from loguru import logger
+
+#########################################################
+#
+# Job queue for data modelling and rule checks
+#
+# Endpoints submit a job (kind + JSON payload) and get a job ID back; a fixed number of
+# workers per server process claim queued jobs oldest first and run the handler
+# registered for the kind. Jobs go through
+#
+#   queued -> running -> completed | failed
+#   queued / running -> cancelled
+#
+# The queue is bounded (max_queued), so a burst of submissions is rejected instead of
+# piling up work in the server. Job state lives in a backend:
+#
+#   InMemoryJobBackend   one server process (default)
+#   SqliteJobBackend     a SQLite file shared by the replicas of a deployment; a job
+#                        submitted to one replica can run on any other
+#
+# Cancelling a queued job drops it; a running job has its handler task cancelled by the
+# process running it (other replicas see the request in the backend). Work a handler
+# already passed to a thread or the rule process pool finishes in the background.
+#
+# A claimed job is leased to the worker process (claimed_by), which refreshes
+# heartbeat_at while the handler runs. When a replica dies its running jobs stop
+# heartbeating; after lease_timeout the next claim puts them back in the queue, or fails
+# them once they lost MAX_ATTEMPTS workers. A worker that lost its lease stops the job
+# and does not record an outcome.
+#
+#########################################################
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+# Finished jobs kept for the status/result endpoints, oldest are dropped first
+MAX_FINISHED_JOBS = 1000
+
+# Claims of a job whose lease expires before it is failed instead of queued again
+MAX_ATTEMPTS = 2
+LEASE_EXPIRED_ERROR = "Worker stopped responding while running the job"
+
+
+class QueueFullError(Exception):
+    """The queue already holds max_queued jobs."""
+
+
+class JobTimeoutError(Exception):
+    """The job did not finish before the wait deadline."""
+
+
+def _new_job(kind: str, payload: Dict) -> Dict:
+
+    return {
+        "job_id": uuid.uuid4().hex,
+        "kind": kind,
+        "status": QUEUED,
+        "payload": payload,
+        "result": None,
+        "error": None,
+        "cancel_requested": False,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "claimed_by": None,
+        "heartbeat_at": None,
+        "attempts": 0,
+    }
+
+
+def job_status(job: Dict) -> Dict:
+    """The job without its payload and result, for status responses."""
+
+    return {key: value for key, value in job.items() if key not in ("payload", "result")}
+
+
+###   Backends #############
+
+
+class JobBackend:
+    """Storage of job records shared by the workers. All methods are atomic."""
+
+    def add(self, job: Dict, max_queued: int) -> bool:
+        """Store a queued job, False when max_queued jobs are already queued."""
+        raise NotImplementedError
+
+    def claim(self, kinds: List[str], worker_id: str, lease_timeout: float) -> Optional[Dict]:
+        """Release running jobs whose lease expired, then lease the oldest queued job of
+        one of the kinds to worker_id and return it."""
+        raise NotImplementedError
+
+    def heartbeat(self, job_id: str, worker_id: str) -> Optional[Dict]:
+        """Refresh the lease of a running job; the job, or None if worker_id lost it."""
+        raise NotImplementedError
+
+    def finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+    ) -> None:
+        """Record the outcome of a job still leased to worker_id."""
+        raise NotImplementedError
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """Cancel a queued job, flag a running one; the job, or None if unknown."""
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+
+class InMemoryJobBackend(JobBackend):
+    """Job records in a dict of this process."""
+
+    def __init__(self):
+
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, job: Dict, max_queued: int) -> bool:
+
+        with self._lock:
+            queued = sum(1 for stored in self._jobs.values() if stored["status"] == QUEUED)
+            if queued >= max_queued:
+                return False
+            self._jobs[job["job_id"]] = dict(job)
+
+        return True
+
+    def claim(self, kinds: List[str], worker_id: str, lease_timeout: float) -> Optional[Dict]:
+
+        now = time.time()
+
+        with self._lock:
+            for job in self._jobs.values():
+                if job["status"] == RUNNING and job["heartbeat_at"] < now - lease_timeout:
+                    logger.warning(f"Lease of job {job['job_id']} expired ({job['claimed_by']})")
+                    if job["cancel_requested"]:
+                        job.update(status=CANCELLED, finished_at=now)
+                    elif job["attempts"] >= MAX_ATTEMPTS:
+                        job.update(status=FAILED, error=LEASE_EXPIRED_ERROR, finished_at=now)
+                    else:
+                        job.update(status=QUEUED, started_at=None)
+                    job.update(claimed_by=None, heartbeat_at=None)
+
+            for job in self._jobs.values():
+                if job["status"] == QUEUED and job["kind"] in kinds:
+                    job.update(
+                        status=RUNNING,
+                        started_at=now,
+                        claimed_by=worker_id,
+                        heartbeat_at=now,
+                        attempts=job["attempts"] + 1,
+                    )
+                    return dict(job)
+
+        return None
+
+    def heartbeat(self, job_id: str, worker_id: str) -> Optional[Dict]:
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != RUNNING or job["claimed_by"] != worker_id:
+                return None
+            job["heartbeat_at"] = time.time()
+
+            return dict(job)
+
+    def finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+    ) -> None:
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] != RUNNING or job["claimed_by"] != worker_id:
+                return
+            job.update(status=status, result=result, error=error, finished_at=time.time())
+            # Most recently finished last, so the oldest are dropped
+            self._jobs.move_to_end(job_id)
+
+            finished = [key for key, stored in self._jobs.items() if stored["status"] in FINISHED_STATUSES]
+            for key in finished[: max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+                del self._jobs[key]
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] == QUEUED:
+                job.update(status=CANCELLED, finished_at=time.time())
+            elif job["status"] == RUNNING:
+                job["cancel_requested"] = True
+
+            return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+
+            return dict(job) if job is not None else None
+
+
+class SqliteJobBackend(JobBackend):
+    """Job records in a SQLite file, for replicas sharing a volume."""
+
+    COLUMNS = (
+        "job_id",
+        "kind",
+        "status",
+        "payload",
+        "result",
+        "error",
+        "cancel_requested",
+        "created_at",
+        "started_at",
+        "finished_at",
+        "claimed_by",
+        "heartbeat_at",
+        "attempts",
+    )
+
+    def __init__(self, db_path: str):
+
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        with closing(self._connect()) as connection:
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT,
+                    result TEXT,
+                    error TEXT,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    claimed_by TEXT,
+                    heartbeat_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0
+                )"""
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Connection in a write transaction, so a read and the write based on it are
+        atomic across processes."""
+
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    def _row_to_job(self, row) -> Optional[Dict]:
+
+        if row is None:
+            return None
+
+        job = dict(zip(self.COLUMNS, row))
+        job["payload"] = json.loads(job["payload"]) if job["payload"] else None
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+
+        return job
+
+    def _select(self, connection: sqlite3.Connection, job_id: str) -> Optional[Dict]:
+
+        row = connection.execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+
+        return self._row_to_job(row)
+
+    def add(self, job: Dict, max_queued: int) -> bool:
+
+        with self._transaction() as connection:
+            (queued,) = connection.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)
+            ).fetchone()
+            if queued >= max_queued:
+                return False
+            connection.execute(
+                f"INSERT INTO jobs ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+                (
+                    job["job_id"],
+                    job["kind"],
+                    job["status"],
+                    json.dumps(job["payload"], ensure_ascii=False),
+                    None,
+                    None,
+                    0,
+                    job["created_at"],
+                    None,
+                    None,
+                    None,
+                    None,
+                    0,
+                ),
+            )
+
+        return True
+
+    def _release_expired(self, connection: sqlite3.Connection, lease_timeout: float) -> None:
+        """Cancel, fail or queue again the running jobs whose lease expired."""
+
+        now = time.time()
+        expired = "status = ? AND heartbeat_at < ?"
+        params = (RUNNING, now - lease_timeout)
+
+        for job_id, claimed_by in connection.execute(
+            f"SELECT job_id, claimed_by FROM jobs WHERE {expired}", params
+        ).fetchall():
+            logger.warning(f"Lease of job {job_id} expired ({claimed_by})")
+
+        connection.execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, claimed_by = NULL, heartbeat_at = NULL "
+            f"WHERE {expired} AND cancel_requested = 1",
+            (CANCELLED, now, *params),
+        )
+        connection.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, claimed_by = NULL, heartbeat_at = NULL "
+            f"WHERE {expired} AND attempts >= ?",
+            (FAILED, LEASE_EXPIRED_ERROR, now, *params, MAX_ATTEMPTS),
+        )
+        connection.execute(
+            "UPDATE jobs SET status = ?, started_at = NULL, claimed_by = NULL, heartbeat_at = NULL "
+            f"WHERE {expired}",
+            (QUEUED, *params),
+        )
+
+    def claim(self, kinds: List[str], worker_id: str, lease_timeout: float) -> Optional[Dict]:
+
+        if not kinds:
+            return None
+
+        with self._transaction() as connection:
+            self._release_expired(connection, lease_timeout)
+            row = connection.execute(
+                f"SELECT job_id FROM jobs WHERE status = ? AND kind IN ({', '.join('?' * len(kinds))}) "
+                "ORDER BY created_at LIMIT 1",
+                (QUEUED, *kinds),
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            connection.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, claimed_by = ?, heartbeat_at = ?, "
+                "attempts = attempts + 1 WHERE job_id = ?",
+                (RUNNING, now, worker_id, now, row[0]),
+            )
+            return self._select(connection, row[0])
+
+    def heartbeat(self, job_id: str, worker_id: str) -> Optional[Dict]:
+
+        with self._transaction() as connection:
+            updated = connection.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE job_id = ? AND status = ? AND claimed_by = ?",
+                (time.time(), job_id, RUNNING, worker_id),
+            ).rowcount
+            return self._select(connection, job_id) if updated else None
+
+    def finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+    ) -> None:
+
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? "
+                "WHERE job_id = ? AND status = ? AND claimed_by = ?",
+                (
+                    status,
+                    json.dumps(result, ensure_ascii=False, default=str),
+                    error,
+                    time.time(),
+                    job_id,
+                    RUNNING,
+                    worker_id,
+                ),
+            )
+            connection.execute(
+                f"DELETE FROM jobs WHERE job_id IN (SELECT job_id FROM jobs WHERE status IN "
+                f"({', '.join('?' * len(FINISHED_STATUSES))}) ORDER BY finished_at DESC LIMIT -1 OFFSET ?)",
+                (*FINISHED_STATUSES, MAX_FINISHED_JOBS),
+            )
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE job_id = ? AND status = ?",
+                (CANCELLED, time.time(), job_id, QUEUED),
+            )
+            connection.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE job_id = ? AND status = ?",
+                (job_id, RUNNING),
+            )
+            return self._select(connection, job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+
+        with closing(self._connect()) as connection:
+            return self._select(connection, job_id)
+
+
+###   Queue and workers #############
+
+
+class JobQueue:
+    """Bounded job queue with a pool of asyncio workers in this process."""
+
+    def __init__(
+        self,
+        backend: JobBackend,
+        workers: int,
+        max_queued: int,
+        poll_interval: float = 1.0,
+        lease_timeout: float = 60.0,
+        wait_timeout: Optional[float] = None,
+    ):
+
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        # How often idle workers look for jobs submitted to other replicas and running
+        # jobs check for cancellation requests made there
+        self.poll_interval = poll_interval
+        # Seconds without a heartbeat after which a running job counts as abandoned
+        self.lease_timeout = lease_timeout
+        # Default deadline of wait() in seconds, None waits until the job finishes
+        self.wait_timeout = wait_timeout
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.handlers: Dict[str, Callable[[Dict], Awaitable[Any]]] = {}
+
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._finished: Optional[asyncio.Event] = None
+
+    def register(self, kind: str, handler: Callable[[Dict], Awaitable[Any]]) -> None:
+        """Run jobs of this kind with handler(payload); its return value is the result."""
+
+        self.handlers[kind] = handler
+
+    ###   Lifecycle #############
+
+    def start(self) -> None:
+
+        if self._worker_tasks:
+            return
+
+        self._wakeup = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        logger.info(
+            f"Job queue started with {self.workers} workers ({type(self.backend).__name__})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the workers; jobs running here are recorded as cancelled."""
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    ###   Jobs #############
+
+    async def submit(self, kind: str, payload: Dict) -> Dict:
+        """Queue a job; raises QueueFullError when max_queued jobs are waiting."""
+
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind '{kind}'")
+
+        job = _new_job(kind, payload)
+        if not await asyncio.to_thread(self.backend.add, job, self.max_queued):
+            raise QueueFullError(f"Job queue is full ({self.max_queued} jobs waiting)")
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+        logger.info(f"Queued {kind} job {job['job_id']}")
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+
+        return await asyncio.to_thread(self.backend.get, job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Dict]:
+
+        job = await asyncio.to_thread(self.backend.cancel, job_id)
+
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+
+        return job
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """The job once it is finished (None if unknown). Raises JobTimeoutError when it is
+        not finished within timeout seconds (default wait_timeout); the job keeps running."""
+
+        timeout = self.wait_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout if timeout else None
+
+        while True:
+            job = await self.get(job_id)
+            if job is None or job["status"] in FINISHED_STATUSES:
+                return job
+
+            interval = self.poll_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise JobTimeoutError(f"Job {job_id} not finished after {timeout:g}s")
+                interval = min(interval, remaining)
+
+            if self._finished is None:
+                # Not started here; another replica runs the job
+                await asyncio.sleep(interval)
+                continue
+
+            self._finished.clear()
+            try:
+                await asyncio.wait_for(self._finished.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+    ###   Workers #############
+
+    async def _worker(self) -> None:
+
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(
+                    self.backend.claim,
+                    list(self.handlers),
+                    self.worker_id,
+                    self.lease_timeout,
+                )
+            except Exception as e:
+                logger.error(f"Failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._run(job)
+
+    async def _keep_alive(self, job_id: str, task: asyncio.Task) -> None:
+        """Refresh the lease of the job while the task runs. Cancel the task when a
+        cancellation is requested through the backend or the lease was lost."""
+
+        interval = min(self.poll_interval, self.lease_timeout / 3)
+
+        while not task.done():
+            await asyncio.sleep(interval)
+            try:
+                job = await asyncio.to_thread(self.backend.heartbeat, job_id, self.worker_id)
+            except Exception as e:
+                logger.error(f"Failed to refresh the lease of job {job_id}: {e}")
+                continue
+
+            if job is None:
+                logger.warning(f"Lost the lease of job {job_id}, stopping it")
+                task.cancel()
+                return
+            if job["cancel_requested"]:
+                task.cancel()
+                return
+
+    async def _run(self, job: Dict) -> None:
+
+        job_id = job["job_id"]
+        logger.info(f"Running {job['kind']} job {job_id}")
+
+        task = asyncio.create_task(self.handlers[job["kind"]](job["payload"]))
+        self._running[job_id] = task
+        watcher = asyncio.create_task(self._keep_alive(job_id, task))
+
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            # Queue stopping
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise
+        finally:
+            watcher.cancel()
+            self._running.pop(job_id, None)
+            status, result, error = self._outcome(task)
+            try:
+                await asyncio.to_thread(
+                    self.backend.finish, job_id, self.worker_id, status, result, error
+                )
+            except Exception as e:
+                logger.error(f"Failed to record the outcome of job {job_id}: {e}")
+            self._finished.set()
+            logger.info(f"Job {job_id} {status}")
+
+    @staticmethod
+    def _outcome(task: asyncio.Task) -> Tuple[str, Any, Optional[str]]:
+
+        if not task.done() or task.cancelled():
+            return CANCELLED, None, None
+
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Job failed: {error}")
+            return FAILED, None, str(error)
+
+        return COMPLETED, task.result(), None
+
+
+def _env_positive_int(name: str, default: int) -> int:
+
+    try:
+        value = int(os.getenv(name) or default)
+    except ValueError:
+        logger.error(f"Invalid {name}, using {default}")
+        return default
+
+    return value if value > 0 else default
+
+
+def job_queue_from_env() -> JobQueue:
+    """JobQueue configured by JOB_BACKEND / JOB_DB_PATH / JOB_WORKERS / JOB_QUEUE_MAX /
+    JOB_LEASE_TIMEOUT / JOB_WAIT_TIMEOUT."""
+
+    backend_name = os.getenv("JOB_BACKEND", "memory").lower()
+
+    if backend_name == "sqlite":
+        backend = SqliteJobBackend(os.getenv("JOB_DB_PATH", "jobs.sqlite3"))
+    else:
+        if backend_name != "memory":
+            logger.error(f"Unknown JOB_BACKEND '{backend_name}', using memory")
+        backend = InMemoryJobBackend()
+
+    return JobQueue(
+        backend,
+        workers=_env_positive_int("JOB_WORKERS", 2),
+        max_queued=_env_positive_int("JOB_QUEUE_MAX", 16),
+        lease_timeout=_env_positive_int("JOB_LEASE_TIMEOUT", 60),
+        wait_timeout=_env_positive_int("JOB_WAIT_TIMEOUT", 3600),
+    )
@@ -0,0 +1,310 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import *
+
+from azure.core import MatchConditions
+from azure.core.exceptions import (
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+    ResourceNotModifiedError,
+)
+from azure.storage.blob import BlobProperties, ContentSettings
+
+#########################################################
+#
+# Filesystem stand-in for Azure Blob Storage
+#
+# AzureBlobStorageManager only needs a small part of the BlobServiceClient /
+# ContainerClient / BlobClient API. LocalBlobServiceClient implements that part on a
+# local directory so the transfer code can run without an account (tests, offline
+# development): set AZURE_STORAGE_LOCAL_DIR instead of the Azure credentials. Against
+# the Azurite emulator, use AZURE_STORAGE_CONNECTION_STRING=UseDevelopmentStorage=true
+# with the real SDK instead.
+#
+#   <root>/<container>/<blob name>           blob contents
+#   <root>/.properties/<container>/<blob>.json  etag, content settings and metadata
+#
+# Blobs are written to a temporary file and moved into place, so readers never see a
+# partial blob. Errors are the azure.core exceptions the SDK raises.
+#
+#########################################################
+
+PROPERTIES_DIRECTORY = ".properties"
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+# Temporary files of uploads in progress, not listed
+UPLOAD_PREFIX = ".upload-"
+
+CONTENT_SETTINGS_FIELDS = (
+    "content_type",
+    "content_encoding",
+    "content_language",
+    "content_disposition",
+    "cache_control",
+)
+
+
+def _new_etag() -> str:
+
+    return f'"0x{time.time_ns():X}"'
+
+
+class LocalBlobServiceClient:
+    """BlobServiceClient stand-in storing containers under a local directory."""
+
+    def __init__(self, root: str, **kwargs):
+        self.root = Path(root)
+        self.account_name = "local"
+        # Same transfer size options as the SDK client
+        self.max_chunk_get_size = kwargs.get("max_chunk_get_size", DEFAULT_CHUNK_SIZE)
+        self.max_block_size = kwargs.get("max_block_size", DEFAULT_CHUNK_SIZE)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def get_container_client(self, container: str) -> "LocalContainerClient":
+        return LocalContainerClient(self, container)
+
+
+class LocalContainerClient:
+    """ContainerClient stand-in for one directory under the service root."""
+
+    def __init__(self, service: LocalBlobServiceClient, container_name: str):
+        self.service = service
+        self.container_name = container_name
+        self.path = service.root / container_name
+        self.properties_path = service.root / PROPERTIES_DIRECTORY / container_name
+
+    def get_container_properties(self) -> Dict:
+        if not self.path.is_dir():
+            raise ResourceNotFoundError(
+                "The specified container does not exist.\nErrorCode:ContainerNotFound"
+            )
+        return {"name": self.container_name}
+
+    def create_container(self) -> None:
+        try:
+            self.path.mkdir(parents=True)
+        except FileExistsError:
+            raise ResourceExistsError(
+                "The specified container already exists.\nErrorCode:ContainerAlreadyExists"
+            )
+
+    def get_blob_client(self, blob: str) -> "LocalBlobClient":
+        return LocalBlobClient(self, blob)
+
+    def list_blobs(self, name_starts_with: Optional[str] = None, **kwargs) -> Iterator[BlobProperties]:
+        """Properties of the blobs whose name starts with name_starts_with, by name."""
+        if not self.path.is_dir():
+            raise ResourceNotFoundError(
+                "The specified container does not exist.\nErrorCode:ContainerNotFound"
+            )
+
+        names = []
+        for file_path in self.path.rglob("*"):
+            if file_path.is_file() and not file_path.name.startswith(UPLOAD_PREFIX):
+                name = file_path.relative_to(self.path).as_posix()
+                if not name_starts_with or name.startswith(name_starts_with):
+                    names.append(name)
+
+        for name in sorted(names):
+            try:
+                yield self.get_blob_client(name).get_blob_properties()
+            except ResourceNotFoundError:
+                # Deleted while listing
+                continue
+
+    def upload_blob(self, name: str, data, overwrite: bool = False, **kwargs) -> "LocalBlobClient":
+        blob_client = self.get_blob_client(name)
+        blob_client.upload_blob(data, overwrite=overwrite, **kwargs)
+        return blob_client
+
+    def delete_blob(self, blob: str, **kwargs) -> None:
+        self.get_blob_client(blob).delete_blob()
+
+
+class LocalBlobClient:
+    """BlobClient stand-in for one file of a local container."""
+
+    # Serializes the replace of a blob and its properties file
+    _write_lock = threading.Lock()
+
+    def __init__(self, container: LocalContainerClient, blob_name: str):
+        self.container = container
+        self.container_name = container.container_name
+        self.blob_name = blob_name
+        self.path = container.path / blob_name
+        self.properties_path = container.properties_path / f"{blob_name}.json"
+
+    def _not_found(self) -> ResourceNotFoundError:
+        return ResourceNotFoundError(
+            f"The specified blob '{self.blob_name}' does not exist.\nErrorCode:BlobNotFound"
+        )
+
+    def _stored_properties(self) -> Dict:
+        try:
+            with open(self.properties_path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def get_blob_properties(self, **kwargs) -> BlobProperties:
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            raise self._not_found()
+
+        stored = self._stored_properties()
+        settings = stored.get("content_settings", {})
+        content_md5 = settings.get("content_md5")
+
+        properties = BlobProperties()
+        properties.name = self.blob_name
+        properties.container = self.container_name
+        properties.size = stat.st_size
+        # Blobs copied into the directory by hand get an etag from their mtime
+        properties.etag = stored.get("etag") or f'"0x{stat.st_mtime_ns:X}{stat.st_size:X}"'
+        properties.last_modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        properties.metadata = stored.get("metadata", {})
+        properties.content_settings = ContentSettings(
+            content_md5=bytearray.fromhex(content_md5) if content_md5 else None,
+            **{field: settings.get(field) for field in CONTENT_SETTINGS_FIELDS},
+        )
+        return properties
+
+    def download_blob(
+        self,
+        offset: Optional[int] = None,
+        length: Optional[int] = None,
+        progress_hook: Optional[Callable[[int, Optional[int]], None]] = None,
+        etag: Optional[str] = None,
+        match_condition: Optional[MatchConditions] = None,
+        **kwargs,
+    ) -> "LocalBlobDownloader":
+        if etag is not None and match_condition is not None:
+            current_etag = self.get_blob_properties().etag
+            # If-None-Match: 304, If-Match: 412
+            if match_condition == MatchConditions.IfModified and current_etag == etag:
+                raise ResourceNotModifiedError("The condition specified using HTTP conditional header(s) is not met.")
+            if match_condition == MatchConditions.IfNotModified and current_etag != etag:
+                raise ResourceModifiedError(
+                    "The condition specified using HTTP conditional header(s) is not met.\nErrorCode:ConditionNotMet"
+                )
+        return LocalBlobDownloader(self, offset, length, progress_hook)
+
+    def upload_blob(
+        self,
+        data,
+        overwrite: bool = False,
+        metadata: Optional[Dict[str, str]] = None,
+        content_settings: Optional[ContentSettings] = None,
+        progress_hook: Optional[Callable[[int, Optional[int]], None]] = None,
+        **kwargs,
+    ) -> Dict:
+        if not overwrite and self.path.exists():
+            raise ResourceExistsError(
+                "The specified blob already exists.\nErrorCode:BlobAlreadyExists"
+            )
+
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=UPLOAD_PREFIX)
+        try:
+            block_size = self.container.service.max_block_size
+            uploaded = 0
+            with os.fdopen(file_descriptor, "wb") as file:
+                if isinstance(data, (bytes, bytearray, memoryview)):
+                    blocks = (data[i:i + block_size] for i in range(0, len(data), block_size))
+                else:
+                    blocks = iter(lambda: data.read(block_size), b"")
+                for block in blocks:
+                    file.write(block)
+                    uploaded += len(block)
+                    if progress_hook:
+                        progress_hook(uploaded, None)
+
+            settings = {}
+            if content_settings is not None:
+                settings = {field: getattr(content_settings, field, None) for field in CONTENT_SETTINGS_FIELDS}
+                if content_settings.content_md5:
+                    settings["content_md5"] = bytes(content_settings.content_md5).hex()
+
+            etag = _new_etag()
+            stored = {"etag": etag, "content_settings": settings, "metadata": dict(metadata or {})}
+
+            with self._write_lock:
+                os.replace(temp_path, self.path)
+                self.properties_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.properties_path, "w", encoding="utf-8") as file:
+                    json.dump(stored, file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return {"etag": etag}
+
+    def delete_blob(self, **kwargs) -> None:
+        with self._write_lock:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                raise self._not_found()
+            if self.properties_path.exists():
+                self.properties_path.unlink()
+
+
+class LocalBlobDownloader:
+    """StorageStreamDownloader stand-in: reads the blob (or a byte range) in chunks
+    of the service's max_chunk_get_size, reporting progress after each."""
+
+    def __init__(
+        self,
+        blob_client: LocalBlobClient,
+        offset: Optional[int],
+        length: Optional[int],
+        progress_hook: Optional[Callable[[int, Optional[int]], None]],
+    ):
+        self.properties = blob_client.get_blob_properties()
+        self.name = blob_client.blob_name
+        self.container = blob_client.container_name
+        self._path = blob_client.path
+        self._chunk_size = blob_client.container.service.max_chunk_get_size
+        self._progress_hook = progress_hook
+
+        self._offset = offset or 0
+        end = self.properties.size if length is None else min(self._offset + length, self.properties.size)
+        self.size = max(end - self._offset, 0)
+
+    def chunks(self) -> Iterator[bytes]:
+        remaining = self.size
+        downloaded = 0
+        with open(self._path, "rb") as file:
+            file.seek(self._offset)
+            while remaining > 0:
+                chunk = file.read(min(self._chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                downloaded += len(chunk)
+                if self._progress_hook:
+                    self._progress_hook(downloaded, self.size)
+                yield chunk
+
+    def readinto(self, stream: BinaryIO) -> int:
+        written = 0
+        for chunk in self.chunks():
+            stream.write(chunk)
+            written += len(chunk)
+        return written
+
+    def readall(self) -> bytes:
+        return b"".join(self.chunks())
+
+    def content_as_bytes(self, max_concurrency: int = 1) -> bytes:
+        return self.readall()
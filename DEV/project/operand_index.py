@@ -0,0 +1,346 @@
+import os
+import re
+import uuid
+from collections import defaultdict
+from typing import *
+
+import pandas as pd
+import polars as pl
+from loguru import logger
+
+from .data_model_format import load_data_model_pl, parse_attributes
+
+#########################################################
+#
+# Operand cross reference
+#
+# Rules that ask "where else is this operand used" re-scanned the whole data model and
+# parsed every row's ATTRIBUTES for each question. OperandIndex maps every operand to
+# its occurrences (program, section, rung, object type, negated, edge and row
+# position), so such a question is one dictionary lookup and a cross-section check is
+# a join on the operand keys.
+#
+# Indexed objects are the Contact/Coil operands and the variables wired to blocks:
+# DataSource identifiers (block inputs) and DataSink identifiers (block outputs);
+# literals such as T#1.0s or USINT#6 are left out. A member "Axis.Busy" or an array
+# element "AL000[3]" can also be looked up through its parent ("Axis", "AL000") with
+# members=True.
+#
+# Data modelling writes the index next to each data model CSV
+# (<stem>_operands.parquet, one row per occurrence); load_operand_index reads it. For
+# older outputs it is built from the data model once and saved there.
+#
+#########################################################
+
+UNIT_COLUMNS = ("PROGRAM", "FUNCTION_BLOCK")
+SECTION_COLUMNS = ("BODY", "BODY_TYPE")
+
+INDEXED_OBJECT_TYPES = {
+    "Contact": "operand",
+    "Coil": "operand",
+    "DataSource": "identifier",
+    "DataSink": "identifier",
+}
+
+# Variable names with optional .member / [index] parts, no typed literals (T#1s, INT#5)
+VARIABLE_PATTERN = re.compile(r"^[A-Za-z_]\w*(\.\w+|\[[^\[\]]*\])*$")
+LITERALS = {"true", "false"}
+
+# Last ".member" or "[index]" of an operand
+LAST_PART_PATTERN = re.compile(r"(\.\w+|\[[^\[\]]*\])$")
+
+# One column per OperandOccurrence field
+OPERAND_INDEX_COLUMNS = [
+    "OPERAND",
+    "PROGRAM",
+    "SECTION",
+    "RUNG",
+    "OBJECT_TYPE",
+    "NEGATED",
+    "EDGE",
+    "ROW",
+]
+
+
+class OperandOccurrence(NamedTuple):
+
+    operand: str
+    program: str
+    section: str
+    rung: Any
+    object_type: str
+    negated: Optional[str]
+    edge: Optional[str]
+    row: int
+
+
+def operand_index_path(csv_path: str) -> str:
+
+    return f"{os.path.splitext(str(csv_path))[0]}_operands.parquet"
+
+
+def operand_parents(operand: str) -> List[str]:
+    """Enclosing variables of a member / array element, innermost first.
+
+    "LT200[26].Q" -> ["LT200[26]", "LT200"]
+    """
+
+    parents = []
+    while True:
+        match = LAST_PART_PATTERN.search(operand)
+        if not match or match.start() == 0:
+            return parents
+        operand = operand[: match.start()]
+        parents.append(operand)
+
+
+def _is_variable(name) -> bool:
+
+    return (
+        isinstance(name, str)
+        and name.lower() not in LITERALS
+        and VARIABLE_PATTERN.match(name) is not None
+    )
+
+
+def _text(value) -> Optional[str]:
+
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+
+    return str(value)
+
+
+def _column(columns: Iterable[str], candidates: Tuple[str, ...]) -> str:
+
+    return next(column for column in candidates if column in columns)
+
+
+class OperandIndex:
+    """operand -> occurrences in one data model frame, in row order."""
+
+    def __init__(self, occurrences: List[OperandOccurrence]):
+
+        self.occurrences = occurrences
+
+        # program -> order of first occurrence, for row ordered results across programs
+        self.program_rank: Dict[Any, int] = {}
+
+        self._by_operand: Dict[str, List[OperandOccurrence]] = defaultdict(list)
+        self._by_parent: Dict[str, List[OperandOccurrence]] = defaultdict(list)
+        for occurrence in occurrences:
+            self.program_rank.setdefault(occurrence.program, len(self.program_rank))
+            self._by_operand[occurrence.operand].append(occurrence)
+
+        for operand, operand_occurrences in self._by_operand.items():
+            for parent in operand_parents(operand):
+                self._by_parent[parent].extend(operand_occurrences)
+
+        for parent_occurrences in self._by_parent.values():
+            parent_occurrences.sort(key=lambda o: o.row)
+
+    ###   Building #############
+
+    @classmethod
+    def from_rows(
+        cls,
+        programs: Iterable,
+        sections: Iterable,
+        rungs: Iterable,
+        object_types: Iterable,
+        attributes: Iterable,
+    ) -> "OperandIndex":
+
+        occurrences = []
+        for row, (program, section, rung, object_type, value) in enumerate(
+            zip(programs, sections, rungs, object_types, attributes)
+        ):
+            key = INDEXED_OBJECT_TYPES.get(object_type)
+            if key is None:
+                continue
+
+            attribute = parse_attributes(value)
+            operand = attribute.get(key)
+            if not isinstance(operand, str) or not operand:
+                continue
+            if key == "identifier" and not _is_variable(operand):
+                continue
+
+            occurrences.append(
+                OperandOccurrence(
+                    operand,
+                    program,
+                    section,
+                    rung,
+                    object_type,
+                    attribute.get("negated"),
+                    attribute.get("edge"),
+                    row,
+                )
+            )
+
+        return cls(occurrences)
+
+    @classmethod
+    def from_frame(cls, frame: Union[pd.DataFrame, pl.DataFrame]) -> "OperandIndex":
+        """Index a (program or function) data model frame."""
+
+        return cls.from_columns({column: frame[column] for column in frame.columns})
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Iterable]) -> "OperandIndex":
+        """Index the columnar buffers of the model writer (one list per column)."""
+
+        return cls.from_rows(
+            columns[_column(columns, UNIT_COLUMNS)],
+            columns[_column(columns, SECTION_COLUMNS)],
+            columns["RUNG"],
+            columns["OBJECT_TYPE_LIST"],
+            columns["ATTRIBUTES"],
+        )
+
+    @classmethod
+    def combine(cls, *indexes: "OperandIndex") -> "OperandIndex":
+        """One index over several frames taken one after the other (programs, then functions)."""
+
+        occurrences = []
+        offset = 0
+        for index in indexes:
+            occurrences.extend(o._replace(row=o.row + offset) for o in index.occurrences)
+            if index.occurrences:
+                offset += index.occurrences[-1].row + 1
+
+        return cls(occurrences)
+
+    ###   Persistence #############
+
+    def to_frame(self) -> pl.DataFrame:
+
+        frame = pl.DataFrame(
+            {
+                column: [
+                    value if column == "ROW" else _text(value)
+                    for value in (o[position] for o in self.occurrences)
+                ]
+                for position, column in enumerate(OPERAND_INDEX_COLUMNS)
+            },
+            schema={
+                column: pl.Int64 if column == "ROW" else pl.Utf8
+                for column in OPERAND_INDEX_COLUMNS
+            },
+        )
+
+        # Same rung type as the typed data model
+        try:
+            frame = frame.with_columns(pl.col("RUNG").cast(pl.Int64))
+        except Exception:
+            pass
+
+        return frame
+
+    @classmethod
+    def from_index_frame(cls, frame: pl.DataFrame) -> "OperandIndex":
+
+        return cls(
+            [
+                OperandOccurrence(*values)
+                for values in frame.select(OPERAND_INDEX_COLUMNS).iter_rows()
+            ]
+        )
+
+    def save(self, path: str) -> str:
+
+        self.to_frame().write_parquet(path)
+
+        return path
+
+    ###   Queries #############
+
+    def __contains__(self, operand: str) -> bool:
+
+        return operand in self._by_operand
+
+    def operands(self) -> KeysView:
+
+        return self._by_operand.keys()
+
+    def members(self, operand: str) -> List[str]:
+        """Members / array elements of operand that occur in the data model."""
+
+        return list(dict.fromkeys(o.operand for o in self._by_parent.get(operand, [])))
+
+    def lookup(
+        self,
+        operand: str,
+        object_types: Optional[Iterable[str]] = None,
+        exclude_sections: Optional[Iterable[str]] = None,
+        members: bool = False,
+    ) -> List[OperandOccurrence]:
+        """Occurrences of operand, optionally limited to object types and outside
+        the given (case-insensitive) sections. members=True adds the occurrences of
+        its members and array elements, in row order."""
+
+        occurrences = self._by_operand.get(operand, [])
+
+        if members and operand in self._by_parent:
+            occurrences = sorted(
+                occurrences + self._by_parent[operand], key=lambda o: o.row
+            )
+
+        if object_types is not None:
+            object_types = set(object_types)
+            occurrences = [o for o in occurrences if o.object_type in object_types]
+
+        if exclude_sections is not None:
+            excluded = {section.lower() for section in exclude_sections}
+            occurrences = [
+                o
+                for o in occurrences
+                if not (isinstance(o.section, str) and o.section.lower() in excluded)
+            ]
+
+        return occurrences
+
+
+def write_operand_index(columns: Dict[str, Iterable], csv_path: str) -> str:
+    """Index the data model being written to csv_path and save it next to it."""
+
+    return OperandIndex.from_columns(columns).save(operand_index_path(csv_path))
+
+
+def build_operand_index(
+    data_model_df: Union[pd.DataFrame, pl.DataFrame], csv_path: str
+) -> OperandIndex:
+    """Index a data model the modeller wrote without an index, and save the index next
+    to its CSV so later requests and worker processes read it instead.
+
+    Written to a temporary file and renamed into place; when it cannot be written the
+    index is only returned.
+    """
+
+    operand_index = OperandIndex.from_frame(data_model_df)
+    index_path = operand_index_path(csv_path)
+    tmp_path = f"{index_path}.{uuid.uuid4().hex}.tmp"
+
+    try:
+        operand_index.save(tmp_path)
+        os.replace(tmp_path, index_path)
+        logger.info(f"Saved the operand index of {csv_path} to {index_path}")
+    except Exception as e:
+        logger.warning(f"Failed to save the operand index of {csv_path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return operand_index
+
+
+def load_operand_index(input_file: str) -> OperandIndex:
+    """Operand index of a data model CSV path, built from the data model (and saved)
+    when the modeller did not write one."""
+
+    index_path = operand_index_path(input_file)
+
+    if os.path.exists(index_path):
+        return OperandIndex.from_index_frame(pl.read_parquet(index_path))
+
+    return build_operand_index(load_data_model_pl(input_file), input_file)
@@ -4,5 +4,7 @@
 
 from .ladder_data_modelling import ingest_file ,data_modelling_program_wise, data_modelling_function_wise
 from .ladder_extract_variable_comment_pair_main import extract_variable_comment_programwise, extract_variable_comment_functionwise
+from .ladder_data_model_engine import data_modelling_single_pass
+from .data_model_cache import DataModelCache, data_model_cache_from_env
 
-__all__=["ingest_file", "data_modelling_program_wise", "data_modelling_function_wise", "extract_variable_comment_programwise", "extract_variable_comment_functionwise"]
\ No newline at end of file
+__all__=["ingest_file", "data_modelling_program_wise", "data_modelling_function_wise", "extract_variable_comment_programwise", "extract_variable_comment_functionwise", "data_modelling_single_pass", "DataModelCache", "data_model_cache_from_env"]
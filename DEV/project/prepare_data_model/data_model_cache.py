@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import *
+
+from loguru import logger
+from .ladder_data_model_engine import DATA_MODELLER_VERSION, data_model_file_names
+
+#########################################################
+#
+# Content addressed data model cache
+#
+# Engineers often re-submit the same Sysmac export. The files written by
+# data_modelling_single_pass only depend on the XML content and the modeller, so they
+# are kept in a local directory keyed by sha256(XML bytes + DATA_MODELLER_VERSION):
+#
+#   <cache_dir>/<key>/manifest.json      program/function names, file roles, size
+#   <cache_dir>/<key>/<role>             one file per data_model_file_names() role
+#
+# Files are stored by role and restored under the names of the requesting
+# dest_file_name, so the same XML uploaded under another name is still a hit. Entries
+# are written to a temporary directory and renamed into place; the total size is kept
+# under max_bytes by evicting the least recently used entries (manifest mtime).
+#
+#########################################################
+
+MANIFEST_FILE_NAME = "manifest.json"
+REQUIRED_ROLES = ("program_csv", "function_csv", "program_comments", "function_comments")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class DataModelCache:
+    """Size bounded LRU cache of data model outputs keyed by XML content."""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+
+        return self.max_bytes > 0
+
+    def key(self, xml_file_path) -> str:
+        """sha256 of the XML content and the modeller version."""
+
+        digest = hashlib.sha256()
+        with open(xml_file_path, "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        digest.update(f"data-modeller-{DATA_MODELLER_VERSION}".encode("utf-8"))
+
+        return digest.hexdigest()
+
+    def restore(
+        self, key: str, output_dir, dest_file_name: str
+    ) -> Optional[Tuple[List[str], List[str]]]:
+        """Copy a cached data model into output_dir; returns the program/function names or None."""
+
+        if not self.enabled:
+            return None
+
+        entry_dir = self.cache_dir / key
+
+        try:
+            with self._lock:
+                manifest_path = entry_dir / MANIFEST_FILE_NAME
+                if not manifest_path.exists():
+                    return None
+
+                with open(manifest_path, "r", encoding="utf-8") as file:
+                    manifest = json.load(file)
+
+                file_names = data_model_file_names(dest_file_name)
+                for role in manifest["roles"]:
+                    shutil.copyfile(entry_dir / role, Path(output_dir) / file_names[role])
+
+                # Mark as recently used
+                os.utime(manifest_path)
+
+            logger.info(f"Data model cache hit for {dest_file_name} ({key[:12]})")
+
+            return manifest["program_names"], manifest["function_names"]
+
+        except Exception as e:
+            logger.error(f"Failed to restore cached data model {key}: {e}")
+
+        return None
+
+    def store(
+        self,
+        key: str,
+        output_dir,
+        dest_file_name: str,
+        program_names: List[str],
+        function_names: List[str],
+    ) -> bool:
+        """Add the data model written to output_dir to the cache."""
+
+        if not self.enabled:
+            return False
+
+        file_names = data_model_file_names(dest_file_name)
+        roles = [
+            role
+            for role, file_name in file_names.items()
+            if (Path(output_dir) / file_name).exists()
+        ]
+        if any(role not in roles for role in REQUIRED_ROLES):
+            logger.warning(f"Incomplete data model for {dest_file_name}, not cached")
+            return False
+
+        tmp_dir = self.cache_dir / f".tmp-{uuid.uuid4().hex}"
+
+        try:
+            tmp_dir.mkdir(parents=True)
+
+            size = 0
+            for role in roles:
+                shutil.copyfile(Path(output_dir) / file_names[role], tmp_dir / role)
+                size += (tmp_dir / role).stat().st_size
+
+            with open(tmp_dir / MANIFEST_FILE_NAME, "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "version": DATA_MODELLER_VERSION,
+                        "roles": roles,
+                        "program_names": program_names,
+                        "function_names": function_names,
+                        "size": size,
+                    },
+                    file,
+                    ensure_ascii=False,
+                )
+
+            with self._lock:
+                entry_dir = self.cache_dir / key
+                if entry_dir.exists():
+                    shutil.rmtree(tmp_dir)
+                else:
+                    tmp_dir.rename(entry_dir)
+                self._evict()
+
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to cache data model {key}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return False
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits max_bytes."""
+
+        entries = []
+        for entry_dir in self.cache_dir.iterdir():
+            manifest_path = entry_dir / MANIFEST_FILE_NAME
+            if not manifest_path.exists():
+                continue
+            size = sum(file.stat().st_size for file in entry_dir.iterdir())
+            entries.append((manifest_path.stat().st_mtime, size, entry_dir))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted cached data model {entry_dir.name}")
+
+
+def data_model_cache_from_env() -> DataModelCache:
+    """DataModelCache configured by DATA_MODEL_CACHE_DIR / DATA_MODEL_CACHE_MAX_MB."""
+
+    cache_dir = os.getenv("DATA_MODEL_CACHE_DIR", "data_model_cache")
+
+    try:
+        max_mb = float(os.getenv("DATA_MODEL_CACHE_MAX_MB", "2048"))
+    except ValueError:
+        logger.error("Invalid DATA_MODEL_CACHE_MAX_MB, data model cache disabled")
+        max_mb = 0
+
+    return DataModelCache(cache_dir, int(max_mb * 1024 * 1024))
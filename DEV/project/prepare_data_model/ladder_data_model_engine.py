@@ -0,0 +1,127 @@
+from typing import *
+from loguru import logger
+from ..data_model_format import data_model_parquet_path
+from ..comment_store import comment_store_path
+from ..operand_index import operand_index_path
+from .ladder_xml_stream import iter_ladder_events
+from .ladder_data_modelling import LadderModelWriter
+from .ladder_extract_variable_comment_pair_main import (
+    write_variable_comment_programwise,
+    write_variable_comment_functionwise,
+)
+
+#########################################################
+
+# Bump whenever the files written by data_modelling_single_pass change, so cached data
+# models of older modeller versions are not reused (see data_model_cache)
+DATA_MODELLER_VERSION = "3"
+
+
+def data_model_file_names(dest_file_name: str) -> Dict[str, str]:
+    """Names of the files data_modelling_single_pass writes for dest_file_name."""
+
+    data_source_prefix = dest_file_name.split("_")[0]
+    file_names = {}
+
+    for section_type in ("program", "function"):
+        csv_name = f"{dest_file_name}_{section_type}wise.csv"
+        file_names[f"{section_type}_csv"] = csv_name
+        file_names[f"{section_type}_parquet"] = data_model_parquet_path(csv_name)
+        file_names[f"{section_type}_operands"] = operand_index_path(csv_name)
+        file_names[f"{section_type}_datasource"] = (
+            f"{data_source_prefix}_datasource_comments_{section_type}wise.csv"
+        )
+        comment_name = f"{dest_file_name}_{section_type}wise.json"
+        file_names[f"{section_type}_comments"] = comment_name
+        file_names[f"{section_type}_comment_store"] = comment_store_path(comment_name)
+
+    return file_names
+
+
+def data_modelling_single_pass(
+    ladder_program,
+    data_model_dir: str,
+    dest_file_name: str,
+    files_written: Optional[Callable[[List[str]], None]] = None,
+) -> Tuple[List[str], List[str]]:
+    """Produce the programwise/functionwise data models and comment JSONs from one walk over the XML.
+
+    Every Program, FunctionBlock, rung and global variable block is visited exactly once
+    and handed to the two model writers and the two comment extractors. Works with both
+    the BeautifulSoup document and the streaming ingest.
+
+    files_written is called with the names of the files of each finished stage (data
+    models, then comments), so they can be uploaded while the next stage runs.
+    """
+
+    logger.info("Extracting programwise/functionwise objects and comments in one pass")
+
+    try:
+
+        program_writer = LadderModelWriter(
+            "program", data_model_dir, f"{dest_file_name}_programwise.csv"
+        )
+        function_writer = LadderModelWriter(
+            "function", data_model_dir, f"{dest_file_name}_functionwise.csv"
+        )
+
+        programs = []
+        function_blocks = []
+        global_vars = []
+        global_namespaces = []
+
+        for event in iter_ladder_events(ladder_program):
+
+            if event.kind == "global":
+                if event.unit_tag == "GlobalVars":
+                    global_vars.append(event.element)
+                else:
+                    global_namespaces.append(event.element)
+                continue
+
+            program_writer.add_event(event)
+            function_writer.add_event(event)
+
+            if event.kind == "unit_end":
+                if event.unit_tag == "Program":
+                    programs.append((event.unit_name, event.element))
+                else:
+                    function_blocks.append((event.unit_name, event.element))
+
+        file_names = data_model_file_names(dest_file_name)
+
+        def stage_done(*keys: str) -> None:
+            if files_written is not None:
+                files_written([file_names[key] for key in keys])
+
+        program_names = program_writer.write()
+        stage_done(
+            "program_csv", "program_parquet", "program_operands", "program_datasource"
+        )
+        function_names = function_writer.write()
+        stage_done(
+            "function_csv",
+            "function_parquet",
+            "function_operands",
+            "function_datasource",
+        )
+
+        write_variable_comment_programwise(
+            programs,
+            global_vars,
+            global_namespaces,
+            f"{dest_file_name}_programwise.json",
+            data_model_dir,
+        )
+        stage_done("program_comments", "program_comment_store")
+        write_variable_comment_functionwise(
+            function_blocks, f"{dest_file_name}_functionwise.json", data_model_dir
+        )
+        stage_done("function_comments", "function_comment_store")
+
+        return program_names, function_names
+
+    except Exception as e:
+        logger.error(str(e))
+
+    return [], []
@@ -2,9 +2,12 @@ from bs4 import BeautifulSoup
 from typing import *
 import pandas as pd
 import re, json
-from ...main import logger
+from loguru import logger
 import os
 import traceback
+from .ladder_xml_stream import LadderEvent, LadderXmlStream, iter_ladder_events
+from ..data_model_format import write_data_model_parquet
+from ..operand_index import write_operand_index
 
 # Optional import for YOLO - only import if available
 try:
@@ -26,7 +29,16 @@ except ImportError:
 ###   Ingesting the file #############
 
 
-def ingest_file(xml_file_path: str):
+def ingest_file(xml_file_path: str, streaming: bool = False):
+    """Parse the Sysmac XML export.
+
+    With streaming=True nothing is parsed up front; a LadderXmlStream is returned that
+    the modelling and comment extraction functions walk rung by rung with bounded memory.
+    xml_file_path may then also be a binary file object (walked once).
+    """
+
+    if streaming:
+        return LadderXmlStream(xml_file_path)
 
     with open(xml_file_path, "r", encoding="utf-8") as file:
 
@@ -50,33 +62,15 @@ def ingest_file(xml_file_path: str):
 
 def extract_from_contact(
     pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
+) -> Dict:
 
     logger.info(f"Contact Extraction from {pg_name} {bd_name} {rg_order}")
 
     try:
 
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
         connection_in_list = []
         connection_out_list = []
 
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
         children_attrs_keys = list(rg_child.attrs.keys())
         attribute_dict = {}
 
@@ -108,8 +102,6 @@ def extract_from_contact(
 
         attribute_dict["out_list"] = connection_out_list
 
-        attributes_list.append(attribute_dict)
-
         # decide the column names accordingly
 
         if section_type == "program":
@@ -132,23 +124,21 @@ def extract_from_contact(
             object_type_key = "OBJECT_TYPE_LIST"
             attribute_key = "ATTRIBUTES"
 
-        contact_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
+        contact_record = {
+            program_key: pg_name,
+            body_key: bd_name,
+            rung_key: rg_order,
+            rung_name_key: rg_name,
+            object_key: rg_child.name,
+            object_type_key: rg_child.attrs["xsi:type"],
+            attribute_key: attribute_dict,
         }
 
-        contact_dataframe = pd.DataFrame(contact_dict)
-
     except Exception as e:
 
         logger.error(f"str(e), traceback.format_exc()")
 
-    return contact_dataframe
+    return contact_record
 
 
 ###############
@@ -156,33 +146,15 @@ def extract_from_contact(
 
 def extract_from_coil(
     pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
+) -> Dict:
 
     logger.info(f"Coil Extraction from {pg_name} {bd_name} {rg_order}")
 
     try:
 
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
         connection_in_list = []
         connection_out_list = []
 
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
         children_attrs_keys = list(rg_child.attrs.keys())
         attribute_dict = {}
 
@@ -208,8 +180,6 @@ def extract_from_coil(
 
         attribute_dict["out_list"] = connection_out_list
 
-        attributes_list.append(attribute_dict)
-
         # decide the column names accordingly
 
         if section_type == "program":
@@ -232,23 +202,21 @@ def extract_from_coil(
             object_type_key = "OBJECT_TYPE_LIST"
             attribute_key = "ATTRIBUTES"
 
-        coil_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
+        coil_record = {
+            program_key: pg_name,
+            body_key: bd_name,
+            rung_key: rg_order,
+            rung_name_key: rg_name,
+            object_key: rg_child.name,
+            object_type_key: rg_child.attrs["xsi:type"],
+            attribute_key: attribute_dict,
         }
 
-        coil_dataframe = pd.DataFrame(coil_dict)
-
     except Exception as e:
 
         logger.error(str(e))
 
-    return coil_dataframe
+    return coil_record
 
 
 ############
@@ -256,33 +224,15 @@ def extract_from_coil(
 
 def extract_from_PowerRails(
     pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
+) -> Dict:
 
     logger.info(f"PowerRail Extraction from {pg_name} {bd_name} {rg_order}")
 
     try:
 
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
         connection_in_list = []
         connection_out_list = []
 
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
         children_attrs_keys = list(rg_child.attrs.keys())
         attribute_dict = {}
 
@@ -302,8 +252,6 @@ def extract_from_PowerRails(
 
         attribute_dict["out_list"] = connection_out_list
 
-        attributes_list.append(attribute_dict)
-
         # decide the column names accordingly
 
         if section_type == "program":
@@ -326,59 +274,49 @@ def extract_from_PowerRails(
             object_type_key = "OBJECT_TYPE_LIST"
             attribute_key = "ATTRIBUTES"
 
-        rail_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
+        rail_record = {
+            program_key: pg_name,
+            body_key: bd_name,
+            rung_key: rg_order,
+            rung_name_key: rg_name,
+            object_key: rg_child.name,
+            object_type_key: rg_child.attrs["xsi:type"],
+            attribute_key: attribute_dict,
         }
 
-        rail_dataframe = pd.DataFrame(rail_dict)
-
     except Exception as e:
 
         logger.error(str(e))
 
-    return rail_dataframe
+    return rail_record
 
 
 ###################################
-def extract_from_Memcopy(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(f"Memcopy Extraction from {pg_name} {bd_name} {rg_order}")
+def extract_from_block(
+    pg_name: str,
+    bd_name: str,
+    rg_name: str,
+    rg_order: str,
+    rg_child,
+    section_type: str,
+    block_label: str = "Block",
+    with_instance_name: bool = False,
+) -> Dict:
+    """Shared extractor for function blocks: typeName plus the connections of every variable.
+
+    The MOVE/ZoneCmp/ADD/SIN/... extractors only differed in their log label, so they all
+    delegate here. with_instance_name also stores the instanceName (FB instances like TON).
+    """
+
+    logger.info(f"{block_label} Extraction from {pg_name} {bd_name} {rg_order}")
 
     try:
 
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
         attribute_dict = {}
 
         attribute_dict["typeName"] = rg_child.attrs["typeName"]
+        if with_instance_name:
+            attribute_dict["instanceName"] = rg_child.attrs["instanceName"]
 
         ####################
 
@@ -432,47 +370,38 @@ def extract_from_Memcopy(
                 out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
             ]
 
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
+        block_record = dict(
+            zip(
+                DATA_MODEL_COLUMNS[section_type],
+                (
+                    pg_name,
+                    bd_name,
+                    rg_order,
+                    rg_name,
+                    rg_child.name,
+                    rg_child.attrs["xsi:type"],
+                    attribute_dict,
+                ),
+            )
+        )
 
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
+    except Exception as e:
 
-        elif section_type == "function":
+        logger.error(str(e))
 
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
+    return block_record
 
-        mem_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
 
-        mem_dataframe = pd.DataFrame(mem_dict)
+#############################
 
-    except Exception as e:
 
-        logger.error(str(e))
+def extract_from_Memcopy(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
 
-    return mem_dataframe
+    return extract_from_block(
+        pg_name, bd_name, rg_name, rg_order, rg_child, section_type, "Memcopy"
+    )
 
 
 ###############################
@@ -480,92 +409,46 @@ def extract_from_Memcopy(
 
 def extract_from_Clear(
     pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
+) -> Dict:
 
-    logger.info(f"Clear Extraction from {pg_name} {bd_name} {rg_order}")
+    return extract_from_block(
+        pg_name, bd_name, rg_name, rg_order, rg_child, section_type, "Clear"
+    )
 
-    try:
 
-        program_name_list = []
-        body_name_list = []
+#################################
 
-        rung_order_list = []
-        rung_name_list = []
 
-        object_list = []
-        object_type_list = []
-        attributes_list = []
+def extract_from_Data_Sink_or_Source(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
 
-        connection_in_list = []
-        connection_out_list = []
+    logger.info(f"Data Source Sink Extraction from {pg_name} {bd_name} {rg_order}")
 
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
+    try:
 
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
+        connection_in_list = []
+        connection_out_list = []
 
         children_attrs_keys = list(rg_child.attrs.keys())
         attribute_dict = {}
 
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
+        attribute_dict["identifier"] = rg_child.attrs["identifier"]
 
         ####################
 
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
+        if rg_child.attrs["xsi:type"] == "DataSink":
 
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
+            attribute_dict["in_list"] = [
+                rg_child.find("Connection").attrs["refConnectionPointOutId"]
             ]
 
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
+        if rg_child.attrs["xsi:type"] == "DataSource":
 
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
+            attribute_dict["out_list"] = [
+                rg_child.find("ConnectionPointOut").attrs["connectionPointOutId"]
             ]
 
-        attributes_list.append(attribute_dict)
-
         # decide the column names accordingly
 
         if section_type == "program":
@@ -588,79 +471,194 @@ def extract_from_Clear(
             object_type_key = "OBJECT_TYPE_LIST"
             attribute_key = "ATTRIBUTES"
 
-        clear_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
+        sink_source_record = {
+            program_key: pg_name,
+            body_key: bd_name,
+            rung_key: rg_order,
+            rung_name_key: rg_name,
+            object_key: rg_child.name,
+            object_type_key: rg_child.attrs["xsi:type"],
+            attribute_key: attribute_dict,
         }
 
-        clear_dataframe = pd.DataFrame(clear_dict)
-
     except Exception as e:
-
         logger.error(str(e))
 
-    return clear_dataframe
+    return sink_source_record
 
 
-#################################
+###################################
+def extract_from_Move(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
+
+    return extract_from_block(
+        pg_name, bd_name, rg_name, rg_order, rg_child, section_type, "Move"
+    )
 
 
-def extract_from_Data_Sink_or_Source(
+########################################
+
+
+def extract_from_Zonecmp(
     pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
+) -> Dict:
 
-    logger.info(f"Data Source Sink Extraction from {pg_name} {bd_name} {rg_order}")
+    return extract_from_block(
+        pg_name, bd_name, rg_name, rg_order, rg_child, section_type, "Zonecmp"
+    )
 
-    try:
 
-        program_name_list = []
-        body_name_list = []
+#############################
+def extract_from_underscore(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
 
-        rung_order_list = []
-        rung_name_list = []
+    return extract_from_block(
+        pg_name, bd_name, rg_name, rg_order, rg_child, section_type, "Underscore"
+    )
 
-        object_list = []
-        object_type_list = []
-        attributes_list = []
 
-        connection_in_list = []
-        connection_out_list = []
+##########################################3
+def extract_from_fwdslash(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
 
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
+    return extract_from_block(
+        pg_name, bd_name, rg_name, rg_order, rg_child, section_type, "//"
+    )
 
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
 
-        children_attrs_keys = list(rg_child.attrs.keys())
+###############################
+def extract_from_DINT_TO_LREAL(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
+
+    return extract_from_block(
+        pg_name, bd_name, rg_name, rg_order, rg_child, section_type, "DINT TO LREAL"
+    )
+
+
+#####################################################
+def extract_from_EN_block(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
+
+    return extract_from_block(
+        pg_name, bd_name, rg_name, rg_order, rg_child, section_type, "EN block"
+    )
+
+
+#################### Compute ADD, SUB, MUL, DIV blocks ####################
+def extract_from_COMP_block(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
+
+    return extract_from_block(
+        pg_name, bd_name, rg_name, rg_order, rg_child, section_type, "COMPUTE block"
+    )
+
+
+###################### Extract from Increment and Decrement Block #######################
+def extract_from_INC_DNC_block(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
+
+    return extract_from_block(
+        pg_name,
+        bd_name,
+        rg_name,
+        rg_order,
+        rg_child,
+        section_type,
+        "INCREMENT DECREMENT block",
+    )
+
+
+###########################################Trigon Math Functions #####################
+def extract_from_TRIGON_block(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
+
+    return extract_from_block(
+        pg_name,
+        bd_name,
+        rg_name,
+        rg_order,
+        rg_child,
+        section_type,
+        "TRIGONOMETRY block",
+    )
+
+
+####################### Miscellaneous blocks #########################
+def extract_from_misc_block(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
+
+    return extract_from_block(
+        pg_name,
+        bd_name,
+        rg_name,
+        rg_order,
+        rg_child,
+        section_type,
+        "Miscellanous blocks",
+    )
+
+
+#########################################
+
+
+def extract_from_FLOW_CONTROL(
+    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
+) -> Dict:
+
+    return extract_from_block(
+        pg_name,
+        bd_name,
+        rg_name,
+        rg_order,
+        rg_child,
+        section_type,
+        "FLOW CONTROL",
+        with_instance_name=True,
+    )
+
+
+###############################
+def extract_in_line_block_data(
+    pg_name, bd_name, rg_name, rg_order, rg_child, section_type="program"
+):
+
+    try:
+
         attribute_dict = {}
 
-        attribute_dict["identifier"] = rg_child.attrs["identifier"]
+        ########################
 
-        ####################
+        comments_list = []
+        data_inputs_list = []
 
-        if rg_child.attrs["xsi:type"] == "DataSink":
+        st_tag = rg_child.find("smcext:ST").find("ST")
 
-            attribute_dict["in_list"] = [
-                rg_child.find("Connection").attrs["refConnectionPointOutId"]
-            ]
+        # Output the result
 
-        if rg_child.attrs["xsi:type"] == "DataSource":
+        for line in st_tag.text.strip().splitlines():
 
-            attribute_dict["out_list"] = [
-                rg_child.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
+            if line.strip():
+
+                if re.search(r"^/s*//.*", line):
 
-        attributes_list.append(attribute_dict)
+                    comments_list.append(line)
+                if re.search(r":=", line):
 
-        # decide the column names accordingly
+                    data_inputs_list.append(line)
+
+        attribute_dict["comments"] = comments_list
+        attribute_dict["data_inputs"] = data_inputs_list
+
+        # #decide the column names accordingly
 
         if section_type == "program":
 
@@ -682,1553 +680,317 @@ def extract_from_Data_Sink_or_Source(
             object_type_key = "OBJECT_TYPE_LIST"
             attribute_key = "ATTRIBUTES"
 
-        sink_source_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
+        block_record = {
+            program_key: pg_name,
+            body_key: bd_name,
+            rung_key: rg_order,
+            rung_name_key: rg_name,
+            object_key: "data_block",
+            object_type_key: rg_child.attrs["xsi:type"],
+            attribute_key: attribute_dict,
         }
 
-        sink_source_dataframe = pd.DataFrame(sink_source_dict)
-
     except Exception as e:
-        logger.error(str(e))
 
-    return sink_source_dataframe
+        logger.error(f"str(e), traceback.format_exc()")
 
+    return block_record
 
-###################################
-def extract_from_Move(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
 
-    logger.info(f"Move Extraction from {pg_name} {bd_name} {rg_order}")
+##############################
 
-    try:
 
-        program_name_list = []
-        body_name_list = []
+DATA_MODEL_COLUMNS = {
+    "program": [
+        "PROGRAM",
+        "BODY",
+        "RUNG",
+        "RUNG_NAME",
+        "OBJECT",
+        "OBJECT_TYPE_LIST",
+        "ATTRIBUTES",
+    ],
+    "function": [
+        "FUNCTION_BLOCK",
+        "BODY_TYPE",
+        "RUNG",
+        "RUNG_NAME",
+        "OBJECT",
+        "OBJECT_TYPE_LIST",
+        "ATTRIBUTES",
+    ],
+}
+
+DATA_SOURCE_COLUMNS = {
+    "program": ["PROGRAM", "BODY", "RUNG", "OBJECT_TYPE_LIST", "ATTRIBUTES"],
+    "function": [
+        "FUNCTION_BLOCK",
+        "BODY_TYPE",
+        "RUNG",
+        "OBJECT_TYPE_LIST",
+        "ATTRIBUTES",
+    ],
+}
+
+
+###   Extractor registry #############
+
+# (xsi:type, typeName) -> extractor; typeName is None for objects other than Blocks
+OBJECT_EXTRACTORS: Dict[Tuple[str, Optional[str]], Callable[..., Dict]] = {}
+
+# Fallback for Blocks whose typeName is not registered, tried in registration order
+BLOCK_PATTERN_EXTRACTORS: List[Tuple[Pattern, Callable[..., Dict]]] = []
+
+
+def register_extractor(
+    extractor: Callable[..., Dict], xsi_type: str, type_names: Iterable[str] = ()
+) -> None:
+    """Register an extractor for an object type, or for the given typeNames of that type.
+
+    The extractor is called as extractor(unit_name, body, rg_name, rg_order, rg_child,
+    section_type=...) and must return one data model row.
+    """
+
+    if not type_names:
+        OBJECT_EXTRACTORS[(xsi_type, None)] = extractor
+
+    for type_name in type_names:
+        OBJECT_EXTRACTORS[(xsi_type, type_name)] = extractor
+
+
+def register_block_pattern(extractor: Callable[..., Dict], pattern: str) -> None:
+
+    BLOCK_PATTERN_EXTRACTORS.append((re.compile(pattern), extractor))
+
+
+def get_extractor(rg_child) -> Optional[Callable[..., Dict]]:
+
+    xsi_type = rg_child.attrs["xsi:type"]
+
+    if xsi_type != "Block":
+        return OBJECT_EXTRACTORS.get((xsi_type, None))
+
+    type_name = rg_child.attrs["typeName"]
+    extractor = OBJECT_EXTRACTORS.get((xsi_type, type_name))
+
+    if extractor is None:
+        for pattern, pattern_extractor in BLOCK_PATTERN_EXTRACTORS:
+            if pattern.search(type_name):
+                return pattern_extractor
+
+    return extractor
+
+
+register_extractor(extract_from_contact, "Contact")
+register_extractor(extract_from_coil, "Coil")
+register_extractor(extract_from_PowerRails, "LeftPowerRail")
+register_extractor(extract_from_PowerRails, "RightPowerRail")
+register_extractor(extract_in_line_block_data, "smcext:InlineST")
+register_extractor(extract_from_Data_Sink_or_Source, "DataSink")
+register_extractor(extract_from_Data_Sink_or_Source, "DataSource")
+
+register_extractor(extract_from_Memcopy, "Block", ["MemCopy"])
+register_extractor(extract_from_Clear, "Block", ["Clear"])
+register_extractor(extract_from_Move, "Block", ["MOVE", "@MOVE"])
+register_extractor(extract_from_Zonecmp, "Block", ["ZoneCmp"])
+register_extractor(extract_from_underscore, "Block", ["-", "+", "*", "**"])
+register_extractor(extract_from_fwdslash, "Block", ["/"])
+register_extractor(
+    extract_from_EN_block, "Block", ["=", "<", ">", "<>", "<=", ">=", "=>"]
+)
+register_extractor(
+    extract_from_COMP_block, "Block", ["ADD", "SUB", "MUL", "DIV", "MOD"]
+)
+register_extractor(extract_from_INC_DNC_block, "Block", ["Inc", "Dec"])
+register_extractor(
+    extract_from_TRIGON_block,
+    "Block",
+    [
+        "SQRT",
+        "LN",
+        "EXP",
+        "EXPT",
+        "LOG",
+        "DegToRad",
+        "RadToDeg",
+        "ABS",
+        "SIN",
+        "ASIN",
+        "COS",
+        "ACOS",
+        "TAN",
+        "ATAN",
+    ],
+)
+register_extractor(extract_from_misc_block, "Block", ["TestABitN"])
+# The Flow control block is reusable for the TON and CTD blocks too
+register_extractor(
+    extract_from_FLOW_CONTROL,
+    "Block",
+    ["FlowControlDataJudge_ZDS", "FlowControlDataWrite_ZFC", "TON", "CTD"],
+)
+register_block_pattern(extract_from_DINT_TO_LREAL, r"_TO_")
+
+
+###   Rung models #############
+
+
+def model_rung(event: LadderEvent, section_type: str) -> Tuple[List[Dict], List[Dict]]:
+    """Extract every object of one Program/FunctionBlock rung through the extractor registry.
+
+    Returns the object rows and the data source/sink comment rows of the rung.
+    """
+
+    object_rows = []
+    data_source_rows = []
+
+    unit_key, body_key = DATA_MODEL_COLUMNS[section_type][:2]
+    unit_name = event.unit_name
+    body = event.body_name if section_type == "program" else event.body_type
+    rg_order = event.rung_order
+    rung = event.element
+
+    rg_name_child_tag = rung.find("CommonObject")
+
+    if rg_name_child_tag:
+
+        rg_name = rg_name_child_tag.text
+
+        # Store the relevant data in separate file, this is to extract the comments for the data source and sinks
+        content_text = rg_name_child_tag.find("Content")
+        if content_text:
+            data_source_rows.append(
+                {
+                    unit_key: unit_name,
+                    body_key: body,
+                    "RUNG": rg_order,
+                    "OBJECT_TYPE_LIST": "Data Source/Sink Comments",
+                    "ATTRIBUTES": content_text.text.strip(),
+                }
+            )
 
-        rung_order_list = []
-        rung_name_list = []
+    else:
+        rg_name = "NONE"
 
-        object_list = []
-        object_type_list = []
-        attributes_list = []
+    for rg_child in rung.find_all(recursive=False):
 
-        connection_in_list = []
-        connection_out_list = []
+        extractor = get_extractor(rg_child)
 
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
+        if extractor is not None:
 
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
+            object_rows.append(
+                extractor(
+                    unit_name,
+                    body,
+                    rg_name,
+                    rg_order,
+                    rg_child,
+                    section_type=section_type,
+                )
+            )
 
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
+        else:
 
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
+            object_rows.append(
+                {
+                    unit_key: unit_name,
+                    body_key: body,
+                    "RUNG": rg_order,
+                    "RUNG_NAME": rg_name,
+                    "OBJECT": rg_child.name,
+                    "OBJECT_TYPE_LIST": rg_child.attrs["xsi:type"],
+                    "ATTRIBUTES": {},
+                }
+            )
 
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
-
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        elif section_type == "function":
-
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        move_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
-
-        move_dataframe = pd.DataFrame(move_dict)
-
-    except Exception as e:
-
-        logger.error(str(e))
-
-    return move_dataframe
-
-
-########################################
-
-
-def extract_from_Zonecmp(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(f"Zonecmp Extraction from {pg_name} {bd_name} {rg_order}")
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
-
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
-
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
-
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        elif section_type == "function":
-
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        zone_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
-
-        zone_dataframe = pd.DataFrame(zone_dict)
-
-    except Exception as e:
-
-        logger.error(str(e))
-
-    return zone_dataframe
-
-
-#############################
-def extract_from_underscore(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(f"Underscore Extraction from {pg_name} {bd_name} {rg_order}")
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
-
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
-
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
-
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        elif section_type == "function":
-
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        under_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
-
-        under_dataframe = pd.DataFrame(under_dict)
-
-    except Exception as e:
-
-        logger.error(str(e))
-
-    return under_dataframe
-
-
-##########################################3
-def extract_from_fwdslash(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(f"// Extraction from {pg_name} {bd_name} {rg_order}")
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
-
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
-
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
-
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        elif section_type == "function":
-
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        fwd_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
-
-        fwd_dataframe = pd.DataFrame(fwd_dict)
-
-    except Exception as e:
-
-        logger.error(str(e))
-
-    return fwd_dataframe
-
-
-###############################
-def extract_from_DINT_TO_LREAL(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(f"DINT TO LREAL Extraction from {pg_name} {bd_name} {rg_order}")
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
-
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
-
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
-
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        elif section_type == "function":
-
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        dint_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
-
-        dint_dataframe = pd.DataFrame(dint_dict)
-
-    except Exception as e:
-
-        logger.error(str(e))
-
-    return dint_dataframe
-
-
-#####################################################
-def extract_from_EN_block(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(f"EN block Extraction from {pg_name} {bd_name} {rg_order}")
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
-
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
-
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
-
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        elif section_type == "function":
-
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        EN_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
-
-        EN_dataframe = pd.DataFrame(EN_dict)
-
-    except Exception as e:
-
-        logger.error(str(e))
-
-    return EN_dataframe
-
-
-#################### Compute ADD, SUB, MUL, DIV blocks ####################
-def extract_from_COMP_block(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(f"COMPUTE block Extraction from {pg_name} {bd_name} {rg_order}")
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
-
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
-
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
-
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        elif section_type == "function":
-
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        COMP_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
-
-        COMP_dataframe = pd.DataFrame(COMP_dict)
-
-    except Exception as e:
-
-        logger.error(str(e))
-
-    return COMP_dataframe
-
-
-###################### Extract from Increment and Decrement Block #######################
-def extract_from_INC_DNC_block(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(
-        f"INCREMENT DECREMENT block Extraction from {pg_name} {bd_name} {rg_order}"
-    )
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
-
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
-
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
-
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        elif section_type == "function":
-
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        inc_dnc_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
-
-        inc_dnc_dataframe = pd.DataFrame(inc_dnc_dict)
-
-    except Exception as e:
-
-        logger.error(str(e))
-
-    return inc_dnc_dataframe
-
-
-###########################################Trigon Math Functions #####################
-def extract_from_TRIGON_block(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(f"TRIGONOMETRY block Extraction from {pg_name} {bd_name} {rg_order}")
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
-
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
-
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
-
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        elif section_type == "function":
-
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        trigon_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
-
-        trigon_dataframe = pd.DataFrame(trigon_dict)
-
-    except Exception as e:
-
-        logger.error(str(e))
-
-    return trigon_dataframe
-
-
-####################### Miscellaneous blocks #########################
-def extract_from_misc_block(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(f"Miscellanous blocks  Extraction from {pg_name} {bd_name} {rg_order}")
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
-
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
-
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
+    return object_rows, data_source_rows
 
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
 
-        for in_var in in_variables:
+def model_program_rung(event: LadderEvent) -> Tuple[List[Dict], List[Dict]]:
 
-            in_var_param_name = in_var.attrs["parameterName"]
+    return model_rung(event, "program")
 
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
 
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
+def model_function_rung(event: LadderEvent) -> Tuple[List[Dict], List[Dict]]:
 
-        out_variables = rg_child.find_all("OutputVariable")
+    return model_rung(event, "function")
 
-        for out_var in out_variables:
 
-            out_var_param_name = out_var.attrs["parameterName"]
+def _append_rows(columns: Dict[str, List], rows: List[Dict]) -> None:
 
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
+    for row in rows:
+        for column, values in columns.items():
+            values.append(row[column])
 
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
 
-        attributes_list.append(attribute_dict)
+class LadderModelWriter:
+    """Collects the rows of the programwise or functionwise data model and writes its CSV files.
 
-        # decide the column names accordingly
+    Events of the other unit type are ignored, so one writer of each kind can be fed
+    from the same walk over the XML.
+    """
 
-        if section_type == "program":
+    unit_tags = {"program": "Program", "function": "FunctionBlock"}
+    rung_models = {"program": model_program_rung, "function": model_function_rung}
 
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
+    def __init__(self, section_type: str, data_model_dir: str, dest_file_name: str):
 
-        elif section_type == "function":
+        self.section_type = section_type
+        self.unit_tag = self.unit_tags[section_type]
+        self.data_model_dir = data_model_dir
+        self.dest_file_name = dest_file_name
 
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
+        self.unit_names = []
 
-        misc_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
+        # Columnar buffers, one list per output column; the DataFrames are only built in write()
+        self.object_columns = {
+            column: [] for column in DATA_MODEL_COLUMNS[section_type]
         }
-
-        misc_dataframe = pd.DataFrame(misc_dict)
-
-    except Exception as e:
-
-        logger.error(str(e))
-
-    return misc_dataframe
-
-
-#########################################
-
-
-def extract_from_FLOW_CONTROL(
-    pg_name: str, bd_name: str, rg_name: str, rg_order: str, rg_child, section_type: str
-) -> pd.DataFrame:
-
-    logger.info(f"FLOW CONTROL Extraction from {pg_name} {bd_name} {rg_order}")
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-
-        object_list.append(rg_child.name)
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        children_attrs_keys = list(rg_child.attrs.keys())
-        attribute_dict = {}
-
-        attribute_dict["typeName"] = rg_child.attrs["typeName"]
-        attribute_dict["instanceName"] = rg_child.attrs["instanceName"]
-
-        ####################
-
-        in_out_variables = rg_child.find_all("InOutVariable")
-
-        for in_out_var in in_out_variables:
-
-            in_out_var_param_name = in_out_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_order"] = [
-                in_out_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_in_list"] = [
-                in_out_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_order"] = [
-                in_out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_out_var_param_name}_inoutVar_out_list"] = [
-                in_out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        in_variables = rg_child.find_all("InputVariable")
-
-        for in_var in in_variables:
-
-            in_var_param_name = in_var.attrs["parameterName"]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_order"] = [
-                in_var.find("ConnectionPointInOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{in_var_param_name}_inVar_in_list"] = [
-                in_var.find("Connection").attrs["refConnectionPointOutId"]
-            ]
-
-        out_variables = rg_child.find_all("OutputVariable")
-
-        for out_var in out_variables:
-
-            out_var_param_name = out_var.attrs["parameterName"]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_order"] = [
-                out_var.find("ConnectionPointOutOrder").attrs["order"]
-            ]
-
-            attribute_dict[f"{out_var_param_name}_outVar_out_list"] = [
-                out_var.find("ConnectionPointOut").attrs["connectionPointOutId"]
-            ]
-
-        attributes_list.append(attribute_dict)
-
-        # decide the column names accordingly
-
-        if section_type == "program":
-
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        elif section_type == "function":
-
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
-
-        FLOW_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
+        self.data_source_columns = {
+            column: [] for column in DATA_SOURCE_COLUMNS[section_type]
         }
 
-        FLOW_dataframe = pd.DataFrame(FLOW_dict)
-
-    except Exception as e:
-        logger.error(str(e))
-
-    return FLOW_dataframe
-
-
-###############################
-def extract_in_line_block_data(
-    pg_name, bd_name, rg_name, rg_order, rg_child, section_type="program"
-):
-
-    try:
-
-        program_name_list = []
-        body_name_list = []
-
-        rung_order_list = []
-        rung_name_list = []
-
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        program_name_list.append(pg_name)
-        body_name_list.append(bd_name)
-        rung_order_list.append(rg_order)
-        rung_name_list.append(rg_name)
-        object_list.append("data_block")
-
-        object_type_list.append(rg_child.attrs["xsi:type"])
-
-        attribute_dict = {}
-
-        ########################
-
-        comments_list = []
-        data_inputs_list = []
-
-        st_tag = rg_child.find("smcext:ST").find("ST")
-
-        # Output the result
-
-        for line in st_tag.text.strip().splitlines():
-
-            if line.strip():
-
-                if re.search(r"^/s*//.*", line):
-
-                    comments_list.append(line)
-                if re.search(r":=", line):
-
-                    data_inputs_list.append(line)
-
-        attribute_dict["comments"] = comments_list
-        attribute_dict["data_inputs"] = data_inputs_list
-        attributes_list.append(attribute_dict)
-
-        # #decide the column names accordingly
-
-        if section_type == "program":
+    def add_event(self, event: LadderEvent) -> None:
 
-            program_key = "PROGRAM"
-            body_key = "BODY"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
+        if event.unit_tag != self.unit_tag:
+            return
 
-        elif section_type == "function":
+        if event.kind == "unit_start":
+            self.unit_names.append(event.unit_name)
 
-            program_key = "FUNCTION_BLOCK"
-            body_key = "BODY_TYPE"
-            rung_key = "RUNG"
-            rung_name_key = "RUNG_NAME"
-            object_key = "OBJECT"
-            object_type_key = "OBJECT_TYPE_LIST"
-            attribute_key = "ATTRIBUTES"
+        elif event.kind == "rung":
 
-        block_dict = {
-            program_key: program_name_list,
-            body_key: body_name_list,
-            rung_key: rung_order_list,
-            rung_name_key: rung_name_list,
-            object_key: object_list,
-            object_type_key: object_type_list,
-            attribute_key: attributes_list,
-        }
+            object_rows, data_source_rows = self.rung_models[self.section_type](event)
 
-        block_dataframe = pd.DataFrame(block_dict)
+            _append_rows(self.object_columns, object_rows)
+            _append_rows(self.data_source_columns, data_source_rows)
 
-    except Exception as e:
+    def write(self) -> List[str]:
 
-        logger.error(f"str(e), traceback.format_exc()")
+        data_source_file_name = f"{self.dest_file_name.split("_")[0]}_datasource_comments_{self.section_type}wise.csv"
 
-    return block_dataframe
+        pd.DataFrame(self.object_columns).to_csv(
+            f"{self.data_model_dir}/{self.dest_file_name}",
+            index=False,
+            encoding="utf-8-sig",
+        )
+        pd.DataFrame(self.data_source_columns).to_csv(
+            f"{self.data_model_dir}/{data_source_file_name}",
+            index=False,
+            encoding="utf-8-sig",
+        )
 
+        # Typed copy of the data model for the rule checker, the CSV stays for compatibility
+        write_data_model_parquet(
+            self.object_columns,
+            self.section_type,
+            f"{self.data_model_dir}/{self.dest_file_name}",
+        )
+        write_operand_index(
+            self.object_columns, f"{self.data_model_dir}/{self.dest_file_name}"
+        )
 
-##############################
+        return self.unit_names
 
 
 def data_modelling_program_wise(
@@ -2239,466 +1001,19 @@ def data_modelling_program_wise(
 
     try:
 
-        program_names = [
-            program["name"] for program in ladder_program.find_all("Program")
-        ]
-
-        dest_file_dict = {
-            "PROGRAM": [],
-            "BODY": [],
-            "RUNG": [],
-            "RUNG_NAME": [],
-            "OBJECT": [],
-            "OBJECT_TYPE_LIST": [],
-            "ATTRIBUTES": [],
-        }
-        dest_file_df = pd.DataFrame(dest_file_dict)
-
-        data_source_df = pd.DataFrame(
-            {
-                "PROGRAM": [],
-                "BODY": [],
-                "RUNG": [],
-                "OBJECT_TYPE_LIST": [],
-                "ATTRIBUTES": [],
-            }
-        )
-
-        program_name_list = []
-        body_name_list = []
-        rung_order_list = []
-        rung_name_list = []
-        object_list = []
-        object_type_list = []
-        attributes_list = []
+        writer = LadderModelWriter("program", data_model_dir, dest_file_name)
 
-        connection_in_list = []
-        connection_out_list = []
-
-        for pg_name in program_names:
-
-            program = ladder_program.find("Program", {"name": pg_name})
-            body_names = [body["name"] for body in program.find_all("BodyContent")]
-
-            for bd_name in body_names:
-                body = program.find("BodyContent", {"name": bd_name})
-                rung_orders = [
-                    rung["evaluationOrder"] for rung in body.find_all("Rung")
-                ]
-
-                for rg_order in rung_orders:
-
-                    rung = body.find("Rung", {"evaluationOrder": rg_order})
-                    rung_children = [child for child in rung.find_all(recursive=False)]
-
-                    rg_name_child_tag = rung.find("CommonObject")
-
-                    if rg_name_child_tag:
-
-                        rg_name = rg_name_child_tag.text
-
-                        # Store the relevant data in separate file, this is to extract the comments for the data source and sinks
-                        content_text = rg_name_child_tag.find("Content")
-                        if content_text:
-                            sub_data_source_df = pd.DataFrame(
-                                {
-                                    "PROGRAM": [pg_name],
-                                    "BODY": [bd_name],
-                                    "RUNG": [rg_order],
-                                    "OBJECT_TYPE_LIST": ["Data Source/Sink Comments"],
-                                    "ATTRIBUTES": [content_text.text.strip()],
-                                }
-                            )
-                            data_source_df = pd.concat(
-                                [data_source_df, sub_data_source_df], axis=0
-                            )
-
-                    else:
-                        rg_name = "NONE"
-
-                    for rg_child in rung_children:
-
-                        if rg_child.attrs["xsi:type"] == "Contact":
-
-                            contact_df = extract_from_contact(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, contact_df], axis=0)
-
-                        elif rg_child.attrs["xsi:type"] == "Coil":
-
-                            coil_df = extract_from_coil(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, coil_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "LeftPowerRail") or (
-                            rg_child.attrs["xsi:type"] == "RightPowerRail"
-                        ):
-
-                            rail_df = extract_from_PowerRails(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, rail_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "MemCopy"
-                        ):
-
-                            mem_df = extract_from_Memcopy(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, mem_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "Clear"
-                        ):
-
-                            clear_df = extract_from_Clear(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, clear_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "MOVE")
-                            or (rg_child.attrs["typeName"] == "@MOVE")
-                        ):
-
-                            move_df = extract_from_Move(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, move_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "ZoneCmp"
-                        ):
-
-                            zone_df = extract_from_Zonecmp(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, zone_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "-")
-                            or (rg_child.attrs["typeName"] == "+")
-                            or (rg_child.attrs["typeName"] == "*")
-                            or (rg_child.attrs["typeName"] == "**")
-                        ):
-
-                            under_df = extract_from_underscore(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, under_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "/"
-                        ):
-
-                            fwd_df = extract_from_fwdslash(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, fwd_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            re.search(r"_TO_", rg_child.attrs["typeName"])
-                        ):
-
-                            #   (rg_child.attrs['typeName']=="DINT_TO_LREAL")):
-
-                            dint_df = extract_from_DINT_TO_LREAL(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, dint_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "=")
-                            or (rg_child.attrs["typeName"] == "<")
-                            or (rg_child.attrs["typeName"] == ">")
-                            or (rg_child.attrs["typeName"] == "<>")
-                            or (rg_child.attrs["typeName"] == "<=")
-                            or (rg_child.attrs["typeName"] == ">=")
-                        ):
-
-                            EN_df = extract_from_EN_block(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, EN_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "ADD")
-                            or (rg_child.attrs["typeName"] == "SUB")
-                            or (rg_child.attrs["typeName"] == "MUL")
-                            or (rg_child.attrs["typeName"] == "DIV")
-                            or (rg_child.attrs["typeName"] == "MOD")
-                        ):
-
-                            COMP_df = extract_from_COMP_block(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, COMP_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "Inc")
-                            or (rg_child.attrs["typeName"] == "Dec")
-                        ):
-
-                            inc_dnc_df = extract_from_INC_DNC_block(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, inc_dnc_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "SQRT")
-                            or (rg_child.attrs["typeName"] == "LN")
-                            or (rg_child.attrs["typeName"] == "EXP")
-                            or (rg_child.attrs["typeName"] == "EXPT")
-                            or (rg_child.attrs["typeName"] == "LOG")
-                            or (rg_child.attrs["typeName"] == "DegToRad")
-                            or (rg_child.attrs["typeName"] == "RadToDeg")
-                            or (rg_child.attrs["typeName"] == "ABS")
-                            or (rg_child.attrs["typeName"] == "SIN")
-                            or (rg_child.attrs["typeName"] == "ASIN")
-                            or (rg_child.attrs["typeName"] == "COS")
-                            or (rg_child.attrs["typeName"] == "ACOS")
-                            or (rg_child.attrs["typeName"] == "TAN")
-                            or (rg_child.attrs["typeName"] == "ATAN")
-                        ):
-
-                            trigon_df = extract_from_TRIGON_block(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, trigon_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "TestABitN"
-                        ):
-
-                            misc_df = extract_from_misc_block(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, misc_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "FlowControlDataJudge_ZDS"
-                        ):
-
-                            flow_df = extract_from_FLOW_CONTROL(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, flow_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "FlowControlDataWrite_ZFC"
-                        ):
-
-                            flow_df = extract_from_FLOW_CONTROL(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, flow_df], axis=0)
-
-                        # The FloW control block is reusable for TOn block too, For now we will reuse Flow Control block sub module only
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "TON"
-                        ):
-
-                            TON_df = extract_from_FLOW_CONTROL(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, TON_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "CTD"
-                        ):
-
-                            CTD_df = extract_from_FLOW_CONTROL(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, CTD_df], axis=0)
-
-                        elif rg_child.attrs["xsi:type"] == "smcext:InlineST":
-
-                            block_df = extract_in_line_block_data(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, block_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "DataSink") or (
-                            rg_child.attrs["xsi:type"] == "DataSource"
-                        ):
-
-                            SS_df = extract_from_Data_Sink_or_Source(
-                                pg_name,
-                                bd_name,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="program",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, SS_df], axis=0)
-
-                        else:
-
-                            program_name_list = []
-                            body_name_list = []
-                            rung_order_list = []
-                            rung_name_list = []
-                            object_list = []
-                            object_type_list = []
-                            attributes_list = []
-
-                            program_name_list.append(pg_name)
-                            body_name_list.append(bd_name)
-
-                            rung_order_list.append(rg_order)
-                            rung_name_list.append(rg_name)
-
-                            object_list.append(rg_child.name)
-                            object_type_list.append(rg_child.attrs["xsi:type"])
-
-                            children_attrs_keys = list(rg_child.attrs.keys())
-
-                            attribute_dict = {}
-
-                            attributes_list.append(attribute_dict)
-
-                            ladder_dict = {
-                                "PROGRAM": program_name_list,
-                                "BODY": body_name_list,
-                                "RUNG": rung_order_list,
-                                "RUNG_NAME": rung_name_list,
-                                "OBJECT": object_list,
-                                "OBJECT_TYPE_LIST": object_type_list,
-                                "ATTRIBUTES": attributes_list,
-                            }
-                            ladder_dataframe = pd.DataFrame(ladder_dict)
-
-                            dest_file_df = pd.concat(
-                                [dest_file_df, ladder_dataframe], axis=0
-                            )
-
-        data_source_file_name = (
-            f"{dest_file_name.split("_")[0]}_datasource_comments_programwise.csv"
-        )
+        for event in iter_ladder_events(ladder_program, ("Program",)):
+            writer.add_event(event)
 
-        dest_file_df.to_csv(
-            f"{data_model_dir}/{dest_file_name}", index=False, encoding="utf-8-sig"
-        )
-        data_source_df.to_csv(
-            f"{data_model_dir}/{data_source_file_name}",
-            index=False,
-            encoding="utf-8-sig",
-        )
+        return writer.write()
 
-        return program_names
     except Exception as e:
         logger.error(str(e))
 
     return []
 
 
-# Execute the program
-
-
 ######################## Extraction from Function Blocks #################################
 
 
@@ -2710,461 +1025,12 @@ def data_modelling_function_wise(
 
     try:
 
-        function_blocks = [
-            function_["name"] for function_ in ladder_program.find_all("FunctionBlock")
-        ]
-
-        dest_file_dict = {
-            "FUNCTION_BLOCK": [],
-            "BODY_TYPE": [],
-            "RUNG": [],
-            "RUNG_NAME": [],
-            "OBJECT": [],
-            "OBJECT_TYPE_LIST": [],
-            "ATTRIBUTES": [],
-        }
-        dest_file_df = pd.DataFrame(dest_file_dict)
-
-        data_source_df = pd.DataFrame(
-            {
-                "FUNCTION_BLOCK": [],
-                "BODY_TYPE": [],
-                "RUNG": [],
-                "OBJECT_TYPE_LIST": [],
-                "ATTRIBUTES": [],
-            }
-        )
-
-        function_block_list = []
-        body_type_list = []
-        rung_order_list = []
-        rung_name_list = []
-        object_list = []
-        object_type_list = []
-        attributes_list = []
-
-        connection_in_list = []
-        connection_out_list = []
-
-        for function_name in function_blocks:
-
-            function_block = ladder_program.find(
-                "FunctionBlock", {"name": function_name}
-            )
-            body_units = function_block.find_all("BodyContent")
-
-            for body_unit in body_units:
-
-                rung_orders = [
-                    rung["evaluationOrder"] for rung in body_unit.find_all("Rung")
-                ]
-                body_type = body_unit.attrs["xsi:type"]
-
-                for rg_order in rung_orders:
-
-                    rung = body_unit.find("Rung", {"evaluationOrder": rg_order})
-                    rung_children = [child for child in rung.find_all(recursive=False)]
-
-                    rg_name_child_tag = rung.find("CommonObject")
-
-                    if rg_name_child_tag:
-
-                        rg_name = rg_name_child_tag.text
-
-                        rg_name = rg_name_child_tag.text
-
-                        # Store the relevant data in separate file, this is to extract the comments for the data source and sinks
-                        content_text = rg_name_child_tag.find("Content")
-                        if content_text:
-                            sub_data_source_df = pd.DataFrame(
-                                {
-                                    "FUNCTION_BLOCK": [function_name],
-                                    "BODY_TYPE": [body_type],
-                                    "RUNG": [rg_order],
-                                    "OBJECT_TYPE_LIST": ["Data Source/Sink Comments"],
-                                    "ATTRIBUTES": [content_text.text.strip()],
-                                }
-                            )
-                            data_source_df = pd.concat(
-                                [data_source_df, sub_data_source_df], axis=0
-                            )
-
-                    else:
-                        rg_name = "NONE"
-
-                    for rg_child in rung_children:
-
-                        if rg_child.attrs["xsi:type"] == "Contact":
-
-                            contact_df = extract_from_contact(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, contact_df], axis=0)
-
-                        elif rg_child.attrs["xsi:type"] == "Coil":
-
-                            coil_df = extract_from_coil(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, coil_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "LeftPowerRail") or (
-                            rg_child.attrs["xsi:type"] == "RightPowerRail"
-                        ):
-
-                            rail_df = extract_from_PowerRails(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, rail_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "MemCopy"
-                        ):
-
-                            mem_df = extract_from_Memcopy(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, mem_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "Clear"
-                        ):
-
-                            clear_df = extract_from_Clear(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, clear_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "MOVE")
-                            or (rg_child.attrs["typeName"] == "@MOVE")
-                        ):
-
-                            move_df = extract_from_Move(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, move_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "ZoneCmp"
-                        ):
-
-                            zone_df = extract_from_Zonecmp(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, zone_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "-")
-                            or (rg_child.attrs["typeName"] == "*")
-                            or (rg_child.attrs["typeName"] == "**")
-                            or (rg_child.attrs["typeName"] == "+")
-                        ):
-
-                            under_df = extract_from_underscore(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, under_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "/"
-                        ):
-
-                            fwd_df = extract_from_fwdslash(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, fwd_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            re.search(r"_TO_", rg_child.attrs["typeName"])
-                        ):
-
-                            dint_df = extract_from_DINT_TO_LREAL(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, dint_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "=")
-                            or (rg_child.attrs["typeName"] == "<")
-                            or (rg_child.attrs["typeName"] == ">")
-                            or (rg_child.attrs["typeName"] == "<>")
-                            or (rg_child.attrs["typeName"] == "<=")
-                            or (rg_child.attrs["typeName"] == "=>")
-                        ):
-
-                            EN_df = extract_from_EN_block(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, EN_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "ADD")
-                            or (rg_child.attrs["typeName"] == "SUB")
-                            or (rg_child.attrs["typeName"] == "MUL")
-                            or (rg_child.attrs["typeName"] == "DIV")
-                            or (rg_child.attrs["typeName"] == "MOD")
-                        ):
-
-                            COMP_df = extract_from_COMP_block(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, COMP_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "Inc")
-                            or (rg_child.attrs["typeName"] == "Dec")
-                        ):
-
-                            inc_dnc_df = extract_from_INC_DNC_block(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, inc_dnc_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            (rg_child.attrs["typeName"] == "SQRT")
-                            or (rg_child.attrs["typeName"] == "LN")
-                            or (rg_child.attrs["typeName"] == "EXP")
-                            or (rg_child.attrs["typeName"] == "EXPT")
-                            or (rg_child.attrs["typeName"] == "LOG")
-                            or (rg_child.attrs["typeName"] == "DegToRad")
-                            or (rg_child.attrs["typeName"] == "RadToDeg")
-                            or (rg_child.attrs["typeName"] == "ABS")
-                            or (rg_child.attrs["typeName"] == "SIN")
-                            or (rg_child.attrs["typeName"] == "ASIN")
-                            or (rg_child.attrs["typeName"] == "COS")
-                            or (rg_child.attrs["typeName"] == "ACOS")
-                            or (rg_child.attrs["typeName"] == "TAN")
-                            or (rg_child.attrs["typeName"] == "ATAN")
-                        ):
-
-                            trigon_df = extract_from_TRIGON_block(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, trigon_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "TestABitN"
-                        ):
-
-                            misc_df = extract_from_misc_block(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, misc_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "FlowControlDataJudge_ZDS"
-                        ):
-
-                            flow_df = extract_from_FLOW_CONTROL(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, flow_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "FlowControlDataWrite_ZFC"
-                        ):
-
-                            flow_df = extract_from_FLOW_CONTROL(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, flow_df], axis=0)
-
-                        # Reusing the Flow Control sub module for tON too.
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "TON"
-                        ):
-
-                            TON_df = extract_from_FLOW_CONTROL(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, TON_df], axis=0)
-
-                        elif rg_child.attrs["xsi:type"] == "smcext:InlineST":
-
-                            block_df = extract_in_line_block_data(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, block_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "Block") and (
-                            rg_child.attrs["typeName"] == "CTD"
-                        ):
-
-                            CTD_df = extract_from_FLOW_CONTROL(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, CTD_df], axis=0)
-
-                        elif (rg_child.attrs["xsi:type"] == "DataSink") or (
-                            rg_child.attrs["xsi:type"] == "DataSource"
-                        ):
-
-                            SS_df = extract_from_Data_Sink_or_Source(
-                                function_name,
-                                body_type,
-                                rg_name,
-                                rg_order,
-                                rg_child,
-                                section_type="function",
-                            )
-                            dest_file_df = pd.concat([dest_file_df, SS_df], axis=0)
-
-                        else:
-
-                            function_block_list = []
-                            body_type_list = []
-                            rung_order_list = []
-                            rung_name_list = []
-                            object_list = []
-                            object_type_list = []
-                            attributes_list = []
-
-                            function_block_list.append(function_name)
-                            body_type_list.append(body_type)
-
-                            rung_order_list.append(rg_order)
-                            rung_name_list.append(rg_name)
-
-                            object_list.append(rg_child.name)
-                            object_type_list.append(rg_child.attrs["xsi:type"])
-
-                            children_attrs_keys = list(rg_child.attrs.keys())
-
-                            attribute_dict = {}
-
-                            attributes_list.append(attribute_dict)
-
-                            ladder_dict = {
-                                "FUNCTION_BLOCK": function_block_list,
-                                "BODY_TYPE": body_type_list,
-                                "RUNG": rung_order_list,
-                                "RUNG_NAME": rung_name_list,
-                                "OBJECT": object_list,
-                                "OBJECT_TYPE_LIST": object_type_list,
-                                "ATTRIBUTES": attributes_list,
-                            }
-                            ladder_dataframe = pd.DataFrame(ladder_dict)
-
-                            dest_file_df = pd.concat(
-                                [dest_file_df, ladder_dataframe], axis=0
-                            )
-
-        # data_source_file_name = dest_file_name.split("_")[0] + '_datasource_comments_functionwise.csv'
-        data_source_file_name = (
-            f"{dest_file_name.split("_")[0]}_datasource_comments_functionwise.csv"
-        )
+        writer = LadderModelWriter("function", data_model_dir, dest_file_name)
 
-        dest_file_df.to_csv(
-            f"{data_model_dir}/{dest_file_name}", index=False, encoding="utf-8-sig"
-        )
-        data_source_df.to_csv(
-            f"{data_model_dir}/{data_source_file_name}",
-            index=False,
-            encoding="utf-8-sig",
-        )
+        for event in iter_ladder_events(ladder_program, ("FunctionBlock",)):
+            writer.add_event(event)
 
-        return function_blocks
+        return writer.write()
 
     except Exception as e:
         logger.error(str(e))
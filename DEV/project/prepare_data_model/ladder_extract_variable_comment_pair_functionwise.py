@@ -4,6 +4,8 @@ import pandas as pd
 import re, json
 from loguru import logger
 import os, sys
+from .ladder_xml_stream import iter_ladder_events
+from ..comment_store import write_comment_store
 
 ##################################################################
 
@@ -26,11 +28,27 @@ def extract_variable_comment_functionwise(
     ladder_program: pd.DataFrame, dest_comment_name: str, data_model_dir: str
 ) -> None:
 
-    try:
+    function_blocks = [
+        (event.unit_name, event.element)
+        for event in iter_ladder_events(
+            ladder_program, ("FunctionBlock",), include_rungs=False
+        )
+        if event.kind == "unit_end"
+    ]
+
+    write_variable_comment_functionwise(
+        function_blocks, dest_comment_name, data_model_dir
+    )
+
+    return None
+
+
+def write_variable_comment_functionwise(
+    function_blocks: List[Tuple[str, Any]], dest_comment_name: str, data_model_dir: str
+) -> None:
+    """Build the functionwise comment JSON from already collected FunctionBlock tags."""
 
-        function_blocks = [
-            function["name"] for function in ladder_program.find_all("FunctionBlock")
-        ]
+    try:
 
         variable_attributes = {}
         attribute_dict = {}
@@ -40,12 +58,10 @@ def extract_variable_comment_functionwise(
         array_variant_2_pattern = "sRB_IN"
 
         ############ This code block looks in to all InputVars rags and extracts the comments##############
-        for fn_name in function_blocks:
+        for fn_name, fn_block in function_blocks:
 
             logger.info(f"Extracting comments from Function {fn_name} and InputVars")
 
-            fn_block = ladder_program.find("FunctionBlock", {"name": fn_name})
-
             in_vars = fn_block.find_all("InputVars")
 
             for in_var in in_vars:
@@ -154,12 +170,10 @@ def extract_variable_comment_functionwise(
                         attribute_dict = {}
 
         ############ Extract from the OutputVars
-        for fn_name in function_blocks:
+        for fn_name, fn_block in function_blocks:
 
             logger.info(f"Extracting comments from Function {fn_name} and OutputVars")
 
-            fn_block = ladder_program.find("FunctionBlock", {"name": fn_name})
-
             out_vars = fn_block.find_all("OutputVars")
 
             for out_var in out_vars:
@@ -261,12 +275,10 @@ def extract_variable_comment_functionwise(
                         attribute_dict = {}
 
         ############ Extract from the Vars
-        for fn_name in function_blocks:
+        for fn_name, fn_block in function_blocks:
 
             logger.info(f"Extracting comments from Function {fn_name} and Vars")
 
-            fn_block = ladder_program.find("FunctionBlock", {"name": fn_name})
-
             _vars = fn_block.find_all("Vars")
 
             for _var in _vars:
@@ -374,6 +386,9 @@ def extract_variable_comment_functionwise(
         with open(dest_comment_name, "w", encoding="utf-8") as json_file:
             json.dump(variable_attributes, json_file, ensure_ascii=False, indent=4)
 
+        # Resolved comment tables for the rule checker, next to the JSON
+        write_comment_store(variable_attributes, dest_comment_name)
+
     except Exception as e:
 
         logger.error(str(e))
@@ -3,14 +3,19 @@ from typing import *
 import pandas as pd
 import re, json
 from pathlib import Path
-from ...main import logger
+from loguru import logger
 from .ladder_extract_variable_comment_pair_functionwise import *
+from .ladder_xml_stream import LadderXmlStream, iter_ladder_events
+from ..comment_store import write_comment_store
 import os, sys
 
 #########################################################
 
 
-def ingest_file(xml_file_path: str):
+def ingest_file(xml_file_path: str, streaming: bool = False):
+
+    if streaming:
+        return LadderXmlStream(xml_file_path)
 
     with open(xml_file_path, "r", encoding="utf-8") as file:
 
@@ -31,23 +36,46 @@ def extract_variable_comment_programwise(
     ladder_program: pd.DataFrame, dest_comment_name: str, data_model_dir: str
 ) -> None:
 
-    try:
+    programs = []
+    global_vars = []
+    global_namespaces = []
+
+    # Only the declarations are needed here, so rungs are skipped while walking
+    for event in iter_ladder_events(ladder_program, ("Program",), include_rungs=False):
+        if event.kind == "unit_end":
+            programs.append((event.unit_name, event.element))
+        elif event.unit_tag == "GlobalVars":
+            global_vars.append(event.element)
+        elif event.unit_tag == "GlobalNamespace":
+            global_namespaces.append(event.element)
+
+    write_variable_comment_programwise(
+        programs, global_vars, global_namespaces, dest_comment_name, data_model_dir
+    )
 
-        program_names = [
-            program["name"] for program in ladder_program.find_all("Program")
-        ]
+    return None
+
+
+def write_variable_comment_programwise(
+    programs: List[Tuple[str, Any]],
+    global_vars: List,
+    global_namespaces: List,
+    dest_comment_name: str,
+    data_model_dir: str,
+) -> None:
+    """Build the programwise comment JSON from already collected Program / global declaration tags."""
+
+    try:
 
         variable_attributes = {}
         attribute_dict = {}
         constant_type = "NONE"
 
         # Look in to each of the program
-        for pg_name in program_names:
+        for pg_name, program in programs:
 
             logger.info(f"Extracting comments from program {pg_name} and ExternalVars")
 
-            program = ladder_program.find("Program", {"name": pg_name})
-
             # Extract all the external variables, loop in all the variables, all extract all its components
             external_vars = program.find_all("ExternalVars")
 
@@ -102,14 +130,12 @@ def extract_variable_comment_programwise(
                     attribute_dict = {}
 
         # Extracting Array variables Program specific in the External Variables Tag
-        for pg_name in program_names:
+        for pg_name, program in programs:
 
             logger.info(
                 f"Extracting comments from program {pg_name} and ExternalVars and Array Types"
             )
 
-            program = ladder_program.find("Program", {"name": pg_name})
-
             _vars = program.find_all("ExternalVars")
             array_rgx_pattern = "ARRAY"
 
@@ -175,14 +201,12 @@ def extract_variable_comment_programwise(
                         attribute_dict = {}
 
         # Extracting Array variables Program specific in the Variables Tag
-        for pg_name in program_names:
+        for pg_name, program in programs:
 
             logger.info(
                 f"Extracting comments from program {pg_name} and Vars and Array Types"
             )
 
-            program = ladder_program.find("Program", {"name": pg_name})
-
             _vars = program.find_all("Vars")
             array_rgx_pattern = "ARRAY"
             array_rgx_pattern_small = "array"
@@ -279,9 +303,6 @@ def extract_variable_comment_programwise(
                         attribute_dict = {}
 
         ########## Going for Global variables
-        global_vars = [
-            global_var for global_var in ladder_program.find_all("GlobalVars")
-        ]
         array_rgx_pattern = "ARRAY"
         array_flag = 0
         attribute_dict = {}
@@ -384,9 +405,6 @@ def extract_variable_comment_programwise(
                     attribute_dict = {}
 
         ###GEtting the values from Global namespaces
-        global_namespaces = [
-            global_name for global_name in ladder_program.find_all("GlobalNamespace")
-        ]
         attribute_dict = {}
 
         for global_namespace in global_namespaces:
@@ -457,6 +475,9 @@ def extract_variable_comment_programwise(
         with open(dest_comment_name, "w", encoding="utf-8") as json_file:
             json.dump(variable_attributes, json_file, ensure_ascii=False, indent=4)
 
+        # Resolved comment tables for the rule checker, next to the JSON
+        write_comment_store(variable_attributes, dest_comment_name)
+
         logger.info("All data extracted")
 
     except Exception as e:
@@ -0,0 +1,275 @@
+from typing import *
+from bs4 import BeautifulSoup
+from lxml import etree
+
+#########################################################
+
+UNIT_TAGS = ("Program", "FunctionBlock")
+GLOBAL_TAGS = ("GlobalVars", "GlobalNamespace")
+
+XSI_TYPE = "{http://www.w3.org/2001/XMLSchema-instance}type"
+
+
+class LadderEvent(NamedTuple):
+    """One step of a walk over the ladder XML.
+
+    kind is one of "unit_start", "rung", "unit_end" or "global". For unit and rung
+    events unit_tag is "Program"/"FunctionBlock"; for global events it is the global
+    tag name ("GlobalVars"/"GlobalNamespace"). element is a BeautifulSoup tag, or
+    None for "unit_start".
+    """
+
+    kind: str
+    unit_tag: str
+    unit_name: Optional[str] = None
+    body_name: Optional[str] = None
+    body_type: Optional[str] = None
+    rung_order: Optional[str] = None
+    element: Any = None
+
+
+def _local_name(elem) -> str:
+
+    return elem.tag.rpartition("}")[2]
+
+
+def _to_soup_tag(elem):
+    """Re-parse a single lxml element as a BeautifulSoup tag so the extract_* helpers can use it."""
+
+    soup = BeautifulSoup(etree.tostring(elem, with_tail=False), "lxml-xml")
+
+    return soup.find(True, recursive=False)
+
+
+def _release(elem) -> None:
+
+    parent = elem.getparent()
+    elem.clear()
+    if parent is not None:
+        parent.remove(elem)
+
+
+###   Streaming ingest #############
+
+
+class LadderXmlStream:
+    """Re-iterable, bounded-memory view of a Sysmac ladder XML export.
+
+    Every iteration re-reads the file with lxml's iterparse. Each Rung is handed
+    out as a small BeautifulSoup tag and dropped from the lxml tree as soon as the
+    consumer moves on, so memory stays bounded by the largest rung plus the
+    variable declarations of the current Program/FunctionBlock.
+
+    The source can also be a binary file object, e.g. a blob that is still being
+    downloaded; it is parsed as it is read and can only be walked once.
+    """
+
+    def __init__(self, xml_source: Union[str, BinaryIO]):
+
+        self.xml_source = xml_source if hasattr(xml_source, "read") else str(xml_source)
+
+    def __iter__(self) -> Iterator[LadderEvent]:
+
+        return self.iter_events()
+
+    def iter_events(self, include_rungs: bool = True) -> Iterator[LadderEvent]:
+
+        unit_tag = None
+        unit_name = None
+        in_body = False
+        body_name = None
+        body_type = None
+        open_globals = 0
+
+        context = etree.iterparse(
+            self.xml_source, events=("start", "end"), huge_tree=True
+        )
+
+        for event, elem in context:
+
+            tag = _local_name(elem)
+
+            if event == "start":
+
+                if unit_tag is None and tag in UNIT_TAGS:
+                    unit_tag = tag
+                    unit_name = elem.get("name")
+                    yield LadderEvent("unit_start", unit_tag, unit_name)
+
+                elif unit_tag is not None and tag == "BodyContent":
+                    in_body = True
+                    body_name = elem.get("name")
+                    body_type = elem.get(XSI_TYPE)
+
+                if tag in GLOBAL_TAGS:
+                    open_globals += 1
+
+                continue
+
+            if tag == "Rung" and in_body:
+
+                if include_rungs:
+                    yield LadderEvent(
+                        "rung",
+                        unit_tag,
+                        unit_name,
+                        body_name,
+                        body_type,
+                        elem.get("evaluationOrder"),
+                        _to_soup_tag(elem),
+                    )
+                _release(elem)
+
+            elif tag == "BodyContent" and unit_tag is not None:
+                in_body = False
+                body_name = None
+                body_type = None
+
+            elif tag in GLOBAL_TAGS:
+                open_globals -= 1
+                yield LadderEvent("global", tag, element=_to_soup_tag(elem))
+                _release(elem)
+
+            elif tag == unit_tag:
+                # Rungs are already gone, so this only carries the variable declarations
+                yield LadderEvent(
+                    "unit_end", unit_tag, unit_name, element=_to_soup_tag(elem)
+                )
+                _release(elem)
+                unit_tag = None
+                unit_name = None
+
+            elif unit_tag is None and open_globals == 0:
+                # Anything finishing outside a Program/FunctionBlock or global block is of no further use
+                elem.clear()
+
+        del context
+
+
+###   Document index #############
+
+
+class LadderIndex:
+    """One-time index of a BeautifulSoup ladder document.
+
+    The document is walked once and every Program/FunctionBlock, BodyContent and Rung
+    is stored under its key, so the modelling and comment extraction loops no longer
+    re-search the tree with find(..., {"name": ...}) for each item. Rungs are keyed by
+    (unit name, body key, evaluationOrder), where the body key is the body name for
+    Programs and the body position for FunctionBlocks (their bodies are unnamed).
+    Lookups keep the first element of a duplicated name/order, like find() did.
+    """
+
+    def __init__(self, ladder_program, unit_tags: Tuple[str, ...] = UNIT_TAGS):
+
+        self.unit_names: Dict[str, List[str]] = {}
+        self.units: Dict[Tuple[str, str], Any] = {}
+        self.bodies: Dict[Tuple[str, str], List[Tuple[str, str, List[Tuple]]]] = {}
+        self.rungs: Dict[str, Dict[Tuple[str, Any, str], Any]] = {}
+        self.globals: Dict[str, List[Any]] = {}
+
+        for unit_tag in unit_tags:
+
+            self.unit_names[unit_tag] = []
+            self.rungs[unit_tag] = {}
+
+            for unit in ladder_program.find_all(unit_tag):
+
+                unit_name = unit["name"]
+                self.unit_names[unit_tag].append(unit_name)
+
+                if (unit_tag, unit_name) not in self.units:
+                    self.units[(unit_tag, unit_name)] = unit
+                    self.bodies[(unit_tag, unit_name)] = self._index_bodies(
+                        unit_tag, unit_name, unit
+                    )
+
+        for global_tag in GLOBAL_TAGS:
+            self.globals[global_tag] = ladder_program.find_all(global_tag)
+
+    def _index_bodies(self, unit_tag: str, unit_name: str, unit) -> List[Tuple]:
+
+        bodies = []
+        named_bodies = {}
+
+        for position, body in enumerate(unit.find_all("BodyContent")):
+
+            body_name = body.attrs.get("name")
+            body_type = body.attrs.get("xsi:type")
+
+            if unit_tag == "Program":
+                # Programs address their bodies by name, so a repeated name maps to the first body
+                body_key = body_name
+                body = named_bodies.setdefault(body_name, body)
+            else:
+                body_key = position
+
+            rung_keys = []
+            for rung in body.find_all("Rung"):
+                rung_key = (unit_name, body_key, rung["evaluationOrder"])
+                rung_keys.append(rung_key)
+                self.rungs[unit_tag].setdefault(rung_key, rung)
+
+            bodies.append((body_name, body_type, rung_keys))
+
+        return bodies
+
+    def rung(self, unit_tag: str, unit_name: str, body_key, evaluation_order: str):
+
+        return self.rungs[unit_tag].get((unit_name, body_key, evaluation_order))
+
+
+def iter_ladder_events(
+    ladder_program, unit_tags: Tuple[str, ...] = UNIT_TAGS, include_rungs: bool = True
+) -> Iterator[LadderEvent]:
+    """Walk a BeautifulSoup document, a LadderIndex or a LadderXmlStream and yield the same events.
+
+    Global events are always yielded; callers filter on kind/unit_tag.
+    """
+
+    if isinstance(ladder_program, LadderXmlStream):
+
+        for event in ladder_program.iter_events(include_rungs=include_rungs):
+            if event.kind == "global" or event.unit_tag in unit_tags:
+                yield event
+
+        return
+
+    if not isinstance(ladder_program, LadderIndex):
+        ladder_program = LadderIndex(ladder_program, unit_tags)
+
+    for unit_tag in unit_tags:
+
+        for unit_name in ladder_program.unit_names.get(unit_tag, []):
+
+            yield LadderEvent("unit_start", unit_tag, unit_name)
+
+            if include_rungs:
+
+                for body_name, body_type, rung_keys in ladder_program.bodies[
+                    (unit_tag, unit_name)
+                ]:
+
+                    for rung_key in rung_keys:
+
+                        yield LadderEvent(
+                            "rung",
+                            unit_tag,
+                            unit_name,
+                            body_name,
+                            body_type,
+                            rung_key[2],
+                            ladder_program.rungs[unit_tag][rung_key],
+                        )
+
+            yield LadderEvent(
+                "unit_end",
+                unit_tag,
+                unit_name,
+                element=ladder_program.units[(unit_tag, unit_name)],
+            )
+
+    for global_tag in GLOBAL_TAGS:
+
+        for global_element in ladder_program.globals[global_tag]:
+            yield LadderEvent("global", global_tag, element=global_element)
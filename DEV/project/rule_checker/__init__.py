@@ -44,6 +44,12 @@ from .rules import (
     rule94,
     rule100,
 )
+from .data_model import DataModel
+from .rule_scheduler import (
+    RuleScheduler,
+    merge_rule_results,
+    rule_checker_workers,
+)
 
 __all__ = [
     "rule1",
@@ -90,4 +96,8 @@ __all__ = [
     "rule93",
     "rule94",
     "rule100",
+    "DataModel",
+    "RuleScheduler",
+    "merge_rule_results",
+    "rule_checker_workers",
 ]
@@ -0,0 +1,459 @@
+import functools
+import json
+import os
+import threading
+import uuid
+from contextvars import ContextVar
+from typing import *
+
+import pandas as pd
+import polars as pl
+
+from ..data_model_format import (
+    data_model_parquet_path,
+    load_data_model,
+    load_data_model_pl,
+    scan_data_model,
+)
+from ..comment_store import CommentStore, comment_store_path, load_comment_store
+from ..operand_index import (
+    OperandIndex,
+    build_operand_index,
+    load_operand_index,
+    operand_index_path,
+)
+from .data_model_queries import (
+    block_rungs,
+    block_rungs_in_rows,
+    collect_partition_order,
+)
+from .datasource_comments import DatasourceCommentIndex
+from .partition import DataModelPartition
+
+#########################################################################################
+#
+# Shared per-request data model
+#
+# broadcast_rule_checker used to hand every rule the same seven file paths, and every
+# rule parsed the programwise/functionwise CSVs, the comment JSONs and the input image
+# again. A DataModel parses each file at most once per request and is passed to the
+# rule wrappers in rules.py.
+#
+# The execute_rule_* functions still take paths. While a rule wrapper runs, its
+# DataModel is active and the cached_* readers below serve the request's files from
+# it; any other path (or no active DataModel) is read from disk as before, so rules
+# can keep being called with plain paths.
+#
+# cached_partition / cached_partition_pl give the program -> section -> rung view of a
+# data model CSV (see partition.py), built once per request like the frames.
+# cached_operand_index gives its operand cross reference (see operand_index.py).
+# cached_comment_store gives the resolved comments of a comment JSON (see
+# comment_store.py), read from the file data modelling saved next to it.
+# cached_datasource_comment_index gives the per-program comment index of a datasource
+# comments CSV (see datasource_comments.py).
+# cached_scan_data_model gives the typed data model (promoted attribute columns) as a
+# LazyFrame for the vectorized queries in data_model_queries.py.
+#
+# Rules that walk rows parse ATTRIBUTES per row (parse_attributes), so they do not need
+# the typed data model: cached_data_model_rows, cached_partition_pl and
+# cached_block_rungs read the CSV rows of a data model without its Parquet file
+# instead of converting it. cached_partition always slices the CSV rows: rule 1 parses
+# a handful of them, so decoding every row up front cost more than it saved.
+#
+#########################################################################################
+
+_active_data_model: ContextVar[Optional["DataModel"]] = ContextVar(
+    "active_data_model", default=None
+)
+
+
+def _path_key(path) -> str:
+
+    return os.path.abspath(str(path))
+
+
+class DataModel:
+    """Read-only, lazily loaded data model files of one rule checker request.
+
+    DataFrames are parsed once and every caller gets its own pandas copy (polars frames
+    are immutable). Comment dictionaries are shared and must not be modified.
+    """
+
+    def __init__(
+        self,
+        program_file_csv,
+        program_comment_file,
+        datasource_program_file,
+        function_file_csv,
+        function_comment_file,
+        datasource_function_file,
+        input_image=None,
+    ):
+
+        self.program_file_csv = program_file_csv
+        self.program_comment_file = program_comment_file
+        self.datasource_program_file = datasource_program_file
+        self.function_file_csv = function_file_csv
+        self.function_comment_file = function_comment_file
+        self.datasource_function_file = datasource_function_file
+        self.input_image = input_image
+
+        # Identifies the request across processes, see rule_scheduler
+        self.request_id = uuid.uuid4().hex
+
+        self._owned_paths = {
+            _path_key(path) for path in self.paths() if path is not None
+        }
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict:
+
+        # Only the paths travel to worker processes; each process parses the files itself
+        state = self.__dict__.copy()
+        state["_cache"] = {}
+        del state["_lock"]
+
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def paths(self) -> Tuple:
+        """The file paths in the argument order of the rule wrappers."""
+
+        return (
+            self.program_file_csv,
+            self.program_comment_file,
+            self.datasource_program_file,
+            self.function_file_csv,
+            self.function_comment_file,
+            self.datasource_function_file,
+            self.input_image,
+        )
+
+    def owns(self, path) -> bool:
+
+        return path is not None and _path_key(path) in self._owned_paths
+
+    def _load(self, kind: str, path, loader: Callable):
+
+        key = (kind, _path_key(path))
+
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = loader(path)
+
+            return self._cache[key]
+
+    def read_csv(self, path) -> pd.DataFrame:
+
+        return self._load("pandas", path, pd.read_csv).copy()
+
+    def read_csv_pl(self, path) -> pl.DataFrame:
+
+        return self._load("polars", path, pl.read_csv)
+
+    def load_data_model(self, path) -> pd.DataFrame:
+
+        return self._load("data_model", path, load_data_model).copy()
+
+    def load_data_model_pl(self, path) -> pl.DataFrame:
+
+        return self._load("data_model_pl", path, load_data_model_pl)
+
+    def load_json(self, path) -> Dict:
+
+        return self._load("json", path, _read_json)
+
+    def typed_data_model(self, path) -> pl.DataFrame:
+
+        # Reordered from the frame load_data_model_pl already read
+        frame = self.load_data_model_pl(path)
+
+        return self._load("typed", path, lambda _: collect_partition_order(frame.lazy()))
+
+    def data_model_rows(self, path) -> pl.DataFrame:
+
+        if os.path.exists(data_model_parquet_path(path)):
+            return self.load_data_model_pl(path)
+
+        return self.read_csv_pl(path)
+
+    def partition(self, path) -> DataModelPartition:
+
+        # Built on the shared CSV frame; the partition hands out copies
+        frame = self._load("pandas", path, pd.read_csv)
+
+        return self._load("partition", path, lambda _: DataModelPartition(frame))
+
+    def partition_pl(self, path) -> DataModelPartition:
+
+        frame = self.data_model_rows(path)
+
+        return self._load("partition_pl", path, lambda _: DataModelPartition(frame))
+
+    def operand_index(self, path) -> OperandIndex:
+
+        if os.path.exists(operand_index_path(path)):
+            return self._load("operand_index", path, load_operand_index)
+
+        # Data model without a written index: build it from the shared frame, once
+        frame = self.load_data_model_pl(path)
+
+        return self._load(
+            "operand_index", path, lambda _: build_operand_index(frame, path)
+        )
+
+    def comment_store(self, path) -> CommentStore:
+
+        if os.path.exists(comment_store_path(path)):
+            return self._load("comment_store", path, load_comment_store)
+
+        # Older data model: build it from the shared JSON
+        comment_data = self.load_json(path)
+
+        return self._load(
+            "comment_store", path, lambda _: CommentStore.from_comment_data(comment_data)
+        )
+
+    def datasource_comment_index(self, path) -> DatasourceCommentIndex:
+
+        frame = self._load("pandas", path, pd.read_csv)
+
+        return self._load(
+            "datasource_comment_index", path, lambda _: DatasourceCommentIndex(frame)
+        )
+
+    def convert_legacy_files(self) -> None:
+        """Convert the data model CSVs written without their typed Parquet file or
+        operand index.
+
+        Both are saved next to the CSV (see scan_data_model, load_operand_index), so
+        running this once before the rules fan out to worker processes spares every
+        worker the conversion.
+        """
+
+        for path in (self.program_file_csv, self.function_file_csv):
+            if path is None or not os.path.exists(path):
+                continue
+            if not os.path.exists(data_model_parquet_path(path)):
+                scan_data_model(path)
+            if not os.path.exists(operand_index_path(path)):
+                load_operand_index(path)
+
+    ###   Named accessors #############
+
+    @property
+    def program_df(self) -> pd.DataFrame:
+        return self.read_csv(self.program_file_csv)
+
+    @property
+    def function_df(self) -> pd.DataFrame:
+        return self.read_csv(self.function_file_csv)
+
+    @property
+    def program_attributes_df(self) -> pd.DataFrame:
+        return self.load_data_model(self.program_file_csv)
+
+    @property
+    def function_attributes_df(self) -> pd.DataFrame:
+        return self.load_data_model(self.function_file_csv)
+
+    @property
+    def program_comments(self) -> Dict:
+        return self.load_json(self.program_comment_file)
+
+    @property
+    def function_comments(self) -> Dict:
+        return self.load_json(self.function_comment_file)
+
+    @property
+    def datasource_program_df(self) -> pd.DataFrame:
+        return self.read_csv(self.datasource_program_file)
+
+    @property
+    def datasource_function_df(self) -> pd.DataFrame:
+        return self.read_csv(self.datasource_function_file)
+
+
+def _read_json(path) -> Dict:
+
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _active_for(path) -> Optional[DataModel]:
+
+    data_model = _active_data_model.get()
+    if data_model is not None and data_model.owns(path):
+        return data_model
+
+    return None
+
+
+###   Drop-in readers for the rule modules #############
+
+
+def cached_read_csv(path) -> pd.DataFrame:
+    """pd.read_csv(path), served from the active DataModel when it owns the file."""
+
+    data_model = _active_for(path)
+
+    return data_model.read_csv(path) if data_model else pd.read_csv(path)
+
+
+def cached_read_csv_pl(path) -> pl.DataFrame:
+    """pl.read_csv(path), served from the active DataModel when it owns the file."""
+
+    data_model = _active_for(path)
+
+    return data_model.read_csv_pl(path) if data_model else pl.read_csv(path)
+
+
+def cached_load_data_model(path) -> pd.DataFrame:
+
+    data_model = _active_for(path)
+
+    return data_model.load_data_model(path) if data_model else load_data_model(path)
+
+
+def cached_load_data_model_pl(path) -> pl.DataFrame:
+
+    data_model = _active_for(path)
+
+    return (
+        data_model.load_data_model_pl(path) if data_model else load_data_model_pl(path)
+    )
+
+
+def cached_data_model_rows(path) -> pl.DataFrame:
+    """Typed data model of a data model CSV when its Parquet file exists, the CSV rows
+    (pl.read_csv) otherwise; ATTRIBUTES is read with parse_attributes either way."""
+
+    data_model = _active_for(path)
+
+    if data_model:
+        return data_model.data_model_rows(path)
+
+    if os.path.exists(data_model_parquet_path(path)):
+        return load_data_model_pl(path)
+
+    return pl.read_csv(path)
+
+
+def cached_load_json(path) -> Dict:
+    """json.load of a comment file, served from the active DataModel when it owns the file."""
+
+    data_model = _active_for(path)
+
+    return data_model.load_json(path) if data_model else _read_json(path)
+
+
+def cached_scan_data_model(path) -> pl.LazyFrame:
+    """Typed data model of a data model CSV as a LazyFrame (see scan_data_model), in
+    the row order of its partition."""
+
+    data_model = _active_for(path)
+
+    typed_df = (
+        data_model.typed_data_model(path)
+        if data_model
+        else collect_partition_order(scan_data_model(path))
+    )
+
+    return typed_df.lazy()
+
+
+def cached_partition(path) -> DataModelPartition:
+    """Program/section/rung partition of a data model CSV (pandas slices of the CSV
+    rows)."""
+
+    data_model = _active_for(path)
+
+    return (
+        data_model.partition(path)
+        if data_model
+        else DataModelPartition(pd.read_csv(path))
+    )
+
+
+def cached_partition_pl(path) -> DataModelPartition:
+    """Program/section/rung partition of a data model CSV (polars slices)."""
+
+    data_model = _active_for(path)
+
+    return (
+        data_model.partition_pl(path)
+        if data_model
+        else DataModelPartition(cached_data_model_rows(path))
+    )
+
+
+def cached_block_rungs(
+    path, type_name: str, sections: Optional[Iterable[str]] = None
+) -> Dict[Any, List[Tuple[Any, Any]]]:
+    """program -> (section, rung) of the objects with the typeName (see block_rungs).
+
+    A data model without its Parquet file is searched row by row instead of being
+    converted to the typed data model for it.
+    """
+
+    if os.path.exists(data_model_parquet_path(path)):
+        return block_rungs(cached_scan_data_model(path), type_name, sections)
+
+    return block_rungs_in_rows(cached_data_model_rows(path), type_name, sections)
+
+
+def cached_operand_index(path) -> OperandIndex:
+    """Operand cross reference of a data model CSV, written by the data modeller."""
+
+    data_model = _active_for(path)
+
+    return data_model.operand_index(path) if data_model else load_operand_index(path)
+
+
+def cached_comment_store(path) -> CommentStore:
+    """Comment store of a comment JSON, for get_the_comment_from_program/_function."""
+
+    data_model = _active_for(path)
+
+    return data_model.comment_store(path) if data_model else load_comment_store(path)
+
+
+def cached_datasource_comment_index(path) -> DatasourceCommentIndex:
+    """Comment index of a datasource comments CSV, for get_comments_from_datasource."""
+
+    data_model = _active_for(path)
+
+    return (
+        data_model.datasource_comment_index(path)
+        if data_model
+        else DatasourceCommentIndex(pd.read_csv(path))
+    )
+
+
+def uses_data_model(rule_wrapper: Callable) -> Callable:
+    """Let a rules.py wrapper take a DataModel, or the seven paths as before.
+
+    The wrapped function is still called with the paths; its DataModel is active for
+    the duration of the call so the cached_* readers hit the shared cache.
+    """
+
+    @functools.wraps(rule_wrapper)
+    def wrapper(*args, **kwargs):
+
+        if len(args) == 1 and not kwargs and isinstance(args[0], DataModel):
+            data_model = args[0]
+        else:
+            data_model = DataModel(*args, **kwargs)
+
+        token = _active_data_model.set(data_model)
+        try:
+            return rule_wrapper(*data_model.paths())
+        finally:
+            _active_data_model.reset(token)
+
+    return wrapper
@@ -0,0 +1,156 @@
+from typing import *
+
+import polars as pl
+
+from ..data_model_format import parse_attributes
+
+#########################################################################################
+#
+# Vectorized queries on the typed data model
+#
+# Rules that look for one kind of block walked every row of a program's sections and
+# parsed its ATTRIBUTES to compare the typeName:
+#
+#   for row in ladder_body.iter_rows():
+#       attrs = parse_attributes(row[-1])
+#       if attrs.get("typeName") == "FlowControlDataJudge_ZDS": ...
+#
+# The typed data model (cached_scan_data_model) already has the common attributes as
+# columns (TYPE_NAME, OPERAND, ...), so these filters are polars expressions evaluated
+# once over the whole frame. cached_scan_data_model hands out the frame in the row
+# order of DataModelPartition (programs, sections and rungs by first appearance,
+# partition_order below), so results come back in the order the row loops saw.
+#
+# A data model CSV without its Parquet file has no typed columns; block_rungs_in_rows
+# keeps the row loop for it and parses only the rows mentioning the typeName.
+#
+#########################################################################################
+
+UNIT_COLUMNS = ("PROGRAM", "FUNCTION_BLOCK")
+SECTION_COLUMNS = ("BODY", "BODY_TYPE")
+
+
+def _first_column(names: List[str], candidates: Tuple[str, ...]) -> str:
+
+    for column in candidates:
+        if column in names:
+            return column
+
+    raise KeyError(f"None of the columns {candidates} in data model frame")
+
+
+def key_columns(data_model: pl.LazyFrame) -> Tuple[str, str]:
+    """(unit column, section column) of a programwise or functionwise frame."""
+
+    names = data_model.collect_schema().names()
+
+    return _first_column(names, UNIT_COLUMNS), _first_column(names, SECTION_COLUMNS)
+
+
+def section_key(section_column: str) -> pl.Expr:
+    """Lower-cased section name, "" for a missing one (as DataModelPartition keys it)."""
+
+    return pl.col(section_column).cast(pl.Utf8).str.to_lowercase().fill_null("")
+
+
+def in_sections(section_column: str, sections: Iterable[str]) -> pl.Expr:
+    """Row is in one of the sections (case-insensitive)."""
+
+    return section_key(section_column).is_in([section.lower() for section in sections])
+
+
+def partition_order(data_model: pl.LazyFrame) -> pl.LazyFrame:
+    """Rows grouped by program, section and rung in order of first appearance, like
+    DataModelPartition; ROW holds the position in the data model."""
+
+    unit_column, section_column = key_columns(data_model)
+    section = section_key(section_column)
+
+    return (
+        data_model.with_row_index("ROW")
+        .with_columns(
+            pl.col("ROW").min().over(unit_column).alias("_UNIT_ROW"),
+            pl.col("ROW").min().over(unit_column, section).alias("_SECTION_ROW"),
+            pl.col("ROW").min().over(unit_column, section, "RUNG").alias("_RUNG_ROW"),
+        )
+        .sort("_UNIT_ROW", "_SECTION_ROW", "_RUNG_ROW", "ROW")
+        .drop("_UNIT_ROW", "_SECTION_ROW", "_RUNG_ROW")
+    )
+
+
+def collect_partition_order(data_model: pl.LazyFrame) -> pl.DataFrame:
+    """partition_order(data_model).collect(), without moving the rows of a frame that
+    is already grouped (the usual case; the nested attribute columns are costly to
+    reorder)."""
+
+    unit_column, section_column = key_columns(data_model)
+
+    order = (
+        partition_order(data_model.select(unit_column, section_column, "RUNG"))
+        .select("ROW")
+        .collect()
+        .to_series()
+    )
+    frame = data_model.with_row_index("ROW").collect()
+
+    if order.is_sorted():
+        return frame
+
+    return frame[order]
+
+
+def block_rungs(
+    data_model: pl.LazyFrame,
+    type_name: str,
+    sections: Optional[Iterable[str]] = None,
+) -> Dict[Any, List[Tuple[Any, Any]]]:
+    """program -> (section, rung) of every object with the typeName, in row order.
+
+    data_model is a frame from cached_scan_data_model. sections limits the search to
+    those sections (case-insensitive); the section is returned as written in the
+    data model.
+    """
+
+    unit_column, section_column = key_columns(data_model)
+
+    blocks = data_model.filter(pl.col("TYPE_NAME") == type_name)
+    if sections is not None:
+        blocks = blocks.filter(in_sections(section_column, sections))
+
+    found = {}
+    for unit, section, rung in (
+        blocks.select(unit_column, section_column, "RUNG").collect().iter_rows()
+    ):
+        found.setdefault(unit, []).append((section, rung))
+
+    return found
+
+
+def block_rungs_in_rows(
+    data_model: pl.DataFrame,
+    type_name: str,
+    sections: Optional[Iterable[str]] = None,
+) -> Dict[Any, List[Tuple[Any, Any]]]:
+    """block_rungs on the rows of a data model CSV (ATTRIBUTES as written).
+
+    Only the rows whose ATTRIBUTES text contains the typeName are parsed.
+    """
+
+    unit_column, section_column = key_columns(data_model.lazy())
+
+    candidates = partition_order(data_model.lazy()).filter(
+        pl.col("ATTRIBUTES").str.contains(type_name, literal=True)
+    )
+    if sections is not None:
+        candidates = candidates.filter(in_sections(section_column, sections))
+
+    found = {}
+    for unit, section, rung, attributes in (
+        candidates.select(unit_column, section_column, "RUNG", "ATTRIBUTES")
+        .collect()
+        .iter_rows()
+    ):
+        if parse_attributes(attributes).get("typeName") == type_name:
+            found.setdefault(unit, []).append((section, rung))
+
+    return found
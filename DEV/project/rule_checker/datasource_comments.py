@@ -0,0 +1,164 @@
+import re
+import threading
+from collections import defaultdict
+from typing import *
+
+import pandas as pd
+
+#########################################################################################
+#
+# Data source / sink comment lookup
+#
+# get_comments_from_datasource filtered the *_datasource_comments_*.csv frame by
+# program and ran re.search(variable, comment) over every comment of the program on
+# every call; rule 25 asks for each block input/output of each rung.
+#
+# DatasourceCommentIndex groups the comments by program once per frame. A variable
+# without regex metacharacters (the usual case) is matched as a substring through a
+# trigram index of the program's comments; anything else is still matched as a regex,
+# like before. Answers are memoized per (program, variable).
+#
+# The request's DataModel builds the index of each datasource comments file once
+# (cached_datasource_comment_index in data_model.py) and the rules pass it in place of
+# the frame; a frame passed as before is indexed for that call only.
+#
+#########################################################################################
+
+UNIT_COLUMNS = ("PROGRAM", "FUNCTION_BLOCK")
+REGEX_METACHARACTERS = set(".^$*+?{}[]\\|()")
+GRAM_SIZE = 3
+
+
+def _grams(text: str) -> Set[str]:
+
+    return {text[i : i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class _ProgramComments:
+
+    def __init__(self, comments: List):
+
+        self.comments = comments
+        # A blank comment (NaN) made re.search raise for the whole program; kept so
+        # the rules see the same error
+        self.has_non_text = any(not isinstance(comment, str) for comment in comments)
+        self._postings: Optional[Dict[str, List[int]]] = None
+
+    def postings(self) -> Dict[str, List[int]]:
+        """trigram -> positions of the comments containing it."""
+
+        if self._postings is None:
+            postings = defaultdict(list)
+            for position, comment in enumerate(self.comments):
+                for gram in _grams(comment):
+                    postings[gram].append(position)
+            self._postings = postings
+
+        return self._postings
+
+    def containing(self, text: str) -> List[str]:
+
+        if len(text) < GRAM_SIZE:
+            return [comment for comment in self.comments if text in comment]
+
+        postings = self.postings()
+        candidates = None
+        for gram in sorted(_grams(text), key=lambda gram: len(postings.get(gram, ()))):
+            positions = postings.get(gram)
+            if not positions:
+                return []
+            candidates = (
+                set(positions) if candidates is None else candidates & set(positions)
+            )
+
+        return [
+            self.comments[position]
+            for position in sorted(candidates)
+            if text in self.comments[position]
+        ]
+
+    def matching(self, pattern: str) -> List[str]:
+
+        compiled = re.compile(pattern)
+
+        return [comment for comment in self.comments if compiled.search(comment)]
+
+
+class DatasourceCommentIndex:
+    """Comments of a datasource comments frame by program, with memoized lookups."""
+
+    def __init__(self, frame: pd.DataFrame):
+
+        self.unit_column = next(
+            (column for column in UNIT_COLUMNS if column in frame.columns), None
+        )
+
+        by_program = defaultdict(list)
+        if self.unit_column is not None:
+            for program, comment in zip(frame[self.unit_column], frame["ATTRIBUTES"]):
+                by_program[program].append(comment)
+
+        self._programs = {
+            program: _ProgramComments(comments)
+            for program, comments in by_program.items()
+        }
+        self._results: Dict[Tuple, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def comments(self, variable, program_name, program_key: str) -> List[str]:
+        """Comments of program_name in which variable occurs (as a regex, like
+        re.search). program_key is the unit column the caller expects."""
+
+        if program_key != self.unit_column:
+            raise KeyError(program_key)
+
+        pattern = f"{variable}"
+        key = (program_name, pattern)
+
+        with self._lock:
+            cached = self._results.get(key)
+        if cached is not None:
+            return list(cached)
+
+        program = self._programs.get(program_name)
+        is_text = REGEX_METACHARACTERS.isdisjoint(pattern)
+        if program is None:
+            found = []
+        elif program.has_non_text:
+            # re.search compiled the pattern before failing on the comment
+            if not is_text:
+                re.compile(pattern)
+            raise TypeError("expected string or bytes-like object")
+        elif is_text:
+            found = program.containing(pattern)
+        else:
+            found = program.matching(pattern)
+
+        with self._lock:
+            self._results[key] = found
+
+        return list(found)
+
+
+def get_comments_from_datasource(
+    input_variable: str,
+    program_name: str,
+    program_type: str,
+    body_name: str,
+    rung_order: int,
+    df: Union[pd.DataFrame, DatasourceCommentIndex],
+) -> List:
+    """Datasource comments of program_name mentioning input_variable (any section/rung).
+
+    df is the datasource comments frame or its DatasourceCommentIndex.
+    """
+
+    if "program" in program_type:
+        program_key = "PROGRAM"
+
+    if program_type == "FUNCTION":
+        program_key = "FUNCTION_BLOCK"
+
+    index = df if isinstance(df, DatasourceCommentIndex) else DatasourceCommentIndex(df)
+
+    return index.comments(input_variable, program_name, program_key)
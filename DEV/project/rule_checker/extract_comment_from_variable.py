@@ -2,322 +2,44 @@ from bs4 import BeautifulSoup
 from typing import *
 import pandas as pd
 import re, json
-import itertools
 
-#########################################################################################
-
-
-def get_the_comment_from_program(
-    variable: str, program: str = "", input_comment_data: Dict = None
-) -> List:
-
-    data = input_comment_data
-    special_case_flag = 0
-
-    # scan for special case first
-    try:
-        variable_prefix = variable.split(".")[0]
-        variable_suffix = variable.split(".")[1]
-        special_case_flag = 1
-
-    except:
-        special_case_flag = 0
-
-    if special_case_flag:
-
-        return_list = []
-
-        ################################Extract the Prefix First ####################################################
-        # Scan Programwise
-        comment_prefix = data.get(f"{variable_prefix}@PG@{program}", "NONE")
-
-        if comment_prefix != "NONE":
-
-            variable_english_comment = comment_prefix.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_prefix.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_prefix.get("documentation", "NONE")
-
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
-
-                return_list.append(comment_prefix)
-
-        # Scan for Global Variables
-        comment_prefix = data.get(f"{variable_prefix}@GBVAR", "NONE")
-        if comment_prefix != "NONE":
-
-            variable_english_comment = comment_prefix.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_prefix.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_prefix.get("documentation", "NONE")
+from ..comment_store import CommentStore, comment_store_for
 
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
-
-                return_list.append(comment_prefix)
-
-        ####################################Extract the Suffix then ##################################################3
-        # Scan Programwise
-        comment_suffix = data.get(f"{variable_suffix}@PG@{program}", "NONE")
-
-        if comment_suffix != "NONE":
-
-            variable_english_comment = comment_suffix.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_suffix.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_suffix.get("documentation", "NONE")
-
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
-
-                return_list.append(comment_suffix)
-
-        # Scan for Global Variables
-        comment_suffix = data.get(f"{variable_suffix}@GBNMSP", "NONE")
-        if comment_suffix != "NONE":
-
-            member_english_comment = comment_suffix.get(
-                "member_english_comment", "NONE"
-            )
-            member_japanese_comment = comment_suffix.get(
-                "member_japanese_comment", "NONE"
-            )
-            member_documentation = comment_suffix.get("member_documentation", "NONE")
-
-            if (
-                (member_english_comment != "NONE")
-                or (member_japanese_comment != "NONE")
-                or (member_documentation != "NONE")
-            ):
-
-                return_list.append(comment_suffix)
-
-        # Flatten the list
-        return_list = [list(ele.values()) for ele in return_list]
-        return_list = list(itertools.chain(*return_list))
-
-        return return_list
-
-    else:
-
-        # Scan Programwise
-        comment_program = data.get(f"{variable}@PG@{program}", "NONE")
-
-        if comment_program != "NONE":
+#########################################################################################
+#
+# input_comment_data is the CommentStore of the comment file (cached_comment_store) or
+# the comment JSON dict itself. The store resolves "<variable>@PG@<program>" /
+# "<variable>@FN@<function>" and the global "@GBVAR" / "@GBNMSP" declarations, see
+# comment_store.py.
+#
+#########################################################################################
 
-            variable_english_comment = comment_program.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_program.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_program.get("documentation", "NONE")
 
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
+def _comment_store(input_comment_data: Union[CommentStore, Dict]) -> CommentStore:
 
-                comment_list = list(comment_program.values())
-                return comment_list
+    if isinstance(input_comment_data, CommentStore):
+        return input_comment_data
 
-        # Scan for Global Variables
-        comment_program = data.get(f"{variable}@GBVAR", "NONE")
-        if comment_program != "NONE":
+    return comment_store_for(input_comment_data)
 
-            variable_english_comment = comment_program.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_program.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_program.get("documentation", "NONE")
 
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
+def get_the_comment_from_program(
+    variable: str, program: str = "", input_comment_data: Dict = None
+) -> List:
+    """Comments of variable in program or the globals; for "prefix.member" the
+    comments of the prefix and of the member (a list, possibly empty). None when
+    the variable has no comment."""
 
-                comment_list = list(comment_program.values())
-                return comment_list
+    return _comment_store(input_comment_data).comments(variable, program, "PG")
 
 
 ########################################################
 def get_the_comment_from_function(
     variable: str, function: str = "", input_comment_data: Dict = None
 ) -> List:
+    """get_the_comment_from_program for the variables of a function block."""
 
-    data = input_comment_data
-    special_case_flag = 0
-
-    # scan for special case first
-    try:
-        variable_prefix = variable.split(".")[0]
-        variable_suffix = variable.split(".")[1]
-        special_case_flag = 1
-
-    except:
-        special_case_flag = 0
-
-    if special_case_flag:
-
-        return_list = []
-
-        ################################Extract the Prefix First ####################################################
-        # Scan Programwise
-        comment_prefix = data.get(f"{variable_prefix}@FN@{function}", "NONE")
-
-        if comment_prefix != "NONE":
-
-            variable_english_comment = comment_prefix.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_prefix.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_prefix.get("documentation", "NONE")
-
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
-
-                return_list.append(comment_prefix)
-
-        # Scan for Global Variables
-        comment_prefix = data.get(f"{variable_prefix}@GBVAR", "NONE")
-        if comment_prefix != "NONE":
-
-            variable_english_comment = comment_prefix.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_prefix.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_prefix.get("documentation", "NONE")
-
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
-
-                return_list.append(comment_prefix)
-
-        ####################################Extract the Suffix then ##################################################3
-        # Scan Programwise
-        comment_suffix = data.get(f"{variable_suffix}@FN@{function}", "NONE")
-
-        if comment_suffix != "NONE":
-
-            variable_english_comment = comment_suffix.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_suffix.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_suffix.get("documentation", "NONE")
-
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
-
-                return_list.append(comment_suffix)
-
-        # Scan for Global Variables
-        comment_suffix = data.get(f"{variable_suffix}@GBNMSP", "NONE")
-        if comment_suffix != "NONE":
-
-            variable_english_comment = comment_suffix.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_suffix.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_suffix.get("documentation", "NONE")
-
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
-
-                return_list.append(comment_suffix)
-
-        # Flatten the list
-        return_list = [list(ele.values()) for ele in return_list]
-        return_list = list(itertools.chain(*return_list))
-
-        return return_list
-
-    else:
-
-        # Scan Programwise
-        comment_program = data.get(f"{variable}@FN@{function}", "NONE")
-
-        if comment_program != "NONE":
-
-            variable_english_comment = comment_program.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_program.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_program.get("documentation", "NONE")
-
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
-
-                comment_list = list(comment_program.values())
-                return comment_list
-
-        # Scan for Global Variables
-        comment_program = data.get(f"{variable}@GBVAR", "NONE")
-        if comment_program != "NONE":
-
-            variable_english_comment = comment_program.get(
-                "variable_english_comment", "NONE"
-            )
-            variable_japanese_comment = comment_program.get(
-                "variable_japanese_comment", "NONE"
-            )
-            documentation = comment_program.get("documentation", "NONE")
-
-            if (
-                (variable_english_comment != "NONE")
-                or (variable_japanese_comment != "NONE")
-                or (documentation != "NONE")
-            ):
-
-                comment_list = list(comment_program.values())
-                return comment_list
+    return _comment_store(input_comment_data).comments(variable, function, "FN")
 
 
 ############################################
@@ -1,30 +1,57 @@
-from typing import List
+from typing import List, Iterable
+from functools import lru_cache
 import re
 from .japanese_half_full_width_mapping import full_to_half_conversion
 
+# Full-width katakana -> half-width, applied by str.translate instead of a per-character join
+FULL_TO_HALF_TABLE = str.maketrans(full_to_half_conversion)
+
+# Comments repeat across variables and rules; patterns are a few hundred literals per rule set
+NORMALIZED_TEXT_CACHE_SIZE = 65536
+COMPILED_PATTERN_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=NORMALIZED_TEXT_CACHE_SIZE)
+def to_half_width(text:str)->str:
+    return text.translate(FULL_TO_HALF_TABLE)
+
+
+@lru_cache(maxsize=COMPILED_PATTERN_CACHE_SIZE)
+def compile_check_pattern(check_pattern:str)->re.Pattern:
+    return re.compile(to_half_width(check_pattern))
+
+
+def _normalized_comments(comment_list:list)->List[str]:
+    return [to_half_width(comment) for comment in comment_list if comment and isinstance(comment, str)]
+
+
 def regex_pattern_check(check_pattern:str, comment_list:list)->bool:
-    
-    ret_flag=0
 
     if check_pattern and isinstance(check_pattern, str) and comment_list and isinstance(comment_list, list):
-        check_pattern = ''.join(full_to_half_conversion.get(char, char) for char in check_pattern)
+        compiled_pattern = compile_check_pattern(check_pattern)
         for comment in comment_list:
-            if comment and isinstance(comment, str):
-                half_width_convert_comment = ''.join(full_to_half_conversion.get(char, char) for char in comment)
-
-                if re.search(check_pattern, half_width_convert_comment):
-                    ret_flag=1
-                    break
-                
-        if ret_flag==0:
-            return False
-        else:
-            
-            return True
-    else:
-        return False
-    
-    
+            if comment and isinstance(comment, str) and compiled_pattern.search(to_half_width(comment)):
+                return True
+
+    return False
+
+
+def regex_pattern_check_patterns(check_patterns:Iterable[str], comment_list:list)->List[bool]:
+    """regex_pattern_check of each pattern against one comment list, normalizing the comments once."""
+
+    check_patterns = list(check_patterns)
+    if not (comment_list and isinstance(comment_list, list)):
+        return [False] * len(check_patterns)
+
+    comments = _normalized_comments(comment_list)
+
+    return [
+        bool(check_pattern) and isinstance(check_pattern, str)
+        and any(compile_check_pattern(check_pattern).search(comment) for comment in comments)
+        for check_pattern in check_patterns
+    ]
+
+
 def clean_rung_number(val):
     if isinstance(val, list):
         if -1 in val:
@@ -0,0 +1,210 @@
+from typing import *
+
+import pandas as pd
+import polars as pl
+
+#########################################################################################
+#
+# Program / section / rung partition of a data model frame
+#
+# Most rules start with
+#
+#   for program in df["PROGRAM"].unique():
+#       program_df = df[df["PROGRAM"] == program]
+#       section_df = program_df[program_df["BODY"].str.lower() == "autorun"]
+#       for _, rung_df in section_df.groupby("RUNG"): ...
+#
+# which scans the whole frame once per program (and again per section and rung). The
+# data modeller writes the rows of a program, of a section and of a rung next to each
+# other, so DataModelPartition records the row range of every program, section
+# (lower-cased) and rung once and hands out slices with the rows of the boolean mask in
+# their original order. A frame that is not grouped that way is reordered first
+# (programs, sections and rungs by first appearance).
+#
+# Works with pandas and polars frames; pandas slices are copies, like the DataModel
+# accessors, polars slices are zero copy.
+#
+#########################################################################################
+
+UNIT_COLUMNS = ("PROGRAM", "FUNCTION_BLOCK")
+SECTION_COLUMNS = ("BODY", "BODY_TYPE")
+RUNG_COLUMN = "RUNG"
+
+Frame = Union[pd.DataFrame, pl.DataFrame]
+
+
+def _section_key(section) -> str:
+
+    return section.lower() if isinstance(section, str) else ""
+
+
+def _first_column(frame: Frame, candidates: Tuple[str, ...]) -> str:
+
+    for column in candidates:
+        if column in frame.columns:
+            return column
+
+    raise KeyError(f"None of the columns {candidates} in data model frame")
+
+
+class DataModelPartition:
+    """Row ranges of the programs, sections and rungs of one data model frame."""
+
+    def __init__(
+        self,
+        frame: Frame,
+        unit_column: Optional[str] = None,
+        section_column: Optional[str] = None,
+    ):
+
+        self.unit_column = unit_column or _first_column(frame, UNIT_COLUMNS)
+        self.section_column = section_column or _first_column(frame, SECTION_COLUMNS)
+        self.is_polars = isinstance(frame, pl.DataFrame)
+
+        units = list(frame[self.unit_column])
+        sections = [_section_key(section) for section in frame[self.section_column]]
+        rungs = list(frame[RUNG_COLUMN])
+
+        order = self._grouped_order(units, sections, rungs)
+        if order is not None:
+            frame = frame[order] if self.is_polars else frame.iloc[order]
+            units = [units[i] for i in order]
+            sections = [sections[i] for i in order]
+            rungs = [rungs[i] for i in order]
+
+        self.frame = frame
+
+        # program -> (start, stop); program -> section -> (start, stop);
+        # (program, section) -> rung -> (start, stop). Dicts keep the row order.
+        self._programs: Dict[Any, Tuple[int, int]] = {}
+        self._sections: Dict[Any, Dict[str, Tuple[int, int]]] = {}
+        self._rungs: Dict[Tuple[Any, str], Dict[Any, Tuple[int, int]]] = {}
+
+        for row, (unit, section, rung) in enumerate(zip(units, sections, rungs)):
+            start = self._programs.get(unit, (row, row))[0]
+            self._programs[unit] = (start, row + 1)
+
+            unit_sections = self._sections.setdefault(unit, {})
+            start = unit_sections.get(section, (row, row))[0]
+            unit_sections[section] = (start, row + 1)
+
+            section_rungs = self._rungs.setdefault((unit, section), {})
+            start = section_rungs.get(rung, (row, row))[0]
+            section_rungs[rung] = (start, row + 1)
+
+    @staticmethod
+    def _grouped_order(units: List, sections: List, rungs: List) -> Optional[List[int]]:
+        """Stable row order grouping program/section/rung, or None if already grouped."""
+
+        seen = (set(), set(), set())
+        previous = None
+        for key in zip(units, sections, rungs):
+            for level in range(3):
+                prefix = key[: level + 1]
+                if previous is None or prefix != previous[: level + 1]:
+                    if prefix in seen[level]:
+                        break
+                    seen[level].add(prefix)
+            else:
+                previous = key
+                continue
+            break
+        else:
+            return None
+
+        rank = {}
+        for key in zip(units, sections, rungs):
+            for prefix in (key[:1], key[:2], key):
+                rank.setdefault(prefix, len(rank))
+
+        return sorted(
+            range(len(units)),
+            key=lambda i: (
+                rank[(units[i],)],
+                rank[(units[i], sections[i])],
+                rank[(units[i], sections[i], rungs[i])],
+            ),
+        )
+
+    def _slice(self, start: int, stop: int) -> Frame:
+
+        if self.is_polars:
+            return self.frame.slice(start, stop - start)
+
+        return self.frame.iloc[start:stop].copy()
+
+    def _ranges(
+        self, program, sections: Optional[Iterable[str]], rung
+    ) -> List[Tuple[int, int]]:
+
+        if program not in self._programs:
+            return []
+
+        if sections is None and rung is None:
+            return [self._programs[program]]
+
+        wanted = None if sections is None else {_section_key(s) for s in sections}
+        ranges = []
+        for section, section_range in self._sections[program].items():
+            if wanted is not None and section not in wanted:
+                continue
+            if rung is None:
+                ranges.append(section_range)
+            elif rung in self._rungs[(program, section)]:
+                ranges.append(self._rungs[(program, section)][rung])
+
+        return ranges
+
+    def programs(self) -> List:
+        """Programs (function blocks) in row order."""
+
+        return list(self._programs)
+
+    def sections(self, program) -> List[str]:
+        """Lower-cased section names of a program in row order."""
+
+        return list(self._sections.get(program, {}))
+
+    def has_section(self, program, *sections: str) -> bool:
+        """True when the program has any of the sections (case-insensitive)."""
+
+        program_sections = self._sections.get(program, {})
+
+        return any(_section_key(section) in program_sections for section in sections)
+
+    def rungs(self, program, section: str) -> List:
+        """Rung numbers of a section in row order."""
+
+        return list(self._rungs.get((program, _section_key(section)), {}))
+
+    def select(
+        self, program, sections: Optional[Iterable[str]] = None, rung=None
+    ) -> Frame:
+        """Rows of a program, optionally limited to sections and/or one rung number.
+
+        Same rows as masking the frame on PROGRAM, lower-cased BODY in sections and
+        RUNG; also in the same order when the frame is grouped as the modeller writes it.
+        """
+
+        ranges = self._ranges(program, sections, rung)
+
+        if not ranges:
+            return self.frame.clear() if self.is_polars else self.frame.iloc[0:0].copy()
+        if len(ranges) == 1:
+            return self._slice(*ranges[0])
+        if self.is_polars:
+            return pl.concat([self._slice(*row_range) for row_range in ranges])
+
+        return pd.concat([self.frame.iloc[start:stop] for start, stop in ranges]).copy()
+
+    def iter_rungs(
+        self, program, sections: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, Any, Frame]]:
+        """(section, rung number, rung rows) of a program, in row order."""
+
+        wanted = None if sections is None else {_section_key(s) for s in sections}
+        for section in self._sections.get(program, {}):
+            if wanted is not None and section not in wanted:
+                continue
+            for rung, rung_range in self._rungs[(program, section)].items():
+                yield section, rung, self._slice(*rung_range)
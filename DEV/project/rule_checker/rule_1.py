@@ -3,13 +3,16 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_partition
+from .partition import DataModelPartition
+from ..data_model_format import parse_attributes
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
     get_the_comment_from_program,
 )
-from .rule_1_self_holding import check_self_holding
+from .self_holding import check_self_holding
 from .ladder_utils import regex_pattern_check, clean_rung_number
 
 # ============================ Rule 1: Definitions, Content, and Configuration Details ============================
@@ -38,7 +41,7 @@ ng_content = {
 
 
 def extract_cycle_start_end_programwise(
-    program_df: pd.DataFrame,
+    program_partition: DataModelPartition,
     section_name: str,
     section_name_with_star: str,
     program_comment_data: dict,
@@ -54,18 +57,11 @@ def extract_cycle_start_end_programwise(
     cycle_start_end_exist_rung_number_dict = {}
     cycle_start_end_operand_dict = {}
 
-    if not program_df.empty:
-        unique_program_values = program_df["PROGRAM"].unique()
+    if program_partition.programs():
 
-        for program_name in unique_program_values:
+        for program_name in program_partition.programs():
 
-            unique_section_df = program_df[program_df["PROGRAM"] == program_name]
-            unique_section_values = unique_section_df["BODY"].str.lower().unique()
-
-            if (
-                "autorun" in unique_section_values
-                or "autorun★" in unique_section_values
-            ):
+            if program_partition.has_section(program_name, "autorun", "autorun★"):
 
                 logger.info(
                     f"Rule 1 Execute Program {program_name} and section {section_name}, {section_name}"
@@ -76,74 +72,66 @@ def extract_cycle_start_end_programwise(
                 cycle_start_operand = ""
                 cycle_end_operand = ""
 
-                curr_program_df = program_df[
-                    program_df["PROGRAM"] == program_name
-                ].copy()
-
-                if not curr_program_df.empty:
-
-                    autorun_section_df = curr_program_df[
-                        curr_program_df["BODY"]
-                        .str.lower()
-                        .isin([section_name, section_name_with_star])
-                    ]
+                autorun_section_df = program_partition.select(
+                    program_name, [section_name, section_name_with_star]
+                )
 
-                    if not autorun_section_df.empty:
-                        try:
-                            coil_df = autorun_section_df[
-                                autorun_section_df["OBJECT_TYPE_LIST"].str.lower()
-                                == "coil"
-                            ]
+                if not autorun_section_df.empty:
+                    try:
+                        coil_df = autorun_section_df[
+                            autorun_section_df["OBJECT_TYPE_LIST"].str.lower()
+                            == "coil"
+                        ]
 
-                            if not coil_df.empty:
-                                for _, coil_row in coil_df.iterrows():
-                                    attr = ast.literal_eval(coil_row["ATTRIBUTES"])
-                                    coil_operand = attr.get("operand")
+                        if not coil_df.empty:
+                            for _, coil_row in coil_df.iterrows():
+                                attr = parse_attributes(coil_row["ATTRIBUTES"])
+                                coil_operand = attr.get("operand")
 
-                                    if isinstance(coil_operand, str) and coil_operand:
-                                        coil_comment = get_the_comment_from_program(
-                                            coil_operand,
-                                            program_name,
-                                            program_comment_data,
-                                        )
+                                if isinstance(coil_operand, str) and coil_operand:
+                                    coil_comment = get_the_comment_from_program(
+                                        coil_operand,
+                                        program_name,
+                                        program_comment_data,
+                                    )
+                                    if (
+                                        isinstance(coil_comment, list)
+                                        and coil_comment
+                                    ):
                                         if (
-                                            isinstance(coil_comment, list)
-                                            and coil_comment
+                                            regex_pattern_check(
+                                                cycle_comment, coil_comment
+                                            )
+                                            and regex_pattern_check(
+                                                start_comment, coil_comment
+                                            )
+                                            and cycle_start_exist_rung_number == -1
                                         ):
-                                            if (
-                                                regex_pattern_check(
-                                                    cycle_comment, coil_comment
-                                                )
-                                                and regex_pattern_check(
-                                                    start_comment, coil_comment
-                                                )
-                                                and cycle_start_exist_rung_number == -1
-                                            ):
-                                                cycle_start_exist_rung_number = (
-                                                    coil_row["RUNG"]
-                                                )
-                                                cycle_start_operand = attr.get(
-                                                    "operand"
-                                                )
-                                            if (
-                                                regex_pattern_check(
-                                                    cycle_comment, coil_comment
-                                                )
-                                                and regex_pattern_check(
-                                                    end_comment, coil_comment
-                                                )
-                                                and cycle_end_exist_rung_number == -1
-                                            ):
-                                                cycle_end_exist_rung_number = coil_row[
-                                                    "RUNG"
-                                                ]
-                                                cycle_end_operand = attr.get("operand")
-
-                        except:
-                            logger.info(
-                                f"Rule 1 Error processing program {program_name} for cycle start/end extraction."
-                            )
-                            continue
+                                            cycle_start_exist_rung_number = (
+                                                coil_row["RUNG"]
+                                            )
+                                            cycle_start_operand = attr.get(
+                                                "operand"
+                                            )
+                                        if (
+                                            regex_pattern_check(
+                                                cycle_comment, coil_comment
+                                            )
+                                            and regex_pattern_check(
+                                                end_comment, coil_comment
+                                            )
+                                            and cycle_end_exist_rung_number == -1
+                                        ):
+                                            cycle_end_exist_rung_number = coil_row[
+                                                "RUNG"
+                                            ]
+                                            cycle_end_operand = attr.get("operand")
+
+                    except:
+                        logger.info(
+                            f"Rule 1 Error processing program {program_name} for cycle start/end extraction."
+                        )
+                        continue
 
                 cycle_start_end_exist_rung_number_dict[program_name] = [
                     cycle_start_exist_rung_number,
@@ -177,7 +165,7 @@ def check_detail_2_programwise(
         ]
         if not contact_coil_df.empty:
             for _, contact_coil_row in contact_coil_df.iterrows():
-                attr = ast.literal_eval(contact_coil_row["ATTRIBUTES"])
+                attr = parse_attributes(contact_coil_row["ATTRIBUTES"])
                 if contact_coil_row["OBJECT_TYPE_LIST"].lower() in ["contact", "coil"]:
                     if attr["operand"] == outcoil_operand:
                         return "NG", 2
@@ -213,7 +201,7 @@ def check_detail_3_programwise(
 
             if not contact_next_rung_to_end_rung_df.empty:
                 for _, contact_row in contact_next_rung_to_end_rung_df.iterrows():
-                    attr = ast.literal_eval(contact_row["ATTRIBUTES"])
+                    attr = parse_attributes(contact_row["ATTRIBUTES"])
                     if attr.get("operand") == outcoil_operand:
                         return "OK", 3
 
@@ -241,7 +229,7 @@ def check_detail_3_programwise(
         is_rule_3_1_valid = False
         if not contact_coil_current_df.empty:
             for _, current_contact_row in contact_coil_current_df.iterrows():
-                attr = ast.literal_eval(current_contact_row["ATTRIBUTES"])
+                attr = parse_attributes(current_contact_row["ATTRIBUTES"])
                 if (
                     re.search(re.escape(outcoil_operand), attr["operand"])
                     and current_contact_row["OBJECT_TYPE_LIST"].lower() == "coil"
@@ -329,7 +317,7 @@ def check_detail_4_programwise(
 
         if not contact_coil_current_df.empty:
             for _, current_contact_row in contact_coil_current_df.iterrows():
-                attr = ast.literal_eval(current_contact_row["ATTRIBUTES"])
+                attr = parse_attributes(current_contact_row["ATTRIBUTES"])
                 if outcoil_operand and isinstance(outcoil_operand, str):
                     if (
                         re.search(re.escape(outcoil_operand), attr["operand"])
@@ -389,7 +377,7 @@ def check_detail_4_programwise(
         if not contact_coil_next_rung_to_end_rung_df.empty:
             for _, contact_coil_row in contact_coil_next_rung_to_end_rung_df.iterrows():
 
-                attr = ast.literal_eval(contact_coil_row["ATTRIBUTES"])
+                attr = parse_attributes(contact_coil_row["ATTRIBUTES"])
                 if (
                     contact_coil_row["OBJECT_TYPE_LIST"].lower() == "contact"
                     and outcoil_operand == attr["operand"]
@@ -403,7 +391,7 @@ def check_detail_4_programwise(
                     and contact_coil_row["OBJECT_TYPE_LIST"].lower() == "coil"
                     and contact_coil_row["RUNG"] == current_rung_number
                 ):
-                    attr = ast.literal_eval(contact_coil_row["ATTRIBUTES"])
+                    attr = parse_attributes(contact_coil_row["ATTRIBUTES"])
 
                     coil_operand = attr.get("operand")
                     self_holding_operand = check_self_holding(
@@ -436,7 +424,7 @@ def check_detail_4_programwise(
 
         # Parse ATTRIBUTES field and extract operand
         if not current_rung_first_contact_df.empty:
-            first_contact_attr = ast.literal_eval(
+            first_contact_attr = parse_attributes(
                 current_rung_first_contact_df["ATTRIBUTES"]
             )
             first_contact_operand = first_contact_attr.get("operand", "NONE")
@@ -457,7 +445,7 @@ def check_detail_4_programwise(
 
 
 def check_detail_cycle_start_end_info_programwise(
-    program_df: pd.DataFrame,
+    program_partition: DataModelPartition,
     program_name: str,
     program_comment_data: str,
     section_name: str,
@@ -468,13 +456,9 @@ def check_detail_cycle_start_end_info_programwise(
     logger.info("Rule 1 Running Rule 1 checks on all check details.")
 
     try:
-        curr_program_df = program_df[program_df["PROGRAM"] == program_name].copy()
-
-        autorun_section_df = curr_program_df[
-            curr_program_df["BODY"]
-            .str.lower()
-            .isin([section_name, section_name_with_star])
-        ]
+        autorun_section_df = program_partition.select(
+            program_name, [section_name, section_name_with_star]
+        )
 
         if not autorun_section_df.empty:
             coil_df = autorun_section_df[
@@ -487,7 +471,7 @@ def check_detail_cycle_start_end_info_programwise(
 
         if not coil_df.empty:
             for _, coil_row in coil_df.iterrows():
-                attr = ast.literal_eval(coil_row["ATTRIBUTES"])
+                attr = parse_attributes(coil_row["ATTRIBUTES"])
 
                 logger.info(
                     f"Rule 1 Executing all check detail for coil {attr['operand']} of program {program_name} and section {section_name}"
@@ -574,7 +558,7 @@ def check_detail_cycle_start_end_info_programwise(
 
 
 def extract_cycle_start_end_functionwise(
-    function_df: pd.DataFrame,
+    function_partition: DataModelPartition,
     section_name: str,
     section_name_with_star: str,
     function_comment_data: dict,
@@ -590,18 +574,11 @@ def extract_cycle_start_end_functionwise(
     cycle_start_end_exist_rung_number_dict = {}
     cycle_start_end_operand_dict = {}
 
-    if not function_df.empty:
-        unique_function_values = function_df["FUNCTION_BLOCK"].unique()
-
-        for function_name in unique_function_values:
+    if function_partition.programs():
 
-            unique_section_df = function_df[function_df["FUNCTION_BLOCK"] == function]
-            unique_section_values = unique_section_df["BODY_TYPE"].str.lower().unique()
+        for function_name in function_partition.programs():
 
-            if (
-                "autorun" in unique_section_values
-                or "autorun★" in unique_section_values
-            ):
+            if function_partition.has_section(function_name, "autorun", "autorun★"):
 
                 logger.info(
                     f"Rule 1 Execute function {function_name} and section {section_name}, section {section_name}"
@@ -612,66 +589,58 @@ def extract_cycle_start_end_functionwise(
                 cycle_start_operand = ""
                 cycle_end_operand = ""
 
-                curr_function_df = function_df[
-                    function_df["FUNCTION_BLOCK"] == function_name
-                ].copy()
-
-                if not curr_function_df.empty:
-
-                    autorun_section_df = curr_function_df[
-                        curr_function_df["BODY_TYPE"]
-                        .str.lower()
-                        .isin([section_name, section_name_with_star])
-                    ]
+                autorun_section_df = function_partition.select(
+                    function_name, [section_name, section_name_with_star]
+                )
 
-                    if not autorun_section_df.empty:
-                        try:
-                            coil_df = autorun_section_df[
-                                autorun_section_df["OBJECT_TYPE_LIST"].str.lower()
-                                == "coil"
-                            ]
+                if not autorun_section_df.empty:
+                    try:
+                        coil_df = autorun_section_df[
+                            autorun_section_df["OBJECT_TYPE_LIST"].str.lower()
+                            == "coil"
+                        ]
 
-                            if not coil_df.empty:
-                                for _, coil_row in coil_df.iterrows():
-                                    attr = ast.literal_eval(coil_row["ATTRIBUTES"])
-                                    coil_comment = get_the_comment_from_function(
-                                        attr["operand"],
-                                        function_name,
-                                        function_comment_data,
-                                    )
-                                    if isinstance(coil_comment, list) and coil_comment:
-                                        if (
-                                            regex_pattern_check(
-                                                cycle_comment, coil_comment
-                                            )
-                                            and regex_pattern_check(
-                                                start_comment, coil_comment
-                                            )
-                                            and cycle_start_exist_rung_number == -1
-                                        ):
-                                            cycle_start_exist_rung_number = coil_row[
-                                                "RUNG"
-                                            ]
-                                            cycle_start_operand = attr.get("operand")
-                                        if (
-                                            regex_pattern_check(
-                                                cycle_comment, coil_comment
-                                            )
-                                            and regex_pattern_check(
-                                                end_comment, coil_comment
-                                            )
-                                            and cycle_end_exist_rung_number == -1
-                                        ):
-                                            cycle_end_exist_rung_number = coil_row[
-                                                "RUNG"
-                                            ]
-                                            cycle_end_operand = attr.get("operand")
+                        if not coil_df.empty:
+                            for _, coil_row in coil_df.iterrows():
+                                attr = parse_attributes(coil_row["ATTRIBUTES"])
+                                coil_comment = get_the_comment_from_function(
+                                    attr["operand"],
+                                    function_name,
+                                    function_comment_data,
+                                )
+                                if isinstance(coil_comment, list) and coil_comment:
+                                    if (
+                                        regex_pattern_check(
+                                            cycle_comment, coil_comment
+                                        )
+                                        and regex_pattern_check(
+                                            start_comment, coil_comment
+                                        )
+                                        and cycle_start_exist_rung_number == -1
+                                    ):
+                                        cycle_start_exist_rung_number = coil_row[
+                                            "RUNG"
+                                        ]
+                                        cycle_start_operand = attr.get("operand")
+                                    if (
+                                        regex_pattern_check(
+                                            cycle_comment, coil_comment
+                                        )
+                                        and regex_pattern_check(
+                                            end_comment, coil_comment
+                                        )
+                                        and cycle_end_exist_rung_number == -1
+                                    ):
+                                        cycle_end_exist_rung_number = coil_row[
+                                            "RUNG"
+                                        ]
+                                        cycle_end_operand = attr.get("operand")
 
-                        except:
-                            logger.info(
-                                f"Rule 1 Error processing function {function_name} for cycle start/end extraction."
-                            )
-                            continue
+                    except:
+                        logger.info(
+                            f"Rule 1 Error processing function {function_name} for cycle start/end extraction."
+                        )
+                        continue
 
                 cycle_start_end_exist_rung_number_dict[function_name] = [
                     cycle_start_exist_rung_number,
@@ -705,7 +674,7 @@ def check_detail_2_functionwise(
         ]
         if not contact_coil_df.empty:
             for _, contact_coil_row in contact_coil_df.iterrows():
-                attr = ast.literal_eval(contact_coil_row["ATTRIBUTES"])
+                attr = parse_attributes(contact_coil_row["ATTRIBUTES"])
                 if contact_coil_row["OBJECT_TYPE_LIST"].lower() in ["contact", "coil"]:
                     if attr["operand"] == outcoil_operand:
                         return "NG", 2
@@ -741,7 +710,7 @@ def check_detail_3_functionwise(
 
             if not contact_next_rung_to_end_rung_df.empty:
                 for _, contact_row in contact_next_rung_to_end_rung_df.iterrows():
-                    attr = ast.literal_eval(contact_row["ATTRIBUTES"])
+                    attr = parse_attributes(contact_row["ATTRIBUTES"])
                     if attr.get("operand") == outcoil_operand:
                         return "OK", 3
 
@@ -769,7 +738,7 @@ def check_detail_3_functionwise(
         is_rule_3_1_valid = False
         if not contact_coil_current_df.empty:
             for _, current_contact_row in contact_coil_current_df.iterrows():
-                attr = ast.literal_eval(current_contact_row["ATTRIBUTES"])
+                attr = parse_attributes(current_contact_row["ATTRIBUTES"])
                 if (
                     re.search(re.escape(outcoil_operand), attr["operand"])
                     and current_contact_row["OBJECT_TYPE_LIST"].lower() == "coil"
@@ -857,7 +826,7 @@ def check_detail_4_functionwise(
 
         if not contact_coil_current_df.empty:
             for _, current_contact_row in contact_coil_current_df.iterrows():
-                attr = ast.literal_eval(current_contact_row["ATTRIBUTES"])
+                attr = parse_attributes(current_contact_row["ATTRIBUTES"])
                 if outcoil_operand and isinstance(outcoil_operand, str):
                     if (
                         re.search(re.escape(outcoil_operand), attr["operand"])
@@ -917,7 +886,7 @@ def check_detail_4_functionwise(
         if not contact_coil_next_rung_to_end_rung_df.empty:
             for _, contact_coil_row in contact_coil_next_rung_to_end_rung_df.iterrows():
 
-                attr = ast.literal_eval(contact_coil_row["ATTRIBUTES"])
+                attr = parse_attributes(contact_coil_row["ATTRIBUTES"])
                 if (
                     contact_coil_row["OBJECT_TYPE_LIST"].lower() == "contact"
                     and outcoil_operand == attr["operand"]
@@ -931,7 +900,7 @@ def check_detail_4_functionwise(
                     and contact_coil_row["OBJECT_TYPE_LIST"].lower() == "coil"
                     and contact_coil_row["RUNG"] == current_rung_number
                 ):
-                    attr = ast.literal_eval(contact_coil_row["ATTRIBUTES"])
+                    attr = parse_attributes(contact_coil_row["ATTRIBUTES"])
 
                     coil_operand = attr.get("operand")
                     self_holding_operand = check_self_holding(
@@ -964,7 +933,7 @@ def check_detail_4_functionwise(
 
         # Parse ATTRIBUTES field and extract operand
         if not current_rung_first_contact_df.empty:
-            first_contact_attr = ast.literal_eval(
+            first_contact_attr = parse_attributes(
                 current_rung_first_contact_df["ATTRIBUTES"]
             )
             first_contact_operand = first_contact_attr.get("operand", "NONE")
@@ -985,7 +954,7 @@ def check_detail_4_functionwise(
 
 
 def check_detail_cycle_start_end_info_functionwise(
-    function_df: pd.DataFrame,
+    function_partition: DataModelPartition,
     function_name: str,
     function_comment_data: str,
     section_name: str,
@@ -996,15 +965,9 @@ def check_detail_cycle_start_end_info_functionwise(
     logger.info("Rule 1 Running Rule 1 checks on all check details.")
 
     try:
-        curr_function_df = function_df[
-            function_df["FUNCTION_BLOCK"] == function_name
-        ].copy()
-
-        autorun_section_df = curr_function_df[
-            curr_function_df["BODY_TYPE"]
-            .str.lower()
-            .isin([section_name, section_name_with_star])
-        ]
+        autorun_section_df = function_partition.select(
+            function_name, [section_name, section_name_with_star]
+        )
 
         if not autorun_section_df.empty:
             coil_df = autorun_section_df[
@@ -1017,7 +980,7 @@ def check_detail_cycle_start_end_info_functionwise(
 
         if not coil_df.empty:
             for _, coil_row in coil_df.iterrows():
-                attr = ast.literal_eval(coil_row["ATTRIBUTES"])
+                attr = parse_attributes(coil_row["ATTRIBUTES"])
 
                 logger.info(
                     f"Rule 1 Executing all check detail for coil {attr['operand']} of function {function_name} and section {section_name}"
@@ -1108,31 +1071,24 @@ def execute_rule_1_programwise(
     output_rows = []
 
     try:
-        program_df = pd.read_csv(input_program_file)
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
-
-        unique_program_values = program_df["PROGRAM"].unique()
-
-        for program in unique_program_values:
+        program_partition = cached_partition(input_program_file)
+        program_comment_data = cached_comment_store(input_program_comment_file)
+
+        # Covers every program, so it is extracted once rather than per program
+        (
+            program_cycle_start_end_rungnumber_info,
+            program_cycle_start_end_operand_info,
+        ) = extract_cycle_start_end_programwise(
+            program_partition=program_partition,
+            section_name=section_name,
+            section_name_with_star=section_name_with_star,
+            program_comment_data=program_comment_data,
+        )
 
-            unique_section_df = program_df[program_df["PROGRAM"] == program]
-            unique_section_values = unique_section_df["BODY"].str.lower().unique()
+        for program in program_partition.programs():
 
-            if (
-                "autorun" in unique_section_values
-                or "autorun★" in unique_section_values
-            ):
+            if program_partition.has_section(program, "autorun", "autorun★"):
 
-                (
-                    program_cycle_start_end_rungnumber_info,
-                    program_cycle_start_end_operand_info,
-                ) = extract_cycle_start_end_programwise(
-                    program_df=program_df,
-                    section_name=section_name,
-                    section_name_with_star=section_name_with_star,
-                    program_comment_data=program_comment_data,
-                )
                 for (
                     program_name,
                     cycle_start_end_rung_number,
@@ -1170,7 +1126,7 @@ def execute_rule_1_programwise(
                             )
 
                         output_rows = check_detail_cycle_start_end_info_programwise(
-                            program_df=program_df,
+                            program_partition=program_partition,
                             program_name=program_name,
                             program_comment_data=program_comment_data,
                             section_name=section_name,
@@ -1229,31 +1185,24 @@ def execute_rule_1_functionwise(
     output_rows = []
 
     try:
-        function_df = pd.read_csv(input_function_file)
-        with open(input_function_comment_file, "r", encoding="utf-8") as file:
-            function_comment_data = json.load(file)
-
-        unique_function_values = function_df["FUNCTION_BLOCK"].unique()
-
-        for function in unique_function_values:
+        function_partition = cached_partition(input_function_file)
+        function_comment_data = cached_comment_store(input_function_comment_file)
+
+        # Covers every function, so it is extracted once rather than per function
+        (
+            function_cycle_start_end_rungnumber_info,
+            function_cycle_start_end_operand_info,
+        ) = extract_cycle_start_end_functionwise(
+            function_partition=function_partition,
+            section_name=section_name,
+            section_name_with_star=section_name_with_star,
+            function_comment_data=function_comment_data,
+        )
 
-            unique_section_df = function_df[function_df["FUNCTION_BLOCK"] == function]
-            unique_section_values = unique_section_df["BODY_TYPE"].str.lower().unique()
+        for function in function_partition.programs():
 
-            if (
-                "autorun" in unique_section_values
-                or "autorun★" in unique_section_values
-            ):
+            if function_partition.has_section(function, "autorun", "autorun★"):
 
-                (
-                    function_cycle_start_end_rungnumber_info,
-                    function_cycle_start_end_operand_info,
-                ) = extract_cycle_start_end_functionwise(
-                    function_df=function_df,
-                    section_name=section_name,
-                    section_name_with_star=section_name_with_star,
-                    function_comment_data=function_comment_data,
-                )
                 for (
                     function_name,
                     cycle_start_end_rung_number,
@@ -1292,7 +1241,7 @@ def execute_rule_1_functionwise(
                             )
 
                         output_rows = check_detail_cycle_start_end_info_functionwise(
-                            function_df=function_df,
+                            function_partition=function_partition,
                             function_name=function_name,
                             function_comment_data=function_comment_data,
                             section_name=section_name,
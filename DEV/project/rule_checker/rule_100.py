@@ -1,9 +1,12 @@
 import ast
 import json
+from collections import defaultdict
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_operand_index
+from ..operand_index import OperandIndex
 import polars as pl
 from .ladder_utils import regex_pattern_check, clean_rung_number
 
@@ -19,78 +22,59 @@ section_name = "devicein"
 
 # ============================== Both Program-Wise and Function-Wise combine in one as per need Function Definitions ===============================
 def extract_matching_operands(
-    merged_program_function_df: pd.DataFrame,
+    operand_index: OperandIndex,
 ) -> Tuple[List, List]:
 
     logger.info(
-        "Rule 100 - Identifying outcoils starting with 'X' and checking if any associated contact operands starting with 'T' exist."
+        "Rule 100 - Identifying outcoils starting with 'T' and the 'X' contacts in the same DeviceIN rung."
     )
 
-    unique_program_values = merged_program_function_df["PROGRAM"].unique()
+    # DeviceIN contacts and coils per (program, rung), like groupby("RUNG") per program
+    devicein_rungs = defaultdict(list)
+    for occurrence in operand_index.occurrences:
+        if (
+            isinstance(occurrence.section, str)
+            and occurrence.section.lower() == section_name
+        ):
+            devicein_rungs[(occurrence.program, occurrence.rung)].append(occurrence)
 
     x_contacts_with_target_outcoil = []
     matching_operand_details = []
+    seen_x_contacts = set()
 
-    for program in unique_program_values:
+    for program, rung in sorted(
+        devicein_rungs, key=lambda key: (operand_index.program_rank[key[0]], key[1])
+    ):
+        rung_objects = devicein_rungs[(program, rung)]
+        contacts = [o for o in rung_objects if o.object_type == "Contact"]
 
-        logger.info(f"Rule 100 - Executing in program {program}")
-
-        try:
-            merged_program_function_filter_df = merged_program_function_df[
-                merged_program_function_df["PROGRAM"] == program
-            ].copy()
-            devicein_section_df = merged_program_function_filter_df[
-                merged_program_function_filter_df["BODY"].str.lower() == section_name
-            ]
-            devicein_rung_group_df = devicein_section_df.groupby("RUNG")
-
-            for _, rung_df in devicein_rung_group_df:
-
-                logger.info(
-                    f"Rule 100 - Executing in section {section_name} and rung number {rung_df["RUNG"].iloc[0]}"
-                )
+        for coil in rung_objects:
+            if coil.object_type != "Coil" or not coil.operand.startswith("T"):
+                continue
 
-                rung_df["ATTR_DICT"] = rung_df["ATTRIBUTES"].apply(
-                    lambda x: ast.literal_eval(x) if pd.notna(x) else {}
-                )
-                coil_df = rung_df[rung_df["OBJECT_TYPE_LIST"] == "Coil"]
-
-                for _, coil_row in coil_df.iterrows():
-                    coil_operand = coil_row["ATTR_DICT"].get("operand", "")
-
-                    if coil_operand.startswith("T"):
-                        contact_df = rung_df[rung_df["OBJECT_TYPE_LIST"] == "Contact"]
-
-                        for _, contact_row in contact_df.iterrows():
-                            contact_operand = contact_row["ATTR_DICT"].get(
-                                "operand", ""
-                            )
-
-                            if (
-                                contact_operand.startswith("X")
-                                and contact_operand
-                                not in x_contacts_with_target_outcoil
-                            ):
-                                x_contacts_with_target_outcoil.append(contact_operand)
-                                matching_operand_details.append(
-                                    [
-                                        contact_operand,
-                                        coil_operand,
-                                        contact_row.get("PROGRAM"),
-                                        contact_row.get("BODY"),
-                                        contact_row.get("RUNG"),
-                                        "OK",
-                                    ]
-                                )
-        except Exception as e:
-            logger.error(f"Rule 100 - Error processing program {program}: {e}")
-            continue
+            for contact in contacts:
+                if (
+                    contact.operand.startswith("X")
+                    and contact.operand not in seen_x_contacts
+                ):
+                    seen_x_contacts.add(contact.operand)
+                    x_contacts_with_target_outcoil.append(contact.operand)
+                    matching_operand_details.append(
+                        [
+                            contact.operand,
+                            coil.operand,
+                            contact.program,
+                            contact.section,
+                            contact.rung,
+                            "OK",
+                        ]
+                    )
 
     return x_contacts_with_target_outcoil, matching_operand_details
 
 
 def check_detail(
-    merged_program_function_df,
+    operand_index: OperandIndex,
     x_contacts_with_target_outcoil: List,
     matching_operand_details: List,
 ) -> List:
@@ -101,77 +85,26 @@ def check_detail(
 
     exclude_section_name = ["devicein", "fault"]
 
-    unique_program_values = merged_program_function_df["PROGRAM"].unique()
-
-    for program in unique_program_values:
-        logger.info(f"Rule 100 - Executing in program {program}")
-
-        merged_program_function_filter_df = merged_program_function_df[
-            merged_program_function_df["PROGRAM"] == program
-        ]
-        non_device_fault_sections_df = merged_program_function_filter_df[
-            ~merged_program_function_filter_df["BODY"]
-            .str.lower()
-            .isin(exclude_section_name)
-        ]
-        non_device_fault_rung_groups = non_device_fault_sections_df.groupby("RUNG")
-
-        for _, rung_df in non_device_fault_rung_groups:
-
-            try:
-
-                current_section_name = rung_df["BODY"].iloc[0]
-                current_rung_number = rung_df["RUNG"].iloc[0]
-
-                logger.info(
-                    f"Rule 100 - Executing in section {current_section_name} and rung number {current_rung_number}"
-                )
-
-                rung_df["ATTR_DICT"] = rung_df["ATTRIBUTES"].apply(
-                    lambda x: ast.literal_eval(x) if pd.notna(x) else {}
-                )
-                contact_df = rung_df[rung_df["OBJECT_TYPE_LIST"] == "Contact"]
-                for _, contact_row in contact_df.iterrows():
-                    contact_operand = contact_row["ATTR_DICT"].get("operand", "")
-                    # if contact_operand.startswith("X"):
-                    if contact_operand in x_contacts_with_target_outcoil:
-                        matching_operand_details.append(
-                            [
-                                contact_operand,
-                                "",
-                                contact_row.get("PROGRAM"),
-                                contact_row.get("BODY"),
-                                contact_row.get("RUNG"),
-                                "NG",
-                            ]
-                        )
-            except Exception as e:
-                logger.error(
-                    f"Rule 100 - Error processing check detail 1 in program {program}: {e}"
-                )
-                continue
-
-    return matching_operand_details
-
-
-def merge_program_function_csv_data(program_df, function_df):
-
-    logger.info("Rule 100 - Merge program and function dataframe into one")
-
-    # Rename the different columns in function_df to match program_df
-    function_df_renamed = function_df.rename(
-        columns={"FUNCTION_BLOCK": "PROGRAM", "BODY_TYPE": "BODY"}
+    # Join the X contacts with their occurrences outside DeviceIN/Fault
+    outside_contacts = [
+        occurrence
+        for contact_operand in set(x_contacts_with_target_outcoil)
+        for occurrence in operand_index.lookup(
+            contact_operand,
+            object_types=["Contact"],
+            exclude_sections=exclude_section_name,
+        )
+    ]
+    outside_contacts.sort(
+        key=lambda o: (operand_index.program_rank[o.program], o.rung, o.row)
     )
 
-    # Ensure both DataFrames have the same column order
-    function_df_renamed = function_df_renamed[program_df.columns]
-
-    # Concatenate both DataFrames
-    merged_program_function_df = pd.concat(
-        [program_df, function_df_renamed], ignore_index=True
-    )
+    for contact in outside_contacts:
+        matching_operand_details.append(
+            [contact.operand, "", contact.program, contact.section, contact.rung, "NG"]
+        )
 
-    return merged_program_function_df
+    return matching_operand_details
 
 
 # ============================== Main Execution Starts Here ===============================
@@ -183,79 +116,69 @@ def execute_rule_100(
     logger.info("Rule 100 - Start executing rule 100 ")
     try:
 
-        program_df = pd.read_csv(input_program_file)
-        function_df = pd.read_csv(input_function_file)
-        merged_program_function_df = merge_program_function_csv_data(
-            program_df=program_df, function_df=function_df
+        # Programs, then function blocks, like the merged program/function frame
+        operand_index = OperandIndex.combine(
+            cached_operand_index(input_program_file),
+            cached_operand_index(input_function_file),
         )
 
-        unique_program_function_values = merged_program_function_df["PROGRAM"].unique()
-
-        for program_function in unique_program_function_values:
-
-            unique_section_name = [
-                val.lower()
-                for val in merged_program_function_df[
-                    merged_program_function_df["PROGRAM"] == program_function
-                ]["BODY"]
-                .str.lower()
-                .unique()
-            ]
-            if "devicein" in unique_section_name:
+        output_rows = []
+        if any(
+            isinstance(occurrence.section, str)
+            and occurrence.section.lower() == "devicein"
+            for occurrence in operand_index.occurrences
+        ):
+            # Both checks cover the whole project, so they run once
+            x_contacts_with_target_outcoil, matching_operand_details = (
+                extract_matching_operands(operand_index=operand_index)
+            )
+            check_detail_result = check_detail(
+                operand_index=operand_index,
+                x_contacts_with_target_outcoil=x_contacts_with_target_outcoil,
+                matching_operand_details=matching_operand_details,
+            )
 
-                x_contacts_with_target_outcoil, matching_operand_details = (
-                    extract_matching_operands(
-                        merged_program_function_df=merged_program_function_df
+            for data in check_detail_result:
+                try:
+                    contact_operand = data[0]
+                    coil_operand = data[1]
+                    program_name = data[2]
+                    section_name = data[3]
+                    rung_number = data[4]
+                    status = data[5]
+
+                    ng_name = ng_content if status == "NG" else ""
+
+                    output_rows.append(
+                        {
+                            "Result": status,
+                            "Task": program_name,
+                            "Section": section_name,
+                            "RungNo": rung_number,
+                            "Target": coil_operand if coil_operand else "",
+                            "CheckItem": rule_100_check_item,
+                            "Detail": ng_name,
+                            "Status": "",
+                        }
                     )
-                )
-                check_detail_result = check_detail(
-                    merged_program_function_df=merged_program_function_df,
-                    x_contacts_with_target_outcoil=x_contacts_with_target_outcoil,
-                    matching_operand_details=matching_operand_details,
-                )
-
-                output_rows = []
-                for data in check_detail_result:
-                    try:
-                        contact_operand = data[0]
-                        coil_operand = data[1]
-                        program_name = data[2]
-                        section_name = data[3]
-                        rung_number = data[4]
-                        status = data[5]
-
-                        ng_name = ng_content if status == "NG" else ""
-
-                        output_rows.append(
-                            {
-                                "Result": status,
-                                "Task": program_name,
-                                "Section": section_name,
-                                "RungNo": rung_number,
-                                "Target": coil_operand if coil_operand else "",
-                                "CheckItem": rule_100_check_item,
-                                "Detail": ng_name,
-                                "Status": "",
-                            }
-                        )
-                        #     "TASK_NAME": program_name,
-                        #     "SECTION_NAME": section_name,
-                        #     "RULE_NUMBER": rule_number_100,
-                        #     "CHECK_NUMBER": 1,
-                        #     "RUNG_NUMBER": rung_number,
-                        #     "RULE_CONTENT": rule_content_100,
-                        #     "CHECK_CONTENT": rule_100_check_content_1,
-                        #     "TARGET_OUTCOIL" : coil_operand if coil_operand else "",
-                        #     "STATUS": status,
-                        #     # "CONTACT_OPERAND" : contact_operand,
-                        #     # "COIL_OPERAND" : coil_operand,
-                        #     "NG_EXPLANATION": ng_name
-                        # })
-                    except Exception as e:
-                        logger.error(
-                            f"Rule 100 - Error processing data for output row: {e}"
-                        )
-                        continue
+                    #     "TASK_NAME": program_name,
+                    #     "SECTION_NAME": section_name,
+                    #     "RULE_NUMBER": rule_number_100,
+                    #     "CHECK_NUMBER": 1,
+                    #     "RUNG_NUMBER": rung_number,
+                    #     "RULE_CONTENT": rule_content_100,
+                    #     "CHECK_CONTENT": rule_100_check_content_1,
+                    #     "TARGET_OUTCOIL" : coil_operand if coil_operand else "",
+                    #     "STATUS": status,
+                    #     # "CONTACT_OPERAND" : contact_operand,
+                    #     # "COIL_OPERAND" : coil_operand,
+                    #     "NG_EXPLANATION": ng_name
+                    # })
+                except Exception as e:
+                    logger.error(
+                        f"Rule 100 - Error processing data for output row: {e}"
+                    )
+                    continue
 
         final_output_df = pd.DataFrame(output_rows)
 
@@ -3,7 +3,14 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import (
+    cached_block_rungs,
+    cached_data_model_rows,
+    cached_partition_pl,
+    cached_read_csv,
+)
+from ..data_model_format import parse_attributes
 import polars as pl
 from .rule_10_15_ladder_utils import *
 from .extract_comment_from_variable import (
@@ -44,17 +51,16 @@ def execute_rule_11(
     try:
         output_df = pd.DataFrame(output_dict)
 
-        ladder_df = pl.read_csv(input_file)
+        ladder_df = cached_data_model_rows(input_file)
+        ladder_partition = cached_partition_pl(input_file)
 
-        rule_11_look_up_df = pd.read_csv(input_image)
+        rule_11_look_up_df = cached_read_csv(input_image)
         rule_11_look_up_df = rule_11_look_up_df[["Task name", "Machine Number"]]
 
         rule_11_look_up_df["Machine Number"] = rule_11_look_up_df[
             "Machine Number"
         ].fillna(-1000)
 
-        unique_program_values = ladder_df[program_key].unique()
-
         program_range_dict = {}
 
         """
@@ -66,25 +72,18 @@ def execute_rule_11(
         
         """
 
-        for program in unique_program_values:
-
-            ladder_program = ladder_df.filter(ladder_df[program_key] == program)
+        body_sections = ["autorun★", "autorun", "preparation"]
+        # (section, rung) of each program's FlowControlDataJudge_ZDS blocks
+        flow_blocks = cached_block_rungs(
+            input_file, "FlowControlDataJudge_ZDS", body_sections
+        )
 
-            ladder_program_df = ladder_df.filter(pl.col(program_key) == program)
-            unique_section_values = ladder_program_df.select(body_type_key).unique()
-            lower_values = {
-                val.lower() for val in unique_section_values[body_type_key].to_list()
-            }
-            if "autorun" in lower_values or "preparation" in lower_values:
+        for program in ladder_partition.programs():
 
-                ladder_program = ladder_df.filter(pl.col(program_key) == program)
+            if ladder_partition.has_section(program, "autorun", "preparation"):
 
-                ladder_body = ladder_program.filter(
-                    pl.col(body_type_key)
-                    .cast(pl.Utf8)
-                    .str.to_lowercase()
-                    .is_in(["autorun★", "autorun", "preparation"])
-                )
+                ladder_program = ladder_partition.select(program)
+                ladder_body = ladder_partition.select(program, body_sections)
 
                 flow_block_flag = 0
                 process_val_assigned_flag = 0
@@ -93,205 +92,338 @@ def execute_rule_11(
                 smc_block_rung = 0
                 variable_lookup_match_flag = 0
 
-                for row in ladder_body.iter_rows():
-
-                    pgm, bdy, rg_order, rg_name, obj, obj_type, attrs = row
-                    attrs = eval(attrs)
-                    attr_type = attrs.get("typeName")
-
-                    if all(
-                        [attr_type != None, attr_type == "FlowControlDataJudge_ZDS"]
-                    ):
-
-                        ladder_rung = ladder_body.filter(
-                            ladder_body["RUNG"] == rg_order
-                        )
-                        block_connections = get_block_connections(ladder_rung)
-                        flow_block_flag = 1
-                        flow_block_rung = rg_order
-
-                        logger.info(
-                            f"FlowControlDataJudge_ZDS found in \n program: {program} \n Body:{bdy} \n RUNG :{rg_order}  "
-                        )
-
-                        # Write the result to output for check 1
-                        detail_dict = {}
-                        detail_dict["RUNG"] = rg_order
-                        # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
-                        #         'CHECK_NUMBER':["1"], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
-                        #         'CHECK_CONTENT':'If the function block  in ② is not found in either of the following in the target task, NG is assumed.',
-                        # 'STATUS': ['OK'], 'TARGET_OUTCOIL': [detail_dict],
-                        #         'NG_EXPLANATION':['NONE']}
-
-                        # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
-                        #         'CHECK_NUMBER':["1"],  "RUNG_NUMBER":[rg_order], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
-                        #         'CHECK_CONTENT':'If the function block  in ② is not found in either of the following in the target task, NG is assumed.',
-                        #         'TARGET_OUTCOIL': [detail_dict], 'STATUS': ['OK'],
-                        #         'NG_EXPLANATION':['NONE']}
-
-                        sub_dict = {
-                            "Result": ["OK"],
-                            "Task": [program],
-                            "Section": [bdy],
-                            "RungNo": [rg_order],
-                            "Target": [detail_dict],
-                            "CheckItem": rule_11_check_item,
-                            "Detail": [""],
-                            "Status": [""],
-                        }
-
-                        sub_df = pd.DataFrame(sub_dict)
-
-                        output_df = pd.concat([output_df, sub_df], ignore_index=True)
-
-                        # Loop for each block connections
-                        for block in block_connections:
-                            try:
-
-                                machine_no_input = ""
-                                for key, values in block.items():
-                                    for val in values:
-                                        val_machine_no = val.get("MachineNo")
-
-                                        if val_machine_no != None:
-                                            machine_no_input = val_machine_no[0]
-
-                                            # smc_blocks=ladder_program.filter(ladder_program['OBJECT_TYPE_LIST'] == "smcext:InlineST")
-                                            if (
-                                                isinstance(machine_no_input, str)
-                                                and machine_no_input
-                                                and machine_no_input[0].isalpha()
-                                                and not machine_no_input.startswith("G")
-                                            ):
-                                                smc_blocks = ladder_program.filter(
-                                                    ladder_program["OBJECT_TYPE_LIST"]
-                                                    == "smcext:InlineST"
-                                                )
-                                                smc_blocks_attrs = list(
-                                                    smc_blocks["ATTRIBUTES"]
-                                                )
-                                                smc_rungs = list(smc_blocks["RUNG"])
-
-                                            elif isinstance(
-                                                machine_no_input, str
-                                            ) and machine_no_input.startswith("G"):
-                                                smc_blocks = ladder_df.filter(
-                                                    ladder_df["OBJECT_TYPE_LIST"]
-                                                    == "smcext:InlineST"
-                                                )
-                                                smc_blocks_attrs = list(
-                                                    smc_blocks["ATTRIBUTES"]
-                                                )
-                                                smc_rungs = list(smc_blocks["RUNG"])
-
-                                            else:
-                                                smc_blocks = ladder_body.filter(
-                                                    ladder_body["OBJECT_TYPE_LIST"]
-                                                    == "smcext:InlineST"
-                                                )
-                                                smc_blocks_attrs = list(
-                                                    smc_blocks["ATTRIBUTES"]
-                                                )
-                                                smc_rungs = list(smc_blocks["RUNG"])
+                for bdy, rg_order in flow_blocks.get(program, []):
+
+                    ladder_rung = ladder_partition.select(
+                        program, body_sections, rung=rg_order
+                    )
+                    block_connections = get_block_connections(ladder_rung)
+                    flow_block_flag = 1
+                    flow_block_rung = rg_order
+
+                    logger.info(
+                        f"FlowControlDataJudge_ZDS found in \n program: {program} \n Body:{bdy} \n RUNG :{rg_order}  "
+                    )
+
+                    # Write the result to output for check 1
+                    detail_dict = {}
+                    detail_dict["RUNG"] = rg_order
+                    # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
+                    #         'CHECK_NUMBER':["1"], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
+                    #         'CHECK_CONTENT':'If the function block  in ② is not found in either of the following in the target task, NG is assumed.',
+                    # 'STATUS': ['OK'], 'TARGET_OUTCOIL': [detail_dict],
+                    #         'NG_EXPLANATION':['NONE']}
+
+                    # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
+                    #         'CHECK_NUMBER':["1"],  "RUNG_NUMBER":[rg_order], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
+                    #         'CHECK_CONTENT':'If the function block  in ② is not found in either of the following in the target task, NG is assumed.',
+                    #         'TARGET_OUTCOIL': [detail_dict], 'STATUS': ['OK'],
+                    #         'NG_EXPLANATION':['NONE']}
+
+                    sub_dict = {
+                        "Result": ["OK"],
+                        "Task": [program],
+                        "Section": [bdy],
+                        "RungNo": [rg_order],
+                        "Target": [detail_dict],
+                        "CheckItem": rule_11_check_item,
+                        "Detail": [""],
+                        "Status": [""],
+                    }
 
+                    sub_df = pd.DataFrame(sub_dict)
+
+                    output_df = pd.concat([output_df, sub_df], ignore_index=True)
+
+                    # Loop for each block connections
+                    for block in block_connections:
+                        try:
+
+                            machine_no_input = ""
+                            for key, values in block.items():
+                                for val in values:
+                                    val_machine_no = val.get("MachineNo")
+
+                                    if val_machine_no != None:
+                                        machine_no_input = val_machine_no[0]
+
+                                        # smc_blocks=ladder_program.filter(ladder_program['OBJECT_TYPE_LIST'] == "smcext:InlineST")
+                                        if (
+                                            isinstance(machine_no_input, str)
+                                            and machine_no_input
+                                            and machine_no_input[0].isalpha()
+                                            and not machine_no_input.startswith("G")
+                                        ):
+                                            smc_blocks = ladder_program.filter(
+                                                ladder_program["OBJECT_TYPE_LIST"]
+                                                == "smcext:InlineST"
+                                            )
                                             smc_blocks_attrs = list(
                                                 smc_blocks["ATTRIBUTES"]
                                             )
                                             smc_rungs = list(smc_blocks["RUNG"])
 
-                                            # Write the result to output for check 2 , process value properly assigned
-                                            detail_dict = {}
-                                            detail_dict["RUNG"] = rg_order
-                                            detail_dict["machine_no_input"] = (
-                                                machine_no_input
+                                        elif isinstance(
+                                            machine_no_input, str
+                                        ) and machine_no_input.startswith("G"):
+                                            smc_blocks = ladder_df.filter(
+                                                ladder_df["OBJECT_TYPE_LIST"]
+                                                == "smcext:InlineST"
                                             )
-                                            # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
-                                            #         'CHECK_NUMBER':["2"],
-                                            #         'RULE_CONTENT':[f"・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
-                                            #         'CHECK_CONTENT':'If a variable is not entered in the input variable in ③, it is assumed to be NG.', 'STATUS': ['OK'], 'TARGET_OUTCOIL': [detail_dict],
-                                            #         'NG_EXPLANATION':['NONE']}
-
-                                            # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
-                                            #     'CHECK_NUMBER':["2"],  "RUNG_NUMBER":[rg_order], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
-                                            #     'CHECK_CONTENT':'If a variable is not entered in the input variable in ③, it is assumed to be NG.',
-                                            #     'TARGET_OUTCOIL': [detail_dict], 'STATUS': ['OK'],
-                                            #     'NG_EXPLANATION':['NONE']}
-
-                                            sub_dict = {
-                                                "Result": ["OK"],
-                                                "Task": [program],
-                                                "Section": [bdy],
-                                                "RungNo": [rg_order],
-                                                "Target": [detail_dict],
-                                                "CheckItem": rule_11_check_item,
-                                                "Detail": [""],
-                                                "Status": [""],
-                                            }
-
-                                            sub_df = pd.DataFrame(sub_dict)
-
-                                            output_df = pd.concat(
-                                                [output_df, sub_df], ignore_index=True
+                                            smc_blocks_attrs = list(
+                                                smc_blocks["ATTRIBUTES"]
                                             )
+                                            smc_rungs = list(smc_blocks["RUNG"])
 
-                                            for smc_attr, smc_rung in zip(
-                                                smc_blocks_attrs, smc_rungs
-                                            ):
+                                        else:
+                                            smc_blocks = ladder_body.filter(
+                                                ladder_body["OBJECT_TYPE_LIST"]
+                                                == "smcext:InlineST"
+                                            )
+                                            smc_blocks_attrs = list(
+                                                smc_blocks["ATTRIBUTES"]
+                                            )
+                                            smc_rungs = list(smc_blocks["RUNG"])
 
-                                                smc_attr = eval(smc_attr)
-                                                data_inputs = smc_attr.get(
-                                                    "data_inputs"
-                                                )
-                                                smc_block_rung = smc_rung
+                                        smc_blocks_attrs = list(
+                                            smc_blocks["ATTRIBUTES"]
+                                        )
+                                        smc_rungs = list(smc_blocks["RUNG"])
+
+                                        # Write the result to output for check 2 , process value properly assigned
+                                        detail_dict = {}
+                                        detail_dict["RUNG"] = rg_order
+                                        detail_dict["machine_no_input"] = (
+                                            machine_no_input
+                                        )
+                                        # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
+                                        #         'CHECK_NUMBER':["2"],
+                                        #         'RULE_CONTENT':[f"・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
+                                        #         'CHECK_CONTENT':'If a variable is not entered in the input variable in ③, it is assumed to be NG.', 'STATUS': ['OK'], 'TARGET_OUTCOIL': [detail_dict],
+                                        #         'NG_EXPLANATION':['NONE']}
+
+                                        # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
+                                        #     'CHECK_NUMBER':["2"],  "RUNG_NUMBER":[rg_order], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
+                                        #     'CHECK_CONTENT':'If a variable is not entered in the input variable in ③, it is assumed to be NG.',
+                                        #     'TARGET_OUTCOIL': [detail_dict], 'STATUS': ['OK'],
+                                        #     'NG_EXPLANATION':['NONE']}
+
+                                        sub_dict = {
+                                            "Result": ["OK"],
+                                            "Task": [program],
+                                            "Section": [bdy],
+                                            "RungNo": [rg_order],
+                                            "Target": [detail_dict],
+                                            "CheckItem": rule_11_check_item,
+                                            "Detail": [""],
+                                            "Status": [""],
+                                        }
+
+                                        sub_df = pd.DataFrame(sub_dict)
+
+                                        output_df = pd.concat(
+                                            [output_df, sub_df], ignore_index=True
+                                        )
+
+                                        for smc_attr, smc_rung in zip(
+                                            smc_blocks_attrs, smc_rungs
+                                        ):
+
+                                            smc_attr = parse_attributes(smc_attr)
+                                            data_inputs = smc_attr.get("data_inputs")
+                                            smc_block_rung = smc_rung
+
+                                            if data_inputs != None:
+
+                                                for data_ in data_inputs:
+
+                                                    if re.search(
+                                                        machine_no_input, data_
+                                                    ):
+                                                        if re.search(r";", data_):
+
+                                                            data_var = data_.split(";")[
+                                                                0
+                                                            ]
+                                                            data_var_value = (
+                                                                data_var.split("=")[
+                                                                    1
+                                                                ].strip()
+                                                            )
+                                                            process_val_assigned_flag = (
+                                                                1
+                                                            )
+
+                                                            # Check3, Write to output
+
+                                                            detail_dict = {}
+                                                            detail_dict["SMC_RUNG"] = (
+                                                                smc_block_rung
+                                                            )
+                                                            detail_dict[
+                                                                "machine_no_input"
+                                                            ] = machine_no_input
+                                                            detail_dict[
+                                                                "process_val_assigned"
+                                                            ] = data_var_value
+
+                                                            # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
+                                                            #         'CHECK_NUMBER':["3"],
+                                                            #         'RULE_CONTENT':[f"・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
+                                                            #         'CHECK_CONTENT':'Check if a numerical value is assigned to the variable detected in ④. If not, NG is assumed.', 'STATUS': ['OK'], 'TARGET_OUTCOIL': [detail_dict],
+                                                            #         'NG_EXPLANATION':['NONE']}
+
+                                                            # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
+                                                            #     'CHECK_NUMBER':["3"],  "RUNG_NUMBER":[rg_order], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
+                                                            #     'CHECK_CONTENT':'Check if a numerical value is assigned to the variable detected in ④. If not, NG is assumed.',
+                                                            #     'TARGET_OUTCOIL': [detail_dict], 'STATUS': ['OK'],
+                                                            #     'NG_EXPLANATION':['NONE']}
+
+                                                            sub_dict = {
+                                                                "Result": ["OK"],
+                                                                "Task": [program],
+                                                                "Section": [bdy],
+                                                                "RungNo": [rg_order],
+                                                                "Target": [detail_dict],
+                                                                "CheckItem": rule_11_check_item,
+                                                                "Detail": [""],
+                                                                "Status": [""],
+                                                            }
+
+                                                            sub_df = pd.DataFrame(
+                                                                sub_dict
+                                                            )
+
+                                                            output_df = pd.concat(
+                                                                [output_df, sub_df],
+                                                                ignore_index=True,
+                                                            )
+
+                                                            """Check for looking into CSV file is remaininig """
+                                                            logger.info(
+                                                                f"Variable {machine_no_input} found in \n program: {program} \n Body:{bdy} \n RUNG :{rg_order}  "
+                                                            )
+
+                                                            # Performing Check 4
+                                                            rule_11_look_up_df_check = (
+                                                                rule_11_look_up_df[
+                                                                    rule_11_look_up_df[
+                                                                        "Task name"
+                                                                    ]
+                                                                    == program
+                                                                ]
+                                                            )
+                                                            rule_11_operation_number_list = list(
+                                                                rule_11_look_up_df_check[
+                                                                    "Machine Number"
+                                                                ]
+                                                            )
+
+                                                            rule_11_operation_number_list = [
+                                                                str(int(ele))
+                                                                for ele in rule_11_operation_number_list
+                                                            ]
+                                                            # rule_11_operation_number_list = [
+                                                            #         str(int(ele)) for ele in rule_11_operation_number_list
+                                                            #         if isinstance(ele, int) or (isinstance(ele, str) and ele.isdigit())
+                                                            #     ]
+
+                                                            data_var_value_number = str(
+                                                                data_var_value.split(
+                                                                    "#"
+                                                                )[1]
+                                                            )
+                                                            print(
+                                                                f"data_var_value_number: {data_var_value_number} \n rule_11_operation_number_list: {rule_11_operation_number_list}"
+                                                            )
+                                                            if (
+                                                                data_var_value_number
+                                                                in rule_11_operation_number_list
+                                                            ):
+
+                                                                # Dump in output file
+                                                                detail_dict = {}
+                                                                detail_dict[
+                                                                    "FLOW_BLOCK_RUNG"
+                                                                ] = rg_order
+                                                                detail_dict[
+                                                                    "SMC_BLOCK_RUNG"
+                                                                ] = smc_rung
+                                                                detail_dict[
+                                                                    "Process_no_variable"
+                                                                ] = machine_no_input
+                                                                detail_dict[
+                                                                    "Process_no_data"
+                                                                ] = data_var_value
 
-                                                if data_inputs != None:
+                                                                # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
+                                                                #         'CHECK_NUMBER':["4"], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
+                                                                #         'CHECK_CONTENT':'The number assigned to the variable detected in ❸ is confirmed to be equal to the ｍachine number of the task being checked, which is INPUT in the system UI, and if it is not equal, it is assumed to be NG.', 'STATUS': ['OK'], 'TARGET_OUTCOIL': [detail_dict],
+                                                                #         'NG_EXPLANATION':["NONE"]}
 
-                                                    for data_ in data_inputs:
+                                                                # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
+                                                                #     'CHECK_NUMBER':["4"],  "RUNG_NUMBER":[rg_order], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
+                                                                #     'CHECK_CONTENT':'The number assigned to the variable detected in ❸ is confirmed to be equal to the ｍachine number of the task being checked, which is INPUT in the system UI, and if it is not equal, it is assumed to be NG.',
+                                                                #     'TARGET_OUTCOIL': [detail_dict], 'STATUS': ['OK'],
+                                                                #     'NG_EXPLANATION':['NONE']}
 
-                                                        if re.search(
-                                                            machine_no_input, data_
-                                                        ):
-                                                            if re.search(r";", data_):
+                                                                sub_dict = {
+                                                                    "Result": ["OK"],
+                                                                    "Task": [program],
+                                                                    "Section": [bdy],
+                                                                    "RungNo": [
+                                                                        rg_order
+                                                                    ],
+                                                                    "Target": [
+                                                                        detail_dict
+                                                                    ],
+                                                                    "CheckItem": rule_11_check_item,
+                                                                    "Detail": [""],
+                                                                    "Status": [""],
+                                                                }
 
-                                                                data_var = data_.split(
-                                                                    ";"
-                                                                )[0]
-                                                                data_var_value = (
-                                                                    data_var.split("=")[
-                                                                        1
-                                                                    ].strip()
+                                                                sub_df = pd.DataFrame(
+                                                                    sub_dict
                                                                 )
-                                                                process_val_assigned_flag = (
-                                                                    1
+
+                                                                output_df = pd.concat(
+                                                                    [
+                                                                        output_df,
+                                                                        sub_df,
+                                                                    ],
+                                                                    ignore_index=True,
                                                                 )
+                                                                raise BreakInner
 
-                                                                # Check3, Write to output
+                                                            else:
 
                                                                 detail_dict = {}
                                                                 detail_dict[
-                                                                    "SMC_RUNG"
-                                                                ] = smc_block_rung
+                                                                    "FLOW_BLOCK_RUNG"
+                                                                ] = rg_order
                                                                 detail_dict[
-                                                                    "machine_no_input"
+                                                                    "SMC_BLOCK_RUNG"
+                                                                ] = smc_rung
+                                                                detail_dict[
+                                                                    "Process_no_variable"
                                                                 ] = machine_no_input
                                                                 detail_dict[
-                                                                    "process_val_assigned"
+                                                                    "Process_no_data"
                                                                 ] = data_var_value
+                                                                ng_str = "ZDSに入力されている設備番号が,チェッカーの入力画面で入力した設備番号と異なっている。"
 
                                                                 # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
-                                                                #         'CHECK_NUMBER':["3"],
-                                                                #         'RULE_CONTENT':[f"・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
-                                                                #         'CHECK_CONTENT':'Check if a numerical value is assigned to the variable detected in ④. If not, NG is assumed.', 'STATUS': ['OK'], 'TARGET_OUTCOIL': [detail_dict],
-                                                                #         'NG_EXPLANATION':['NONE']}
-
+                                                                #         'CHECK_NUMBER':["4"], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
+                                                                #         'CHECK_CONTENT':'The number assigned to the variable detected in ❸ is confirmed to be equal to the ｍachine number of the task being checked, which is INPUT in the system UI, and if it is not equal, it is assumed to be NG.', 'STATUS': ['NG'], 'TARGET_OUTCOIL': [detail_dict],
+                                                                #         'NG_EXPLANATION':[ng_str]}
                                                                 # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
-                                                                #     'CHECK_NUMBER':["3"],  "RUNG_NUMBER":[rg_order], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
-                                                                #     'CHECK_CONTENT':'Check if a numerical value is assigned to the variable detected in ④. If not, NG is assumed.',
-                                                                #     'TARGET_OUTCOIL': [detail_dict], 'STATUS': ['OK'],
-                                                                #     'NG_EXPLANATION':['NONE']}
+                                                                #     'CHECK_NUMBER':["4"],  "RUNG_NUMBER":[""], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
+                                                                #     'CHECK_CONTENT':'The number assigned to the variable detected in ❸ is confirmed to be equal to the ｍachine number of the task being checked, which is INPUT in the system UI, and if it is not equal, it is assumed to be NG.',
+                                                                #     'TARGET_OUTCOIL': [detail_dict], 'STATUS': ['NG'],
+                                                                #     'NG_EXPLANATION':[ng_str]}
 
                                                                 sub_dict = {
-                                                                    "Result": ["OK"],
+                                                                    "Result": ["NG"],
                                                                     "Task": [program],
                                                                     "Section": [bdy],
                                                                     "RungNo": [
@@ -301,7 +433,7 @@ def execute_rule_11(
                                                                         detail_dict
                                                                     ],
                                                                     "CheckItem": rule_11_check_item,
-                                                                    "Detail": [""],
+                                                                    "Detail": [ng_str],
                                                                     "Status": [""],
                                                                 }
 
@@ -310,186 +442,21 @@ def execute_rule_11(
                                                                 )
 
                                                                 output_df = pd.concat(
-                                                                    [output_df, sub_df],
+                                                                    [
+                                                                        output_df,
+                                                                        sub_df,
+                                                                    ],
                                                                     ignore_index=True,
                                                                 )
 
-                                                                """Check for looking into CSV file is remaininig """
                                                                 logger.info(
-                                                                    f"Variable {machine_no_input} found in \n program: {program} \n Body:{bdy} \n RUNG :{rg_order}  "
+                                                                    f"Variable did not match with look up tale in \nProgram:{program} \n Body:{bdy} \n RUNG:{rg_order} for \nvariable {machine_no_input} \Process data:{data_var_value} "
                                                                 )
 
-                                                                # Performing Check 4
-                                                                rule_11_look_up_df_check = rule_11_look_up_df[
-                                                                    rule_11_look_up_df[
-                                                                        "Task name"
-                                                                    ]
-                                                                    == program
-                                                                ]
-                                                                rule_11_operation_number_list = list(
-                                                                    rule_11_look_up_df_check[
-                                                                        "Machine Number"
-                                                                    ]
-                                                                )
+                                                                raise BreakInner
 
-                                                                rule_11_operation_number_list = [
-                                                                    str(int(ele))
-                                                                    for ele in rule_11_operation_number_list
-                                                                ]
-                                                                # rule_11_operation_number_list = [
-                                                                #         str(int(ele)) for ele in rule_11_operation_number_list
-                                                                #         if isinstance(ele, int) or (isinstance(ele, str) and ele.isdigit())
-                                                                #     ]
-
-                                                                data_var_value_number = str(
-                                                                    data_var_value.split(
-                                                                        "#"
-                                                                    )[
-                                                                        1
-                                                                    ]
-                                                                )
-                                                                print(
-                                                                    f"data_var_value_number: {data_var_value_number} \n rule_11_operation_number_list: {rule_11_operation_number_list}"
-                                                                )
-                                                                if (
-                                                                    data_var_value_number
-                                                                    in rule_11_operation_number_list
-                                                                ):
-
-                                                                    # Dump in output file
-                                                                    detail_dict = {}
-                                                                    detail_dict[
-                                                                        "FLOW_BLOCK_RUNG"
-                                                                    ] = rg_order
-                                                                    detail_dict[
-                                                                        "SMC_BLOCK_RUNG"
-                                                                    ] = smc_rung
-                                                                    detail_dict[
-                                                                        "Process_no_variable"
-                                                                    ] = machine_no_input
-                                                                    detail_dict[
-                                                                        "Process_no_data"
-                                                                    ] = data_var_value
-
-                                                                    # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
-                                                                    #         'CHECK_NUMBER':["4"], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
-                                                                    #         'CHECK_CONTENT':'The number assigned to the variable detected in ❸ is confirmed to be equal to the ｍachine number of the task being checked, which is INPUT in the system UI, and if it is not equal, it is assumed to be NG.', 'STATUS': ['OK'], 'TARGET_OUTCOIL': [detail_dict],
-                                                                    #         'NG_EXPLANATION':["NONE"]}
-
-                                                                    # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
-                                                                    #     'CHECK_NUMBER':["4"],  "RUNG_NUMBER":[rg_order], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
-                                                                    #     'CHECK_CONTENT':'The number assigned to the variable detected in ❸ is confirmed to be equal to the ｍachine number of the task being checked, which is INPUT in the system UI, and if it is not equal, it is assumed to be NG.',
-                                                                    #     'TARGET_OUTCOIL': [detail_dict], 'STATUS': ['OK'],
-                                                                    #     'NG_EXPLANATION':['NONE']}
-
-                                                                    sub_dict = {
-                                                                        "Result": [
-                                                                            "OK"
-                                                                        ],
-                                                                        "Task": [
-                                                                            program
-                                                                        ],
-                                                                        "Section": [
-                                                                            bdy
-                                                                        ],
-                                                                        "RungNo": [
-                                                                            rg_order
-                                                                        ],
-                                                                        "Target": [
-                                                                            detail_dict
-                                                                        ],
-                                                                        "CheckItem": rule_11_check_item,
-                                                                        "Detail": [""],
-                                                                        "Status": [""],
-                                                                    }
-
-                                                                    sub_df = (
-                                                                        pd.DataFrame(
-                                                                            sub_dict
-                                                                        )
-                                                                    )
-
-                                                                    output_df = pd.concat(
-                                                                        [
-                                                                            output_df,
-                                                                            sub_df,
-                                                                        ],
-                                                                        ignore_index=True,
-                                                                    )
-                                                                    raise BreakInner
-
-                                                                else:
-
-                                                                    detail_dict = {}
-                                                                    detail_dict[
-                                                                        "FLOW_BLOCK_RUNG"
-                                                                    ] = rg_order
-                                                                    detail_dict[
-                                                                        "SMC_BLOCK_RUNG"
-                                                                    ] = smc_rung
-                                                                    detail_dict[
-                                                                        "Process_no_variable"
-                                                                    ] = machine_no_input
-                                                                    detail_dict[
-                                                                        "Process_no_data"
-                                                                    ] = data_var_value
-                                                                    ng_str = "ZDSに入力されている設備番号が,チェッカーの入力画面で入力した設備番号と異なっている。"
-
-                                                                    # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
-                                                                    #         'CHECK_NUMBER':["4"], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
-                                                                    #         'CHECK_CONTENT':'The number assigned to the variable detected in ❸ is confirmed to be equal to the ｍachine number of the task being checked, which is INPUT in the system UI, and if it is not equal, it is assumed to be NG.', 'STATUS': ['NG'], 'TARGET_OUTCOIL': [detail_dict],
-                                                                    #         'NG_EXPLANATION':[ng_str]}
-                                                                    # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':[bdy], 'RULE_NUMBER': ["11"],
-                                                                    #     'CHECK_NUMBER':["4"],  "RUNG_NUMBER":[""], 'RULE_CONTENT':["・For each process, check that all the processes before the own process are OK, and that all the facilities before the own facility are OK. If not, it is judged to be defective."],
-                                                                    #     'CHECK_CONTENT':'The number assigned to the variable detected in ❸ is confirmed to be equal to the ｍachine number of the task being checked, which is INPUT in the system UI, and if it is not equal, it is assumed to be NG.',
-                                                                    #     'TARGET_OUTCOIL': [detail_dict], 'STATUS': ['NG'],
-                                                                    #     'NG_EXPLANATION':[ng_str]}
-
-                                                                    sub_dict = {
-                                                                        "Result": [
-                                                                            "NG"
-                                                                        ],
-                                                                        "Task": [
-                                                                            program
-                                                                        ],
-                                                                        "Section": [
-                                                                            bdy
-                                                                        ],
-                                                                        "RungNo": [
-                                                                            rg_order
-                                                                        ],
-                                                                        "Target": [
-                                                                            detail_dict
-                                                                        ],
-                                                                        "CheckItem": rule_11_check_item,
-                                                                        "Detail": [
-                                                                            ng_str
-                                                                        ],
-                                                                        "Status": [""],
-                                                                    }
-
-                                                                    sub_df = (
-                                                                        pd.DataFrame(
-                                                                            sub_dict
-                                                                        )
-                                                                    )
-
-                                                                    output_df = pd.concat(
-                                                                        [
-                                                                            output_df,
-                                                                            sub_df,
-                                                                        ],
-                                                                        ignore_index=True,
-                                                                    )
-
-                                                                    logger.info(
-                                                                        f"Variable did not match with look up tale in \nProgram:{program} \n Body:{bdy} \n RUNG:{rg_order} for \nvariable {machine_no_input} \Process data:{data_var_value} "
-                                                                    )
-
-                                                                    raise BreakInner
-
-                            except BreakInner:
-                                pass
+                        except BreakInner:
+                            pass
 
                 ###################### Based on the flag values develop the report ###############3
 
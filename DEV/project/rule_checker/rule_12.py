@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .rule_10_15_ladder_utils import *
 from .extract_comment_from_variable import (
@@ -759,10 +760,9 @@ def execute_rule_12_programwise(
 
     try:
 
-        all_program_df = pd.read_csv(input_program_file)
-        input_image_df = pd.read_csv(input_image_csv_file)
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        all_program_df = cached_read_csv(input_program_file)
+        input_image_df = cached_read_csv(input_image_csv_file)
+        program_comment_data = cached_comment_store(input_program_comment_file)
 
         unique_program_values = all_program_df["PROGRAM"].unique()
 
@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_read_csv, cached_read_csv_pl
 import polars as pl
 from .extract_comment_from_variable import *
 from .rule_10_15_ladder_utils import *
@@ -48,8 +49,8 @@ def execute_rule_15(
     try:
         output_df = pd.DataFrame(output_dict)
 
-        ladder_df = pl.read_csv(input_file)
-        rule_15_look_up_df = pd.read_csv(input_image)
+        ladder_df = cached_read_csv_pl(input_file)
+        rule_15_look_up_df = cached_read_csv(input_image)
         rule_15_look_up_df = rule_15_look_up_df[["Task name", "Machine Number"]]
         rule_15_look_up_df["Machine Number"] = rule_15_look_up_df[
             "Machine Number"
@@ -3,14 +3,15 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
     get_the_comment_from_function,
 )
 from .ladder_utils import regex_pattern_check, clean_rung_number
-from .rule_16_ladder_utils import get_series_contacts
+from .rung_graph import contacts_in_series
 
 # ============================ Rule 16: Definitions, Content, and Configuration Details ============================
 autorun_section_name = "autorun"
@@ -179,20 +180,8 @@ def check_detail_1_programwise(
         if len(all_match_operand) == 3 and all(
             item <= max_self for item in all_match_operand_outlist
         ):
-            get_series_connect_data = get_series_contacts(
-                pl.from_pandas(current_rung_df)
-            )
-            series_contact_operands_only = [
-                [item.get("operand") for item in sublist]
-                for sublist in get_series_connect_data
-            ]
-            for series_contact in series_contact_operands_only:
-                all_series_present = all(
-                    item in series_contact for item in all_match_operand
-                )
-                if all_series_present:
-                    status = "OK"
-                    break
+            if contacts_in_series(pl.from_pandas(current_rung_df), all_match_operand):
+                status = "OK"
 
     return {"status": status, "check_number": "cc1"}
 
@@ -379,20 +368,8 @@ def check_detail_1_functionwise(
         if len(all_match_operand) == 3 and all(
             item <= max_self for item in all_match_operand_outlist
         ):
-            get_series_connect_data = get_series_contacts(
-                pl.from_pandas(current_rung_df)
-            )
-            series_contact_operands_only = [
-                [item.get("operand") for item in sublist]
-                for sublist in get_series_connect_data
-            ]
-            for series_contact in series_contact_operands_only:
-                all_series_present = all(
-                    item in series_contact for item in all_match_operand
-                )
-                if all_series_present:
-                    status = "OK"
-                    break
+            if contacts_in_series(pl.from_pandas(current_rung_df), all_match_operand):
+                status = "OK"
 
     return {"status": status, "check_number": "cc1"}
 
@@ -437,9 +414,8 @@ def execute_rule_16_programwise(
 
     try:
 
-        program_df = pd.read_csv(input_program_file)
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
         for program in unique_program_values:
@@ -543,9 +519,8 @@ def execute_rule_16_functionwise(
 
     try:
 
-        function_df = pd.read_csv(input_function_file)
-        with open(function_comment_file, "r", encoding="utf-8") as file:
-            function_comment_data = json.load(file)
+        function_df = cached_read_csv(input_function_file)
+        function_comment_data = cached_comment_store(function_comment_file)
 
         unique_function_values = function_df["FUNCTION_BLOCK"].unique()
         for function in unique_function_values:
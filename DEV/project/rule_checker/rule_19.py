@@ -3,9 +3,10 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
-from .rule_19_ladder_utils import get_series_contacts
+from .rung_graph import contacts_in_series
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
     get_the_comment_from_program,
@@ -204,18 +205,11 @@ def check_detail_2_programwise(
                     position_end_operand = contact_operand
 
         reset_start_memory_rung_df_polar = pl.from_pandas(reset_start_memory_rung_df)
-        series_contact_data = get_series_contacts(reset_start_memory_rung_df_polar)
-        series_contact_operands_only = [
-            [item["operand"] for item in sublist] for sublist in series_contact_data
-        ]
-
-        for series_contact in series_contact_operands_only:
-            if (
-                transport_postion_end_contact_operand in series_contact
-                and position_end_operand in series_contact
-            ):
-                series_contact_status = True
-                break
+        if contacts_in_series(
+            reset_start_memory_rung_df_polar,
+            [transport_postion_end_contact_operand, position_end_operand],
+        ):
+            series_contact_status = True
 
         if (
             transport_postion_end_contact_operand
@@ -282,8 +276,8 @@ def execute_rule_19_programwise(
     logger.info("Starting execution of Rule 19")
 
     try:
-        program_df = pd.read_csv(input_program_file)
-        input_image_program_df = pd.read_csv(input_image)
+        program_df = cached_read_csv(input_program_file)
+        input_image_program_df = cached_read_csv(input_image)
         task_names = (
             input_image_program_df[
                 input_image_program_df["Unit"].astype(str).str.lower() == "gripper"
@@ -293,8 +287,7 @@ def execute_rule_19_programwise(
             .tolist()
         )
 
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_comment_data = cached_comment_store(input_program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
 
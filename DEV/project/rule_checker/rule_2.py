@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv, cached_read_csv_pl
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
@@ -15,7 +16,11 @@ from .rule_2_ladder_utils import (
     get_in_parallel_A_contacts,
     get_parallel_contacts,
 )
-from .ladder_utils import regex_pattern_check, clean_rung_number
+from .ladder_utils import (
+    regex_pattern_check,
+    regex_pattern_check_patterns,
+    clean_rung_number,
+)
 
 ##################################################################################################
 
@@ -28,7 +33,7 @@ def process_memory_feeding(
     ladder_df: pd.DataFrame, program_key: str, body_type_key: str
 ) -> Dict[str, Any]:
 
-    # ladder_df = pl.read_csv(input_file)
+    # ladder_df = cached_read_csv_pl(input_file)
     unique_program_values = ladder_df[program_key].unique()
 
     outcoil_config_dict = {}
@@ -564,14 +569,13 @@ def execute_rule_2(
     output_df = pd.DataFrame(output_dict)
     output_df_jp = pd.DataFrame(output_dict)
 
-    with open(input_program_comment_file, "r", encoding="utf-8") as file:
-        comment_data = json.load(file)
+    comment_data = cached_comment_store(input_program_comment_file)
 
     ##########################Range Detection#################################3
     try:
 
-        ladder_df = pl.read_csv(input_file)
-        ladder_pd_df = pd.read_csv(input_file)
+        ladder_df = cached_read_csv_pl(input_file)
+        ladder_pd_df = cached_read_csv(input_file)
         unique_program_values = ladder_df[program_key].unique()
         program_range_dict = {}
 
@@ -818,9 +822,15 @@ def execute_rule_2(
                                         abnormal_jp,
                                     ]
 
-                                    for pattern_ in comment_patterns_to_checked:
+                                    pattern_matches = regex_pattern_check_patterns(
+                                        comment_patterns_to_checked, comment_list
+                                    )
+
+                                    for pattern_, matched in zip(
+                                        comment_patterns_to_checked, pattern_matches
+                                    ):
 
-                                        if regex_pattern_check(pattern_, comment_list):
+                                        if matched:
 
                                             if pattern_ == ok_jp:
                                                 ok_coil_operands.append(coil_operand)
@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
@@ -267,8 +268,8 @@ def execute_rule_20_programwise(
 
     try:
 
-        program_df = pd.read_csv(input_program_file)
-        input_image_program_df = pd.read_csv(input_image)
+        program_df = cached_read_csv(input_program_file)
+        input_image_program_df = cached_read_csv(input_image)
 
         task_names = (
             input_image_program_df[
@@ -282,8 +283,7 @@ def execute_rule_20_programwise(
             .tolist()
         )
 
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_comment_data = cached_comment_store(input_program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
 
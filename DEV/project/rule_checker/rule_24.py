@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
@@ -161,10 +162,9 @@ def execute_rule_24_programwise(
     logger.info("Starting execution of Rule 24")
 
     try:
-        program_df = pd.read_csv(input_program_file)
-        input_image_data = pd.read_csv(input_image)
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        input_image_data = cached_read_csv(input_image)
+        program_comment_data = cached_comment_store(input_program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
 
@@ -3,7 +3,13 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import (
+    cached_comment_store,
+    cached_datasource_comment_index,
+    cached_read_csv,
+)
+from .datasource_comments import DatasourceCommentIndex
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
@@ -232,7 +238,7 @@ def check_detail_1_programwise(detection_result: dict, program_name: str) -> Lis
 def check_detail_2_programwise(
     autorun_rung_groups_df: pd.DataFrame,
     program_comment_data: dict,
-    datasource_program_df: pd.DataFrame,
+    datasource_comment_index: DatasourceCommentIndex,
     detection_3_operand: str,
     previous_comment: str,
     present_comment: str,
@@ -312,7 +318,7 @@ def check_detail_2_programwise(
                                         program_type="program",
                                         body_name=section_name,
                                         rung_order=contact_row["RUNG"],
-                                        df=datasource_program_df,
+                                        df=datasource_comment_index,
                                     )
                                 )
                                 if (
@@ -342,7 +348,7 @@ def check_detail_2_programwise(
                                         program_type="program",
                                         body_name=section_name,
                                         rung_order=contact_row["RUNG"],
-                                        df=datasource_program_df,
+                                        df=datasource_comment_index,
                                     )
                                 )
                                 if (
@@ -867,8 +873,8 @@ def execute_rule_26_programwise(
     logger.info("Starting execution of Rule 24")
 
     try:
-        program_df = pd.read_csv(input_program_file)
-        input_image_program_df = pd.read_csv(input_image)
+        program_df = cached_read_csv(input_program_file)
+        input_image_program_df = cached_read_csv(input_image)
 
         task_names = (
             input_image_program_df[
@@ -882,10 +888,11 @@ def execute_rule_26_programwise(
         """
         for getting comment fo transformer block as it is needed for this rule to execute
         """
-        datasource_program_df = pd.read_csv(input_datasource_program_file)
+        datasource_comment_index = cached_datasource_comment_index(
+            input_datasource_program_file
+        )
 
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_comment_data = cached_comment_store(input_program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
 
@@ -936,7 +943,7 @@ def execute_rule_26_programwise(
                 cc2_result = check_detail_2_programwise(
                     autorun_rung_groups_df=autorun_rung_groups_df,
                     program_comment_data=program_comment_data,
-                    datasource_program_df=datasource_program_df,
+                    datasource_comment_index=datasource_comment_index,
                     detection_3_operand=detection_3_operand,
                     previous_comment=previous_comment,
                     present_comment=present_comment,
@@ -4,13 +4,14 @@ import pandas as pd
 from typing import *
 import re
 import polars as pl
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
     get_the_comment_from_program,
 )
 from .ladder_utils import regex_pattern_check, clean_rung_number
-from .rule_27_ladder_utils import get_series_contacts_coil
+from .rung_graph import first_series_chain_ending_with
 
 # ============================================ Comments referenced in Rule 27 processing ============================================
 # memory feed Complete （記憶送り完了）/memory feed timing （記憶送りタイミング）/ memory shift timing （記憶シフトタイミング）/ memory shift Complete （記憶シフト完了）
@@ -59,25 +60,15 @@ ng_content = {
 
 
 # condition of 3.1 and 3.2 for matching with reset coil in check content 4.1 and 4.2
-def extract_first_sublist_with_last_operand(data, target):
-    for sublist in data:
-        if not sublist:
-            continue
-        last_item = sublist[-1]
-
-        # Check if the operand of the last item equals the target
-        if last_item.get("operand") == target:
-            # Simplify each item in the sublist
-            simplified_sublist = [
-                {
-                    k: item[k]
-                    for k in ["operand", "negated", "edge", "latch"]
-                    if k in item
-                }
-                for item in sublist
-            ]
-            return simplified_sublist
-    return []
+def extract_first_sublist_with_last_operand(rung_df, target):
+    # First series chain of contacts and coils ending with the target operand
+    sublist = first_series_chain_ending_with(rung_df, target)
+
+    # Simplify each item in the sublist
+    return [
+        {k: item[k] for k in ["operand", "negated", "edge", "latch"] if k in item}
+        for item in sublist
+    ]
 
 
 def parse_attr(x):
@@ -610,11 +601,8 @@ def check_detail_4_1_programwise(
         detection_3_2_rung_number_details_polar = pl.from_pandas(
             detection_3_2_rung_number_details
         )
-        detection_3_2_get_series_data = get_series_contacts_coil(
-            detection_3_2_rung_number_details_polar
-        )
         detection_3_2_condition = extract_first_sublist_with_last_operand(
-            detection_3_2_get_series_data, target=detection_3_2_operand
+            detection_3_2_rung_number_details_polar, target=detection_3_2_operand
         )
 
         for _, memory_rung_df in memory_feeding_rung_groups_df:
@@ -630,11 +618,9 @@ def check_detail_4_1_programwise(
                     detection_3_1_reset_coil_rung_detail_polar = pl.from_pandas(
                         detection_3_1_reset_coil_rung_detail
                     )
-                    detection_3_1_get_series_data = get_series_contacts_coil(
-                        detection_3_1_reset_coil_rung_detail_polar
-                    )
                     detection_3_1_condition = extract_first_sublist_with_last_operand(
-                        detection_3_1_get_series_data, target=detection_3_1_operand
+                        detection_3_1_reset_coil_rung_detail_polar,
+                        target=detection_3_1_operand,
                     )
                     detection_3_1_3_2_condition_status = conditions_match_except_last(
                         detection_3_1_condition, detection_3_2_condition
@@ -675,11 +661,8 @@ def check_detail_4_2_programwise(
         detection_3_1_rung_number_details_polar = pl.from_pandas(
             detection_3_1_rung_number_details
         )
-        detection_3_1_get_series_data = get_series_contacts_coil(
-            detection_3_1_rung_number_details_polar
-        )
         detection_3_1_condition = extract_first_sublist_with_last_operand(
-            detection_3_1_get_series_data, target=detection_3_1_operand
+            detection_3_1_rung_number_details_polar, target=detection_3_1_operand
         )
 
         for _, memory_rung_df in memory_feeding_rung_groups_df:
@@ -695,11 +678,9 @@ def check_detail_4_2_programwise(
                     detection_3_2_reset_coil_rung_detail_polar = pl.from_pandas(
                         detection_3_2_reset_coil_rung_detail
                     )
-                    detection_3_2_get_series_data = get_series_contacts_coil(
-                        detection_3_2_reset_coil_rung_detail_polar
-                    )
                     detection_3_2_condition = extract_first_sublist_with_last_operand(
-                        detection_3_2_get_series_data, target=detection_3_2_operand
+                        detection_3_2_reset_coil_rung_detail_polar,
+                        target=detection_3_2_operand,
                     )
                     detection_3_1_3_2_condition_status = conditions_match_except_last(
                         detection_3_2_condition, detection_3_1_condition
@@ -1119,8 +1100,8 @@ def execute_rule_27_programwise(
 
     try:
 
-        program_df = pd.read_csv(input_program_file)
-        input_image_program_df = pd.read_csv(input_image)
+        program_df = cached_read_csv(input_program_file)
+        input_image_program_df = cached_read_csv(input_image)
 
         task_names = (
             input_image_program_df[
@@ -1134,8 +1115,7 @@ def execute_rule_27_programwise(
         """
         for getting comment fo transformer block as it is needed for this rule to execute
         """
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_comment_data = cached_comment_store(input_program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
 
@@ -3,13 +3,18 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv_pl
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
     get_the_comment_from_program,
 )
-from .ladder_utils import regex_pattern_check, clean_rung_number
+from .ladder_utils import (
+    regex_pattern_check,
+    regex_pattern_check_patterns,
+    clean_rung_number,
+)
 
 
 #########################
@@ -59,12 +64,11 @@ def execute_rule_3(
 
     acceptable_en_block_list = ["=", ">", "<", "<>", "<=", "=>"]
 
-    with open(input_program_comment_file, "r", encoding="utf-8") as file:
-        comment_data = json.load(file)
+    comment_data = cached_comment_store(input_program_comment_file)
 
     try:
 
-        ladder_df = pl.read_csv(input_file)
+        ladder_df = cached_read_csv_pl(input_file)
         unique_program_values = ladder_df[program_key].unique()
 
         print("input_file", input_file)
@@ -350,9 +354,15 @@ def execute_rule_3(
 
                                     comment_patterns_to_checked = [ok_jp, normal_jp]
 
-                                    for pattern_ in comment_patterns_to_checked:
+                                    pattern_matches = regex_pattern_check_patterns(
+                                        comment_patterns_to_checked, comment_list
+                                    )
+
+                                    for pattern_, matched in zip(
+                                        comment_patterns_to_checked, pattern_matches
+                                    ):
 
-                                        if regex_pattern_check(pattern_, comment_list):
+                                        if matched:
 
                                             ok_outcoil_found_flag = 1
                                             ok_outcoil_operand = coil_operand
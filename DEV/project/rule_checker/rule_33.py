@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
@@ -97,9 +98,9 @@ def execute_rule_33(
     output_rows = []
 
     try:
-        program_df = pd.read_csv(input_program_file)
+        program_df = cached_read_csv(input_program_file)
 
-        input_image_program_df = pd.read_csv(input_image)
+        input_image_program_df = cached_read_csv(input_image)
 
         task_names = (
             input_image_program_df[
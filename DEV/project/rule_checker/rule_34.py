@@ -3,14 +3,15 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
     get_the_comment_from_function,
 )
 from .ladder_utils import regex_pattern_check, clean_rung_number
-from .rule_34_ladder_utils import check_self_holding
+from .self_holding import check_self_holding
 
 # ============================ Rule 34: Definitions, Content, and Configuration Details ============================
 
@@ -246,10 +247,9 @@ def execute_rule_34_programwise(
 
     try:
 
-        program_df = pd.read_csv(input_program_file)
-        input_image_program_df = pd.read_csv(input_image)
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        input_image_program_df = cached_read_csv(input_image)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         task_names = (
             input_image_program_df[
@@ -3,15 +3,16 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 import pprint
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
     get_the_comment_from_function,
 )
-from .ladder_utils import regex_pattern_check, clean_rung_number
-from .rule_71_ladder_utils import get_series_contacts
+from .ladder_utils import regex_pattern_check_patterns, clean_rung_number
+from .rung_graph import contacts_in_series
 
 
 # ============================ Rule 71: Definitions, Content, and Configuration Details ============================
@@ -67,12 +68,19 @@ def detection_range_programwise(
                 coil_operand, program, program_comment_data
             )
             if isinstance(coil_comment, list) and coil_comment:
-                if regex_pattern_check(workpiece_comment, coil_comment) and (
-                    regex_pattern_check(unmatch_comment_1, coil_comment)
-                    or regex_pattern_check(unmatch_comment_2, coil_comment)
-                    or regex_pattern_check(match_comment, coil_comment)
-                    or regex_pattern_check(state_comment, coil_comment)
-                ):
+                workpiece, unmatch_1, unmatch_2, match, state = (
+                    regex_pattern_check_patterns(
+                        [
+                            workpiece_comment,
+                            unmatch_comment_1,
+                            unmatch_comment_2,
+                            match_comment,
+                            state_comment,
+                        ],
+                        coil_comment,
+                    )
+                )
+                if workpiece and (unmatch_1 or unmatch_2 or match or state):
                     match_outcoil[index] = {
                         "coil": coil_operand,
                         "rung_number": coil_row["RUNG"],
@@ -120,13 +128,13 @@ def check_detail_2_programwise(
                 contact_comment = get_the_comment_from_program(
                     contact_operand, program, program_comment_data
                 )
+                workpiece, with_1, with_2, confirm = regex_pattern_check_patterns(
+                    [workpiece_comment, with_comment_1, with_comment_2, confirm_comment],
+                    contact_comment,
+                )
                 if (
-                    regex_pattern_check(workpiece_comment, contact_comment)
-                    and (
-                        regex_pattern_check(with_comment_1, contact_comment)
-                        or regex_pattern_check(with_comment_2, contact_comment)
-                        or regex_pattern_check(confirm_comment, contact_comment)
-                    )
+                    workpiece
+                    and (with_1 or with_2 or confirm)
                     and negated_operand == "false"
                 ):
                     status = "OK"
@@ -217,14 +225,11 @@ def check_detail_4_programwise(
                 contact_comment = get_the_comment_from_program(
                     contact_operand, program, program_comment_data
                 )
-                if (
-                    regex_pattern_check(workpiece_comment, contact_comment)
-                    and (
-                        regex_pattern_check(without_comment_1, contact_comment)
-                        or regex_pattern_check(without_comment_2, contact_comment)
-                    )
-                    and negated_operand == "false"
-                ):
+                workpiece, without_1, without_2 = regex_pattern_check_patterns(
+                    [workpiece_comment, without_comment_1, without_comment_2],
+                    contact_comment,
+                )
+                if workpiece and (without_1 or without_2) and negated_operand == "false":
                     status = "OK"
                     cc4_contact = contact_operand
                     break
@@ -344,17 +349,10 @@ def check_detail_6_programwise(
                     (fault_section_df["RUNG"] == rung_number)
                     & (fault_section_df["OBJECT_TYPE_LIST"].str.lower() == "contact")
                 ]
-                get_series_connect_data = get_series_contacts(
-                    pl.from_pandas(current_rung_contact_df)
-                )
-                series_contact_operands_only = [
-                    [item.get("operand") for item in sublist]
-                    for sublist in get_series_connect_data
-                ]
-                for series_contact in series_contact_operands_only:
-                    if cc2_contact in series_contact and cc4_contact in series_contact:
-                        status = "NG"
-                        break
+                if contacts_in_series(
+                    pl.from_pandas(current_rung_contact_df), [cc2_contact, cc4_contact]
+                ):
+                    status = "NG"
 
     return {
         "status": status,
@@ -374,9 +372,8 @@ def execute_rule_35_programwise(
     output_rows = []
 
     try:
-        program_df = pd.read_csv(input_program_file)
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
         for program in unique_program_values:
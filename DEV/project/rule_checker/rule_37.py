@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
@@ -173,7 +174,7 @@ def execute_rule_37(
     output_rows = []
 
     try:
-        program_df = pd.read_csv(input_program_file)
+        program_df = cached_read_csv(input_program_file)
 
         unique_program_values = program_df[program_key].unique()
         for program in unique_program_values:
@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
@@ -323,8 +324,8 @@ def execute_rule_40_program_functionwise(
     try:
         all_program_function_data = []
 
-        program_df = pd.read_csv(input_program_file)
-        function_df = pd.read_csv(input_function_file)
+        program_df = cached_read_csv(input_program_file)
+        function_df = cached_read_csv(input_function_file)
 
         unique_program_names = program_df["PROGRAM"].unique()
         unique_function_names = function_df["FUNCTION_BLOCK"].unique()
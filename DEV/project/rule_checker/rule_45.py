@@ -3,14 +3,16 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 import pprint
 from rich import print as rprint
 from rich.pretty import Pretty
 from .extract_comment_from_variable import get_the_comment_from_function, get_the_comment_from_program
-from .ladder_utils import regex_pattern_check, clean_rung_number
-from .rule_45_self_holding import check_self_holding, get_series_contacts
+from .ladder_utils import regex_pattern_check, regex_pattern_check_patterns, clean_rung_number
+from .rule_45_self_holding import check_self_holding
+from .rung_graph import contacts_in_series
 # from rule_27_ladder_utils import get_block_connections, get_comments_from_datasource, get_series_contacts_coil
 
 # ============================================ Comments referenced in Rule 25 processing ============================================
@@ -81,7 +83,7 @@ ng_content = {
 
 # def execute_rule_45_programwise(input_program_file:str, input_program_comment_file:str) -> pd.DataFrame:
 
-#     program_df = pd.read_csv(input_program_file)
+#     program_df = cached_read_csv(input_program_file)
 #     all_comment = [automatic_stop_comment, cycle_stop_comment, fault_stop_comment, warning_comment, operation_fault_comment]
 
 
@@ -578,11 +580,7 @@ def check_detail_9_programwise(fault_section_df:pd.DataFrame, all_rung_comment_f
 
                         if found_count == total_contact_operands:
                             # Check if all contacts appear together in any series
-                            all_contact_in_series = get_series_contacts(pl.from_pandas(contact_coil_df))
-                            series_contact_operands_only = [
-                                [item.get('operand') for item in sublist] for sublist in all_contact_in_series
-                            ]
-                            if any(all(elem in series for elem in contact_list) for series in series_contact_operands_only):
+                            if contacts_in_series(pl.from_pandas(contact_coil_df), contact_list):
                                 check_flags[check_flag] = True
                                 break
 
@@ -763,21 +761,10 @@ def check_detail_10_programwise(fault_section_df:pd.DataFrame, all_rung_comment_
 
         # Get all contacts in the rung
         contact_df = fault_section_df[fault_section_df['RUNG'] == current_rung_number]
-        all_contact_in_series = get_series_contacts(pl.from_pandas(contact_df))
-        
-        # Extract operand + negated info
-        series_contact_operands_only = [
-            [{'operand': item.get('operand'), 'negated': item.get('negated')} for item in sublist]
-            for sublist in all_contact_in_series
-        ]
 
         # Check if all other_than_last_contact are present with negated == 'false' in any one series
-        result = any(
-            all(
-                any(d['operand'] == op and d['negated'] == 'false' for d in series)
-                for op in other_than_last_contact
-            )
-            for series in series_contact_operands_only
+        result = contacts_in_series(
+            pl.from_pandas(contact_df), other_than_last_contact, negated='false'
         )
 
         all_result[circuit_name] = result
@@ -888,16 +875,9 @@ def check_detail_11_programwise(fault_section_df:pd.DataFrame, all_rung_comment_
     # ---- 5. If found, check contact conditions ----
     if current_rung_number != -1:
         contact_df = fault_section_df[fault_section_df['RUNG'] == current_rung_number]
-        all_contact_in_series = get_series_contacts(pl.from_pandas(contact_df))
-
-        series_contact_operands_only = [
-            [{'operand': item.get('operand'), 'negated': item.get('negated')} for item in sublist]
-            for sublist in all_contact_in_series
-        ]
 
-        result = any(
-            all(any(c['operand'] == op and c['negated'] == 'false' for c in series) for op in all_contact_total)
-            for series in series_contact_operands_only
+        result = contacts_in_series(
+            pl.from_pandas(contact_df), all_contact_total, negated='false'
         )
 
     print("result", result)
@@ -1160,36 +1140,58 @@ def fetch_matched_rung_no_without_total(fault_section_rung_group_df:pd.DataFrame
 
     for _, fault_df in fault_section_rung_group_df:
         rung_name_str = str(fault_df['RUNG_NAME'].iloc[0])
+        (
+            emergency_stop,
+            independent_device,
+            total,
+            automatic_stop,
+            cycle_stop,
+            fault_stop,
+            warning,
+            operation_fault,
+        ) = regex_pattern_check_patterns(
+            [
+                emergency_stop_comment,
+                independent_device_comment,
+                total_comment,
+                automatic_stop_comment,
+                cycle_stop_comment,
+                fault_stop_comment,
+                warning_comment,
+                operation_fault_comment,
+            ],
+            [rung_name_str],
+        )
         # if  all_rung_comment_details_without_total['emergency_stop']['rung_no']==-1 and regex_pattern_check(emergency_stop_comment, [rung_name_str]) and not regex_pattern_check(independent_device_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(emergency_stop_comment, [rung_name_str]) and not regex_pattern_check(independent_device_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
+        if emergency_stop and not independent_device and not total:
             all_rung_comment_details_without_total['emergency_stop']['rung_no'] = int(fault_df['RUNG'].iloc[0])
         
         # if  all_rung_comment_details_without_total['emergency_stop_with_independence_device']['rung_no']==-1 and regex_pattern_check(emergency_stop_comment, [rung_name_str]) and regex_pattern_check(independent_device_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(emergency_stop_comment, [rung_name_str]) and regex_pattern_check(independent_device_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
+        if emergency_stop and independent_device and not total:
             all_rung_comment_details_without_total['emergency_stop_with_independence_device']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
         # if  all_rung_comment_details_without_total['automatic_stop']['rung_no']==-1 and regex_pattern_check(automatic_stop_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(automatic_stop_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
+        if automatic_stop and not total:
             all_rung_comment_details_without_total['automatic_stop']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
         # if  all_rung_comment_details_without_total['cycle_stop']['rung_no']==-1 and (regex_pattern_check(cycle_stop_comment, [rung_name_str])) and not regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(cycle_stop_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
+        if cycle_stop and not total:
             all_rung_comment_details_without_total['cycle_stop']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
         # if  all_rung_comment_details_without_total['fault_stop']['rung_no']==-1 and regex_pattern_check(fault_stop_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(fault_stop_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
+        if fault_stop and not total:
             all_rung_comment_details_without_total['fault_stop']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
         # if  all_rung_comment_details_without_total['warning']['rung_no']==-1 and regex_pattern_check(warning_comment, [rung_name_str]) and not regex_pattern_check(independent_device_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(warning_comment, [rung_name_str]) and not regex_pattern_check(independent_device_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
+        if warning and not independent_device and not total:
             all_rung_comment_details_without_total['warning']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
         # if  all_rung_comment_details_without_total['warning_with_independence_device']['rung_no']==-1 and regex_pattern_check(warning_comment, [rung_name_str]) and regex_pattern_check(independent_device_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(warning_comment, [rung_name_str]) and regex_pattern_check(independent_device_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
+        if warning and independent_device and not total:
             all_rung_comment_details_without_total['warning_with_independence_device']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
         # if  all_rung_comment_details_without_total['operation_fault']['rung_no']==-1 and regex_pattern_check(operation_fault_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(operation_fault_comment, [rung_name_str]) and not regex_pattern_check(total_comment, [rung_name_str]):
+        if operation_fault and not total:
             all_rung_comment_details_without_total['operation_fault']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
     return all_rung_comment_details_without_total
@@ -1262,26 +1264,46 @@ def fetch_matched_rung_no_with_total(fault_section_rung_group_df:pd.DataFrame, a
 
     for _, fault_df in fault_section_rung_group_df:
         rung_name_str = str(fault_df['RUNG_NAME'].iloc[0])
+        (
+            emergency_stop,
+            total,
+            independent_device,
+            automatic_stop,
+            cycle_stop,
+            fault_stop,
+            warning,
+        ) = regex_pattern_check_patterns(
+            [
+                emergency_stop_comment,
+                total_comment,
+                independent_device_comment,
+                automatic_stop_comment,
+                cycle_stop_comment,
+                fault_stop_comment,
+                warning_comment,
+            ],
+            [rung_name_str],
+        )
 
         # if  all_rung_comment_details_with_total['emergency_stop_total']['rung_no']==-1 and regex_pattern_check(emergency_stop_comment, [rung_name_str]) and regex_pattern_check(total_comment, [rung_name_str]):
        
-        if  regex_pattern_check(emergency_stop_comment, [rung_name_str]) and regex_pattern_check(total_comment, [rung_name_str]) and not regex_pattern_check(independent_device_comment, [rung_name_str]):
+        if emergency_stop and total and not independent_device:
             all_rung_comment_details_with_total['emergency_stop_total']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
         # if  all_rung_comment_details_with_total['automatic_stop_total']['rung_no']==-1 and regex_pattern_check(automatic_stop_comment, [rung_name_str]) and regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(automatic_stop_comment, [rung_name_str]) and regex_pattern_check(total_comment, [rung_name_str]):
+        if automatic_stop and total:
             all_rung_comment_details_with_total['automatic_stop_total']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
         # if  all_rung_comment_details_with_total['cycle_stop_total']['rung_no']==-1 and regex_pattern_check(cycle_stop_comment, [rung_name_str]) and regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(cycle_stop_comment, [rung_name_str]) and regex_pattern_check(total_comment, [rung_name_str]):
+        if cycle_stop and total:
             all_rung_comment_details_with_total['cycle_stop_total']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
         # if  all_rung_comment_details_with_total['fault_stop_total']['rung_no']==-1 and regex_pattern_check(fault_stop_comment, [rung_name_str]) and regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(fault_stop_comment, [rung_name_str]) and regex_pattern_check(total_comment, [rung_name_str]):
+        if fault_stop and total:
             all_rung_comment_details_with_total['fault_stop_total']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
         # if  all_rung_comment_details_with_total['warning_total']['rung_no']==-1 and regex_pattern_check(warning_comment, [rung_name_str]) and regex_pattern_check(total_comment, [rung_name_str]):
-        if  regex_pattern_check(warning_comment, [rung_name_str]) and regex_pattern_check(total_comment, [rung_name_str]):
+        if warning and total:
             all_rung_comment_details_with_total['warning_total']['rung_no'] = int(fault_df['RUNG'].iloc[0])
 
     return all_rung_comment_details_with_total
@@ -1361,9 +1383,8 @@ def filled_outcoil_detail_with_total(fault_section_df, all_rung_comment_filled_r
 ##---------------------------- Execution Program main code here -----------------------------------##
 def execute_rule_45_programwise(input_program_file:str, input_program_comment_file:str) -> pd.DataFrame:
 
-    program_df = pd.read_csv(input_program_file)
-    with open(input_program_comment_file, 'r', encoding="utf-8") as file:
-        program_comment_data = json.load(file)
+    program_df = cached_read_csv(input_program_file)
+    program_comment_data = cached_comment_store(input_program_comment_file)
 
     # print("program_df",program_df)
     unique_program_values = program_df["PROGRAM"].unique()
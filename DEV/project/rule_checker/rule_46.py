@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
@@ -182,7 +183,7 @@ def execute_rule_46_programwise(input_program_file: str) -> pd.DataFrame:
 
     try:
 
-        program_df = pd.read_csv(input_program_file)
+        program_df = cached_read_csv(input_program_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
 
@@ -290,7 +291,7 @@ def execute_rule_46_functionwise(input_function_file: str) -> pd.DataFrame:
 
     try:
 
-        function_df = pd.read_csv(input_function_file)
+        function_df = cached_read_csv(input_function_file)
 
         unique_function_values = function_df["FUNCTION_BLOCK"].unique()
 
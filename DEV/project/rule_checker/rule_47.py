@@ -3,14 +3,16 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
     get_the_comment_from_program,
 )
 from .ladder_utils import regex_pattern_check, clean_rung_number
-from .rule_47_ladder_utils import check_self_holding, get_series_contacts
+from .rule_47_ladder_utils import check_self_holding
+from .rung_graph import contacts_in_series
 
 # ============================================ Comments referenced in Rule 25 processing ============================================
 # memory feed Complete （記憶送り完了）/memory feed timing （記憶送りタイミング）/ memory shift timing （記憶シフトタイミング）/ memory shift Complete （記憶シフト完了）
@@ -231,17 +233,10 @@ def check_detail_4_programwise(
     ].copy()
 
     all_self_holding_coil = check_self_holding(detection_coil_rung_df)
-    get_series_connect_data = get_series_contacts(
-        pl.from_pandas(detection_coil_rung_df)
-    )
-
-    series_contact_operands_only = [
-        [item.get("operand") for item in sublist] for sublist in get_series_connect_data
-    ]
-    for series_contact in series_contact_operands_only:
-        if cc2_contact in series_contact and cc3_contact in series_contact:
-            both_contact_operand_in_series = True
-            break
+    if contacts_in_series(
+        pl.from_pandas(detection_coil_rung_df), [cc2_contact, cc3_contact]
+    ):
+        both_contact_operand_in_series = True
     """
     this is function is for checking if both contact should be in under self holding
     logic is if both contact outcoil is less than self holding outcoil then it is under slef holding
@@ -291,9 +286,8 @@ def execute_rule_47_programwise(
     logger.info("Starting execution of Rule 46")
 
     try:
-        program_df = pd.read_csv(input_program_file)
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        program_comment_data = cached_comment_store(input_program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
         output_rows = []
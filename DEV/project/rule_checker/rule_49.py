@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv, cached_read_csv_pl
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
@@ -11,6 +12,7 @@ from .extract_comment_from_variable import (
 )
 from .rule_47_ladder_utils import *
 from .ladder_utils import regex_pattern_check, clean_rung_number
+from .rung_graph import contacts_in_series
 
 #######################3 Function for execution ##################################
 
@@ -38,8 +40,7 @@ def execute_rule_49(
     safety_confirmation_pattern = r"安全確認"
 
     try:
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            comment_data = json.load(file)
+        comment_data = cached_comment_store(input_program_comment_file)
 
         # output_dict={'TASK_NAME':[], 'SECTION_NAME':[],   'RULE_NUMBER': [], 'CHECK_NUMBER':[], 'RULE_CONTENT':[], 'STATUS': [], 'DETAILS': [], 'NG_EXPLANATION':[]}
         output_dict = {
@@ -54,8 +55,8 @@ def execute_rule_49(
         }
         output_df = pd.DataFrame(output_dict)
 
-        ladder_df = pl.read_csv(input_file)
-        ladder_df_pd = pd.read_csv(input_file)
+        ladder_df = cached_read_csv_pl(input_file)
+        ladder_df_pd = cached_read_csv(input_file)
 
         unique_program_values = ladder_df[program_key].unique()
         program_range_dict = {}
@@ -314,48 +315,40 @@ def execute_rule_49(
                                 ladder_fault["RUNG"] == rung_of_interest
                             )
 
-                            series_contacts_list = get_series_contacts(rung_df)
-                            series_contacts_operands = [
-                                [entry.get("operand", "NONE") for entry in sublist]
-                                for sublist in series_contacts_list
-                            ]
-
-                            series_contacts_operands_set_list = [
-                                set(ele) for ele in series_contacts_operands
-                            ]
                             series_operand_list = set(series_operand_list)
 
-                            # Check for Series connections
-                            has_series_connection = False
-                            for ele_set in series_contacts_operands_set_list:
-                                if ele_set == series_operand_list:
+                            # Check for Series connections: one chain of exactly these contacts
+                            has_series_connection = bool(
+                                series_operand_list
+                            ) and contacts_in_series(
+                                rung_df, list(series_operand_list), exact=True
+                            )
+                            if has_series_connection:
 
-                                    check_4_1_flag = 1
-                                    # Write the data to dataframe
-                                    detail_dict = {}
-                                    detail_dict["target_rung"] = rung_of_interest
-                                    detail_dict["A_contact"] = A_contact
-                                    detail_dict["B_contact"] = B_contact
+                                check_4_1_flag = 1
+                                # Write the data to dataframe
+                                detail_dict = {}
+                                detail_dict["target_rung"] = rung_of_interest
+                                detail_dict["A_contact"] = A_contact
+                                detail_dict["B_contact"] = B_contact
 
-                                    has_series_connection = True
-                                    break
-                                    # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':['Fault'], 'RULE_NUMBER': ["49"],
-                                    #         'CHECK_NUMBER':["4.1"], 'RULE_CONTENT':['A Contact , B Contact are to be in Series connection'],
-                                    #             'STATUS': ['OK'], 'DETAILS': [detail_dict],
-                                    #             'NG_EXPLANATION':['NONE']}
+                                # sub_dict={'TASK_NAME':[program], 'SECTION_NAME':['Fault'], 'RULE_NUMBER': ["49"],
+                                #         'CHECK_NUMBER':["4.1"], 'RULE_CONTENT':['A Contact , B Contact are to be in Series connection'],
+                                #             'STATUS': ['OK'], 'DETAILS': [detail_dict],
+                                #             'NG_EXPLANATION':['NONE']}
 
-                                    # sub_dict={'Result':["OK"], 'Task':[program], 'Section': ['Fault'],
-                                    #                 'RungNo':[rung_of_interest], "Target":[detail_dict],
-                                    #                 'CheckItem':rule_49_check_item,
-                                    #                 'Detail': [''],  'Status': ['']}
+                                # sub_dict={'Result':["OK"], 'Task':[program], 'Section': ['Fault'],
+                                #                 'RungNo':[rung_of_interest], "Target":[detail_dict],
+                                #                 'CheckItem':rule_49_check_item,
+                                #                 'Detail': [''],  'Status': ['']}
 
-                                    # sub_df=pd.DataFrame(sub_dict)
+                                # sub_df=pd.DataFrame(sub_dict)
 
-                                    # output_df=pd.concat([output_df, sub_df], ignore_index=True)
+                                # output_df=pd.concat([output_df, sub_df], ignore_index=True)
 
-                                    # logger.warning(f" Contact chain {ele_set} is in series connection in \n program:{program} \n Body : Fault \n Rung: {rung_num}")
-                                    # print("Series Confirmed")
-                                    # break
+                                # logger.warning(f" Contact chain {ele_set} is in series connection in \n program:{program} \n Body : Fault \n Rung: {rung_num}")
+                                # print("Series Confirmed")
+                                # break
 
                             # Check for Self holding, 4.2
                             if rung_of_interest != 0 and has_series_connection:
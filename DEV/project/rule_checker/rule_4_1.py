@@ -2,7 +2,8 @@ from typing import *
 import polars as pl
 import re
 import pandas as pd
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv_pl
 from .extract_comment_from_variable import *
 from .japanese_half_full_width_mapping import full_to_half_conversion
 from .ladder_utils import regex_pattern_check, clean_rung_number
@@ -72,8 +73,8 @@ def execute_rule_4_1_programwise(
 
         ##################################################
 
-        ladder_df = pl.read_csv(input_file)
-        input_image_program_df = pl.read_csv(input_image)
+        ladder_df = cached_read_csv_pl(input_file)
+        input_image_program_df = cached_read_csv_pl(input_image)
 
         task_names = (
             input_image_program_df.filter(
@@ -84,8 +85,7 @@ def execute_rule_4_1_programwise(
             .to_list()
         )
 
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_comment_data = cached_comment_store(input_program_comment_file)
 
         unique_program_values = ladder_df["PROGRAM"].unique()
 
@@ -662,8 +662,8 @@ def execute_rule_4_1_functionwise(
 
         ##################################################
 
-        ladder_df = pl.read_csv(input_file)
-        input_image_function_df = pl.read_csv(input_image)
+        ladder_df = cached_read_csv_pl(input_file)
+        input_image_function_df = cached_read_csv_pl(input_image)
 
         task_names = (
             input_image_function_df.filter(
@@ -674,8 +674,7 @@ def execute_rule_4_1_functionwise(
             .to_list()
         )
 
-        with open(input_function_comment_file, "r", encoding="utf-8") as file:
-            function_comment_data = json.load(file)
+        function_comment_data = cached_comment_store(input_function_comment_file)
 
         unique_function_values = ladder_df["FUNCTION_BLOCK"].unique()
 
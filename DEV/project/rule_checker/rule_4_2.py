@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
@@ -585,15 +586,14 @@ def execute_rule_4_2_program_wise(
     logger.info("Executing Rule 4.2 program wise")
 
     try:
-        program_df = pd.read_csv(input_file)
+        program_df = cached_read_csv(input_file)
         # Check if input_image is provided
         if input_image is None:
             # If Task-csv file is not provided, create an empty DataFrame with required columns
             input_image_program_df = pd.DataFrame(columns=["Unit", "Task name"])
         else:
-            input_image_program_df = pd.read_csv(input_image)
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+            input_image_program_df = cached_read_csv(input_image)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         task_names = (
             input_image_program_df[
@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
@@ -13,8 +14,7 @@ from .rule_4_3_ladder_utils import (
     get_parallel_contacts,
     get_format_parellel_contact_detail,
 )
-from .ladder_utils import regex_pattern_check, clean_rung_number
-from .japanese_half_full_width_mapping import full_to_half_conversion
+from .ladder_utils import regex_pattern_check, clean_rung_number, to_half_width
 
 # ============================================ Comments referenced in Rule 4.3 processing ============================================
 rule_content_cc = {
@@ -60,13 +60,8 @@ def check_chuck_operation_condition_from_program(
             )
             if isinstance(comment, list):
 
-                unchuck_comment = "".join(
-                    full_to_half_conversion.get(char, char) for char in unchuck_comment
-                )
-                comment = [
-                    "".join(full_to_half_conversion.get(char, char) for char in c)
-                    for c in comment
-                ]
+                unchuck_comment = to_half_width(unchuck_comment)
+                comment = [to_half_width(c) for c in comment]
                 """
                     check unchuck should not be there 
                     """
@@ -381,18 +376,9 @@ def check_detail_2_programwise(
                             contact_operand, program_name, program_comment_data
                         )
                         if isinstance(contact_comment, list):
-                            unchuck_comment = "".join(
-                                full_to_half_conversion.get(char, char)
-                                for char in unchuck_comment
-                            )
-
-                            contact_comment = [
-                                "".join(
-                                    full_to_half_conversion.get(char, char)
-                                    for char in c
-                                )
-                                for c in contact_comment
-                            ]
+                            unchuck_comment = to_half_width(unchuck_comment)
+
+                            contact_comment = [to_half_width(c) for c in contact_comment]
                             """
                             check unchuck should not be there 
                             """
@@ -563,8 +549,8 @@ def execute_rule_4_3_program_wise(
     logger.info("Executing Rule 4.3 program wise")
 
     try:
-        program_df = pd.read_csv(input_file)
-        input_image_program_df = pd.read_csv(input_image)
+        program_df = cached_read_csv(input_file)
+        input_image_program_df = cached_read_csv(input_image)
         task_names = (
             input_image_program_df[
                 input_image_program_df["Unit"].astype(str).str.lower() == "p&p"
@@ -574,8 +560,7 @@ def execute_rule_4_3_program_wise(
             .tolist()
         )
 
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         output_rows = []
         unique_program_values = program_df["PROGRAM"].unique()
@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv, cached_read_csv_pl
 import polars as pl
 from .extract_comment_from_variable import *
 from .ladder_utils import regex_pattern_check, clean_rung_number
@@ -36,8 +37,7 @@ def execute_rule_50(
     rule_50_check_item = "Rule of Air Source Pressure Down Detection Circuit"
 
     try:
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            comment_data = json.load(file)
+        comment_data = cached_comment_store(input_program_comment_file)
 
         # output_dict={'TASK_NAME':[], 'SECTION_NAME':[],   'RULE_NUMBER': [], 'CHECK_NUMBER':[], 'RULE_CONTENT':[], 'STATUS': [], 'DETAILS': [], 'NG_EXPLANATION':[]}
         output_dict = {
@@ -53,8 +53,8 @@ def execute_rule_50(
 
         output_df = pd.DataFrame(output_dict)
 
-        ladder_df = pl.read_csv(input_file)
-        ladder_df_pd = pd.read_csv(input_file)
+        ladder_df = cached_read_csv_pl(input_file)
+        ladder_df_pd = cached_read_csv(input_file)
 
         unique_program_values = ladder_df[program_key].unique()
         program_range_dict = {}
@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_function,
@@ -480,9 +481,8 @@ def execute_rule_55_programwise(
     logger.info("Starting execution of Rule 55")
 
     try:
-        program_df = pd.read_csv(input_program_file)
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        program_comment_data = cached_comment_store(input_program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
         output_rows = []
@@ -661,9 +661,8 @@ def execute_rule_55_functionwise(
 
     try:
 
-        function_df = pd.read_csv(input_function_file)
-        with open(input_function_comment_file, "r", encoding="utf-8") as file:
-            function_comment_data = json.load(file)
+        function_df = cached_read_csv(input_function_file)
+        function_comment_data = cached_comment_store(input_function_comment_file)
 
         unique_function_values = function_df["FUNCTION_BLOCK"].unique()
         output_rows = []
@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from collections import defaultdict
 from .extract_comment_from_variable import (
@@ -11,8 +12,8 @@ from .extract_comment_from_variable import (
     get_the_comment_from_program,
 )
 from .ladder_utils import regex_pattern_check, clean_rung_number
+from .rung_graph import contacts_in_series
 from .rule_56_ladder_utils import (
-    get_series_contacts_coil,
     get_parallel_contacts,
     get_format_parellel_contact_detail,
 )
@@ -245,30 +246,20 @@ def check_detail_2_programwise(
             cc_detection_3_rung_number_details_polar = pl.from_pandas(
                 cc_detection_3_rung_number_details
             )
-            cc2_detection_3_get_series_data = get_series_contacts_coil(
-                cc_detection_3_rung_number_details_polar
-            )
-
-            operand_list_per_rung = [
-                [step["operand"] for step in rung]
-                for rung in cc2_detection_3_get_series_data
-            ]
-            if operand_list_per_rung:
-                for rung_operands in operand_list_per_rung:
-                    if (
-                        not_abnormal_operand in rung_operands
-                        and buzzer_abnormal_operand in rung_operands
-                    ):
-
-                        return {
-                            "cc": "cc2",
-                            "status": "OK",
-                            "check_number": 2,
-                            "target_coil": "",
-                            "rung_number": cc_detection_3_rung_number,
-                            "not_abnormal_operand": not_abnormal_operand,
-                            "buzzer_abnormal_operand": buzzer_abnormal_operand,
-                        }
+            if contacts_in_series(
+                cc_detection_3_rung_number_details_polar,
+                [not_abnormal_operand, buzzer_abnormal_operand],
+                object_types=("Contact", "Coil"),
+            ):
+                return {
+                    "cc": "cc2",
+                    "status": "OK",
+                    "check_number": 2,
+                    "target_coil": "",
+                    "rung_number": cc_detection_3_rung_number,
+                    "not_abnormal_operand": not_abnormal_operand,
+                    "buzzer_abnormal_operand": buzzer_abnormal_operand,
+                }
 
     return {
         "cc": "cc2",
@@ -550,29 +541,20 @@ def check_detail_6_programwise(
             cc_detection_4_rung_number_details_polar = pl.from_pandas(
                 cc_detection_4_rung_number_details
             )
-            cc2_detection_3_get_series_data = get_series_contacts_coil(
-                cc_detection_4_rung_number_details_polar
-            )
-
-            operand_list_per_rung = [
-                [step["operand"] for step in rung]
-                for rung in cc2_detection_3_get_series_data
-            ]
-            if operand_list_per_rung:
-                for rung_operands in operand_list_per_rung:
-                    if (
-                        not_warning_operand in rung_operands
-                        and buzzer_warning_operand in rung_operands
-                    ):
-                        return {
-                            "cc": "cc6",
-                            "status": "OK",
-                            "check_number": 6,
-                            "target_coil": "",
-                            "rung_number": cc_detection_4_rung_number,
-                            "not_warning_operand": not_warning_operand,
-                            "buzzer_warning_operand": buzzer_warning_operand,
-                        }
+            if contacts_in_series(
+                cc_detection_4_rung_number_details_polar,
+                [not_warning_operand, buzzer_warning_operand],
+                object_types=("Contact", "Coil"),
+            ):
+                return {
+                    "cc": "cc6",
+                    "status": "OK",
+                    "check_number": 6,
+                    "target_coil": "",
+                    "rung_number": cc_detection_4_rung_number,
+                    "not_warning_operand": not_warning_operand,
+                    "buzzer_warning_operand": buzzer_warning_operand,
+                }
 
     return {
         "cc": "cc6",
@@ -875,9 +857,8 @@ def execute_rule_56_programwise(
     logger.info("Starting execution of Rule 56")
 
     try:
-        program_df = pd.read_csv(input_program_file)
-        with open(input_program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        program_comment_data = cached_comment_store(input_program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
         output_rows = []
@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
@@ -168,10 +169,9 @@ def execute_rule_63_programwise(
 
     try:
 
-        program_df = pd.read_csv(input_program_file)
+        program_df = cached_read_csv(input_program_file)
 
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
 
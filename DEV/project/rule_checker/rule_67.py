@@ -3,14 +3,15 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
     get_the_comment_from_function,
 )
 from .ladder_utils import regex_pattern_check, clean_rung_number
-from .rule_67_ladder_utils import get_series_contacts
+from .rung_graph import contacts_in_series
 
 # ============================ Rule 67: Definitions, Content, and Configuration Details ============================
 rule_content_67 = "・Indicator light, signal tower, buzzer and emergency stop interlock output are standard circuits."
@@ -658,18 +659,10 @@ def check_detail_11_programwise(
         current_rung_df = deviceout_section_df[
             deviceout_section_df["RUNG"] == rung_number
         ]
-        all_series_contact_data = get_series_contacts(pl.from_pandas(current_rung_df))
-        series_contact_operand_list = [
-            [step["operand"] for step in rung] for rung in all_series_contact_data
-        ]
-        if series_contact_operand_list:
-            for each_series_contact in series_contact_operand_list:
-                if all(
-                    operand in each_series_contact
-                    for operand in [cc8_operand, cc9_operand, cc10_operand]
-                ):
-                    status = "OK"
-                    break
+        if contacts_in_series(
+            pl.from_pandas(current_rung_df), [cc8_operand, cc9_operand, cc10_operand]
+        ):
+            status = "OK"
 
     return {
         "status": status,
@@ -688,10 +681,9 @@ def execute_rule_67_programwise(
 
     try:
 
-        program_df = pd.read_csv(input_program_file)
+        program_df = cached_read_csv(input_program_file)
 
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
 
@@ -3,7 +3,8 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
@@ -135,9 +136,8 @@ def execute_rule_70_programwise(
     output_rows = []
 
     try:
-        program_df = pd.read_csv(input_program_file)
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
         for program in unique_program_values:
@@ -235,9 +235,8 @@ def execute_rule_70_functionwise(
     output_rows = []
 
     try:
-        function_df = pd.read_csv(input_function_file)
-        with open(function_comment_file, "r", encoding="utf-8") as file:
-            function_comment_data = json.load(file)
+        function_df = cached_read_csv(input_function_file)
+        function_comment_data = cached_comment_store(function_comment_file)
 
         unique_function_values = function_df["FUNCTION_BLOCK"].unique()
         for function in unique_function_values:
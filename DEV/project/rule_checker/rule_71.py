@@ -3,14 +3,15 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
     get_the_comment_from_function,
 )
 from .ladder_utils import regex_pattern_check, clean_rung_number
-from .rule_71_ladder_utils import get_series_contacts
+from .rung_graph import contacts_before_operand
 
 
 # ============================ Rule 71: Definitions, Content, and Configuration Details ============================
@@ -167,9 +168,8 @@ def execute_rule_71_programwise(
     output_rows = []
 
     try:
-        program_df = pd.read_csv(input_program_file)
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
         for program in unique_program_values:
@@ -193,53 +193,33 @@ def execute_rule_71_programwise(
                         match_rung_df = device_in_program_df[
                             device_in_program_df["RUNG"] == v["rung_number"]
                         ]
-                        get_series_connect_data = get_series_contacts(
-                            pl.from_pandas(match_rung_df)
-                        )
-                        series_contact_operands_only = [
-                            [item.get("operand") for item in sublist]
-                            for sublist in get_series_connect_data
-                        ]
-                        for series_contact in series_contact_operands_only:
-                            both_coil_contact_present = B_contact in series_contact
-                            if both_coil_contact_present:
-                                for series_contact_operand in series_contact:
-                                    if series_contact_operand == B_contact:
-                                        status = "NG"
-                                        ng_name = ng_content
-                                        break
-
-                                    if series_contact_operand == "PWR_ON":
-                                        status = "OK"
-                                        ng_name = ""
-                                        break
-
-                                    if (
-                                        isinstance(series_contact_operand, str)
-                                        and series_contact_operand
-                                    ):
-                                        comment = get_the_comment_from_program(
-                                            series_contact_operand,
-                                            program,
-                                            program_comment_data,
-                                        )
-                                        if (
-                                            regex_pattern_check(
-                                                communication_comment, comment
-                                            )
-                                            or regex_pattern_check(
-                                                network_comment, comment
-                                            )
-                                        ) and regex_pattern_check(
-                                            normal_comment, comment
-                                        ):
-                                            status = "OK"
-                                            ng_name = ""
-                                            break
-
-                            if status == "OK":
+                        # Contacts in series before the B contact on one of its chains
+                        for series_contact in contacts_before_operand(
+                            pl.from_pandas(match_rung_df), B_contact
+                        ):
+                            series_contact_operand = series_contact.get("operand")
+                            if series_contact_operand == "PWR_ON":
+                                status = "OK"
+                                ng_name = ""
                                 break
 
+                            if (
+                                isinstance(series_contact_operand, str)
+                                and series_contact_operand
+                            ):
+                                comment = get_the_comment_from_program(
+                                    series_contact_operand,
+                                    program,
+                                    program_comment_data,
+                                )
+                                if (
+                                    regex_pattern_check(communication_comment, comment)
+                                    or regex_pattern_check(network_comment, comment)
+                                ) and regex_pattern_check(normal_comment, comment):
+                                    status = "OK"
+                                    ng_name = ""
+                                    break
+
                         rung_number = (
                             v.get("rung_number") - 1
                             if v.get("rung_number") != -1
@@ -296,9 +276,8 @@ def execute_rule_71_functionwise(
     output_rows = []
 
     try:
-        function_df = pd.read_csv(input_function_file)
-        with open(function_comment_file, "r", encoding="utf-8") as file:
-            function_comment_data = json.load(file)
+        function_df = cached_read_csv(input_function_file)
+        function_comment_data = cached_comment_store(function_comment_file)
 
         unique_function_values = function_df["FUNCTION_BLOCK"].unique()
         for function in unique_function_values:
@@ -324,53 +303,33 @@ def execute_rule_71_functionwise(
                         match_rung_df = device_in_function_df[
                             device_in_function_df["RUNG"] == v["rung_number"]
                         ]
-                        get_series_connect_data = get_series_contacts(
-                            pl.from_pandas(match_rung_df)
-                        )
-                        series_contact_operands_only = [
-                            [item.get("operand") for item in sublist]
-                            for sublist in get_series_connect_data
-                        ]
-                        for series_contact in series_contact_operands_only:
-                            both_coil_contact_present = B_contact in series_contact
-                            if both_coil_contact_present:
-                                for series_contact_operand in series_contact:
-                                    if series_contact_operand == B_contact:
-                                        status = "NG"
-                                        ng_name = ng_content
-                                        break
-
-                                    if series_contact_operand == "PWR_ON":
-                                        status = "OK"
-                                        ng_name = ""
-                                        break
-
-                                    if (
-                                        isinstance(series_contact_operand, str)
-                                        and series_contact_operand
-                                    ):
-                                        comment = get_the_comment_from_function(
-                                            series_contact_operand,
-                                            function,
-                                            function_comment_data,
-                                        )
-                                        if (
-                                            regex_pattern_check(
-                                                communication_comment, comment
-                                            )
-                                            or regex_pattern_check(
-                                                network_comment, comment
-                                            )
-                                        ) and regex_pattern_check(
-                                            normal_comment, comment
-                                        ):
-                                            status = "OK"
-                                            ng_name = ""
-                                            break
-
-                            if status == "OK":
+                        # Contacts in series before the B contact on one of its chains
+                        for series_contact in contacts_before_operand(
+                            pl.from_pandas(match_rung_df), B_contact
+                        ):
+                            series_contact_operand = series_contact.get("operand")
+                            if series_contact_operand == "PWR_ON":
+                                status = "OK"
+                                ng_name = ""
                                 break
 
+                            if (
+                                isinstance(series_contact_operand, str)
+                                and series_contact_operand
+                            ):
+                                comment = get_the_comment_from_function(
+                                    series_contact_operand,
+                                    function,
+                                    function_comment_data,
+                                )
+                                if (
+                                    regex_pattern_check(communication_comment, comment)
+                                    or regex_pattern_check(network_comment, comment)
+                                ) and regex_pattern_check(normal_comment, comment):
+                                    status = "OK"
+                                    ng_name = ""
+                                    break
+
                         rung_number = (
                             v.get("rung_number") - 1
                             if v.get("rung_number") != -1
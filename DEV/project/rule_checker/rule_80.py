@@ -3,14 +3,15 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
     get_the_comment_from_function,
 )
 from .ladder_utils import regex_pattern_check, clean_rung_number
-from .rule_80_ladder_utils import get_series_contacts
+from .rung_graph import contacts_in_series
 
 # ============================ Rule 80: Definitions, Content, and Configuration Details ============================
 
@@ -144,19 +145,12 @@ def check_detail_2_programwise(
                                     auxiliary_comment, coil_comment
                                 )
                             ):
-                                get_series_connect_data = get_series_contacts(
-                                    pl.from_pandas(current_rung_df)
-                                )
-                                series_contact_operands_only = [
-                                    [item.get("operand") for item in sublist]
-                                    for sublist in get_series_connect_data
-                                ]
-                                for series_contact in series_contact_operands_only:
-                                    if contact_operand in series_contact:
-                                        status = "OK"
-                                        rung_number = coil_row["RUNG"]
-                                        target_coil = coil_operand
-                                        break
+                                if contacts_in_series(
+                                    pl.from_pandas(current_rung_df), [contact_operand]
+                                ):
+                                    status = "OK"
+                                    rung_number = coil_row["RUNG"]
+                                    target_coil = coil_operand
 
                             if status == "OK":
                                 break
@@ -185,9 +179,8 @@ def execute_rule_80_programwise(
 
     try:
 
-        program_df = pd.read_csv(input_program_file)
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
 
@@ -3,14 +3,15 @@ import json
 import pandas as pd
 from typing import *
 import re
-from ...main import logger
+from loguru import logger
+from .data_model import cached_comment_store, cached_read_csv
 import polars as pl
 from .extract_comment_from_variable import (
     get_the_comment_from_program,
     get_the_comment_from_function,
 )
 from .ladder_utils import regex_pattern_check, clean_rung_number
-from .rule_93_self_holding import check_self_holding
+from .self_holding import check_self_holding
 
 # ============================ Rule 34: Definitions, Content, and Configuration Details ============================
 
@@ -335,9 +336,8 @@ def execute_rule_93_programwise(
 
         output_rows = []
 
-        program_df = pd.read_csv(input_program_file)
-        with open(program_comment_file, "r", encoding="utf-8") as file:
-            program_comment_data = json.load(file)
+        program_df = cached_read_csv(input_program_file)
+        program_comment_data = cached_comment_store(program_comment_file)
 
         unique_program_values = program_df["PROGRAM"].unique()
 
@@ -439,9 +439,8 @@ def execute_rule_93_functionwise(
 
         output_rows = []
 
-        function_df = pd.read_csv(input_function_file)
-        with open(function_comment_file, "r", encoding="utf-8") as file:
-            function_comment_data = json.load(file)
+        function_df = cached_read_csv(input_function_file)
+        function_comment_data = cached_comment_store(function_comment_file)
 
         unique_function_values = function_df["FUNCTION_BLOCK"].unique()
 
@@ -0,0 +1,229 @@
+import asyncio
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import *
+
+import pandas as pd
+
+from loguru import logger
+from .data_model import DataModel
+
+#########################################################################################
+#
+# Parallel rule execution
+#
+# The rules are independent of each other and CPU bound (pandas/polars and pure Python
+# graph walks), so running them one after another on a single thread left the other
+# cores idle. RuleScheduler runs the selected rules on a process pool:
+#   - only the DataModel paths are sent to the workers; every worker process parses the
+#     request's files once and reuses them for all rules it runs for that request,
+#   - results are awaited in the order of the rule list, so progress messages and the
+#     merged output keep the order of the request,
+#   - an exception inside a rule is returned as a FAILED status, and a worker that dies
+#     (segfault, OOM kill) only fails the rule that was running in it: the unfinished
+#     rules are re-run one by one in their own process.
+# With max_workers=1 the rules run sequentially in a thread, as before.
+#
+#########################################################################################
+
+RESULT_COLUMNS = [
+    "Result",
+    "Task",
+    "Section",
+    "RungNo",
+    "Target",
+    "CheckItem",
+    "Detail",
+    "Status",
+]
+
+# DataModels kept per worker process, keyed by request_id
+_WORKER_DATA_MODELS_KEPT = 2
+_worker_data_models: "OrderedDict[str, DataModel]" = OrderedDict()
+
+
+def _worker_data_model(data_model: DataModel) -> DataModel:
+
+    cached = _worker_data_models.get(data_model.request_id)
+    if cached is None:
+        _worker_data_models[data_model.request_id] = data_model
+        while len(_worker_data_models) > _WORKER_DATA_MODELS_KEPT:
+            _worker_data_models.popitem(last=False)
+        return data_model
+
+    _worker_data_models.move_to_end(data_model.request_id)
+
+    return cached
+
+
+def run_rule(rule_function: Callable, data_model: DataModel) -> Dict:
+    """Run one rules.py wrapper; an exception becomes a FAILED status."""
+
+    try:
+        return rule_function(_worker_data_model(data_model))
+    except Exception as e:
+        logger.error(f"Rule {getattr(rule_function, '__name__', rule_function)}: {e}")
+        return {"status": "FAILED", "error": str(e)}
+
+
+def merge_rule_results(
+    results: List[Tuple[str, Optional[Dict]]],
+) -> Tuple[pd.DataFrame, Dict]:
+    """Combine the (rule id, status) results into one output frame and a status per rule.
+
+    results must be in request order; the output rows follow it, so the merged frame
+    does not depend on which worker finished first.
+    """
+
+    rule_status = {}
+    all_outputs = []
+
+    for rl, function_status in results:
+
+        if function_status is None:
+            rule_status[rl] = "Rule number not implemented or present"
+            continue
+
+        if (
+            function_status.get("status") == "SUCCESS"
+            and isinstance(function_status.get("output_df"), pd.DataFrame)
+            and not function_status["output_df"].empty
+        ):
+            all_outputs.append(function_status["output_df"][RESULT_COLUMNS])
+            rule_status[rl] = "SUCCESS"
+
+        else:
+            if isinstance(function_status.get("output_df"), pd.DataFrame):
+                function_status["output_df"] = function_status["output_df"].to_dict(
+                    orient="records"
+                )
+            if "output_df" not in function_status and "error" not in function_status:
+                function_status = "FAILED"
+            rule_status[rl] = function_status
+
+    if not all_outputs:
+        return pd.DataFrame(columns=RESULT_COLUMNS), rule_status
+
+    return pd.concat(all_outputs, ignore_index=True), rule_status
+
+
+def rule_checker_workers() -> int:
+    """Worker processes from RULE_CHECKER_WORKERS (default: one per CPU)."""
+
+    value = os.getenv("RULE_CHECKER_WORKERS", "").strip()
+
+    try:
+        return max(1, int(value)) if value else os.cpu_count() or 1
+    except ValueError:
+        logger.error(f"Invalid RULE_CHECKER_WORKERS value {value!r}, using 1")
+        return 1
+
+
+class RuleScheduler:
+    """Runs rule wrappers for a DataModel on a lazily started, reused process pool."""
+
+    def __init__(self, max_workers: int):
+
+        self.max_workers = max(1, max_workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+
+        if self._pool is None:
+            # spawn: forking the threaded server process can inherit held locks
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        return self._pool
+
+    def shutdown(self) -> None:
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _run_isolated(self, rule_function: Callable, data_model: DataModel) -> Dict:
+        """Re-run a rule alone in a fresh process after the shared pool broke."""
+
+        loop = asyncio.get_running_loop()
+        executor = ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        )
+
+        try:
+            return await loop.run_in_executor(
+                executor, run_rule, rule_function, data_model
+            )
+        except BrokenProcessPool:
+            logger.error(f"Worker process crashed while running {rule_function.__name__}")
+            return {"status": "FAILED", "error": "Worker process crashed"}
+        except Exception as e:
+            return {"status": "FAILED", "error": str(e)}
+        finally:
+            executor.shutdown(wait=False)
+
+    async def run(
+        self,
+        rules: List[Tuple[str, Optional[Callable]]],
+        data_model: DataModel,
+        on_progress: Optional[Callable[[int, int, str], Awaitable]] = None,
+    ) -> List[Tuple[str, Optional[Dict]]]:
+        """Run (rule id, wrapper) pairs and return (rule id, status) in the same order.
+
+        A missing wrapper gives a None status. on_progress(idx, total, rule id) is
+        awaited once per rule, in rule order, as soon as that rule has finished.
+        """
+
+        loop = asyncio.get_running_loop()
+        total = len(rules)
+
+        if self.max_workers == 1:
+            futures = [None] * total
+        else:
+            # Converted here once instead of in every worker
+            await asyncio.to_thread(data_model.convert_legacy_files)
+            executor = self._executor()
+            futures = [
+                (
+                    loop.run_in_executor(executor, run_rule, function, data_model)
+                    if function
+                    else None
+                )
+                for _, function in rules
+            ]
+
+        results = []
+        pool_broken = False
+
+        for idx, (rl, function) in enumerate(rules, start=1):
+
+            if function is None:
+                function_status = None
+
+            elif self.max_workers == 1:
+                function_status = await asyncio.to_thread(run_rule, function, data_model)
+
+            else:
+                try:
+                    function_status = await futures[idx - 1]
+                except BrokenProcessPool:
+                    if not pool_broken:
+                        logger.error("Rule checker worker pool broke, isolating rules")
+                        pool_broken = True
+                        self.shutdown()
+                    function_status = await self._run_isolated(function, data_model)
+                except Exception as e:
+                    logger.error(f"Rule {rl}: {e}")
+                    function_status = {"status": "FAILED", "error": str(e)}
+
+            if on_progress is not None:
+                await on_progress(idx, total, rl)
+
+            results.append((rl, function_status))
+
+        return results
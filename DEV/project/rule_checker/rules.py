@@ -46,8 +46,10 @@ from .rule_90 import execute_rule_90_programwise
 from .rule_93 import execute_rule_93_programwise, execute_rule_93_functionwise
 from .rule_94 import execute_rule_94_programwise, execute_rule_94_functionwise
 from .rule_100 import execute_rule_100
+from .data_model import uses_data_model
 
 
+@uses_data_model
 def rule1(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     
     program_output_status_df = execute_rule_1_programwise(program_file_csv, program_comment_file)
@@ -67,6 +69,7 @@ def rule1(program_file_csv, program_comment_file, datasource_program_file, funct
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule2(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_2(program_file_csv, program_comment_file, program_key="PROGRAM", body_type_key="BODY")
     function_output_status_df = execute_rule_2(function_file_csv, function_comment_file, program_key="FUNCTION_BLOCK", body_type_key="BODY_TYPE")
@@ -86,6 +89,7 @@ def rule2(program_file_csv, program_comment_file, datasource_program_file, funct
 
 
 
+@uses_data_model
 def rule3(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_3(program_file_csv, program_comment_file, program_key="PROGRAM", body_type_key="BODY")
     function_output_status_df = execute_rule_3(function_file_csv, function_comment_file, program_key="FUNCTION_BLOCK", body_type_key="BODY_TYPE")
@@ -113,6 +117,7 @@ def rule3(program_file_csv, program_comment_file, datasource_program_file, funct
 
 
 
+@uses_data_model
 def rule4_1(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_4_1_programwise(program_file_csv, program_comment_file, input_image)
     function_output_status_df = execute_rule_4_1_functionwise(function_file_csv, function_comment_file, input_image)
@@ -132,6 +137,7 @@ def rule4_1(program_file_csv, program_comment_file, datasource_program_file, fun
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule4_2(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_4_2_program_wise(program_file_csv, program_comment_file, input_image)
     program_status = program_output_status_df.get('status')
@@ -142,6 +148,7 @@ def rule4_2(program_file_csv, program_comment_file, datasource_program_file, fun
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule4_3(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_4_3_program_wise(program_file_csv, program_comment_file, input_image)
     program_status = program_output_status_df.get('status')
@@ -154,6 +161,7 @@ def rule4_3(program_file_csv, program_comment_file, datasource_program_file, fun
 
 
 
+@uses_data_model
 def rule10(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_10(program_file_csv, input_image, program_key="PROGRAM", body_type_key="BODY")
     program_status = program_output_status_df.get('status')
@@ -165,6 +173,7 @@ def rule10(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule11(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_11(program_file_csv, input_image, program_key="PROGRAM", body_type_key="BODY")
     program_status = program_output_status_df.get('status')
@@ -175,6 +184,7 @@ def rule11(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule12(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_12_programwise(program_file_csv, program_comment_file, input_image)
     program_status = program_output_status_df.get('status')
@@ -186,6 +196,7 @@ def rule12(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule14(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_14(program_file_csv, input_image, program_key="PROGRAM", body_type_key="BODY")
     program_status = program_output_status_df.get('status')
@@ -197,6 +208,7 @@ def rule14(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule15(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_15(program_file_csv, input_image, program_key="PROGRAM", body_type_key="BODY")
     program_status = program_output_status_df.get('status')
@@ -208,6 +220,7 @@ def rule15(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule16(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 18")
     program_output_status_df = execute_rule_16_programwise(program_file_csv, program_comment_file)
@@ -227,6 +240,7 @@ def rule16(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule18(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 18")
 
@@ -239,6 +253,7 @@ def rule18(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
     
+@uses_data_model
 def rule19(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 18")
     program_output_status_df = execute_rule_19_programwise(program_file_csv, program_comment_file, input_image)
@@ -250,6 +265,7 @@ def rule19(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule20(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 18")
     program_output_status_df = execute_rule_20_programwise(program_file_csv, program_comment_file, input_image)
@@ -261,6 +277,7 @@ def rule20(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule24(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 18")
     program_output_status_df = execute_rule_24_programwise(program_file_csv, program_comment_file, input_image)
@@ -273,6 +290,7 @@ def rule24(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule25(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 18")
     program_output_status_df = execute_rule_25_programwise(program_file_csv, program_comment_file, datasource_program_file, input_image)
@@ -285,6 +303,7 @@ def rule25(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule26(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 18")
     program_output_status_df = execute_rule_26_programwise(program_file_csv, program_comment_file, datasource_program_file, input_image)
@@ -296,6 +315,7 @@ def rule26(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule27(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 18")
     program_output_status_df = execute_rule_27_programwise(program_file_csv, program_comment_file, input_image)
@@ -308,6 +328,7 @@ def rule27(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule33(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 33")
 
@@ -320,6 +341,7 @@ def rule33(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
     
+@uses_data_model
 def rule34(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 34")
 
@@ -333,6 +355,7 @@ def rule34(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
     
 
+@uses_data_model
 def rule35(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 33")
 
@@ -345,6 +368,7 @@ def rule35(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule37(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 33")
 
@@ -365,6 +389,7 @@ def rule37(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule40(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 40")
 
@@ -378,6 +403,7 @@ def rule40(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_function_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule45(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_45_programwise(program_file_csv, program_comment_file)
     # function_output_status_df = execute_rule_4_1_functionwise(function_file_csv, function_comment_file,  input_image)
@@ -396,6 +422,7 @@ def rule45(program_file_csv, program_comment_file, datasource_program_file, func
     # else:
     return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule46(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_46_programwise(program_file_csv)
     function_output_status_df = execute_rule_46_functionwise(function_file_csv)
@@ -415,6 +442,7 @@ def rule46(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule47(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_47_programwise(program_file_csv, program_comment_file)
     program_status = program_output_status_df.get('status')
@@ -425,6 +453,7 @@ def rule47(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule48(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_48_programwise(program_file_csv, program_comment_file)
     program_status = program_output_status_df.get('status')
@@ -435,6 +464,7 @@ def rule48(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule49(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_49(program_file_csv, program_comment_file, program_key="PROGRAM", body_type_key="BODY")
     program_status = program_output_status_df.get('status')
@@ -445,6 +475,7 @@ def rule49(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule50(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     program_output_status_df = execute_rule_50(program_file_csv, program_comment_file, program_key="PROGRAM", body_type_key="BODY")
     program_status = program_output_status_df.get('status')
@@ -455,6 +486,7 @@ def rule50(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule51(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_51_programwise(program_file_csv, program_comment_file)
@@ -466,6 +498,7 @@ def rule51(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule55(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_55_programwise(program_file_csv, program_comment_file)
@@ -484,6 +517,7 @@ def rule55(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule56(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_56_programwise(program_file_csv, program_comment_file)
@@ -495,6 +529,7 @@ def rule56(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule62(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_62_programwise(program_file_csv, program_comment_file)
@@ -506,6 +541,7 @@ def rule62(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule63(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_63_programwise(program_file_csv, program_comment_file)
@@ -517,6 +553,7 @@ def rule63(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule67(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_67_programwise(program_file_csv, program_comment_file)
@@ -529,6 +566,7 @@ def rule67(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule70(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_70_programwise(program_file_csv, program_comment_file)
@@ -547,6 +585,7 @@ def rule70(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule71(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_71_programwise(program_file_csv, program_comment_file)
@@ -565,6 +604,7 @@ def rule71(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule76(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 76")
 
@@ -578,6 +618,7 @@ def rule76(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
     
 
+@uses_data_model
 def rule80(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_80_programwise(program_file_csv, program_comment_file)
@@ -589,6 +630,7 @@ def rule80(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
     
+@uses_data_model
 def rule90(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_90_programwise(program_file_csv, program_comment_file)
@@ -607,6 +649,7 @@ def rule90(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
+@uses_data_model
 def rule93(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_93_programwise(program_file_csv, program_comment_file)
@@ -625,6 +668,7 @@ def rule93(program_file_csv, program_comment_file, datasource_program_file, func
     else:
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
     
+@uses_data_model
 def rule94(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
 
     program_output_status_df = execute_rule_94_programwise(program_file_csv, program_comment_file)
@@ -644,6 +688,7 @@ def rule94(program_file_csv, program_comment_file, datasource_program_file, func
         return {"status": "FAILED", "error": program_output_status_df.get('error', 'Error Occured')}
 
 
+@uses_data_model
 def rule100(program_file_csv, program_comment_file, datasource_program_file, function_file_csv, function_comment_file, datasource_function_file, input_image):
     print("Executing Rule 100")
     program_function_status_df = execute_rule_100(program_file_csv, function_file_csv)
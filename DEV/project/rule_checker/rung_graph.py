@@ -0,0 +1,938 @@
+import json
+import threading
+from collections import OrderedDict, defaultdict
+from typing import *
+
+import pandas as pd
+from loguru import logger
+
+from ..data_model_format import parse_attributes
+
+#########################################################################################
+#
+# Rung connectivity graph
+#
+# In the ladder data model every object lists the connection point ids it consumes
+# (in_list, <parameter>_inVar_in_list, ...) and produces (out_list,
+# <parameter>_outVar_out_list, ...). The get_block_connections copies in the
+# rule_*_ladder_utils modules compared every list attribute of a block with every list
+# attribute of every other object, parsing the attributes again in the innermost loop.
+#
+# RungGraph parses the rows once and indexes connection id -> (object, attribute key)
+# for the producing (*out_list) and consuming (*in_list) keys, so resolving what is
+# wired to a block parameter is a dictionary lookup.
+#
+# SeriesParallelAnalyser replaces the path enumeration of build_chains for the series /
+# parallel contact questions, see the section further down.
+#
+#########################################################################################
+
+IN_LIST_KEY = "in_list"
+OUT_LIST_KEY = "out_list"
+
+
+class RungObject(NamedTuple):
+
+    index: int
+    name: str
+    object_type: str
+    attributes: Dict
+
+
+class RungGraph:
+    """Connection point index over the objects of one rung (or any data model slice)."""
+
+    def __init__(self, objects: List[RungObject]):
+
+        self.objects = objects
+
+        # connection id -> [(object index, key position, key)] in row/key order
+        self.producers: Dict[Any, List[Tuple[int, int, str]]] = defaultdict(list)
+        self.consumers: Dict[Any, List[Tuple[int, int, str]]] = defaultdict(list)
+
+        for rung_object in objects:
+            for position, (key, value) in enumerate(rung_object.attributes.items()):
+                if type(value) is not list:
+                    continue
+                for index_map, marker in (
+                    (self.producers, OUT_LIST_KEY),
+                    (self.consumers, IN_LIST_KEY),
+                ):
+                    if marker in key:
+                        for connection_id in set(value):
+                            index_map[connection_id].append(
+                                (rung_object.index, position, key)
+                            )
+
+    @classmethod
+    def from_frame(cls, ladder_df) -> "RungGraph":
+        """Build the graph from data model rows (pandas or polars)."""
+
+        return cls(
+            [
+                RungObject(index, name, object_type, parse_attributes(attributes))
+                for index, (name, object_type, attributes) in enumerate(
+                    zip(
+                        list(ladder_df["OBJECT"]),
+                        list(ladder_df["OBJECT_TYPE_LIST"]),
+                        list(ladder_df["ATTRIBUTES"]),
+                    )
+                )
+            ]
+        )
+
+    def connected_keys(self, index: int, key: str) -> List[Tuple[int, str]]:
+        """(object index, key) pairs of the other objects sharing a connection with index.key.
+
+        An *in_list key is matched with *out_list keys and vice versa, in row order and
+        then attribute order, each pair once.
+        """
+
+        value = self.objects[index].attributes.get(key)
+        if type(value) is not list:
+            return []
+
+        matches = set()
+        for index_map, marker in (
+            (self.producers, IN_LIST_KEY),
+            (self.consumers, OUT_LIST_KEY),
+        ):
+            if marker in key:
+                for connection_id in set(value):
+                    matches.update(
+                        match
+                        for match in index_map.get(connection_id, ())
+                        if match[0] != index
+                    )
+
+        return [(other, other_key) for other, _, other_key in sorted(matches)]
+
+
+###   Block connections #############
+
+
+def block_parameter_prefix(block_key: str, direction: str) -> str:
+    """Parameter label used by most rules: the text before the first underscore."""
+
+    return block_key.split("_")[0]
+
+
+# Suffixes tried in order by block_parameter_name; the input side historically looked
+# for "inVar_in_list" without the leading underscore
+_PARAMETER_SUFFIXES = {
+    IN_LIST_KEY: [
+        "inVar_in_list",
+        "_inVar_in_order",
+        "_outVar_out_list",
+        "_outVar_out_order",
+        "_OUT_outVar_out_list",
+        "_outVar_out_list",
+    ],
+    OUT_LIST_KEY: [
+        "_inVar_in_list",
+        "_inVar_in_order",
+        "_outVar_out_list",
+        "_outVar_out_order",
+        "_OUT_outVar_out_list",
+        "_outVar_out_list",
+    ],
+}
+
+
+def block_parameter_name(block_key: str, direction: str) -> str:
+    """Full parameter name (keeps underscores inside the name), used by rules 10-16/71/80."""
+
+    matched_key = next(
+        (suffix for suffix in _PARAMETER_SUFFIXES[direction] if suffix in block_key),
+        None,
+    )
+    if matched_key:
+        return block_key.split(matched_key)[0].rstrip("_")
+
+    return block_key.split("_")[0]
+
+
+def _connected_label(rung_object: RungObject, direction: str) -> Optional[str]:
+
+    if direction == IN_LIST_KEY:
+        if rung_object.object_type == "DataSource":
+            return rung_object.attributes["identifier"]
+        if rung_object.object_type == "LeftPowerRail":
+            return "LeftPowerRail"
+    else:
+        if rung_object.object_type == "DataSink":
+            return rung_object.attributes["identifier"]
+        if rung_object.object_type == "RightPowerRail":
+            return "RightPowerRail"
+
+    if rung_object.object_type in ("Contact", "Coil"):
+        return rung_object.attributes["operand"]
+
+    return None
+
+
+def get_block_connections(
+    ladder_df: pd.DataFrame,
+    parameter_label: Callable[[str, str], str] = block_parameter_prefix,
+    rung_graph: Optional[RungGraph] = None,
+) -> List[Dict]:
+    """What is wired to each block parameter, one {typeName: [...]} dict per block.
+
+    Every (block parameter key, connected object key) pair sharing a connection id adds
+    one entry to the list: {label: [operand | identifier | power rail]} for contacts,
+    coils, data sources/sinks and power rails, {} for anything else (e.g. another block).
+    """
+
+    if rung_graph is None:
+        rung_graph = RungGraph.from_frame(ladder_df)
+
+    output_list = []
+
+    for block in rung_graph.objects:
+
+        if block.object_type != "Block" or len(block.attributes) == 0:
+            continue
+
+        connections = []
+
+        for block_key in block.attributes:
+            for other, other_key in rung_graph.connected_keys(block.index, block_key):
+
+                # A key could in theory be on both sides, so check each direction like before
+                connection = {}
+                other_object = rung_graph.objects[other]
+                for direction, other_marker in (
+                    (IN_LIST_KEY, OUT_LIST_KEY),
+                    (OUT_LIST_KEY, IN_LIST_KEY),
+                ):
+                    if direction in block_key and other_marker in other_key:
+                        label = _connected_label(other_object, direction)
+                        if label is not None:
+                            connection.setdefault(
+                                parameter_label(block_key, direction), []
+                            ).append(label)
+                        connections.append(connection)
+
+        output_list.append({block.attributes["typeName"]: connections})
+
+    return output_list
+
+
+###   Series / parallel structure #############
+#
+# build_chains listed every maximal path ("chain") starting at every object, and the
+# series/parallel helpers scanned those chains. The number of chains grows
+# exponentially with the parallel branches of a rung.
+#
+# SeriesParallelAnalyser works on the object DAG instead (edge a -> b when an id of
+# a's out_list is in b's in_list) and precomputes, once per rung, the successors,
+# reachability bitsets, the number of chains starting at each object and the first
+# chain start reaching each object. That answers "are these objects on one chain",
+# "which objects are in series with X" and "which chain is the first to contain X then
+# Y" without enumerating chains. The chain list itself is still available, built from
+# per-object suffixes instead of one DFS per start, but capped at MAX_CHAINS; the rules
+# use the queries below instead.
+#
+# Ladder rungs are acyclic; if a rung is not, everything falls back to the DFS.
+
+# Chains returned by build_chains at most, the rest are dropped with a warning
+MAX_CHAINS = 100000
+
+
+class SeriesParallelAnalyser:
+    """Reachability structure of the in_list/out_list DAG of a list of attribute dicts."""
+
+    def __init__(self, attributes: List[Dict]):
+
+        self.size = len(attributes)
+
+        producers = defaultdict(list)
+        for index, attribute in enumerate(attributes):
+            for connection_id in set(attribute.get("out_list", [])):
+                producers[connection_id].append(index)
+
+        successors = [set() for _ in range(self.size)]
+        for index, attribute in enumerate(attributes):
+            for connection_id in set(attribute.get("in_list", [])):
+                for producer in producers.get(connection_id, ()):
+                    if producer != index:
+                        successors[producer].add(index)
+
+        self.successors = [sorted(successor) for successor in successors]
+        self.predecessors = [[] for _ in range(self.size)]
+        for index, successor in enumerate(self.successors):
+            for other in successor:
+                self.predecessors[other].append(index)
+
+        self.order = _topological_order(self.successors)
+        self.is_dag = len(self.order) == self.size
+
+        if not self.is_dag:
+            return
+
+        self.reach = [0] * self.size
+        self.path_counts = [0] * self.size
+        for index in reversed(self.order):
+            reach = 1 << index
+            for other in self.successors[index]:
+                reach |= self.reach[other]
+            self.reach[index] = reach
+            self.path_counts[index] = (
+                sum(self.path_counts[other] for other in self.successors[index]) or 1
+            )
+
+        # Smallest chain start from which an object can be reached (itself included)
+        self.first_start = list(range(self.size))
+        for index in self.order:
+            for other in self.successors[index]:
+                if self.first_start[index] < self.first_start[other]:
+                    self.first_start[other] = self.first_start[index]
+
+        # Position of the first chain of every start in the enumeration
+        self.chain_offsets = [0] * self.size
+        for index in range(1, self.size):
+            self.chain_offsets[index] = (
+                self.chain_offsets[index - 1] + self.path_counts[index - 1]
+            )
+
+    def reaches(self, source: int, target: int) -> bool:
+        """True when target is source or lies downstream of it."""
+
+        return bool((self.reach[source] >> target) & 1)
+
+    def in_series(self, index: int) -> List[int]:
+        """Objects that share at least one chain with index (itself included)."""
+
+        return [
+            other
+            for other in range(self.size)
+            if self.reaches(index, other) or self.reaches(other, index)
+        ]
+
+    def chains(self) -> List[List[int]]:
+        """build_chains as object indices, in the same order (at most MAX_CHAINS)."""
+
+        if not self.is_dag:
+            return _dfs_chains(self.successors)
+
+        if sum(self.path_counts) > MAX_CHAINS:
+            logger.warning(
+                f"Rung has {sum(self.path_counts)} chains, only the first {MAX_CHAINS} are listed"
+            )
+            return _dfs_chains(self.successors)
+
+        suffixes = [None] * self.size
+        for index in reversed(self.order):
+            if not self.successors[index]:
+                suffixes[index] = [[index]]
+            else:
+                suffixes[index] = [
+                    [index] + suffix
+                    for other in self.successors[index]
+                    for suffix in suffixes[other]
+                ]
+
+        return [chain for index in range(self.size) for chain in suffixes[index]]
+
+    def first_chain(self, through: List[int]) -> Tuple[int, List[int]]:
+        """Enumeration index and objects of the first chain visiting through in order.
+
+        Every object of through must be reachable from the previous one.
+        """
+
+        start = self.first_start[through[0]]
+        chain_index = self.chain_offsets[start]
+        chain = [start]
+        targets = list(through)
+
+        current = start
+        while True:
+            while targets and targets[0] == current:
+                targets.pop(0)
+
+            if not self.successors[current]:
+                return chain_index, chain
+
+            for other in self.successors[current]:
+                if not targets or self.reaches(other, targets[0]):
+                    break
+                chain_index += self.path_counts[other]
+
+            chain.append(other)
+            current = other
+
+    def first_chain_ending_in(self, targets: Set[int]) -> List[int]:
+        """Objects of the first chain whose last object is in targets ([] if none)."""
+
+        if not self.is_dag:
+            return next((chain for chain in self.chains() if chain[-1] in targets), [])
+
+        # Chains end at objects without successors
+        target_mask = 0
+        for index in targets:
+            if not self.successors[index]:
+                target_mask |= 1 << index
+
+        for start in range(self.size):
+            if not self.reach[start] & target_mask:
+                continue
+
+            chain = [start]
+            while self.successors[chain[-1]]:
+                chain.append(
+                    next(
+                        other
+                        for other in self.successors[chain[-1]]
+                        if self.reach[other] & target_mask
+                    )
+                )
+            return chain
+
+        return []
+
+    def upstream_of(self, targets: Set[int]) -> Set[int]:
+        """Objects followed on some chain by an object of targets with no other target
+        object in between (targets themselves excluded)."""
+
+        upstream = set()
+        pending = list(targets)
+        while pending:
+            for other in self.predecessors[pending.pop()]:
+                if other not in targets and other not in upstream:
+                    upstream.add(other)
+                    pending.append(other)
+
+        return upstream
+
+    def has_chain_through(
+        self, groups: List[Set[int]], allowed: Optional[Set[int]] = None
+    ) -> bool:
+        """True when one chain contains an object of every group. With allowed set, only
+        chains made of allowed objects count."""
+
+        if not self.size:
+            return False
+
+        if not self.is_dag or len(groups) > 16:
+            return any(
+                all(group & set(chain) for group in groups)
+                and (allowed is None or allowed.issuperset(chain))
+                for chain in self.chains()
+            )
+
+        full_mask = (1 << len(groups)) - 1
+        object_masks = [0] * self.size
+        for bit, group in enumerate(groups):
+            for index in group:
+                object_masks[index] |= 1 << bit
+
+        # Group masks covered by some path ending at each object
+        masks = [set() for _ in range(self.size)]
+        for index in self.order:
+            if allowed is not None and index not in allowed:
+                continue
+            own = {object_masks[index]}
+            for other in self.predecessors[index]:
+                own.update(mask | object_masks[index] for mask in masks[other])
+            # Any path extends to a chain; restricted to allowed, it must end here
+            if full_mask in own and (allowed is None or not self.successors[index]):
+                return True
+            masks[index] = own
+
+        return False
+
+
+def _topological_order(successors: List[List[int]]) -> List[int]:
+
+    in_degree = [0] * len(successors)
+    for successor in successors:
+        for other in successor:
+            in_degree[other] += 1
+
+    ready = [index for index, degree in enumerate(in_degree) if degree == 0]
+    order = []
+    while ready:
+        index = ready.pop()
+        order.append(index)
+        for other in successors[index]:
+            in_degree[other] -= 1
+            if in_degree[other] == 0:
+                ready.append(other)
+
+    return order
+
+
+def _dfs_chains(successors: List[List[int]]) -> List[List[int]]:
+    """The original build_chains walk, stopped after MAX_CHAINS; used for cyclic
+    graphs and for rungs with too many chains to share suffixes."""
+
+    chains = []
+
+    def dfs(path, visited):
+        extended = False
+        for other in successors[path[-1]]:
+            if len(chains) >= MAX_CHAINS:
+                return
+            if other in visited:
+                continue
+            dfs(path + [other], visited | {other})
+            extended = True
+        if not extended:
+            chains.append(path)
+
+    for index in range(len(successors)):
+        if len(chains) >= MAX_CHAINS:
+            break
+        dfs([index], {index})
+
+    return chains
+
+
+def build_chains(data: List[Dict]) -> List[List[Dict]]:
+    """Every maximal in_list/out_list path starting at every dict of data."""
+
+    return [
+        [data[index] for index in chain]
+        for chain in series_parallel_analyser(data).chains()
+    ]
+
+
+_ANALYSER_CACHE_SIZE = 256
+_analyser_cache: "OrderedDict[Tuple, SeriesParallelAnalyser]" = OrderedDict()
+_analyser_lock = threading.Lock()
+
+
+def series_parallel_analyser(attributes: List[Dict]) -> SeriesParallelAnalyser:
+    """SeriesParallelAnalyser of attributes, shared between calls on the same rung."""
+
+    key = tuple(
+        (tuple(attribute.get("in_list", [])), tuple(attribute.get("out_list", [])))
+        for attribute in attributes
+    )
+
+    with _analyser_lock:
+        analyser = _analyser_cache.get(key)
+        if analyser is not None:
+            _analyser_cache.move_to_end(key)
+            return analyser
+
+    analyser = SeriesParallelAnalyser(attributes)
+
+    with _analyser_lock:
+        _analyser_cache[key] = analyser
+        while len(_analyser_cache) > _ANALYSER_CACHE_SIZE:
+            _analyser_cache.popitem(last=False)
+
+    return analyser
+
+
+def _attributes_of_type(ladder_df, object_types: Tuple[str, ...]) -> List[Dict]:
+
+    return [
+        parse_attributes(attributes)
+        for object_type, attributes in zip(
+            list(ladder_df["OBJECT_TYPE_LIST"]), list(ladder_df["ATTRIBUTES"])
+        )
+        if object_type in object_types
+    ]
+
+
+###   Series contacts #############
+
+
+def get_series_contacts(ladder_df: pd.DataFrame) -> List:
+    """Chains (lists of attribute dicts) of the contacts of ladder_df."""
+
+    return build_chains(_attributes_of_type(ladder_df, ("Contact",)))
+
+
+def get_series_contacts_coil(ladder_df: pd.DataFrame) -> List:
+    """Chains of the contacts and coils of ladder_df."""
+
+    return build_chains(_attributes_of_type(ladder_df, ("Contact", "Coil")))
+
+
+def contacts_in_series(
+    ladder_df: pd.DataFrame,
+    operands: List[str],
+    negated: Optional[str] = None,
+    object_types: Tuple[str, ...] = ("Contact",),
+    excluded: Iterable[str] = (),
+    exact: bool = False,
+) -> bool:
+    """True when one chain of get_series_contacts(ladder_df) holds every operand.
+
+    With negated set, only contacts with that negated attribute count. object_types
+    ("Contact", "Coil") asks about the chains of get_series_contacts_coil. The chain must
+    not hold an operand of excluded, nor with exact set any operand not in operands.
+    """
+
+    contacts = _attributes_of_type(ladder_df, object_types)
+    excluded = set(excluded)
+
+    allowed = None
+    if excluded or exact:
+        allowed = {
+            index
+            for index, contact in enumerate(contacts)
+            if contact.get("operand") not in excluded
+            and (not exact or contact.get("operand") in operands)
+        }
+
+    groups = [
+        {
+            index
+            for index, contact in enumerate(contacts)
+            if contact.get("operand") == operand
+            and (negated is None or contact.get("negated") == negated)
+        }
+        for operand in operands
+    ]
+    if not all(groups) and groups:
+        return False
+
+    return series_parallel_analyser(contacts).has_chain_through(groups, allowed)
+
+
+def first_series_chain_ending_with(
+    ladder_df: pd.DataFrame,
+    operand: str,
+    object_types: Tuple[str, ...] = ("Contact", "Coil"),
+) -> List[Dict]:
+    """First chain of get_series_contacts_coil(ladder_df), in the same order, whose last
+    object has operand ([] if none)."""
+
+    attributes = _attributes_of_type(ladder_df, object_types)
+    targets = {
+        index
+        for index, attribute in enumerate(attributes)
+        if attribute.get("operand") == operand
+    }
+    if not targets:
+        return []
+
+    chain = series_parallel_analyser(attributes).first_chain_ending_in(targets)
+
+    return [attributes[index] for index in chain]
+
+
+def contacts_before_operand(ladder_df: pd.DataFrame, operand: str) -> List[Dict]:
+    """Contacts that come before a contact of operand on a chain of
+    get_series_contacts(ladder_df), with no other contact of operand in between."""
+
+    contacts = _attributes_of_type(ladder_df, ("Contact",))
+    targets = {
+        index
+        for index, contact in enumerate(contacts)
+        if contact.get("operand") == operand
+    }
+    if not targets:
+        return []
+
+    upstream = series_parallel_analyser(contacts).upstream_of(targets)
+
+    return [contacts[index] for index in sorted(upstream)]
+
+
+###   Parallel contacts #############
+
+
+class ConnectionSuperNodes:
+    """Disjoint sets of connection ids; lists sharing an id belong to one super node.
+
+    Built once per rung from the in_list/out_list values, after which the super node of
+    any connection id is a near constant time find(). Super nodes are numbered in the
+    order of the first list that reaches them, like create_super_sets.
+    """
+
+    def __init__(self, connection_lists: Iterable[List] = ()):
+
+        self._parent: Dict[Any, Any] = {}
+        self._size: Dict[Any, int] = {}
+        self._list_heads: List[Any] = []
+        self.has_empty = False
+        self._groups: Optional[Dict[Any, List]] = None
+
+        for connection_list in connection_lists:
+            self.add(connection_list)
+
+    def add(self, connection_list: List) -> None:
+
+        if not connection_list:
+            self.has_empty = True
+            return
+
+        self._groups = None
+        head = connection_list[0]
+        self._list_heads.append(head)
+        for connection_id in connection_list:
+            self._union(head, connection_id)
+
+    def find(self, connection_id):
+
+        parent = self._parent
+        if connection_id not in parent:
+            parent[connection_id] = connection_id
+            self._size[connection_id] = 1
+            return connection_id
+
+        # Path halving
+        while parent[connection_id] != connection_id:
+            parent[connection_id] = parent[parent[connection_id]]
+            connection_id = parent[connection_id]
+
+        return connection_id
+
+    def _union(self, a, b) -> None:
+
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size[root_b]
+
+    def _ordered_groups(self) -> Dict[Any, List]:
+        """root -> sorted members, in super node order."""
+
+        if self._groups is None:
+            members = defaultdict(list)
+            for connection_id in self._parent:
+                members[self.find(connection_id)].append(connection_id)
+
+            self._groups = {}
+            for head in self._list_heads:
+                root = self.find(head)
+                if root not in self._groups:
+                    self._groups[root] = sorted(members[root])
+
+        return self._groups
+
+    def super_nodes(self) -> List[List]:
+        """The sorted super nodes, followed by [] when an empty list was added."""
+
+        groups = list(self._ordered_groups().values())
+        if self.has_empty:
+            groups.append([])
+
+        return groups
+
+    def super_node(self, connection_list: List) -> List:
+        """The super node of a list; unknown ids (and []) are returned unchanged."""
+
+        groups = self._ordered_groups()
+        roots = {
+            self.find(connection_id)
+            for connection_id in connection_list
+            if connection_id in self._parent
+        }
+        if not roots:
+            return connection_list
+        if len(roots) == 1:
+            return groups[roots.pop()]
+
+        # A list that was not added can touch several super nodes: the first one wins
+        return next(group for root, group in groups.items() if root in roots)
+
+
+def create_super_sets(sub_list: List) -> List:
+    """Merge overlapping connection lists into sorted super nodes ([] kept once)."""
+
+    return ConnectionSuperNodes(sub_list).super_nodes()
+
+
+def replace_sub_list_with_super_list(single: List, multi: List[List]) -> List:
+    """The first super node of multi overlapping single, or single itself.
+
+    Scans multi; use ConnectionSuperNodes.super_node to resolve many lists.
+    """
+
+    connection_ids = set(single)
+    for group in multi:
+        if not connection_ids.isdisjoint(group):
+            return group
+
+    return single
+
+
+def dict_to_tuple(d):
+    return tuple(
+        sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in d.items())
+    )
+
+
+def get_unique_dicts(in_list: List) -> List:
+
+    seen = set()
+    unique = []
+    for d in in_list:
+        key = dict_to_tuple(d)
+        if key not in seen:
+            seen.add(key)
+            unique.append(d)
+
+    return unique
+
+
+def _junctions_are_acyclic(attribute_list: List[Dict]) -> bool:
+    """True when no path of the rung can pass the same super node twice.
+
+    Every object is an edge from the super node of its in_list to the one of its
+    out_list; empty lists get a node of their own per object.
+    """
+
+    junction_ids = {}
+    edges = []
+    for index, attribute in enumerate(attribute_list):
+        ends = []
+        for key in ("in_list", "out_list"):
+            junction = tuple(attribute[key]) if attribute[key] else (key, index)
+            ends.append(junction_ids.setdefault(junction, len(junction_ids)))
+        edges.append(ends)
+
+    successors = [[] for _ in range(len(junction_ids))]
+    for source, target in edges:
+        successors[source].append(target)
+
+    return len(_topological_order(successors)) == len(junction_ids)
+
+
+def get_parallel_contacts(ladder_df: pd.DataFrame) -> Dict:
+    """Contacts wired in parallel with each contact of ladder_df.
+
+    Returns {"<contact index>_<chain index>": {"contact_chain": [first, last],
+    "ref_contact": contact}}: for each contact, the contact leaving the same super node
+    and the contact entering the same super node on one chain, in chain order and
+    without duplicate entries. The attribute dicts carry object_type and super node
+    in_list/out_list.
+    """
+
+    attribute_list = [
+        parse_attributes(attributes) for attributes in list(ladder_df["ATTRIBUTES"])
+    ]
+    for attribute, object_type in zip(
+        attribute_list, list(ladder_df["OBJECT_TYPE_LIST"])
+    ):
+        attribute["object_type"] = object_type
+
+    # Chains follow the raw connection ids, the pairing compares super nodes
+    analyser = series_parallel_analyser(attribute_list)
+
+    super_nodes = ConnectionSuperNodes()
+    for attribute in attribute_list:
+        super_nodes.add(attribute.get("in_list", []))
+        super_nodes.add(attribute.get("out_list", []))
+
+    for attribute in attribute_list:
+        attribute["in_list"] = super_nodes.super_node(attribute.get("in_list", []))
+        attribute["out_list"] = super_nodes.super_node(attribute.get("out_list", []))
+
+    if not analyser.is_dag or not _junctions_are_acyclic(attribute_list):
+        parallel_pairs = _parallel_pairs_from_chains(
+            attribute_list, [
+                [attribute_list[index] for index in chain]
+                for chain in analyser.chains()
+            ]
+        )
+    else:
+        parallel_pairs = _parallel_pairs_from_dag(attribute_list, analyser)
+
+    # Remove the duplicates
+    seen = set()
+    unique_pairs = {}
+    for key, value in parallel_pairs.items():
+        serialized = json.dumps(value, sort_keys=True)
+        if serialized not in seen:
+            seen.add(serialized)
+            unique_pairs[key] = value
+
+    return unique_pairs
+
+
+def _parallel_pairs_from_dag(
+    attribute_list: List[Dict], analyser: SeriesParallelAnalyser
+) -> Dict:
+    """Pairs of the chain walk, computed from reachability.
+
+    With acyclic super nodes a chain passes the super node of a contact's in_list and
+    the one of its out_list at most once, so every chain through a start contact S
+    (same in_list) and then an end contact E (same out_list) yields exactly [S, E],
+    keyed by the first such chain.
+    """
+
+    starts = defaultdict(list)
+    ends = defaultdict(list)
+    for index, attribute in enumerate(attribute_list):
+        if attribute["object_type"] == "Contact":
+            starts[tuple(attribute["in_list"])].append(index)
+            ends[tuple(attribute["out_list"])].append(index)
+
+    parallel_pairs = {}
+
+    for indiv_count, indiv in enumerate(attribute_list):
+
+        if indiv["object_type"] != "Contact":
+            continue
+
+        found = []
+        for start in starts[tuple(indiv["in_list"])]:
+            if attribute_list[start] == indiv:
+                continue
+            for end in ends[tuple(indiv["out_list"])]:
+                if attribute_list[end] != indiv and analyser.reaches(start, end):
+                    chain_count, _ = analyser.first_chain([start, end])
+                    found.append((chain_count, start, end))
+
+        for chain_count, start, end in sorted(found):
+            parallel_pairs[f"{indiv_count}_{chain_count}"] = {
+                "contact_chain": get_unique_dicts(
+                    [attribute_list[start], attribute_list[end]]
+                ),
+                "ref_contact": indiv,
+            }
+
+    return parallel_pairs
+
+
+def _parallel_pairs_from_chains(attribute_list: List[Dict], chains: List) -> Dict:
+    """The original walk over every chain, for rungs that are not acyclic."""
+
+    parallel_pairs = {}
+
+    for indiv_count, indiv in enumerate(attribute_list):
+        if indiv["object_type"] != "Contact":
+            continue
+
+        for chain_count, chain in enumerate(chains):
+            start_point = 0
+            contact_stack = []
+
+            for sub_dict in chain:
+                if sub_dict["object_type"] == "Contact" and indiv != sub_dict:
+                    if indiv["in_list"] == sub_dict["in_list"]:
+                        start_point = 1
+                        contact_stack.append(sub_dict)
+
+                    if indiv["out_list"] == sub_dict["out_list"] and start_point == 1:
+                        contact_stack.append(sub_dict)
+                        parallel_pairs[f"{indiv_count}_{chain_count}"] = {
+                            "contact_chain": get_unique_dicts(contact_stack),
+                            "ref_contact": indiv,
+                        }
+                        break
+
+    return parallel_pairs
+
+
+def get_in_parallel_A_contacts(contact_chain_list: List, contact: str) -> List:
+    """Normally open (A) contacts in parallel with contact, from get_parallel_contacts values."""
+
+    in_parallel_list = []
+    for contact_chain in contact_chain_list:
+        if contact_chain["ref_contact"]["operand"] == contact:
+            for contact_operand in contact_chain["contact_chain"]:
+                if contact_operand.get("negated", "NONE") == "false":
+                    in_parallel_list.append(contact_operand["operand"])
+
+    return in_parallel_list
@@ -0,0 +1,165 @@
+import threading
+from collections import OrderedDict, defaultdict
+from typing import *
+
+import pandas as pd
+
+from ..data_model_format import parse_attributes
+
+#########################################################################################
+#
+# Self holding coils
+#
+# A coil is self holding when a contact of its own operand feeds it, directly or
+# through other contacts. The check_self_holding copies in the rule_* modules walked
+# the contact list recursively once per coil, running ast.literal_eval on every contact
+# at every level of the recursion.
+#
+# SelfHoldingAnalyser parses the contacts of a rung once and indexes them by the
+# connection ids of their out_list, so going from an in_list to the contacts feeding it
+# is a lookup. The walk is iterative and visits the contacts in the same order as the
+# old recursion, which matters for the negated check: a negated contact of the coil
+# operand ends the branch it was found on, and the search goes on with the next one.
+#
+# Results are memoized per rung (keyed by the Coil/Contact rows), so the rules asking
+# about the same rung within a request share the answer.
+#
+#########################################################################################
+
+
+class SelfHoldingAnalyser:
+    """Reverse reachability from coil in_lists over the contacts of one rung."""
+
+    def __init__(self, contacts: List[Dict]):
+
+        self.contacts = contacts
+        self._node_ids = [
+            (
+                contact.get("operand"),
+                tuple(contact.get("in_list", [])),
+                tuple(contact.get("out_list", [])),
+            )
+            for contact in contacts
+        ]
+
+        # connection id -> indices of the contacts producing it, in rung order
+        self._producers: Dict[Any, List[int]] = defaultdict(list)
+        for index, contact in enumerate(contacts):
+            for connection_id in contact.get("out_list", []):
+                self._producers[connection_id].append(index)
+
+        self._results: Dict[Tuple, bool] = {}
+
+    def _feeding(self, in_list: List) -> List[int]:
+        """Contacts with an out_list id in in_list, in rung order."""
+
+        indices = set()
+        for connection_id in in_list:
+            indices.update(self._producers.get(connection_id, ()))
+
+        return sorted(indices)
+
+    def is_self_holding(
+        self, operand: str, in_list: List, check_negated: bool = True
+    ) -> bool:
+        """True when a contact of operand feeds in_list.
+
+        With check_negated only a contact with negated "false" counts, and a contact
+        with negated "true" ends the branch it is on.
+        """
+
+        key = (operand, tuple(in_list), check_negated)
+        if key not in self._results:
+            self._results[key] = self._search(operand, in_list, check_negated)
+
+        return self._results[key]
+
+    def _search(self, operand: str, in_list: List, check_negated: bool) -> bool:
+
+        visited = set()
+        stack = [iter(self._feeding(in_list))]
+
+        while stack:
+            for index in stack[-1]:
+                node_id = self._node_ids[index]
+                if node_id in visited:
+                    continue
+                visited.add(node_id)
+
+                contact = self.contacts[index]
+                if contact.get("operand") == operand:
+                    if not check_negated or contact.get("negated") == "false":
+                        return True
+                    if contact.get("negated") == "true":
+                        stack.pop()
+                        break
+
+                stack.append(iter(self._feeding(contact.get("in_list", []))))
+                break
+            else:
+                stack.pop()
+
+        return False
+
+
+_RESULT_CACHE_SIZE = 1024
+_result_cache: "OrderedDict[Tuple, List[str]]" = OrderedDict()
+_result_lock = threading.Lock()
+
+
+def _rung_key(object_types: List[str], attributes: List) -> Tuple:
+
+    return tuple(
+        (object_type, value if isinstance(value, str) else repr(value))
+        for object_type, value in zip(object_types, attributes)
+        if object_type in ("Coil", "Contact")
+    )
+
+
+def self_holding_coils(ladder_df: pd.DataFrame, check_negated: bool = True) -> List[str]:
+    """Operands of the self holding coils of ladder_df, in row order.
+
+    ladder_df is one rung (pandas or polars). check_negated=False also accepts a
+    negated contact of the coil operand, like the rule 10-16/71 variant did. A rung
+    without coils gives []; a row whose ATTRIBUTES cannot be parsed raises.
+    """
+
+    object_types = list(ladder_df["OBJECT_TYPE_LIST"])
+    attributes = list(ladder_df["ATTRIBUTES"])
+    key = (check_negated, _rung_key(object_types, attributes))
+
+    with _result_lock:
+        cached = _result_cache.get(key)
+        if cached is not None:
+            _result_cache.move_to_end(key)
+            return list(cached)
+
+    coils = []
+    contacts = []
+    for object_type, value in zip(object_types, attributes):
+        if object_type == "Coil":
+            coils.append(parse_attributes(value))
+        elif object_type == "Contact":
+            contacts.append(parse_attributes(value))
+
+    analyser = SelfHoldingAnalyser(contacts)
+    self_holding = [
+        coil.get("operand", "NONE")
+        for coil in coils
+        if analyser.is_self_holding(
+            coil.get("operand", "NONE"), coil.get("in_list", []), check_negated
+        )
+    ]
+
+    with _result_lock:
+        _result_cache[key] = self_holding
+        while len(_result_cache) > _RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
+
+    return list(self_holding)
+
+
+def check_self_holding(ladder_df: pd.DataFrame) -> List[str]:
+    """Self holding coil operands of a rung; negated contacts do not hold."""
+
+    return self_holding_coils(ladder_df)
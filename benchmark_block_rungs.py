@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark the flow control block lookup of rules 10, 11 and 14
+
+Before, the rules walked every row of a program's AutoRun/Preparation sections
+and parsed its ATTRIBUTES to compare the typeName. Now block_rungs filters the
+TYPE_NAME column of the typed data model once. Both lookups run on the
+programwise data model of each sample in input_files (or the given CSVs) and
+their timings are printed side by side, together with whether they found the
+same blocks in the same order. Loading the data model is timed separately: the
+rules share one load per request.
+
+Usage:
+    python benchmark_block_rungs.py [--sample NAME] [--repeat N] [data_model.csv ...]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import polars as pl
+
+# Make the DEV package importable from the repository root
+sys.path.insert(0, str(Path(__file__).parent))
+
+from loguru import logger
+from DEV.project.data_model_format import (
+    DATA_MODEL_KEY_COLUMNS,
+    decode_attributes,
+    load_data_model_pl,
+    parse_attributes,
+    scan_data_model,
+)
+from DEV.project.rule_checker.data_model_queries import (
+    block_rungs,
+    collect_partition_order,
+)
+from DEV.project.rule_checker.partition import DataModelPartition
+
+INPUT_FILES_DIR = Path(__file__).parent / "input_files"
+
+# Blocks and sections looked up by rules 10/11 and 14
+BODY_SECTIONS = ["autorun★", "autorun", "preparation"]
+TYPE_NAMES = ["FlowControlDataJudge_ZDS", "FlowControlDataWrite_ZFC"]
+
+
+def legacy_data_model_pl(csv_path: Path) -> pl.DataFrame:
+    """The data model as the rules loaded it before the typed columns: the CSV columns
+    with ATTRIBUTES decoded to dicts."""
+
+    typed_df = load_data_model_pl(str(csv_path))
+    key_columns = [
+        column
+        for column in typed_df.columns
+        if column in DATA_MODEL_KEY_COLUMNS["program"]
+        or column in DATA_MODEL_KEY_COLUMNS["function"]
+    ]
+
+    return typed_df.select(key_columns).with_columns(
+        pl.Series(
+            "ATTRIBUTES",
+            [decode_attributes(entries) for entries in typed_df["ATTRIBUTES"].to_list()],
+            dtype=pl.Object,
+        )
+    )
+
+
+def row_loop_block_rungs(ladder_partition: DataModelPartition, type_name: str) -> dict:
+    """The lookup as the rules did it before block_rungs."""
+
+    found = {}
+    for program in ladder_partition.programs():
+        ladder_body = ladder_partition.select(program, BODY_SECTIONS)
+        for row in ladder_body.iter_rows():
+            pgm, bdy, rg_order, rg_name, obj, obj_type, attrs = row
+            attrs = parse_attributes(attrs)
+            if attrs.get("typeName") == type_name:
+                found.setdefault(program, []).append((bdy, rg_order))
+
+    return found
+
+
+def _timed(function, repeat: int):
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+
+    return result, (time.perf_counter() - start) / repeat
+
+
+def run_benchmark(csv_path: Path, repeat: int) -> dict:
+
+    start = time.perf_counter()
+    ladder_partition = DataModelPartition(legacy_data_model_pl(csv_path))
+    before_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    typed_df = collect_partition_order(scan_data_model(str(csv_path)))
+    after_load = time.perf_counter() - start
+
+    before, before_seconds = _timed(
+        lambda: [row_loop_block_rungs(ladder_partition, name) for name in TYPE_NAMES],
+        repeat,
+    )
+    after, after_seconds = _timed(
+        lambda: [
+            block_rungs(typed_df.lazy(), name, BODY_SECTIONS) for name in TYPE_NAMES
+        ],
+        repeat,
+    )
+
+    return {
+        "data_model": csv_path.parent.name,
+        "rows": len(typed_df),
+        "blocks": sum(len(rungs) for found in after for rungs in found.values()),
+        "same": before == after,
+        "before_load_s": round(before_load, 3),
+        "after_load_s": round(after_load, 3),
+        "before_query_s": round(before_seconds, 4),
+        "after_query_s": round(after_seconds, 4),
+        "speedup": round(before_seconds / after_seconds, 1) if after_seconds else 0.0,
+    }
+
+
+def _sample_data_models(sample: str = None) -> list:
+
+    sample_dirs = sorted(p for p in INPUT_FILES_DIR.iterdir() if p.is_dir())
+    if sample:
+        sample_dirs = [INPUT_FILES_DIR / sample]
+
+    return [
+        next(f for f in d.glob("*_programwise.csv") if "datasource" not in f.name)
+        for d in sample_dirs
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "data_models", nargs="*", type=Path, help="Programwise data model CSVs"
+    )
+    parser.add_argument("--sample", help="Name of one folder in input_files")
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per lookup, the mean is reported"
+    )
+    args = parser.parse_args()
+
+    logger.remove()
+
+    csv_paths = args.data_models or _sample_data_models(args.sample)
+    results = [run_benchmark(path, max(1, args.repeat)) for path in csv_paths]
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
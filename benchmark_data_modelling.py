@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ladder data modelling stage on the samples in input_files/
+
+The samples only ship the modelled CSVs, so an equivalent Sysmac-style XML is
+rebuilt from each *_programwise.csv / *_functionwise.csv pair first. The XML is
+then ingested and modelled with data_modelling_single_pass and the rows/sec of
+the written data model is reported. Logging is switched off so the numbers
+reflect the modelling itself and not the log file I/O.
+
+With --baseline the same XML is also modelled by ladder_data_modelling_original
+(BeautifulSoup ingest, one DataFrame concat per object) and both timings are
+printed side by side.
+
+Usage:
+    python benchmark_data_modelling.py [--sample NAME] [--max-units N] [--streaming] [--baseline]
+"""
+
+import argparse
+import ast
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+import pandas as pd
+
+# Make the DEV package importable from the repository root
+sys.path.insert(0, str(Path(__file__).parent))
+
+from loguru import logger
+from DEV.project.prepare_data_model import ingest_file, data_modelling_single_pass
+from DEV.project.prepare_data_model import ladder_data_modelling_original
+
+INPUT_FILES_DIR = Path(__file__).parent / "input_files"
+
+
+def _connection_in(ids, order=None):
+    xml = "<ConnectionPointIn>"
+    if order is not None:
+        xml += f'<ConnectionPointInOrder order="{order}"/>'
+    for connection_id in ids:
+        xml += f'<Connection refConnectionPointOutId="{connection_id}"/>'
+    return xml + "</ConnectionPointIn>"
+
+
+def _connection_out(ids, order=None):
+    xml = ""
+    for connection_id in ids:
+        xml += f'<ConnectionPointOut connectionPointOutId="{connection_id}">'
+        if order is not None:
+            xml += f'<ConnectionPointOutOrder order="{order}"/>'
+        xml += "</ConnectionPointOut>"
+    return xml
+
+
+def _object_xml(row):
+    object_type = row.OBJECT_TYPE_LIST
+    attrs = ast.literal_eval(row.ATTRIBUTES) if row.ATTRIBUTES else {}
+    tag = row.OBJECT
+
+    if object_type == "Comment":
+        return ""
+
+    if object_type in ("Contact", "Coil"):
+        extra = "".join(
+            f" {key}={quoteattr(attrs[key])}"
+            for key in ("operand", "edge", "negated", "latch")
+            if key in attrs
+        )
+        return (
+            f'<{tag} xsi:type="{object_type}"{extra}>'
+            f'{_connection_in(attrs.get("in_list", []))}{_connection_out(attrs.get("out_list", []))}</{tag}>'
+        )
+
+    if object_type in ("LeftPowerRail", "RightPowerRail"):
+        return (
+            f'<{tag} xsi:type="{object_type}">'
+            f'{_connection_in(attrs.get("in_list", []))}{_connection_out(attrs.get("out_list", []))}</{tag}>'
+        )
+
+    if object_type == "DataSource":
+        return f'<{tag} xsi:type="{object_type}" identifier={quoteattr(attrs["identifier"])}>{_connection_out(attrs["out_list"])}</{tag}>'
+
+    if object_type == "DataSink":
+        return f'<{tag} xsi:type="{object_type}" identifier={quoteattr(attrs["identifier"])}>{_connection_in(attrs["in_list"])}</{tag}>'
+
+    if object_type == "smcext:InlineST":
+        st_text = escape("\n".join(attrs["comments"] + attrs["data_inputs"]))
+        return f'<{tag} xsi:type="{object_type}"><smcext:ST><ST>{st_text}</ST></smcext:ST></{tag}>'
+
+    if object_type == "Block":
+        block_attrs = f' typeName={quoteattr(attrs.get("typeName", "UnknownFB"))}'
+        if "instanceName" in attrs:
+            block_attrs += f' instanceName={quoteattr(attrs["instanceName"])}'
+
+        in_vars, out_vars, in_out_vars = {}, {}, {}
+        for key, value in attrs.items():
+            for suffix, variables in (
+                ("_inoutVar_", in_out_vars),
+                ("_inVar_", in_vars),
+                ("_outVar_", out_vars),
+            ):
+                if suffix in key:
+                    parameter, field = key.split(suffix)
+                    variables.setdefault(parameter, {})[field] = value
+                    break
+
+        xml = f'<{tag} xsi:type="Block"{block_attrs}><InputVariables>'
+        for parameter, var in in_vars.items():
+            xml += f"<InputVariable parameterName={quoteattr(parameter)}>{_connection_in(var['in_list'], var['in_order'][0])}</InputVariable>"
+        xml += "</InputVariables><InOutVariables>"
+        for parameter, var in in_out_vars.items():
+            xml += (
+                f"<InOutVariable parameterName={quoteattr(parameter)}>{_connection_in(var['in_list'], var['in_order'][0])}"
+                f"{_connection_out(var['out_list'], var['out_order'][0])}</InOutVariable>"
+            )
+        xml += "</InOutVariables><OutputVariables>"
+        for parameter, var in out_vars.items():
+            xml += f"<OutputVariable parameterName={quoteattr(parameter)}>{_connection_out(var['out_list'], var['out_order'][0])}</OutputVariable>"
+        return xml + f"</OutputVariables></{tag}>"
+
+    return f'<{tag} xsi:type="{object_type}"/>'
+
+
+def _units_xml(df, unit_tag, unit_column, body_column):
+    xml = []
+    for unit_name, unit_df in df.groupby(unit_column, sort=False):
+        xml.append(f"<{unit_tag} name={quoteattr(unit_name)}>")
+        for body_name, body_df in unit_df.groupby(body_column, sort=False):
+            if unit_tag == "Program":
+                xml.append(f'<BodyContent xsi:type="Ladder" name={quoteattr(body_name)}>')
+            else:
+                xml.append(f"<BodyContent xsi:type={quoteattr(body_name)}>")
+            for rung, rung_df in body_df.groupby("RUNG", sort=False):
+                xml.append(f'<Rung evaluationOrder="{rung}">')
+                rung_name = rung_df["RUNG_NAME"].iloc[0]
+                if rung_name != "NONE":
+                    xml.append(
+                        f'<CommonObject xsi:type="Comment"><Content>{escape(rung_name)}</Content></CommonObject>'
+                    )
+                xml.extend(_object_xml(row) for row in rung_df.itertuples())
+                xml.append("</Rung>")
+            xml.append("</BodyContent>")
+        xml.append(f"</{unit_tag}>")
+    return "".join(xml)
+
+
+def build_sample_xml(sample_dir: Path, xml_file_path: Path, max_units: int = 0) -> int:
+    """Rebuild a ladder XML from a sample's programwise/functionwise CSVs; returns the row count."""
+
+    program_csv = next(
+        f for f in sample_dir.glob("*_programwise.csv") if "datasource" not in f.name
+    )
+    function_csv = next(
+        f for f in sample_dir.glob("*_functionwise.csv") if "datasource" not in f.name
+    )
+
+    program_df = pd.read_csv(program_csv, keep_default_na=False, dtype=str)
+    function_df = pd.read_csv(function_csv, keep_default_na=False, dtype=str)
+
+    if max_units:
+        program_df = program_df[
+            program_df["PROGRAM"].isin(program_df["PROGRAM"].unique()[:max_units])
+        ]
+        function_df = function_df[
+            function_df["FUNCTION_BLOCK"].isin(
+                function_df["FUNCTION_BLOCK"].unique()[:max_units]
+            )
+        ]
+
+    xml = (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<Project xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:smcext="urn:smcext">'
+        + _units_xml(program_df, "Program", "PROGRAM", "BODY")
+        + _units_xml(function_df, "FunctionBlock", "FUNCTION_BLOCK", "BODY_TYPE")
+        + "</Project>"
+    )
+    xml_file_path.write_text(xml, encoding="utf-8")
+
+    return len(program_df) + len(function_df)
+
+
+def _written_rows(data_model_dir: Path) -> int:
+
+    return len(pd.read_csv(data_model_dir / "benchmark_programwise.csv")) + len(
+        pd.read_csv(data_model_dir / "benchmark_functionwise.csv")
+    )
+
+
+def _model_current(xml_file_path: Path, data_model_dir: Path, streaming: bool) -> float:
+
+    start = time.perf_counter()
+    ladder_program = ingest_file(str(xml_file_path), streaming)
+    data_modelling_single_pass(ladder_program, str(data_model_dir), "benchmark")
+
+    return time.perf_counter() - start
+
+
+def _model_original(xml_file_path: Path, data_model_dir: Path) -> float:
+    """The data modelling before the row record rewrite, as main_ladder_data_modelling ran it"""
+
+    # The original writes to ./<data_model_dir>, so it is given a name relative to its parent
+    cwd = os.getcwd()
+    os.chdir(data_model_dir.parent)
+    try:
+        start = time.perf_counter()
+        ladder_program = ladder_data_modelling_original.ingest_file(str(xml_file_path))
+        ladder_data_modelling_original.data_modelling_program_wise(
+            ladder_program, data_model_dir.name, "benchmark_programwise.csv"
+        )
+        ladder_data_modelling_original.data_modelling_function_wise(
+            ladder_program, data_model_dir.name, "benchmark_functionwise.csv"
+        )
+        elapsed = time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+
+    return elapsed
+
+
+def run_benchmark(sample_dir: Path, max_units: int, streaming: bool, baseline: bool) -> dict:
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        xml_file_path = tmp_path / "benchmark.xml"
+        expected_rows = build_sample_xml(sample_dir, xml_file_path, max_units)
+
+        current_dir = tmp_path / "current"
+        current_dir.mkdir()
+        elapsed = _model_current(xml_file_path, current_dir, streaming)
+        written_rows = _written_rows(current_dir)
+
+        result = {
+            "sample": sample_dir.name,
+            "rows": written_rows,
+            "expected_rows": expected_rows,
+            "seconds": round(elapsed, 2),
+            "rows_per_sec": round(written_rows / elapsed, 1) if elapsed else 0.0,
+        }
+
+        if baseline:
+            original_dir = tmp_path / "original"
+            original_dir.mkdir()
+            original_elapsed = _model_original(xml_file_path, original_dir)
+            original_rows = _written_rows(original_dir)
+
+            result.update(
+                {
+                    "before_rows": original_rows,
+                    "before_seconds": round(original_elapsed, 2),
+                    "before_rows_per_sec": (
+                        round(original_rows / original_elapsed, 1)
+                        if original_elapsed
+                        else 0.0
+                    ),
+                    "speedup": round(original_elapsed / elapsed, 1) if elapsed else 0.0,
+                }
+            )
+
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sample", help="Name of one folder in input_files")
+    parser.add_argument(
+        "--max-units",
+        type=int,
+        default=0,
+        help="Only use the first N programs/function blocks of each sample",
+    )
+    parser.add_argument("--streaming", action="store_true", help="Use streaming ingest")
+    parser.add_argument(
+        "--baseline",
+        action="store_true",
+        help="Also time ladder_data_modelling_original on the same XML (before/after)",
+    )
+    args = parser.parse_args()
+
+    # Also drops the log file sink ladder_data_modelling_original adds on import
+    logger.remove()
+
+    sample_dirs = sorted(p for p in INPUT_FILES_DIR.iterdir() if p.is_dir())
+    if args.sample:
+        sample_dirs = [INPUT_FILES_DIR / args.sample]
+
+    results = [
+        run_benchmark(d, args.max_units, args.streaming, args.baseline)
+        for d in sample_dirs
+    ]
+    print(pd.DataFrame(results).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
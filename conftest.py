@@ -0,0 +1,41 @@
+"""
+Fixtures shared by the root test modules
+
+The blob tests run AzureBlobStorageManager against the filesystem stand-in
+(AZURE_STORAGE_LOCAL_DIR, see DEV/project/local_blob_storage.py), so no storage
+account is needed.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the DEV package importable from the repository root
+sys.path.insert(0, str(Path(__file__).parent))
+
+from DEV.project.azure_storage import AzureBlobStorageManager
+
+
+@pytest.fixture
+def storage_env():
+    """Extra environment of the manager; test modules override it for their settings"""
+
+    return {}
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch, storage_env):
+    for name in ["AZURE_STORAGE_CONNECTION_STRING", "AZURE_STORAGE_ACCOUNT_NAME", "AZURE_STORAGE_ACCOUNT_KEY"]:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("AZURE_STORAGE_LOCAL_DIR", str(tmp_path / "blobs"))
+    # Every download goes to the stand-in unless a module sizes the cache (test_blob_cache.py)
+    monkeypatch.setenv("BLOB_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("BLOB_CACHE_MAX_MB", "0")
+    for name, value in storage_env.items():
+        monkeypatch.setenv(name, value)
+
+    manager = AzureBlobStorageManager()
+    assert manager.enabled
+
+    return manager
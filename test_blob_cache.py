@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests of the local blob cache behind AzureBlobStorageManager downloads
+
+The manager runs against the filesystem stand-in (AZURE_STORAGE_LOCAL_DIR, see
+DEV/project/local_blob_storage.py), so no storage account is needed:
+
+    python -m pytest test_blob_cache.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotModifiedError
+
+# Make the DEV package importable from the repository root
+sys.path.insert(0, str(Path(__file__).parent))
+
+from DEV.project import local_blob_storage
+from DEV.project.blob_cache import DATA_FILE_NAME
+
+FILE_SIZE = 200_000
+
+
+@pytest.fixture
+def storage_env():
+    # Room for two of the test blobs
+    return {"BLOB_CACHE_MAX_MB": str(2.5 * FILE_SIZE / (1024 * 1024))}
+
+
+@pytest.fixture
+def storage(storage):
+    assert storage.blob_cache.enabled
+
+    return storage
+
+
+@pytest.fixture
+def download_requests(monkeypatch):
+    """(blob name, match condition, result) of every download request to the stand-in"""
+    calls = []
+    download_blob = local_blob_storage.LocalBlobClient.download_blob
+
+    def recorded(self, *args, **kwargs):
+        match_condition = kwargs.get("match_condition")
+        try:
+            downloader = download_blob(self, *args, **kwargs)
+        except ResourceNotModifiedError:
+            calls.append((self.blob_name, match_condition, 304))
+            raise
+        calls.append((self.blob_name, match_condition, 200))
+        return downloader
+
+    monkeypatch.setattr(local_blob_storage.LocalBlobClient, "download_blob", recorded)
+
+    return calls
+
+
+def _upload(storage, source, names):
+    source.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (source / name).write_bytes(os.urandom(FILE_SIZE))
+    assert asyncio.run(storage.upload_directory(str(source), "proj"))
+
+
+def test_listing_etag_hit_skips_the_request(storage, download_requests, tmp_path):
+    source = tmp_path / "src"
+    _upload(storage, source, ["f0.bin", "f1.bin"])
+
+    assert asyncio.run(storage.download_directory("proj/", str(tmp_path / "d1")))
+    assert sorted(download_requests) == [("proj/f0.bin", None, 200), ("proj/f1.bin", None, 200)]
+
+    # The ETags of the listing match the cache: no download request at all
+    download_requests.clear()
+    assert asyncio.run(storage.download_directory("proj/", str(tmp_path / "d2")))
+    assert download_requests == []
+    for name in ["f0.bin", "f1.bin"]:
+        assert (tmp_path / "d2" / name).read_bytes() == (source / name).read_bytes()
+
+
+def test_unchanged_blob_is_revalidated(storage, download_requests, tmp_path):
+    source = tmp_path / "src"
+    _upload(storage, source, ["f0.bin"])
+    assert asyncio.run(storage.download_file("proj/f0.bin", str(tmp_path / "first.bin")))
+
+    # Without a listing ETag the cached copy is revalidated with If-None-Match
+    download_requests.clear()
+    assert asyncio.run(storage.download_file("proj/f0.bin", str(tmp_path / "second.bin")))
+    assert download_requests == [("proj/f0.bin", MatchConditions.IfModified, 304)]
+    assert (tmp_path / "second.bin").read_bytes() == (source / "f0.bin").read_bytes()
+
+
+def test_changed_blob_is_downloaded_again(storage, download_requests, tmp_path):
+    source = tmp_path / "src"
+    _upload(storage, source, ["f0.bin"])
+    assert asyncio.run(storage.download_file("proj/f0.bin", str(tmp_path / "first.bin")))
+    cached_etag = storage.blob_cache.lookup(storage.container_name, "proj/f0.bin").etag
+
+    _upload(storage, source, ["f0.bin"])
+    download_requests.clear()
+    assert asyncio.run(storage.download_file("proj/f0.bin", str(tmp_path / "second.bin")))
+
+    assert download_requests == [("proj/f0.bin", MatchConditions.IfModified, 200)]
+    assert (tmp_path / "second.bin").read_bytes() == (source / "f0.bin").read_bytes()
+    assert storage.blob_cache.lookup(storage.container_name, "proj/f0.bin").etag != cached_etag
+
+
+def test_least_recently_used_blobs_are_evicted(storage, download_requests, tmp_path):
+    source = tmp_path / "src"
+    _upload(storage, source, ["a.bin", "b.bin", "c.bin"])
+
+    for name in ["a.bin", "b.bin", "a.bin", "c.bin"]:
+        assert asyncio.run(storage.download_file(f"proj/{name}", str(tmp_path / "dst" / name)))
+        # Distinct use times for the LRU order
+        time.sleep(0.01)
+
+    # a.bin was used after b.bin, so b.bin made room for c.bin
+    cache = storage.blob_cache
+    assert cache.lookup(storage.container_name, "proj/a.bin") is not None
+    assert cache.lookup(storage.container_name, "proj/b.bin") is None
+    assert cache.lookup(storage.container_name, "proj/c.bin") is not None
+    cached_bytes = sum(path.stat().st_size for path in cache.cache_dir.rglob(DATA_FILE_NAME))
+    assert cached_bytes <= cache.max_bytes
+
+    # The evicted blob is downloaded again, the cached one revalidated
+    download_requests.clear()
+    assert asyncio.run(storage.download_file("proj/b.bin", str(tmp_path / "again" / "b.bin")))
+    assert asyncio.run(storage.download_file("proj/c.bin", str(tmp_path / "again" / "c.bin")))
+    assert download_requests == [("proj/b.bin", None, 200), ("proj/c.bin", MatchConditions.IfModified, 304)]
+
+
+def test_blob_larger_than_the_cache_is_not_cached(storage, tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    (source / "big.bin").write_bytes(os.urandom(3 * FILE_SIZE))
+    assert asyncio.run(storage.upload_directory(str(source), "proj"))
+
+    assert asyncio.run(storage.download_file("proj/big.bin", str(tmp_path / "big.bin")))
+    assert (tmp_path / "big.bin").read_bytes() == (source / "big.bin").read_bytes()
+    assert storage.blob_cache.lookup(storage.container_name, "proj/big.bin") is None
+
+
+def test_missing_blob_is_not_served_from_the_cache(storage, tmp_path):
+    source = tmp_path / "src"
+    _upload(storage, source, ["f0.bin"])
+    assert asyncio.run(storage.download_file("proj/f0.bin", str(tmp_path / "first.bin")))
+
+    storage.container_client.delete_blob("proj/f0.bin")
+    assert not asyncio.run(storage.download_file("proj/f0.bin", str(tmp_path / "second.bin")))
+    assert not (tmp_path / "second.bin").exists()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests of incremental uploads and deduplicated archives of
+AzureBlobStorageManager
+
+The manager runs against the filesystem stand-in (AZURE_STORAGE_LOCAL_DIR, see
+DEV/project/local_blob_storage.py), so no storage account is needed:
+
+    python -m pytest test_blob_sync.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the DEV package importable from the repository root
+sys.path.insert(0, str(Path(__file__).parent))
+
+from DEV.project.azure_storage import ARCHIVE_MANIFEST, CONTENT_PREFIX
+
+ARCHIVE_CONTAINER = "input-files"
+
+
+@pytest.fixture
+def uploaded(storage, monkeypatch):
+    """Blob names of the files the manager uploads"""
+    blob_names = []
+    upload_file_to_container = storage._upload_file_to_container
+
+    async def recorded(local_file_path, blob_name, *args, **kwargs):
+        blob_names.append(blob_name)
+        return await upload_file_to_container(local_file_path, blob_name, *args, **kwargs)
+
+    monkeypatch.setattr(storage, "_upload_file_to_container", recorded)
+
+    return blob_names
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    source = tmp_path / "src"
+    (source / "out").mkdir(parents=True)
+    for i in range(4):
+        (source / f"f{i}.bin").write_bytes(os.urandom(200_000))
+    # Same content as f0.bin under another name
+    (source / "out" / "same.csv").write_bytes((source / "f0.bin").read_bytes())
+
+    return source
+
+
+def test_incremental_upload_skips_unchanged_files(storage, uploaded, source_dir):
+    assert asyncio.run(storage.upload_directory(str(source_dir), "proj", incremental=True))
+    assert len(uploaded) == 5
+
+    uploaded.clear()
+    assert asyncio.run(storage.upload_directory(str(source_dir), "proj", incremental=True))
+    assert uploaded == []
+
+    # Same size, other content: the Content-MD5 tells them apart
+    (source_dir / "f2.bin").write_bytes(os.urandom(200_000))
+    (source_dir / "f9.bin").write_bytes(os.urandom(1_000))
+    uploaded.clear()
+    assert asyncio.run(storage.upload_directory(str(source_dir), "proj", incremental=True))
+    assert sorted(uploaded) == ["proj/f2.bin", "proj/f9.bin"]
+
+    # A full upload sends every file again
+    uploaded.clear()
+    assert asyncio.run(storage.upload_directory(str(source_dir), "proj"))
+    assert len(uploaded) == 6
+
+
+def test_incremental_upload_compares_only_its_prefix(storage, uploaded, source_dir):
+    assert asyncio.run(storage.upload_directory(str(source_dir), "proj", incremental=True))
+
+    uploaded.clear()
+    assert asyncio.run(storage.upload_directory(str(source_dir), "proj_copy", incremental=True))
+    assert len(uploaded) == 5
+    assert all(blob_name.startswith("proj_copy/") for blob_name in uploaded)
+
+
+def test_archive_directory_stores_identical_content_once(storage, uploaded, source_dir):
+    assert asyncio.run(storage.archive_directory(str(source_dir), "proj_1", ARCHIVE_CONTAINER))
+
+    # f0.bin and out/same.csv share one content blob
+    assert len(uploaded) == 4
+    assert all(blob_name.startswith(f"{CONTENT_PREFIX}/") for blob_name in uploaded)
+
+    container_client = storage.blob_service_client.get_container_client(ARCHIVE_CONTAINER)
+    manifest_blob = container_client.get_blob_client(f"proj_1/{ARCHIVE_MANIFEST}")
+    manifest = json.loads(manifest_blob.download_blob().readall())["files"]
+    assert sorted(manifest) == ["f0.bin", "f1.bin", "f2.bin", "f3.bin", "out/same.csv"]
+    assert manifest["f0.bin"]["blob"] == manifest["out/same.csv"]["blob"]
+    assert manifest["f1.bin"]["size"] == 200_000
+
+    # A second archive uploads only the content no archive has stored yet
+    uploaded.clear()
+    (source_dir / "f4.bin").write_bytes(os.urandom(50_000))
+    assert asyncio.run(storage.archive_directory(str(source_dir), "proj_2", ARCHIVE_CONTAINER))
+    assert len(uploaded) == 1
+
+    stored = [blob.name for blob in container_client.list_blobs()]
+    assert len([name for name in stored if name.startswith(f"{CONTENT_PREFIX}/")]) == 5
+    assert f"proj_1/{ARCHIVE_MANIFEST}" in stored and f"proj_2/{ARCHIVE_MANIFEST}" in stored
+
+
+def test_download_archive_restores_the_files(storage, source_dir, tmp_path):
+    assert asyncio.run(storage.archive_directory(str(source_dir), "proj_1", ARCHIVE_CONTAINER))
+    events = []
+
+    async def progress_callback(event):
+        events.append(event)
+
+    target = tmp_path / "restored"
+    assert asyncio.run(storage.download_archive("proj_1", str(target), ARCHIVE_CONTAINER, progress_callback))
+
+    for relative_path in ["f0.bin", "f1.bin", "f2.bin", "f3.bin", "out/same.csv"]:
+        assert (target / relative_path).read_bytes() == (source_dir / relative_path).read_bytes()
+    assert events[-1]["type"] == "download_complete" and events[-1]["files_completed"] == 5
+
+
+def test_download_archive_of_a_missing_archive_fails(storage, tmp_path):
+    assert not asyncio.run(storage.download_archive("nothing", str(tmp_path / "restored"), ARCHIVE_CONTAINER))
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests of the concurrent blob transfers of AzureBlobStorageManager
+
+The manager runs against the filesystem stand-in (AZURE_STORAGE_LOCAL_DIR, see
+DEV/project/local_blob_storage.py), so no storage account is needed:
+
+    python -m pytest test_blob_transfers.py
+"""
+
+import asyncio
+import os
+
+import pytest
+
+# Sizes of the test files; with 1 MB blocks most of them take several ranges
+FILE_SIZES = {
+    "f0.bin": 300_000,
+    "f1.bin": 1_200_000,
+    "f2.bin": 2_500_000,
+    "f3.bin": 700_000,
+    "f4.bin": 3_100_000,
+    "sub/x.xml": 1_800_000,
+}
+
+
+@pytest.fixture
+def storage_env():
+    return {"AZURE_TRANSFER_BLOCK_SIZE_MB": "1", "AZURE_TRANSFER_CONCURRENCY": "4"}
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    source = tmp_path / "src"
+    for relative_path, size in FILE_SIZES.items():
+        file_path = source / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_bytes(os.urandom(size))
+
+    return source
+
+
+def _collector():
+    events = []
+
+    async def progress_callback(event):
+        events.append(event)
+
+    return events, progress_callback
+
+
+def test_upload_and_download_directory_round_trip(storage, source_dir, tmp_path):
+    events, progress_callback = _collector()
+
+    assert asyncio.run(storage.upload_directory(str(source_dir), "proj", progress_callback=progress_callback))
+    blobs = asyncio.run(storage.list_blob_properties("proj/"))
+    assert {blob.name: blob.size for blob in blobs} == {f"proj/{name}": size for name, size in FILE_SIZES.items()}
+
+    assert events[-1]["type"] == "upload_complete"
+    assert events[-1]["success"] and events[-1]["files_completed"] == len(FILE_SIZES)
+
+    target = tmp_path / "dst"
+    assert asyncio.run(storage.download_directory("proj", str(target)))
+    for relative_path in FILE_SIZES:
+        assert (target / relative_path).read_bytes() == (source_dir / relative_path).read_bytes()
+
+
+def test_download_progress_is_aggregated(storage, source_dir, tmp_path):
+    asyncio.run(storage.upload_directory(str(source_dir), "proj"))
+    events, progress_callback = _collector()
+
+    assert asyncio.run(storage.download_directory("proj/", str(tmp_path / "dst"), progress_callback))
+
+    types = [event["type"] for event in events]
+    assert types.count("file_start") == len(FILE_SIZES)
+    assert types.count("file_complete") == len(FILE_SIZES)
+    assert types[-1] == "download_complete"
+    assert events[-1]["success"] and events[-1]["files_completed"] == len(FILE_SIZES)
+
+    # One running total over all blobs in flight, never going back
+    total_bytes = sum(FILE_SIZES.values())
+    overall = [event["overall_progress"] for event in events if event["type"] == "file_progress"]
+    assert overall and overall == sorted(overall)
+    assert overall[-1] <= total_bytes
+    assert all(event["overall_total"] == total_bytes for event in events if event["type"] == "file_progress")
+    assert [event["files_completed"] for event in events if event["type"] == "file_complete"] == list(
+        range(1, len(FILE_SIZES) + 1)
+    )
+
+
+def test_downloads_run_concurrently_up_to_the_limit(storage, source_dir, tmp_path, monkeypatch):
+    asyncio.run(storage.upload_directory(str(source_dir), "proj"))
+    download_blob_to_file = storage._download_blob_to_file
+    in_flight = []
+    peak = []
+
+    async def tracked(*args, **kwargs):
+        in_flight.append(args[0])
+        peak.append(len(in_flight))
+        # Hold the slot so the other downloads start in the meantime
+        await asyncio.sleep(0.05)
+        try:
+            return await download_blob_to_file(*args, **kwargs)
+        finally:
+            in_flight.remove(args[0])
+
+    monkeypatch.setattr(storage, "_download_blob_to_file", tracked)
+
+    assert asyncio.run(storage.download_directory("proj/", str(tmp_path / "dst")))
+    assert max(peak) == storage.transfer_concurrency
+
+
+def test_download_file_reports_progress(storage, source_dir, tmp_path):
+    asyncio.run(storage.upload_directory(str(source_dir), "proj"))
+    calls = []
+
+    async def progress_callback(current, total, filename):
+        calls.append((current, total, filename))
+
+    local_file = tmp_path / "one" / "x.xml"
+    assert asyncio.run(storage.download_file("proj/sub/x.xml", str(local_file), progress_callback))
+
+    assert local_file.read_bytes() == (source_dir / "sub" / "x.xml").read_bytes()
+    # One call per 1 MB range
+    assert len(calls) == 2
+    assert calls[-1] == (FILE_SIZES["sub/x.xml"], FILE_SIZES["sub/x.xml"], "x.xml")
+
+
+def test_missing_blob_fails_without_a_local_file(storage, tmp_path):
+    local_file = tmp_path / "one" / "missing.bin"
+
+    assert not asyncio.run(storage.download_file("proj/missing.bin", str(local_file)))
+    assert not local_file.exists()
+    assert not asyncio.run(storage.download_directory("nothing/", str(tmp_path / "dst")))
+
+
+def test_blob_deleted_after_listing_fails_the_directory(storage, source_dir, tmp_path, monkeypatch):
+    asyncio.run(storage.upload_directory(str(source_dir), "proj"))
+    list_blob_properties = storage.list_blob_properties
+
+    async def listing_then_delete(*args, **kwargs):
+        blobs = await list_blob_properties(*args, **kwargs)
+        storage.container_client.delete_blob("proj/f3.bin")
+        return blobs
+
+    monkeypatch.setattr(storage, "list_blob_properties", listing_then_delete)
+    events, progress_callback = _collector()
+    target = tmp_path / "dst"
+
+    assert not asyncio.run(storage.download_directory("proj/", str(target), progress_callback))
+
+    # The other blobs still arrive, the final event reports the failure
+    assert not (target / "f3.bin").exists()
+    assert (target / "f4.bin").read_bytes() == (source_dir / "f4.bin").read_bytes()
+    assert events[-1]["type"] == "download_complete"
+    assert not events[-1]["success"]
+    assert events[-1]["files_completed"] == len(FILE_SIZES) - 1
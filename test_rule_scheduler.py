@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests of the rule checker process pool
+
+    python -m pytest test_rule_scheduler.py
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Make the DEV package importable from the repository root
+sys.path.insert(0, str(Path(__file__).parent))
+
+from DEV.project.rule_checker import DataModel, RuleScheduler
+
+
+def _worker_probe(data_model: DataModel) -> dict:
+    """Rule wrapper stand-in reporting on the worker process it runs in"""
+
+    return {"status": "SUCCESS", "pid": os.getpid(), "main_imported": "DEV.main" in sys.modules}
+
+
+def _failing_rule(data_model: DataModel) -> dict:
+
+    raise ValueError("malformed rung")
+
+
+def test_workers_do_not_import_the_server_module(tmp_path):
+    data_model = DataModel(*(str(tmp_path / f"missing_{i}") for i in range(7)))
+    scheduler = RuleScheduler(2)
+
+    try:
+        results = asyncio.run(scheduler.run([("a", _worker_probe), ("b", _worker_probe)], data_model))
+    finally:
+        scheduler.shutdown()
+
+    assert [rule_id for rule_id, _ in results] == ["a", "b"]
+    for _, status in results:
+        assert status["pid"] != os.getpid()
+        # DEV.main adds the log file sink and builds the app, storage and job queue
+        assert not status["main_imported"]
+
+
+def test_rule_exception_fails_only_that_rule(tmp_path):
+    data_model = DataModel(*(str(tmp_path / f"missing_{i}") for i in range(7)))
+    scheduler = RuleScheduler(2)
+
+    try:
+        results = asyncio.run(
+            scheduler.run([("a", _failing_rule), ("b", _worker_probe), ("c", None)], data_model)
+        )
+    finally:
+        scheduler.shutdown()
+
+    assert results[0] == ("a", {"status": "FAILED", "error": "malformed rung"})
+    assert results[1][1]["status"] == "SUCCESS"
+    assert results[2] == ("c", None)
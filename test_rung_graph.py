@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests of the series / parallel contact queries of the rung graph and of
+the connection super nodes
+
+    python -m pytest test_rung_graph.py
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Make the DEV package importable from the repository root
+sys.path.insert(0, str(Path(__file__).parent))
+
+from DEV.project.rule_checker.rung_graph import (
+    ConnectionSuperNodes,
+    build_chains,
+    contacts_before_operand,
+    contacts_in_series,
+    create_super_sets,
+    first_series_chain_ending_with,
+    get_in_parallel_A_contacts,
+    get_parallel_contacts,
+    get_series_contacts,
+    replace_sub_list_with_super_list,
+    series_parallel_analyser,
+)
+
+
+def _contact(operand, in_list, out_list, negated="false"):
+    return ("Contact", {"operand": operand, "negated": negated, "in_list": in_list, "out_list": out_list})
+
+
+def _coil(operand, in_list):
+    return ("Coil", {"operand": operand, "in_list": in_list, "out_list": []})
+
+
+def _rung(*objects) -> pd.DataFrame:
+    """Rung frame of (object type, attributes) pairs, ATTRIBUTES written like the CSV"""
+
+    return pd.DataFrame(
+        {
+            "OBJECT_TYPE_LIST": [object_type for object_type, _ in objects],
+            "ATTRIBUTES": [repr(attributes) for _, attributes in objects],
+        }
+    )
+
+
+def _operands(chains):
+    return [[attributes["operand"] for attributes in chain] for chain in chains]
+
+
+# A and C in parallel, then B, then the coil:
+#
+#   --+--[A]--+--[B]--( Y )
+#     +--[C]--+
+PARALLEL_RUNG = _rung(
+    _contact("A", ["1"], ["2"]),
+    _contact("C", ["1"], ["2"]),
+    _contact("B", ["2"], ["3"]),
+    _coil("Y", ["3"]),
+)
+
+# A in parallel with the series branch D, E (E negated)
+#
+#   --+--[A]---------+--[B]--( Y )
+#     +--[D]--[/E]---+
+BRANCH_RUNG = _rung(
+    _contact("A", ["1"], ["2"]),
+    _contact("D", ["1"], ["5"]),
+    _contact("E", ["5"], ["2"], negated="true"),
+    _contact("B", ["2"], ["3"]),
+    _coil("Y", ["3"]),
+)
+
+
+def _reference_chains(data):
+    """build_chains as written before the analyser: one DFS from every object"""
+
+    chains = []
+
+    def dfs(path, visited):
+        extended = False
+        for index, candidate in enumerate(data):
+            if index not in visited and set(path[-1].get("out_list", [])) & set(candidate.get("in_list", [])):
+                dfs(path + [candidate], visited | {index})
+                extended = True
+        if not extended:
+            chains.append(path)
+
+    for index in range(len(data)):
+        dfs([data[index]], {index})
+
+    return chains
+
+
+def test_series_chains_follow_the_wiring():
+    assert _operands(get_series_contacts(PARALLEL_RUNG)) == [["A", "B"], ["C", "B"], ["B"]]
+    assert _operands(get_series_contacts(BRANCH_RUNG)) == [["A", "B"], ["D", "E", "B"], ["E", "B"], ["B"]]
+
+
+def test_chains_match_the_path_enumeration():
+    # Three parallel pairs in series plus a bypass: 2 * 2 * 2 + 1 chains from the start
+    objects = []
+    for stage in range(3):
+        objects.append({"operand": f"P{stage}", "in_list": [str(stage)], "out_list": [str(stage + 1)]})
+        objects.append({"operand": f"Q{stage}", "in_list": [str(stage)], "out_list": [str(stage + 1)]})
+    objects.append({"operand": "R", "in_list": ["0"], "out_list": ["3"]})
+    objects.append({"operand": "Y", "in_list": ["3"], "out_list": []})
+
+    assert build_chains(objects) == _reference_chains(objects)
+
+
+def test_contacts_in_series():
+    assert contacts_in_series(PARALLEL_RUNG, ["A", "B"])
+    assert contacts_in_series(PARALLEL_RUNG, ["C", "B"])
+    # Parallel contacts never share a chain
+    assert not contacts_in_series(PARALLEL_RUNG, ["A", "C"])
+
+    assert contacts_in_series(BRANCH_RUNG, ["D", "E", "B"])
+    assert not contacts_in_series(BRANCH_RUNG, ["D", "E"], negated="false")
+    assert contacts_in_series(BRANCH_RUNG, ["A", "Y"], object_types=("Contact", "Coil"))
+    # D reaches B only through E
+    assert contacts_in_series(BRANCH_RUNG, ["D", "B"], excluded=["A"])
+    assert not contacts_in_series(BRANCH_RUNG, ["D", "B"], excluded=["E"])
+    assert not contacts_in_series(BRANCH_RUNG, ["D", "B"], exact=True)
+    assert contacts_in_series(BRANCH_RUNG, ["D", "E", "B"], exact=True)
+
+
+def test_chain_and_upstream_queries():
+    assert [contact["operand"] for contact in first_series_chain_ending_with(BRANCH_RUNG, "Y")] == ["A", "B", "Y"]
+    assert first_series_chain_ending_with(BRANCH_RUNG, "Z") == []
+
+    assert [contact["operand"] for contact in contacts_before_operand(BRANCH_RUNG, "B")] == ["A", "D", "E"]
+    assert [contact["operand"] for contact in contacts_before_operand(BRANCH_RUNG, "E")] == ["D"]
+
+
+def test_parallel_contacts():
+    parallel = list(get_parallel_contacts(PARALLEL_RUNG).values())
+    assert get_in_parallel_A_contacts(parallel, "A") == ["C"]
+    assert get_in_parallel_A_contacts(parallel, "C") == ["A"]
+    assert get_in_parallel_A_contacts(parallel, "B") == []
+
+    # The branch D, E is in parallel with A; only the normally open contact counts
+    parallel = list(get_parallel_contacts(BRANCH_RUNG).values())
+    pairs = [
+        [contact["operand"] for contact in pair["contact_chain"]]
+        for pair in parallel
+        if pair["ref_contact"]["operand"] == "A"
+    ]
+    assert pairs == [["D", "E"]]
+    assert get_in_parallel_A_contacts(parallel, "A") == ["D"]
+
+
+def test_wide_rung_is_answered_without_listing_the_chains():
+    # 40 parallel pairs in series: 2**40 chains from the first junction
+    objects = []
+    for stage in range(40):
+        objects.append(_contact(f"P{stage}", [str(stage)], [str(stage + 1)]))
+        objects.append(_contact(f"Q{stage}", [str(stage)], [str(stage + 1)]))
+    objects.append(_coil("Y", ["40"]))
+    rung = _rung(*objects)
+
+    assert contacts_in_series(rung, ["P0", "Q20", "P39"])
+    assert not contacts_in_series(rung, ["P0", "Q0"])
+
+    analyser = series_parallel_analyser([attributes for _, attributes in objects])
+    assert analyser.path_counts[0] == 2**39
+    assert analyser.reaches(0, len(objects) - 1)
+
+
+def _reference_super_sets(sub_list):
+    """create_super_sets as written before the disjoint-set: BFS over the lists"""
+
+    sets = [set(connection_list) for connection_list in sub_list]
+    visited = set()
+    groups = []
+    for index, connection_set in enumerate(sets):
+        if not connection_set or index in visited:
+            continue
+        group = set(connection_set)
+        queue = [index]
+        visited.add(index)
+        while queue:
+            queue.pop()
+            for other, other_set in enumerate(sets):
+                if other not in visited and other_set and group & other_set:
+                    group |= other_set
+                    visited.add(other)
+                    queue.append(other)
+        groups.append(sorted(group))
+
+    if any(not connection_list for connection_list in sub_list):
+        groups.append([])
+
+    return groups
+
+
+def test_super_sets_merge_overlapping_lists():
+    assert create_super_sets([["1", "2"], ["3"], ["2", "4"], [], ["5", "3"]]) == [["1", "2", "4"], ["3", "5"], []]
+    # Merged through a later list
+    assert create_super_sets([["1"], ["2"], ["1", "2"]]) == [["1", "2"]]
+    assert create_super_sets([]) == []
+
+
+def test_super_sets_match_the_list_scan():
+    generator = random.Random(7)
+    for _ in range(200):
+        sub_list = [
+            [str(generator.randrange(30)) for _ in range(generator.randrange(4))]
+            for _ in range(generator.randrange(1, 25))
+        ]
+        assert create_super_sets(sub_list) == _reference_super_sets(sub_list)
+
+
+def test_super_node_lookup():
+    super_nodes = ConnectionSuperNodes([["1", "2"], ["3"], ["2", "4"]])
+    groups = super_nodes.super_nodes()
+
+    assert super_nodes.find("4") == super_nodes.find("1")
+    assert super_nodes.find("3") != super_nodes.find("1")
+    assert super_nodes.super_node(["4"]) == ["1", "2", "4"]
+    assert super_nodes.super_node(["9"]) == ["9"]
+    assert super_nodes.super_node([]) == []
+    # A list touching two super nodes gets the first, like the old scan
+    assert super_nodes.super_node(["3", "4"]) == ["1", "2", "4"]
+
+    for single in (["4"], ["9"], [], ["3", "4"]):
+        assert replace_sub_list_with_super_list(single, groups) == super_nodes.super_node(single)
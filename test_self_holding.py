@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests of the self holding coil check shared by the rules
+
+    python -m pytest test_self_holding.py
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Make the DEV package importable from the repository root
+sys.path.insert(0, str(Path(__file__).parent))
+
+from DEV.project.rule_checker.self_holding import check_self_holding, self_holding_coils
+
+SAMPLE_DIR = Path(__file__).parent / "input_files" / "Coding Checker_Rule10-23_33_250729"
+
+
+def _sample_rung(kind: str, unit: str, section: str, rung: int) -> pd.DataFrame:
+    ladder_df = pd.read_csv(SAMPLE_DIR / f"Coding Checker_Rule10-23_33_250729_{kind}.csv")
+    unit_column, section_column = ("PROGRAM", "BODY") if kind == "programwise" else ("FUNCTION_BLOCK", "BODY_TYPE")
+
+    return ladder_df[
+        (ladder_df[unit_column] == unit) & (ladder_df[section_column] == section) & (ladder_df["RUNG"] == rung)
+    ]
+
+
+def _contact(operand, in_list, out_list, negated="false"):
+    return ("Contact", {"operand": operand, "negated": negated, "in_list": in_list, "out_list": out_list})
+
+
+def _coil(operand, in_list):
+    return ("Coil", {"operand": operand, "in_list": in_list, "out_list": ["99"]})
+
+
+def _rung(*objects) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "OBJECT_TYPE_LIST": [object_type for object_type, _ in objects],
+            "ATTRIBUTES": [repr(attributes) for _, attributes in objects],
+        }
+    )
+
+
+# (sample, unit, section, rung, negation aware answer, rule 10-16/71 answer); the
+# expected values are those of the check_self_holding copies the analyser replaced
+SAMPLE_RUNGS = [
+    # The negated contact of the coil operand is the first one feeding the coil, so the
+    # normally open contact next to it is never looked at
+    ("functionwise", "Flow_Motion_Time", "LD", 8, [], ["LB100[1]"]),
+    # Same, one contact further up the rung
+    ("functionwise", "Operation_Assist", "LD", 2, [], ["OP_PL[1]"]),
+    # Two interlocked coils: each holds itself, the other one's negated contact is in series
+    ("programwise", "P101_HMI", "SetUp_Data", 12, ["LB200[11]", "LB200[12]"], ["LB200[11]", "LB200[12]"]),
+    ("programwise", "P111_XXXPRS_Function1", "AutoRun", 19, ["LB680[12]", "LB680[13]"], ["LB680[12]", "LB680[13]"]),
+]
+
+
+@pytest.mark.parametrize("kind, unit, section, rung, negation_aware, loose", SAMPLE_RUNGS)
+def test_sample_rungs(kind, unit, section, rung, negation_aware, loose):
+    ladder_df = _sample_rung(kind, unit, section, rung)
+    assert not ladder_df.empty
+
+    assert check_self_holding(ladder_df) == negation_aware
+    assert self_holding_coils(ladder_df, check_negated=False) == loose
+
+
+def test_negated_contact_ends_only_its_branch():
+    # --[/Y]--[X1]--+--( Y )
+    # --[Y]---[X2]--+
+    ladder_df = _rung(
+        _contact("X1", ["1"], ["9"]),
+        _contact("X2", ["2"], ["9"]),
+        _contact("Y", ["0"], ["1"], negated="true"),
+        _contact("Y", ["0"], ["2"]),
+        _coil("Y", ["9"]),
+    )
+
+    assert check_self_holding(ladder_df) == ["Y"]
+
+
+def test_negated_contact_first_at_the_coil_hides_its_sibling():
+    negated_first = _rung(
+        _contact("Y", ["0"], ["9"], negated="true"),
+        _contact("Y", ["0"], ["9"]),
+        _coil("Y", ["9"]),
+    )
+    holding_first = _rung(
+        _contact("Y", ["0"], ["9"]),
+        _contact("Y", ["0"], ["9"], negated="true"),
+        _coil("Y", ["9"]),
+    )
+
+    assert check_self_holding(negated_first) == []
+    assert check_self_holding(holding_first) == ["Y"]
+    assert self_holding_coils(negated_first, check_negated=False) == ["Y"]
+
+
+def test_rung_without_coils():
+    assert check_self_holding(_rung(_contact("A", ["0"], ["1"]))) == []
+
+
+def test_malformed_attributes_raise():
+    ladder_df = pd.DataFrame({"OBJECT_TYPE_LIST": ["Coil"], "ATTRIBUTES": ["{'operand': "]})
+
+    with pytest.raises(SyntaxError):
+        check_self_holding(ladder_df)